@@ -1,16 +1,36 @@
 """API routes for agent management."""
 
-from typing import List
-from fastapi import APIRouter, HTTPException, status, UploadFile, File
-from fastapi.responses import JSONResponse
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Query, UploadFile, File, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+import io
 import json
+import asyncio
+import shutil
+import tempfile
+import zipfile
+
+from app.core.config import settings
+from app.core.etag import compute_etag, conditional
 
 from app.models.agent import (
     AgentCreate,
     AgentUpdate,
     AgentResponse,
     AgentListResponse,
-    AgentGenerateRequest
+    AgentSearchQuery,
+    AgentSearchResponse,
+    AgentGenerateRequest,
+    AgentBatchGenerateRequest,
+    AgentBatchGenerateItem,
+    AgentImportResponse
+)
+from app.services.agent_import import (
+    JSONL_CONTENT_TYPES,
+    ZIP_CONTENT_TYPES,
+    AsyncStreamReader,
+    iter_jsonl_records,
+    iter_zip_records,
 )
 from app.services.agent_service import agent_service
 
@@ -39,15 +59,22 @@ async def create_agent(agent_create: AgentCreate):
 
 
 @router.get("/", response_model=AgentListResponse)
-async def list_agents():
+async def list_agents(request: Request, response: Response):
     """
     List all agents.
 
+    The ETag covers every agent's ID and ``updated_at``, so an unchanged
+    library is answered with 304 before it is serialized.
+
     Returns:
         List of all agents
     """
     try:
         agents = agent_service.list_agents()
+        etag = compute_etag("agents", [(agent.id, agent.updated_at) for agent in agents])
+        not_modified = conditional(request, response, etag)
+        if not_modified:
+            return not_modified
         return AgentListResponse(agents=agents, total=len(agents))
     except Exception as e:
         raise HTTPException(
@@ -56,8 +83,68 @@ async def list_agents():
         )
 
 
+@router.get("/search", response_model=AgentSearchResponse)
+async def search_agents(
+    request: Request,
+    response: Response,
+    name: Optional[str] = None,
+    occupation: Optional[str] = None,
+    nationality: Optional[str] = None,
+    residence: Optional[str] = None,
+    age_min: Optional[int] = Query(None, ge=0),
+    age_max: Optional[int] = Query(None, ge=0),
+    skills: Optional[List[str]] = Query(None, alias="skill"),
+    traits: Optional[List[str]] = Query(None, alias="trait"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    Search agents by persona attributes, oldest first.
+
+    Text filters match whole words regardless of case and accents, so
+    ``occupation=engineer`` finds "Software Engineer". All filters must
+    match. Searches use secondary indexes kept up to date on every write.
+
+    Args:
+        name: Words of the persona's name
+        occupation: Words of occupation.title
+        nationality: Words of the nationality
+        residence: Words of the residence
+        age_min: Minimum age, inclusive
+        age_max: Maximum age, inclusive
+        skills: Words found among the skills; repeat the parameter for more
+        traits: Words found among the personality traits; repeat for more
+        cursor: Cursor returned as next_cursor by the previous page
+        limit: Page size
+
+    Returns:
+        One page of matching agents
+    """
+    query = AgentSearchQuery(
+        name=name,
+        occupation=occupation,
+        nationality=nationality,
+        residence=residence,
+        age_min=age_min,
+        age_max=age_max,
+        skills=skills or [],
+        traits=traits or []
+    )
+    try:
+        agents, total, next_cursor = agent_service.search_agents(query, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    etag = compute_etag("agents", [(agent.id, agent.updated_at) for agent in agents], total, next_cursor)
+    return conditional(request, response, etag) or AgentSearchResponse(
+        agents=agents, total=total, next_cursor=next_cursor
+    )
+
+
 @router.get("/{agent_id}", response_model=AgentResponse)
-async def get_agent(agent_id: str):
+async def get_agent(agent_id: str, request: Request, response: Response):
     """
     Get a specific agent by ID.
 
@@ -65,7 +152,7 @@ async def get_agent(agent_id: str):
         agent_id: Agent ID
 
     Returns:
-        Agent data
+        Agent data, or 304 if the client's ETag is current
     """
     agent = agent_service.get_agent(agent_id)
     if not agent:
@@ -73,7 +160,8 @@ async def get_agent(agent_id: str):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Agent with ID {agent_id} not found"
         )
-    return agent
+    etag = compute_etag("agent", agent.id, agent.updated_at or agent.model_dump(mode="json"))
+    return conditional(request, response, etag) or agent
 
 
 @router.put("/{agent_id}", response_model=AgentResponse)
@@ -137,6 +225,44 @@ async def generate_agent(request: AgentGenerateRequest):
         )
 
 
+@router.post("/generate/batch")
+async def generate_agents_batch(request: AgentBatchGenerateRequest):
+    """
+    Generate many agents concurrently, streaming each one as it is created.
+
+    The response is newline-delimited JSON: one object per requested agent,
+    in completion order, with its ``index`` in the batch and either the
+    created ``agent`` or an ``error``.
+
+    Args:
+        request: Descriptions, or a count of agents matching one description
+
+    Returns:
+        Streaming NDJSON response
+    """
+    descriptions = request.expand()
+    concurrency = request.concurrency or settings.agent_generation_concurrency
+    try:
+        factory = await asyncio.to_thread(agent_service.create_factory, request.context)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate agents: {str(e)}"
+        )
+
+    async def stream():
+        async for index, outcome in agent_service.generate_agents(
+            descriptions, factory, concurrency=concurrency
+        ):
+            if isinstance(outcome, Exception):
+                item = AgentBatchGenerateItem(index=index, error=str(outcome))
+            else:
+                item = AgentBatchGenerateItem(index=index, agent=outcome)
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/upload", response_model=AgentResponse, status_code=status.HTTP_201_CREATED)
 async def upload_agent(file: UploadFile = File(...)):
     """
@@ -175,8 +301,54 @@ async def upload_agent(file: UploadFile = File(...)):
         )
 
 
+@router.post("/import", response_model=AgentImportResponse)
+async def import_agents(request: Request):
+    """
+    Import many agents from a JSONL file or a zip archive of agent JSONs.
+
+    The file is sent as the raw request body, with a Content-Type of
+    ``application/x-ndjson`` or ``application/zip``. Every record has the
+    shape accepted by POST /api/agents. JSONL is parsed while the body is
+    still arriving and agents are written in batches; a zip archive is
+    first copied to a temporary file, since its members are listed at the
+    end. Invalid records are reported and skipped.
+
+    Returns:
+        Counts of imported and rejected records with per-record errors
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in JSONL_CONTENT_TYPES + ZIP_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send a JSONL file as application/x-ndjson or a zip archive as application/zip"
+        )
+
+    upload = io.BufferedReader(AsyncStreamReader(request.stream(), asyncio.get_running_loop()))
+
+    def run_import() -> AgentImportResponse:
+        if content_type in JSONL_CONTENT_TYPES:
+            return agent_service.import_agents(iter_jsonl_records(upload), settings.agent_import_batch_size)
+        with tempfile.TemporaryFile() as archive:
+            shutil.copyfileobj(upload, archive)
+            archive.seek(0)
+            return agent_service.import_agents(iter_zip_records(archive), settings.agent_import_batch_size)
+
+    try:
+        return await asyncio.to_thread(run_import)
+    except zipfile.BadZipFile:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid zip archive"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import agents: {str(e)}"
+        )
+
+
 @router.get("/{agent_id}/fragments")
-async def list_agent_fragments(agent_id: str):
+async def list_agent_fragments(agent_id: str, request: Request, response: Response):
     """
     List available fragments that can be added to an agent.
 
@@ -188,7 +360,8 @@ async def list_agent_fragments(agent_id: str):
     """
     # This would list available fragment files
     # For now, return empty list - will be implemented when fragments are added
-    return {"fragments": [], "total": 0}
+    fragments = {"fragments": [], "total": 0}
+    return conditional(request, response, compute_etag(fragments)) or fragments
 
 
 @router.post("/{agent_id}/fragments/{fragment_name}", response_model=AgentResponse)
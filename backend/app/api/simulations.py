@@ -1,21 +1,64 @@
 """API routes for simulation management."""
 
-from typing import List
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from fastapi.responses import JSONResponse
-
+import json
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+from fastapi import APIRouter, HTTPException, status, Query, Header, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from app.core.etag import compute_etag, conditional
 from app.models.simulation import (
     SimulationCreate,
+    SimulationForkRequest,
     SimulationResponse,
     SimulationListResponse,
     SimulationStatusResponse,
-    SimulationStatus
+    SimulationQueueResponse,
+    SimulationStatus,
+    SimulationSummary,
+    LLMCacheStatsResponse,
+    TranscriptSearchResponse,
+    InteractionAggregateResponse
+)
+from app.services.llm_cache import llm_cache
+from app.services.result_export import EXPORT_FORMATS, encode_csv, encode_jsonl, encode_parquet
+from app.services.simulation_runner import (
+    simulation_runner,
+    SimulationAlreadyScheduledError,
+    SimulationQueueFullError
 )
-from app.services.simulation_service import simulation_service
+from app.services.simulation_service import SimulationStatusConflictError, simulation_service
 
 router = APIRouter()
 
 
+def _model_response(model: BaseModel, response: Response) -> Response:
+    """
+    Serialize a large model in a single pass.
+
+    Returning a Response skips FastAPI's dump, re-validation and re-encoding
+    of the response_model, which dominates the cost of big results.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        media_type="application/json",
+        headers=dict(response.headers)
+    )
+
+
+def _simulation_etag(summary: SimulationSummary, *extra) -> str:
+    """
+    Build a simulation's ETag from its summary.
+
+    Results are only written together with a status change, so the summary
+    versions the whole document and the result never has to be read to
+    answer a conditional request.
+    """
+    return compute_etag("simulation", summary.model_dump(mode="json"), *extra)
+
+
 @router.post("/", response_model=SimulationResponse, status_code=status.HTTP_201_CREATED)
 async def create_simulation(simulation_create: SimulationCreate):
     """
@@ -37,17 +80,62 @@ async def create_simulation(simulation_create: SimulationCreate):
         )
 
 
+def _to_stored_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """Convert a query timestamp to the naive UTC ISO format used in storage."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
 @router.get("/", response_model=SimulationListResponse)
-async def list_simulations():
+async def list_simulations(
+    request: Request,
+    response: Response,
+    status_filter: Optional[List[SimulationStatus]] = Query(None, alias="status"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200)
+):
     """
-    List all simulations.
+    List simulation summaries, newest first.
+
+    Args:
+        status_filter: Only include simulations with these statuses
+        created_after: Only include simulations created at or after this time
+        created_before: Only include simulations created before this time
+        cursor: Cursor returned as next_cursor by the previous page
+        limit: Page size
 
     Returns:
-        List of all simulations
+        One page of simulation summaries
     """
     try:
-        simulations = simulation_service.list_simulations()
-        return SimulationListResponse(simulations=simulations, total=len(simulations))
+        simulations, total, next_cursor = simulation_service.list_simulations(
+            statuses=status_filter,
+            created_after=_to_stored_timestamp(created_after),
+            created_before=_to_stored_timestamp(created_before),
+            cursor=cursor,
+            limit=limit
+        )
+        etag = compute_etag(
+            "simulations", [summary.model_dump(mode="json") for summary in simulations], total, next_cursor
+        )
+        not_modified = conditional(request, response, etag)
+        if not_modified:
+            return not_modified
+        return SimulationListResponse(
+            simulations=simulations,
+            total=total,
+            next_cursor=next_cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -55,8 +143,208 @@ async def list_simulations():
         )
 
 
+ExportFormat = Literal["jsonl", "csv", "parquet"]
+
+EXPORT_ENCODERS = {"jsonl": encode_jsonl, "csv": encode_csv, "parquet": encode_parquet}
+
+
+def _export_response(simulation_ids, export_format: str, filename: str) -> StreamingResponse:
+    """Stream the interactions of simulations in an export format."""
+    media_type, extension = EXPORT_FORMATS[export_format]
+    try:
+        body = EXPORT_ENCODERS[export_format](simulation_service.iter_export_rows(simulation_ids))
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires pyarrow to be installed"
+        )
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+
+@router.get("/export")
+async def export_simulations(
+    ids: Optional[List[str]] = Query(None, alias="id", description="Simulations to export"),
+    status_filter: List[SimulationStatus] = Query([SimulationStatus.COMPLETED], alias="status"),
+    export_format: ExportFormat = Query("jsonl", alias="format")
+):
+    """
+    Stream the interactions of many simulations as JSONL, CSV or Parquet.
+
+    Rows are flat (simulation_id, seq, timestamp, agent_id, agent_name,
+    message_type, content, step) and are read and encoded in batches, so
+    memory use does not grow with the size of the export.
+
+    Args:
+        ids: Simulation IDs; defaults to every simulation matching status
+        status_filter: Statuses exported when no IDs are given
+        export_format: jsonl, csv or parquet
+
+    Returns:
+        Streaming file download
+    """
+    if ids:
+        missing = [
+            simulation_id for simulation_id in ids
+            if simulation_service.repository.get_summary(simulation_id) is None
+        ]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Simulations not found: {', '.join(missing)}"
+            )
+        simulation_ids = ids
+    else:
+        simulation_ids = simulation_service.iter_simulation_ids(status_filter)
+
+    return _export_response(simulation_ids, export_format, "interactions")
+
+
+@router.get("/search", response_model=TranscriptSearchResponse)
+async def search_transcripts(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Search query"),
+    ids: Optional[List[str]] = Query(None, alias="id", description="Only search these simulations"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Search the transcripts of completed simulations.
+
+    Matches message content, agent names and message types, best matches
+    first. The query supports FTS5 syntax, e.g. ``"price point"``,
+    ``competitor OR rival``, ``cheap*`` or ``agent_name: alice``; other
+    input is searched as plain words.
+
+    Args:
+        q: Search query
+        ids: Simulation IDs to restrict the search to
+        offset: Hits to skip
+        limit: Page size
+
+    Returns:
+        One page of hits with highlighted snippets
+    """
+    try:
+        hits, total, simulations = simulation_service.search_transcripts(q, ids, limit, offset)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    results = TranscriptSearchResponse(
+        query=q, hits=hits, total=total, simulations=simulations, offset=offset, limit=limit
+    )
+    etag = compute_etag(results.model_dump(mode="json"))
+    return conditional(request, response, etag) or results
+
+
+GroupDimension = Literal["simulation", "agent", "message_type", "step", "time"]
+
+BucketUnit = Literal["minute", "hour", "day", "week"]
+
+
+@router.get("/analytics", response_model=InteractionAggregateResponse)
+async def aggregate_interactions(
+    request: Request,
+    response: Response,
+    group_by: List[GroupDimension] = Query([], description="Dimensions to group by"),
+    bucket: BucketUnit = Query("hour", description="Time bucket unit when grouping by time"),
+    bucket_size: int = Query(1, ge=1, le=1000, description="Units per time bucket"),
+    ids: Optional[List[str]] = Query(None, alias="id", description="Only include these simulations"),
+    agent_ids: Optional[List[str]] = Query(None, alias="agent_id", description="Only include these agents"),
+    message_types: Optional[List[str]] = Query(None, alias="message_type"),
+    since: Optional[datetime] = Query(None, description="Only include messages at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only include messages before this time"),
+    limit: int = Query(1000, ge=1, le=10000)
+):
+    """
+    Aggregate the interactions of completed simulations.
+
+    Reads the columnar interaction store, so queries across hundreds of
+    simulations only touch the columns they need instead of loading each
+    simulation. Each group reports message count, total and mean words,
+    distinct simulations and agents, and first and last message times,
+    e.g. ``?group_by=agent&group_by=time&bucket=hour`` for messages per
+    agent per hour. Without group_by a single group covers every match.
+    Times are UTC; naive query times are read as UTC.
+
+    Args:
+        group_by: simulation, agent, message_type, step and/or time
+        bucket: Time bucket unit
+        bucket_size: Units per time bucket, e.g. 15 with bucket=minute
+        ids: Simulation IDs to restrict the query to
+        agent_ids: Agent IDs to restrict the query to
+        message_types: Message types to restrict the query to
+        since: Start of the time range
+        until: End of the time range
+        limit: Maximum number of groups to return
+
+    Returns:
+        Groups ordered by their keys, with totals over all matching messages
+    """
+    try:
+        groups, totals, total_groups = await asyncio.to_thread(
+            simulation_service.aggregate_interactions,
+            group_by, bucket, bucket_size, ids, agent_ids, message_types, since, until, limit
+        )
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Interaction analytics require pyarrow to be installed"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    results = InteractionAggregateResponse(
+        group_by=group_by,
+        bucket=f"{bucket_size} {bucket}" if "time" in group_by else None,
+        groups=groups,
+        total_groups=total_groups,
+        totals=totals
+    )
+    etag = compute_etag(results.model_dump(mode="json"))
+    return conditional(request, response, etag) or results
+
+
+@router.get("/queue", response_model=SimulationQueueResponse)
+async def get_simulation_queue(request: Request, response: Response):
+    """
+    Get simulation worker pool utilisation.
+
+    Returns:
+        Running and queued simulation counts
+    """
+    stats = simulation_runner.stats()
+    return conditional(request, response, compute_etag(stats)) or SimulationQueueResponse(**stats)
+
+
+@router.get("/cache", response_model=LLMCacheStatsResponse)
+async def get_llm_cache_stats(request: Request, response: Response):
+    """
+    Get statistics of the LLM response cache shared by all simulations.
+
+    Returns:
+        Cache size and hit/miss counters
+    """
+    stats = llm_cache.stats()
+    return conditional(request, response, compute_etag(stats)) or LLMCacheStatsResponse(**stats)
+
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_llm_cache():
+    """Remove all cached LLM responses and reset the counters."""
+    llm_cache.clear()
+
+
 @router.get("/{simulation_id}", response_model=SimulationResponse)
-async def get_simulation(simulation_id: str):
+async def get_simulation(simulation_id: str, request: Request, response: Response):
     """
     Get a specific simulation by ID.
 
@@ -64,15 +352,21 @@ async def get_simulation(simulation_id: str):
         simulation_id: Simulation ID
 
     Returns:
-        Simulation data
+        Simulation data, or 304 if the client's ETag is current
     """
+    summary = simulation_service.repository.get_summary(simulation_id)
+    if summary:
+        not_modified = conditional(request, response, _simulation_etag(summary))
+        if not_modified:
+            return not_modified
+
     simulation = simulation_service.get_simulation(simulation_id)
     if not simulation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Simulation with ID {simulation_id} not found"
         )
-    return simulation
+    return _model_response(simulation, response)
 
 
 @router.delete("/{simulation_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -92,13 +386,15 @@ async def delete_simulation(simulation_id: str):
 
 
 @router.post("/{simulation_id}/start", response_model=SimulationResponse)
-async def start_simulation(simulation_id: str, background_tasks: BackgroundTasks):
+async def start_simulation(simulation_id: str):
     """
     Start running a simulation.
 
+    The simulation is queued for the worker pool and stays pending until a
+    worker picks it up.
+
     Args:
         simulation_id: Simulation ID
-        background_tasks: FastAPI background tasks
 
     Returns:
         Updated simulation data
@@ -116,8 +412,120 @@ async def start_simulation(simulation_id: str, background_tasks: BackgroundTasks
             detail=f"Simulation is already {simulation.status}"
         )
 
-    # Start simulation in background
-    background_tasks.add_task(simulation_service.run_simulation, simulation_id)
+    try:
+        simulation_service.start_simulation(simulation_id)
+    except SimulationStatusConflictError as e:
+        # Another API worker changed the simulation since it was read
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except SimulationAlreadyScheduledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SimulationQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
+
+    # Return updated simulation
+    simulation = simulation_service.get_simulation(simulation_id)
+    return simulation
+
+
+@router.post(
+    "/{simulation_id}/fork",
+    response_model=SimulationResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def fork_simulation(
+    simulation_id: str,
+    step: int = Query(..., ge=1, description="Last step shared with the parent"),
+    fork_request: Optional[SimulationForkRequest] = None
+):
+    """
+    Fork a simulation from one of its checkpointed steps.
+
+    The fork starts out pending with the parent's state and interactions up
+    to ``step``; starting it runs only the remaining steps, optionally with
+    a new prompt or a different set of agents. Every checkpointed step can
+    be forked unless CHECKPOINT_KEEP limits how many a simulation keeps.
+
+    Args:
+        simulation_id: Parent simulation ID
+        step: Last step shared with the parent
+        fork_request: Changes for the fork
+
+    Returns:
+        Created simulation data
+    """
+    try:
+        simulation = simulation_service.fork_simulation(
+            simulation_id, step, fork_request or SimulationForkRequest()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if not simulation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulation with ID {simulation_id} not found"
+        )
+    return simulation
+
+
+@router.post("/{simulation_id}/resume", response_model=SimulationResponse)
+async def resume_simulation(simulation_id: str):
+    """
+    Resume a failed simulation from its last checkpointed step.
+
+    Steps completed before the failure are not run again; the simulation is
+    queued like a new start and stays pending until a worker picks it up.
+
+    Args:
+        simulation_id: Simulation ID
+
+    Returns:
+        Updated simulation data
+    """
+    simulation = simulation_service.get_simulation(simulation_id)
+    if not simulation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulation with ID {simulation_id} not found"
+        )
+
+    if simulation.status != SimulationStatus.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Only failed simulations can be resumed (simulation is {simulation.status})"
+        )
+
+    try:
+        simulation_service.resume_simulation(simulation_id)
+    except SimulationStatusConflictError as e:
+        # Another API worker changed the simulation since it was read
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except SimulationAlreadyScheduledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SimulationQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "30"}
+        )
 
     # Return updated simulation
     simulation = simulation_service.get_simulation(simulation_id)
@@ -125,7 +533,7 @@ async def start_simulation(simulation_id: str, background_tasks: BackgroundTasks
 
 
 @router.get("/{simulation_id}/status", response_model=SimulationStatusResponse)
-async def get_simulation_status(simulation_id: str):
+async def get_simulation_status(simulation_id: str, request: Request, response: Response):
     """
     Get the status of a simulation.
 
@@ -135,7 +543,7 @@ async def get_simulation_status(simulation_id: str):
     Returns:
         Simulation status
     """
-    simulation = simulation_service.get_simulation(simulation_id)
+    simulation = simulation_service.repository.get_summary(simulation_id)
     if not simulation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -149,13 +557,13 @@ async def get_simulation_status(simulation_id: str):
 
     if simulation.status == SimulationStatus.RUNNING:
         total_steps = simulation.config.steps
-        # This would need to be tracked during execution
-        current_step = 0  # Placeholder
+        step_progress = simulation_service.get_progress(simulation_id)
+        current_step = step_progress["current_step"] if step_progress else 0
         progress = int((current_step / total_steps) * 100) if total_steps > 0 else 0
     elif simulation.status == SimulationStatus.COMPLETED:
         progress = 100
 
-    return SimulationStatusResponse(
+    status_response = SimulationStatusResponse(
         id=simulation.id,
         status=simulation.status,
         progress=progress,
@@ -163,20 +571,88 @@ async def get_simulation_status(simulation_id: str):
         total_steps=total_steps,
         message=simulation.error if simulation.error else None
     )
+    etag = compute_etag(status_response.model_dump(mode="json"))
+    return conditional(request, response, etag) or status_response
 
 
-@router.get("/{simulation_id}/results", response_model=SimulationResponse)
-async def get_simulation_results(simulation_id: str):
+@router.get("/{simulation_id}/events")
+async def stream_simulation_events(
+    simulation_id: str,
+    since: Optional[int] = Query(None, description="Last event sequence number already received"),
+    last_event_id: Optional[str] = Header(None)
+):
     """
-    Get the results of a completed simulation.
+    Stream simulation events as server-sent events.
+
+    Emits ``status``, ``step`` and ``interaction`` events as they happen.
+    A ``running`` status carries the ``resume_step`` a resumed run continues
+    after, so clients keep the interactions up to it. Reconnecting clients
+    resume after ``since`` or the ``Last-Event-ID`` header sent
+    automatically by EventSource. Once the latest run completes or fails,
+    an ``end`` event is sent and the stream closes; earlier terminal
+    statuses replayed from a log with resumed runs do not end it.
 
     Args:
         simulation_id: Simulation ID
+        since: Last event sequence number already received
+        last_event_id: Standard SSE resume header
 
     Returns:
-        Simulation data with results
+        text/event-stream response
     """
-    simulation = simulation_service.get_simulation(simulation_id)
+    simulation = simulation_service.repository.get_summary(simulation_id)
+    if not simulation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulation with ID {simulation_id} not found"
+        )
+
+    if since is None:
+        since = int(last_event_id) if last_event_id and last_event_id.isdigit() else -1
+
+    async def event_stream():
+        # Simulations finished before event logs existed have nothing to replay
+        if simulation.status in (SimulationStatus.COMPLETED, SimulationStatus.FAILED) \
+                and simulation_service.get_progress(simulation_id) is None:
+            payload = {"status": simulation.status.value, "error": simulation.error}
+            yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+            yield "event: end\ndata: {}\n\n"
+            return
+
+        async for event in simulation_service.events.subscribe(simulation_id, since, idle_timeout=15):
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            data = json.dumps(event["data"], ensure_ascii=False)
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n"
+        # Subscriptions only end once the run finished; tells EventSource not to reconnect
+        yield "event: end\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{simulation_id}/export")
+async def export_simulation(
+    simulation_id: str,
+    request: Request,
+    response: Response,
+    export_format: ExportFormat = Query("jsonl", alias="format")
+):
+    """
+    Stream the interactions of a completed simulation as JSONL, CSV or Parquet.
+
+    Args:
+        simulation_id: Simulation ID
+        export_format: jsonl, csv or parquet
+
+    Returns:
+        Streaming file download
+    """
+    simulation = simulation_service.repository.get_summary(simulation_id)
     if not simulation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -189,4 +665,41 @@ async def get_simulation_results(simulation_id: str):
             detail=f"Simulation is not completed yet (status: {simulation.status})"
         )
 
-    return simulation
+    etag = _simulation_etag(simulation, export_format)
+    not_modified = conditional(request, response, etag)
+    if not_modified:
+        return not_modified
+    export = _export_response([simulation_id], export_format, f"simulation-{simulation_id}")
+    export.headers.update(response.headers)
+    return export
+
+
+@router.get("/{simulation_id}/results", response_model=SimulationResponse)
+async def get_simulation_results(simulation_id: str, request: Request, response: Response):
+    """
+    Get the results of a completed simulation.
+
+    Args:
+        simulation_id: Simulation ID
+
+    Returns:
+        Simulation data with results, or 304 if the client's ETag is current
+    """
+    summary = simulation_service.repository.get_summary(simulation_id)
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulation with ID {simulation_id} not found"
+        )
+
+    if summary.status != SimulationStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Simulation is not completed yet (status: {summary.status})"
+        )
+
+    not_modified = conditional(request, response, _simulation_etag(summary))
+    if not_modified:
+        return not_modified
+
+    return _model_response(simulation_service.get_simulation(simulation_id), response)
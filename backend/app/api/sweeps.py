@@ -0,0 +1,98 @@
+"""API routes for parameter sweeps."""
+
+from fastapi import APIRouter, HTTPException, status, Request, Response
+
+from app.core.etag import compute_etag, conditional
+from app.models.sweep import SweepCreate, SweepListResponse, SweepResponse, SweepResultsResponse
+from app.services.sweep_service import sweep_service
+
+router = APIRouter()
+
+
+@router.post("/", response_model=SweepResponse, status_code=status.HTTP_201_CREATED)
+async def create_sweep(sweep_create: SweepCreate):
+    """
+    Create a sweep over a grid of simulation parameters.
+
+    One simulation is created per combination of the grid's prompts,
+    agent subsets, step counts and environments. They share the LLM cache
+    and are started automatically, at most ``max_concurrency`` at a time.
+
+    Args:
+        sweep_create: Grid and scheduling options
+
+    Returns:
+        Created sweep with its simulations
+    """
+    try:
+        return sweep_service.create_sweep(sweep_create)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create sweep: {str(e)}"
+        )
+
+
+@router.get("/", response_model=SweepListResponse)
+async def list_sweeps(request: Request, response: Response):
+    """
+    List all sweeps, newest first.
+
+    Returns:
+        Sweeps with their aggregate progress
+    """
+    sweeps = sweep_service.list_sweeps()
+    sweep_list = SweepListResponse(sweeps=sweeps, total=len(sweeps))
+    etag = compute_etag(sweep_list.model_dump(mode="json"))
+    return conditional(request, response, etag) or sweep_list
+
+
+@router.get("/{sweep_id}", response_model=SweepResponse)
+async def get_sweep(sweep_id: str, request: Request, response: Response):
+    """
+    Get a sweep with the status of each simulation and aggregate progress.
+
+    Args:
+        sweep_id: Sweep ID
+
+    Returns:
+        Sweep data
+    """
+    sweep = sweep_service.get_sweep(sweep_id)
+    if not sweep:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sweep with ID {sweep_id} not found"
+        )
+    etag = compute_etag(sweep.model_dump(mode="json"))
+    return conditional(request, response, etag) or sweep
+
+
+@router.get("/{sweep_id}/results", response_model=SweepResultsResponse)
+async def get_sweep_results(sweep_id: str, request: Request, response: Response):
+    """
+    Get the combined result table of a sweep.
+
+    Each row holds one simulation's parameters, status, duration, message
+    counts, LLM usage and summary. The full transcripts of all runs can be
+    downloaded together from GET /api/simulations/export with their IDs.
+
+    Args:
+        sweep_id: Sweep ID
+
+    Returns:
+        One row per simulation, in grid order
+    """
+    results = sweep_service.get_results(sweep_id)
+    if not results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sweep with ID {sweep_id} not found"
+        )
+    etag = compute_etag(results.model_dump(mode="json"))
+    return conditional(request, response, etag) or results
@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:5173"]
 
+    # Response compression for bodies of at least this many bytes
+    response_compression: bool = True
+    response_compression_min_bytes: int = 1024
+
     # OpenAI Configuration
     openai_api_key: Optional[str] = None
     azure_openai_key: Optional[str] = None
@@ -30,10 +34,60 @@ class Settings(BaseSettings):
     tinytroupe_temperature: float = 1.5
     tinytroupe_cache_api_calls: bool = False
 
+    # Default number of concurrent generations in a batch agent request
+    agent_generation_concurrency: int = 8
+
+    # Agents written per batch by POST /api/agents/import
+    agent_import_batch_size: int = 500
+
+    # LLM response cache shared by all simulations
+    llm_cache_path: str = "data/llm_cache.db"
+    llm_cache_max_mb: int = 512
+
+    # Simulation execution
+    simulation_max_workers: int = 2
+    simulation_queue_size: int = 100
+    simulation_worker_prewarm: bool = True
+    simulation_action_fanout: int = 8
+
+    # Parameter sweeps: default simulations in flight per sweep, grid size limit
+    sweeps_dir: str = "data/sweeps"
+    sweep_concurrency: int = 2
+    sweep_max_runs: int = 200
+
+    # Configured TinyPerson specs kept per worker process (0 disables)
+    persona_cache_size: int = 512
+
+    # Step checkpoints for resuming simulations (0 disables checkpointing)
+    checkpoints_dir: str = "data/checkpoints"
+    checkpoint_interval: int = 1
+    # Latest checkpoints kept per simulation (0 keeps every step)
+    checkpoint_keep: int = 0
+
+    # Durable job queue
+    job_queue_path: str = "data/jobs.db"
+    job_lease_seconds: float = 60.0
+    job_heartbeat_seconds: float = 15.0
+    job_max_attempts: int = 3
+
     # File Storage
     upload_dir: str = "uploads"
     agents_dir: str = "agents"
     simulations_dir: str = "simulations"
+    events_dir: str = "data/events"
+
+    # Full-text search index over completed simulation transcripts
+    search_index_path: str = "data/search.db"
+
+    # Columnar (Arrow IPC) copies of completed transcripts for aggregate queries
+    interaction_store_dir: str = "data/interactions"
+
+    # Storage backend ("file" or "sqlite")
+    storage_backend: str = "file"
+    database_path: str = "data/optimus.db"
+
+    # Seconds between directory scans for files changed outside the API
+    catalog_refresh_interval: float = 2.0
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,62 @@
+"""Strong ETags and conditional GET handling for API resources."""
+
+import json
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+
+def compute_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values that determine a representation.
+
+    Args:
+        *parts: JSON-serializable version data (timestamps, IDs, content)
+
+    Returns:
+        Quoted ETag
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether a request's If-None-Match header covers an ETag.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def conditional(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Answer a GET with 304 if the client's copy is current.
+
+    Otherwise the ETag is set on the response the endpoint will return.
+
+    Args:
+        request: Incoming request
+        response: Response whose headers FastAPI merges into the result
+        etag: Current ETag of the resource
+
+    Returns:
+        A 304 response to return instead of the resource, or None
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,85 @@
+"""Cross-process file locks and atomic file replacement."""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: Union[str, Path]) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a lock file, blocking until it is free.
+
+    The lock is shared by every process and thread on the host that locks
+    the same path, so it can guard read-modify-write cycles on files that
+    several API workers update.
+
+    A holder may unlink the lock file. Anyone who opened it before then
+    acquires a lock on a file that no longer exists at the path, so they
+    notice and retry on the current file.
+
+    Args:
+        path: Lock file, created if missing
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        with open(path, 'a+b') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                # Windows cannot unlink open files, so only POSIX needs the check
+                if fcntl is not None and not _is_current(f, path):
+                    continue
+                yield
+                return
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _is_current(f, path: Path) -> bool:
+    """Check whether an open lock file is still the file at its path."""
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(f.fileno())
+    return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+
+def atomic_write(path: Union[str, Path], data: bytes):
+    """
+    Replace a file's contents so readers see either the old or new version.
+
+    The data is written to a temporary file in the same directory, named
+    uniquely per process and thread and without the target's extension so
+    directory scans skip it, then renamed over the target.
+
+    Args:
+        path: File to write
+        data: Complete new contents
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
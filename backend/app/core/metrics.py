@@ -0,0 +1,229 @@
+"""Prometheus metrics for the API, simulation pipeline and storage."""
+
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, REGISTRY, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+REQUEST_LATENCY = Histogram(
+    "optimus_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+
+SIMULATIONS_FINISHED = Counter(
+    "optimus_simulations_finished_total",
+    "Simulations that finished running",
+    ["status"],
+)
+
+STEP_DURATION = Histogram(
+    "optimus_simulation_step_duration_seconds",
+    "Wall time of one simulation step",
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300),
+)
+
+LLM_CALLS = Counter(
+    "optimus_llm_calls_total",
+    "LLM completions requested by simulations, by where they were answered",
+    ["source"],
+)
+
+LLM_TOKENS = Counter(
+    "optimus_llm_tokens_total",
+    "Tokens reported by the LLM API",
+    ["kind"],
+)
+
+SIMULATION_LLM_CALLS = Histogram(
+    "optimus_simulation_llm_calls",
+    "LLM completions requested per simulation",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+
+SIMULATION_LLM_TOKENS = Histogram(
+    "optimus_simulation_llm_tokens",
+    "LLM tokens used per simulation",
+    buckets=(1e3, 5e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6),
+)
+
+# Per-agent usage is bucketed rather than labelled by agent ID, which
+# would add a series for every agent ever simulated
+AGENT_LLM_CALLS = Histogram(
+    "optimus_agent_llm_calls",
+    "LLM completions requested per agent in one simulation",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500),
+)
+
+AGENT_LLM_TOKENS = Histogram(
+    "optimus_agent_llm_tokens",
+    "LLM tokens used per agent in one simulation",
+    buckets=(1e3, 5e3, 1e4, 5e4, 1e5, 5e5, 1e6),
+)
+
+PERSONA_CACHE_LOOKUPS = Counter(
+    "optimus_persona_cache_lookups_total",
+    "TinyPerson builds answered from a worker's persona cache or rebuilt",
+    ["result"],
+)
+
+STORAGE_LATENCY = Histogram(
+    "optimus_storage_operation_duration_seconds",
+    "Latency of repository operations",
+    ["store", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+TOKEN_KINDS = ("prompt_tokens", "completion_tokens")
+
+_runtime_collector = None
+
+
+def record_simulation_run(status: str, result: Dict[str, Any]):
+    """
+    Record the metrics of a finished simulation run.
+
+    Args:
+        status: Final simulation status
+        result: Worker result, with ``step_seconds``, ``persona_cache``
+            and ``llm_usage``
+    """
+    SIMULATIONS_FINISHED.labels(status=status).inc()
+    for seconds in result.get("step_seconds") or []:
+        STEP_DURATION.observe(seconds)
+    persona_lookups = result.get("persona_cache") or {}
+    PERSONA_CACHE_LOOKUPS.labels(result="hit").inc(persona_lookups.get("hits", 0))
+    PERSONA_CACHE_LOOKUPS.labels(result="miss").inc(persona_lookups.get("misses", 0))
+
+    usage = result.get("llm_usage") or {}
+    hits = usage.get("cache_hits", 0)
+    LLM_CALLS.labels(source="cache").inc(hits)
+    LLM_CALLS.labels(source="api").inc(usage.get("calls", 0) - hits)
+    SIMULATION_LLM_CALLS.observe(usage.get("calls", 0))
+    SIMULATION_LLM_TOKENS.observe(sum(usage.get(kind, 0) for kind in TOKEN_KINDS))
+    for kind in TOKEN_KINDS:
+        LLM_TOKENS.labels(kind=kind.split("_")[0]).inc(usage.get(kind, 0))
+
+    for counters in (usage.get("agents") or {}).values():
+        AGENT_LLM_CALLS.observe(counters.get("calls", 0))
+        AGENT_LLM_TOKENS.observe(sum(counters.get(kind, 0) for kind in TOKEN_KINDS))
+
+
+class InstrumentedRepository:
+    """
+    Proxy timing the calls of a storage repository.
+
+    Every public method listed in ``operations`` is observed in
+    ``optimus_storage_operation_duration_seconds``; everything else is
+    passed through unchanged.
+    """
+
+    def __init__(self, repository: Any, store: str, operations: Iterable[str]):
+        """
+        Initialize the proxy.
+
+        Args:
+            repository: Repository to wrap
+            store: Store label ("agents" or "simulations")
+            operations: Names of the methods to time
+        """
+        self._repository = repository
+        self._store = store
+        self._operations = set(operations)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._repository, name)
+        if name not in self._operations:
+            return attribute
+
+        histogram = STORAGE_LATENCY.labels(store=self._store, operation=name)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return timed
+
+
+class RuntimeCollector(Collector):
+    """Reads queue and cache state at scrape time."""
+
+    def __init__(
+        self,
+        queue_stats: Callable[[], Dict[str, int]],
+        cache_stats: Callable[[], Dict[str, Any]]
+    ):
+        """
+        Initialize the collector.
+
+        Args:
+            queue_stats: Returns the simulation runner's stats()
+            cache_stats: Returns the LLM cache's stats()
+        """
+        self.queue_stats = queue_stats
+        self.cache_stats = cache_stats
+
+    def collect(self) -> List:
+        queue = self.queue_stats()
+        depth = GaugeMetricFamily(
+            "optimus_simulation_queue_depth", "Simulation jobs by state", labels=["state"]
+        )
+        depth.add_metric(["queued"], queue["queued"])
+        depth.add_metric(["running"], queue["running"])
+        workers = GaugeMetricFamily("optimus_simulation_workers", "Simulation worker processes")
+        workers.add_metric([], queue["max_workers"])
+
+        cache = self.cache_stats()
+        lookups = CounterMetricFamily(
+            "optimus_llm_cache_lookups", "LLM cache lookups by outcome", labels=["result"]
+        )
+        lookups.add_metric(["hit"], cache["hits"])
+        lookups.add_metric(["miss"], cache["misses"])
+        ratio = GaugeMetricFamily("optimus_llm_cache_hit_ratio", "LLM cache hits per lookup")
+        ratio.add_metric([], cache["hit_ratio"])
+        size = GaugeMetricFamily("optimus_llm_cache_size_bytes", "Size of cached LLM responses")
+        size.add_metric([], cache["size_bytes"])
+        entries = GaugeMetricFamily("optimus_llm_cache_entries", "Cached LLM responses")
+        entries.add_metric([], cache["entries"])
+
+        return [depth, workers, lookups, ratio, size, entries]
+
+
+def register_runtime_collector(
+    queue_stats: Callable[[], Dict[str, int]],
+    cache_stats: Callable[[], Dict[str, Any]]
+):
+    """Register the scrape-time collector with the default registry once."""
+    global _runtime_collector
+    if _runtime_collector is None:
+        _runtime_collector = RuntimeCollector(queue_stats, cache_stats)
+        REGISTRY.register(_runtime_collector)
+
+
+
+def scrape_registry() -> CollectorRegistry:
+    """
+    Registry to expose at ``/metrics``.
+
+    Each API process counts in its own memory, so with several uvicorn
+    workers a scrape would only see the process that answered it. When
+    ``PROMETHEUS_MULTIPROC_DIR`` is set, the processes write their samples
+    there and every scrape merges them; the runtime gauges read shared
+    state, so any process can report them.
+
+    Returns:
+        The default registry, or a fresh one merging all processes
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    if _runtime_collector is not None:
+        registry.register(_runtime_collector)
+    return registry
@@ -2,15 +2,20 @@
 
 import os
 import sys
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 # Add TinyTroupe to path
 tinytroupe_path = os.path.join(os.path.dirname(__file__), "..", "..", "TinyTroupe")
 sys.path.insert(0, tinytroupe_path)
 
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings, validate_api_configuration
+from app.core.metrics import REQUEST_LATENCY, register_runtime_collector, scrape_registry
 
 
 @asynccontextmanager
@@ -39,12 +44,53 @@ async def lifespan(app: FastAPI):
     os.makedirs(settings.agents_dir, exist_ok=True)
     os.makedirs(settings.simulations_dir, exist_ok=True)
 
+    # Open storage and warm in-memory indexes
+    from app.services.agent_service import agent_service
+    from app.services.simulation_service import simulation_service
+    agent_service.repository.load()
+    simulation_service.repository.load()
+    print(f"✓ Storage ({settings.storage_backend}): "
+          f"{agent_service.repository.count()} agents, "
+          f"{simulation_service.repository.count()} simulations")
+    # Index transcripts completed while the search index was unavailable
+    indexed = simulation_service.sync_transcript_index()
+    print(f"✓ Transcript index: {len(simulation_service.transcripts.indexed())} simulations "
+          f"({indexed} indexed at startup)")
+    # Store transcripts completed while the interaction store was unavailable
+    try:
+        stored = simulation_service.sync_interaction_store()
+        print(f"✓ Interaction store: {len(simulation_service.interaction_store.stored())} simulations "
+              f"({stored} stored at startup)")
+    except ImportError:
+        print("✗ Interaction store disabled: pyarrow is not installed")
+
+    # Start the simulation worker pool, recovering jobs orphaned by a restart
+    from app.services.simulation_runner import simulation_runner
+    await simulation_runner.start(
+        simulation_service.run_simulation,
+        recovery_handler=simulation_service.handle_recovered_jobs
+    )
+    interrupted = simulation_service.recover_interrupted_simulations()
+    if interrupted:
+        print(f"✗ Marked {interrupted} interrupted simulations as failed")
+
+    # Continue scheduling sweeps that were still running
+    from app.services.sweep_service import sweep_service
+    sweep_service.load()
+    scheduled = sweep_service.schedule_all()
+    print(f"✓ Sweeps: {len(sweep_service.sweeps)} ({scheduled} simulations scheduled)")
+    from app.services.llm_cache import llm_cache
+    register_runtime_collector(simulation_runner.stats, llm_cache.stats)
+    print(f"✓ Simulation workers: {simulation_runner.max_workers} "
+          f"({simulation_runner.stats()['queued']} jobs queued)")
+
     print(f"\n{settings.app_name} is ready! 🚀\n")
 
     yield
 
     # Shutdown
     print(f"\n{settings.app_name} shutting down...")
+    await simulation_runner.shutdown()
 
 
 # Create FastAPI application
@@ -52,7 +98,8 @@ app = FastAPI(
     title=settings.app_name,
     description="Web interface for TinyTroupe multiagent simulations",
     version=settings.app_version,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -62,8 +109,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read ETags for conditional requests
+    expose_headers=["ETag"],
 )
 
+# Compress large responses (brotli when installed, otherwise gzip)
+if settings.response_compression:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.response_compression_min_bytes
+    )
+
 
 @app.get("/")
 async def root():
@@ -86,8 +142,30 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe each request's latency under its route template."""
+    started = time.perf_counter()
+    response = await call_next(request)
+    # The router stores the matched route in the shared scope
+    route = request.scope.get("route")
+    REQUEST_LATENCY.labels(
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code
+    ).observe(time.perf_counter() - started)
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics in text exposition format."""
+    return Response(generate_latest(scrape_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
 # API Routes
-from app.api import agents, simulations
+from app.api import agents, simulations, sweeps
 
 app.include_router(agents.router, prefix="/api/agents", tags=["agents"])
 app.include_router(simulations.router, prefix="/api/simulations", tags=["simulations"])
+app.include_router(sweeps.router, prefix="/api/sweeps", tags=["sweeps"])
@@ -1,7 +1,7 @@
 """Pydantic models for TinyTroupe agents."""
 
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class BigFivePersonality(BaseModel):
@@ -103,6 +103,34 @@ class AgentGenerateRequest(BaseModel):
     context: Optional[str] = Field(None, description="Context for the agent (e.g., 'A hospital in São Paulo')")
 
 
+class AgentBatchGenerateRequest(BaseModel):
+    """Request model for generating many agents at once."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    descriptions: Optional[List[str]] = Field(
+        None, min_length=1, max_length=500, description="One description per agent to generate"
+    )
+    count: Optional[int] = Field(
+        None, ge=1, le=500, description="Number of agents to generate from the shared description"
+    )
+    description: Optional[str] = Field(None, description="Description shared by all agents when using count")
+    context: Optional[str] = Field(None, description="Context shared by all generated agents")
+    concurrency: Optional[int] = Field(None, ge=1, le=32, description="Maximum generations in flight")
+
+    @model_validator(mode="after")
+    def check_batch(self) -> "AgentBatchGenerateRequest":
+        """Require exactly one of descriptions or count."""
+        if (self.descriptions is None) == (self.count is None):
+            raise ValueError("Provide either descriptions or count")
+        return self
+
+    def expand(self) -> List[Optional[str]]:
+        """Return the description of every agent to generate, in order."""
+        if self.descriptions is not None:
+            return list(self.descriptions)
+        return [self.description] * self.count
+
+
 class AgentResponse(BaseModel):
     """Response model for agent data."""
     model_config = {"arbitrary_types_allowed": True}
@@ -114,9 +142,69 @@ class AgentResponse(BaseModel):
     updated_at: Optional[str] = None
 
 
+class AgentBatchGenerateItem(BaseModel):
+    """One streamed outcome of a batch generation."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    index: int = Field(..., description="Position of the request in the batch")
+    agent: Optional[AgentResponse] = None
+    error: Optional[str] = None
+
+
+class AgentImportError(BaseModel):
+    """A record rejected by a bulk import."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    record: str = Field(..., description="Line number or archive member of the record")
+    error: str
+
+
+class AgentImportResponse(BaseModel):
+    """Summary of a bulk import."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    imported: int
+    failed: int
+    errors: List[AgentImportError] = Field(
+        default_factory=list, description="Rejected records, capped at max_errors"
+    )
+    errors_truncated: bool = False
+
+
 class AgentListResponse(BaseModel):
     """Response model for listing agents."""
     model_config = {"arbitrary_types_allowed": True}
 
     agents: List[AgentResponse]
     total: int
+
+
+class AgentSearchQuery(BaseModel):
+    """
+    Persona filters for agent search.
+
+    Text filters match case- and accent-insensitively by whole words: an
+    agent matches when the field contains every word of the filter value.
+    For skills and traits, words may come from any entry of the list.
+    """
+    model_config = {"arbitrary_types_allowed": True}
+
+    name: Optional[str] = None
+    occupation: Optional[str] = Field(None, description="Words of occupation.title")
+    nationality: Optional[str] = None
+    residence: Optional[str] = None
+    age_min: Optional[int] = Field(None, ge=0)
+    age_max: Optional[int] = Field(None, ge=0)
+    skills: List[str] = Field(default_factory=list, description="Words found among the agent's skills")
+    traits: List[str] = Field(
+        default_factory=list, description="Words found among personality.traits"
+    )
+
+
+class AgentSearchResponse(BaseModel):
+    """Response model for agent search."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    agents: List[AgentResponse]
+    total: int = Field(..., description="Number of agents matching the filters")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
@@ -41,6 +41,27 @@ class SimulationCreate(BaseModel):
     config: SimulationConfig
 
 
+class SimulationForkRequest(BaseModel):
+    """Request model for forking a simulation at a checkpointed step."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    name: Optional[str] = Field(None, description="Name of the fork, defaults to the parent's name")
+    prompt: Optional[str] = Field(None, description="Message given to the first agent where the fork diverges")
+    agent_ids: Optional[List[str]] = Field(
+        None, min_length=1, description="Agents of the fork, defaults to the parent's agents"
+    )
+    steps: Optional[int] = Field(None, ge=1, le=50, description="Total steps, defaults to the parent's")
+
+
+class SimulationFork(BaseModel):
+    """Where a forked simulation branched off its parent."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    parent_id: str
+    step: int = Field(..., description="Last parent step shared with the fork")
+    prompt: Optional[str] = None
+
+
 class InteractionMessage(BaseModel):
     """A single interaction message in the simulation."""
     model_config = {"arbitrary_types_allowed": True}
@@ -50,6 +71,7 @@ class InteractionMessage(BaseModel):
     agent_name: str
     message_type: str  # e.g., "TALK", "THOUGHT", "DONE"
     content: str
+    step: Optional[int] = None
 
 
 class SimulationResult(BaseModel):
@@ -59,6 +81,9 @@ class SimulationResult(BaseModel):
     interactions: List[InteractionMessage]
     summary: Optional[str] = None
     extracted_data: Optional[Dict[str, Any]] = None
+    llm_usage: Optional[Dict[str, Any]] = Field(
+        None, description="LLM calls, cache hits/misses and tokens, in total and per agent ID"
+    )
 
 
 class SimulationResponse(BaseModel):
@@ -75,14 +100,32 @@ class SimulationResponse(BaseModel):
     completed_at: Optional[str] = None
     result: Optional[SimulationResult] = None
     error: Optional[str] = None
+    fork: Optional[SimulationFork] = None
+
+
+class SimulationSummary(BaseModel):
+    """Lightweight simulation projection without result payloads."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    id: str
+    name: str
+    agent_ids: List[str]
+    config: SimulationConfig
+    status: SimulationStatus
+    created_at: str
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    error: Optional[str] = None
+    fork: Optional[SimulationFork] = None
 
 
 class SimulationListResponse(BaseModel):
     """Response model for listing simulations."""
     model_config = {"arbitrary_types_allowed": True}
 
-    simulations: List[SimulationResponse]
-    total: int
+    simulations: List[SimulationSummary]
+    total: int = Field(..., description="Number of simulations matching the filters")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 class SimulationStatusResponse(BaseModel):
@@ -95,3 +138,84 @@ class SimulationStatusResponse(BaseModel):
     current_step: Optional[int] = None
     total_steps: Optional[int] = None
     message: Optional[str] = None
+
+
+class SimulationQueueResponse(BaseModel):
+    """Response model for simulation worker pool utilisation."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    max_workers: int
+    running: int
+    queued: int = Field(..., description="Simulations waiting for a free worker")
+    queue_capacity: int
+
+
+class LLMCacheStatsResponse(BaseModel):
+    """Response model for LLM cache statistics."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_ratio: float
+
+
+class TranscriptSearchHit(BaseModel):
+    """A transcript message matching a search query."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    simulation_id: str
+    simulation_name: Optional[str] = None
+    seq: int = Field(..., description="Position of the message in the simulation's interactions")
+    step: Optional[int] = None
+    timestamp: str
+    agent_id: str
+    agent_name: str
+    message_type: str
+    snippet: str = Field(..., description="HTML-escaped excerpt with matched terms wrapped in <mark> tags")
+    score: float = Field(..., description="Relevance, higher is better")
+
+
+class TranscriptSearchResponse(BaseModel):
+    """Response model for transcript search."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    query: str
+    hits: List[TranscriptSearchHit]
+    total: int = Field(..., description="Number of matching messages")
+    simulations: int = Field(..., description="Number of simulations with a matching message")
+    offset: int
+    limit: int
+
+
+class InteractionAggregate(BaseModel):
+    """Aggregated interactions of one group, or of all matching messages."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    simulation_id: Optional[str] = None
+    simulation_name: Optional[str] = None
+    agent_id: Optional[str] = None
+    agent_name: Optional[str] = None
+    message_type: Optional[str] = None
+    step: Optional[int] = None
+    bucket_start: Optional[str] = Field(None, description="Start of the time bucket")
+    messages: int
+    words: Optional[int] = Field(None, description="Total words across messages")
+    mean_words: Optional[float] = None
+    simulations: int = Field(..., description="Number of distinct simulations")
+    agents: int = Field(..., description="Number of distinct agents")
+    first_timestamp: Optional[str] = None
+    last_timestamp: Optional[str] = None
+
+
+class InteractionAggregateResponse(BaseModel):
+    """Response model for aggregate queries over completed simulations' interactions."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    group_by: List[str]
+    bucket: Optional[str] = Field(None, description="Time bucket, e.g. '15 minute', when grouped by time")
+    groups: List[InteractionAggregate]
+    total_groups: int
+    totals: InteractionAggregate
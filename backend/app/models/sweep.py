@@ -0,0 +1,141 @@
+"""Pydantic models for parameter sweeps over simulations."""
+
+import itertools
+from typing import Annotated, Optional, List, Dict, Any
+from pydantic import BaseModel, Field
+
+from app.models.simulation import EnvironmentType, SimulationStatus
+
+
+class SweepGrid(BaseModel):
+    """Values to combine; every combination becomes one simulation."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    initial_prompt: List[str] = Field(..., min_length=1, description="Initial prompts to try")
+    agent_ids: List[Annotated[List[str], Field(min_length=1)]] = Field(
+        ..., min_length=1, description="Agent subsets to try"
+    )
+    steps: List[Annotated[int, Field(ge=1, le=50)]] = Field(
+        default=[5], min_length=1, description="Step counts to try"
+    )
+    environment_type: List[EnvironmentType] = Field(
+        default=[EnvironmentType.CHAT_ROOM], min_length=1, description="Environments to try"
+    )
+
+    def size(self) -> int:
+        """Number of combinations in the grid."""
+        return len(self.initial_prompt) * len(self.agent_ids) * len(self.steps) * len(self.environment_type)
+
+    def combinations(self) -> List["SweepParameters"]:
+        """Expand the grid, varying the last parameter fastest."""
+        return [
+            SweepParameters(
+                initial_prompt=initial_prompt,
+                agent_ids=agent_ids,
+                steps=steps,
+                environment_type=environment_type
+            )
+            for initial_prompt, agent_ids, steps, environment_type in itertools.product(
+                self.initial_prompt, self.agent_ids, self.steps, self.environment_type
+            )
+        ]
+
+
+class SweepParameters(BaseModel):
+    """One point of a sweep grid."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    initial_prompt: str
+    agent_ids: List[str]
+    steps: int
+    environment_type: EnvironmentType
+
+
+class SweepCreate(BaseModel):
+    """Request model for creating a sweep."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    name: str = Field(..., description="Name of the sweep, used as a prefix for its simulations")
+    grid: SweepGrid
+    parallel_actions: bool = Field(default=True, description="Run agent actions in parallel")
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, le=32, description="Maximum simulations of the sweep queued or running at once"
+    )
+
+
+class SweepRun(BaseModel):
+    """A simulation belonging to a sweep."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    simulation_id: str
+    parameters: SweepParameters
+    status: SimulationStatus
+
+
+class SweepProgress(BaseModel):
+    """Aggregate progress of a sweep's simulations."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    total: int
+    pending: int
+    running: int
+    completed: int
+    failed: int
+    completed_steps: int = Field(..., description="Steps finished across all simulations")
+    total_steps: int
+    progress: int = Field(..., ge=0, le=100, description="Progress percentage by steps")
+
+
+class SweepResponse(BaseModel):
+    """Response model for sweep data."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    id: str
+    name: str
+    status: SimulationStatus = Field(
+        ..., description="Running until every simulation has finished, failed if none completed"
+    )
+    max_concurrency: int
+    created_at: str
+    completed_at: Optional[str] = None
+    progress: SweepProgress
+    runs: List[SweepRun]
+
+
+class SweepListResponse(BaseModel):
+    """Response model for listing sweeps."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    sweeps: List[SweepResponse]
+    total: int
+
+
+class SweepResultRow(BaseModel):
+    """Outcome of one simulation of a sweep."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    simulation_id: str
+    initial_prompt: str
+    agent_ids: List[str]
+    steps: int
+    environment_type: EnvironmentType
+    status: SimulationStatus
+    duration_seconds: Optional[float] = None
+    interactions: int = 0
+    message_types: Dict[str, int] = Field(default_factory=dict, description="Interactions per message type")
+    llm_calls: int = 0
+    llm_cache_hits: int = 0
+    llm_tokens: int = 0
+    summary: Optional[str] = None
+    extracted_data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class SweepResultsResponse(BaseModel):
+    """Response model for the combined results of a sweep."""
+    model_config = {"arbitrary_types_allowed": True}
+
+    sweep_id: str
+    status: SimulationStatus
+    progress: SweepProgress
+    rows: List[SweepResultRow]
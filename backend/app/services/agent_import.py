@@ -0,0 +1,115 @@
+"""Incremental readers for bulk agent imports."""
+
+import asyncio
+import io
+import json
+import zipfile
+from typing import Any, AsyncIterator, BinaryIO, Iterator, Optional, Tuple
+
+# A record is (source, parsed data or the exception raised while reading it)
+ImportRecord = Tuple[str, Any]
+
+# Request Content-Types of each import format
+JSONL_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/x-jsonlines", "text/plain")
+ZIP_CONTENT_TYPES = ("application/zip", "application/x-zip-compressed")
+
+
+async def _next_chunk(chunks: AsyncIterator[bytes]) -> Optional[bytes]:
+    """Await the next chunk of a stream, or None at its end."""
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+class AsyncStreamReader(io.RawIOBase):
+    """
+    Blocking binary file over an async byte stream.
+
+    Lets the synchronous import readers run in a worker thread while the
+    request body is still arriving: each read waits on the event loop for
+    the next chunk, so only one chunk is held at a time.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        """
+        Initialize the reader.
+
+        Args:
+            chunks: Async iterator of body chunks, e.g. ``request.stream()``
+            loop: Event loop the iterator belongs to
+        """
+        super().__init__()
+        self._chunks = chunks
+        self._loop = loop
+        self._chunk = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk and not self._eof:
+            chunk = asyncio.run_coroutine_threadsafe(_next_chunk(self._chunks), self._loop).result()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+def iter_jsonl_records(stream: BinaryIO, source: str = "line") -> Iterator[ImportRecord]:
+    """
+    Read one JSON document per line, skipping blank lines.
+
+    Args:
+        stream: Binary file positioned at the start of the data
+        source: Prefix of each record's source label
+
+    Yields:
+        ("<source> <n>", parsed data or JSONDecodeError) per non-blank line
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield f"{source} {number}", json.loads(line)
+            except json.JSONDecodeError as e:
+                yield f"{source} {number}", e
+    finally:
+        # Leave the underlying upload open for its owner to close
+        text.detach()
+
+
+def iter_zip_records(stream: BinaryIO) -> Iterator[ImportRecord]:
+    """
+    Read the JSON and JSONL members of a zip archive one at a time.
+
+    Each ``.json`` member holds one agent; ``.jsonl`` members hold one agent
+    per line. Directories, other files and macOS metadata are skipped.
+
+    Args:
+        stream: Seekable binary file containing the archive
+
+    Yields:
+        (member name, or "member line n", parsed data or the read error)
+    """
+    with zipfile.ZipFile(stream) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or name.rsplit("/", 1)[-1].startswith("."):
+                continue
+            if name.endswith(".jsonl"):
+                with archive.open(info) as member:
+                    yield from iter_jsonl_records(member, source=f"{name} line")
+            elif name.endswith(".json"):
+                try:
+                    with archive.open(info) as member:
+                        yield name, json.load(member)
+                except (json.JSONDecodeError, UnicodeDecodeError, zipfile.BadZipFile) as e:
+                    yield name, e
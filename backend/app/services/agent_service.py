@@ -1,42 +1,39 @@
 """Service layer for agent management with TinyTroupe integration."""
 
-import os
-import json
 import uuid
+import asyncio
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
 
-from app.core.config import settings
-from app.models.agent import AgentCreate, AgentResponse, AgentUpdate
+from pydantic import ValidationError
+
+from app.core.metrics import InstrumentedRepository
+from app.models.agent import (
+    AgentCreate,
+    AgentImportError,
+    AgentImportResponse,
+    AgentResponse,
+    AgentSearchQuery,
+    AgentUpdate
+)
+from app.services.agent_import import ImportRecord
+from app.storage import AgentRepository, get_agent_repository
+from app.storage.cursor import decode_cursor, encode_cursor
 
 
 class AgentService:
     """Service for managing TinyTroupe agents."""
 
-    def __init__(self):
-        """Initialize the agent service."""
-        self.agents_dir = Path(settings.agents_dir)
-        self.agents_dir.mkdir(parents=True, exist_ok=True)
-
-    def _get_agent_file_path(self, agent_id: str) -> Path:
-        """Get the file path for an agent."""
-        return self.agents_dir / f"{agent_id}.json"
-
-    def _load_agent_from_file(self, agent_id: str) -> Optional[Dict[str, Any]]:
-        """Load agent data from file."""
-        file_path = self._get_agent_file_path(agent_id)
-        if not file_path.exists():
-            return None
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    def __init__(self, repository: Optional[AgentRepository] = None):
+        """
+        Initialize the agent service.
 
-    def _save_agent_to_file(self, agent_id: str, agent_data: Dict[str, Any]):
-        """Save agent data to file."""
-        file_path = self._get_agent_file_path(agent_id)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(agent_data, f, indent=2, ensure_ascii=False)
+        Args:
+            repository: Storage backend, defaults to the configured one
+        """
+        self.repository = repository or InstrumentedRepository(
+            get_agent_repository(), "agents", AgentRepository.__abstractmethods__
+        )
 
     def create_agent(self, agent_create: AgentCreate) -> AgentResponse:
         """
@@ -59,9 +56,7 @@ class AgentService:
             "updated_at": now
         }
 
-        self._save_agent_to_file(agent_id, agent_data)
-
-        return AgentResponse(**agent_data)
+        return self.repository.save(agent_data)
 
     def get_agent(self, agent_id: str) -> Optional[AgentResponse]:
         """
@@ -73,11 +68,7 @@ class AgentService:
         Returns:
             Agent response or None if not found
         """
-        agent_data = self._load_agent_from_file(agent_id)
-        if not agent_data:
-            return None
-
-        return AgentResponse(**agent_data)
+        return self.repository.get(agent_id)
 
     def list_agents(self) -> List[AgentResponse]:
         """
@@ -86,17 +77,39 @@ class AgentService:
         Returns:
             List of agent responses
         """
-        agents = []
-        for agent_file in self.agents_dir.glob("*.json"):
-            try:
-                with open(agent_file, 'r', encoding='utf-8') as f:
-                    agent_data = json.load(f)
-                    agents.append(AgentResponse(**agent_data))
-            except Exception as e:
-                print(f"Error loading agent from {agent_file}: {e}")
-                continue
+        return self.repository.list()
+
+    def search_agents(
+        self,
+        query: AgentSearchQuery,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[AgentResponse], int, Optional[str]]:
+        """
+        Search agents by persona attributes, oldest first, one page at a time.
+
+        Args:
+            query: Search filters
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of agents to return
+
+        Returns:
+            Tuple of (page of agents, total matching count, next cursor or None)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        after_key = decode_cursor(cursor) if cursor else None
 
-        return agents
+        # Fetch one extra agent to learn whether another page exists
+        page, total = self.repository.search(query, after_key=after_key, limit=limit + 1)
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+        return page, total, next_cursor
 
     def update_agent(self, agent_id: str, agent_update: AgentUpdate) -> Optional[AgentResponse]:
         """
@@ -109,17 +122,16 @@ class AgentService:
         Returns:
             Updated agent response or None if not found
         """
-        agent_data = self._load_agent_from_file(agent_id)
-        if not agent_data:
+        agent = self.repository.get(agent_id)
+        if not agent:
             return None
 
+        agent_data = agent.model_dump()
         if agent_update.persona:
             agent_data["persona"] = agent_update.persona.model_dump()
             agent_data["updated_at"] = datetime.utcnow().isoformat()
 
-        self._save_agent_to_file(agent_id, agent_data)
-
-        return AgentResponse(**agent_data)
+        return self.repository.save(agent_data)
 
     def delete_agent(self, agent_id: str) -> bool:
         """
@@ -131,30 +143,112 @@ class AgentService:
         Returns:
             True if deleted, False if not found
         """
-        file_path = self._get_agent_file_path(agent_id)
-        if not file_path.exists():
-            return False
+        return self.repository.delete(agent_id)
+
+    def import_agents(
+        self,
+        records: Iterable[ImportRecord],
+        batch_size: int = 500,
+        max_errors: int = 1000
+    ) -> AgentImportResponse:
+        """
+        Validate and store agents read from a bulk import.
+
+        Records are consumed lazily and written in batches, so memory use
+        is bounded by ``batch_size`` rather than the size of the import.
+
+        Args:
+            records: (source, data or read error) pairs from an import reader
+            batch_size: Agents written per repository call
+            max_errors: Maximum rejected records reported individually
+
+        Returns:
+            Import summary with per-record errors
+        """
+        summary = AgentImportResponse(imported=0, failed=0)
+
+        def reject(source: str, error: str):
+            summary.failed += 1
+            if len(summary.errors) < max_errors:
+                summary.errors.append(AgentImportError(record=source, error=error))
+            else:
+                summary.errors_truncated = True
+
+        def flush(batch: List[Tuple[str, dict]]):
+            try:
+                self.repository.save_many([agent_data for _, agent_data in batch])
+                summary.imported += len(batch)
+            except Exception as e:
+                for source, _ in batch:
+                    reject(source, f"Failed to save agent: {e}")
+            batch.clear()
+
+        batch: List[Tuple[str, dict]] = []
+        for source, data in records:
+            if isinstance(data, Exception):
+                reject(source, f"Invalid JSON: {data}")
+                continue
+            try:
+                agent_create = AgentCreate.model_validate(data)
+            except ValidationError as e:
+                reject(source, "; ".join(
+                    f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}"
+                    for error in e.errors()
+                ))
+                continue
+
+            now = datetime.utcnow().isoformat()
+            batch.append((source, {
+                "id": str(uuid.uuid4()),
+                "type": agent_create.type,
+                "persona": agent_create.persona.model_dump(),
+                "created_at": now,
+                "updated_at": now
+            }))
+            if len(batch) >= batch_size:
+                flush(batch)
+
+        if batch:
+            flush(batch)
+        return summary
+
+    @staticmethod
+    def create_factory(context: Optional[str] = None):
+        """
+        Create a TinyPersonFactory for a generation context.
+
+        Args:
+            context: Optional context for the generated agents
+
+        Returns:
+            TinyPersonFactory instance
+        """
+        # Import TinyTroupe here to avoid issues if not properly configured
+        from tinytroupe.factory import TinyPersonFactory
 
-        file_path.unlink()
-        return True
+        return TinyPersonFactory(context=context or "A modern workplace")
 
-    def generate_agent(self, description: str, context: Optional[str] = None) -> AgentResponse:
+    def generate_agent(
+        self,
+        description: Optional[str],
+        context: Optional[str] = None,
+        factory=None
+    ) -> AgentResponse:
         """
         Generate an agent using TinyPersonFactory.
 
         Args:
             description: Natural language description of the agent
             context: Optional context for the agent
+            factory: Factory to reuse, e.g. one shared by a batch so it
+                avoids generating duplicate people
 
         Returns:
             Generated agent response
         """
         try:
-            # Import TinyTroupe here to avoid issues if not properly configured
-            from tinytroupe.factory import TinyPersonFactory
-
-            # Create factory with context
-            factory = TinyPersonFactory(context=context or "A modern workplace")
+            if factory is None:
+                factory = self.create_factory(context)
 
             # Generate the person
             tiny_person = factory.generate_person(description)
@@ -186,6 +280,45 @@ class AgentService:
         except Exception as e:
             raise Exception(f"Failed to generate agent: {str(e)}")
 
+    async def generate_agents(
+        self,
+        descriptions: List[Optional[str]],
+        factory,
+        concurrency: int = 8
+    ) -> AsyncIterator[Tuple[int, Union[AgentResponse, Exception]]]:
+        """
+        Generate many agents concurrently.
+
+        Factory calls run in threads, at most ``concurrency`` at a time, and
+        share one factory so the batch does not repeat people.
+
+        Args:
+            descriptions: Description of each agent to generate
+            factory: Factory shared by the batch, from create_factory
+            concurrency: Maximum generations in flight
+
+        Yields:
+            (index, agent or error) pairs in completion order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(index: int, description: Optional[str]):
+            async with semaphore:
+                try:
+                    agent = await asyncio.to_thread(self.generate_agent, description, factory=factory)
+                    return index, agent
+                except Exception as e:
+                    return index, e
+
+        tasks = [asyncio.create_task(generate(i, d)) for i, d in enumerate(descriptions)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop pending generations if the client goes away
+            for task in tasks:
+                task.cancel()
+
 
 # Global instance
 agent_service = AgentService()
@@ -0,0 +1,204 @@
+"""In-memory catalog over a directory of JSON entity files."""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+from pathlib import Path
+
+import orjson
+
+T = TypeVar("T")
+
+# (mtime_ns, size) is enough to notice in-place rewrites as well as replacements
+FileStamp = Tuple[int, int]
+
+
+class FileCatalog(Generic[T]):
+    """
+    Keeps parsed entities from ``<directory>/*.json`` in memory.
+
+    Entities are loaded once and then kept in sync in two ways: the owning
+    service calls :meth:`put` / :meth:`discard` after its own writes, and
+    :meth:`refresh` stats the directory to pick up files changed by anyone
+    else. Only files whose stamp changed are re-read and re-validated, so a
+    single changed entity never triggers a full reload. Owners can keep
+    derived indexes current through the ``on_change`` callback.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        loader: Callable[[Dict], T],
+        refresh_interval: float = 2.0,
+        on_change: Optional[Callable[[str, Optional[T]], None]] = None
+    ):
+        """
+        Initialize the catalog.
+
+        Args:
+            directory: Directory holding one ``<id>.json`` file per entity
+            loader: Converts raw file data into the cached value
+            refresh_interval: Minimum seconds between directory scans
+            on_change: Called with an entity's ID and new value, or None once
+                it is gone, whenever the cached entity changes
+        """
+        self.directory = directory
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.on_change = on_change
+        self._entries: Dict[str, T] = {}
+        self._stamps: Dict[str, FileStamp] = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._last_scan = 0.0
+
+    def _path(self, entity_id: str) -> Path:
+        """Get the file path for an entity."""
+        return self.directory / f"{entity_id}.json"
+
+    @staticmethod
+    def _stamp(stat_result: os.stat_result) -> FileStamp:
+        """Build the change-detection stamp for a file."""
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+
+    def _set(self, entity_id: str, value: T):
+        """Cache an entity's value and report the change."""
+        self._entries[entity_id] = value
+        if self.on_change:
+            self.on_change(entity_id, value)
+
+    def _drop(self, entity_id: str):
+        """Forget an entity's value, reporting it if one was cached."""
+        if self._entries.pop(entity_id, None) is not None and self.on_change:
+            self.on_change(entity_id, None)
+
+    def _read(self, path: Path) -> T:
+        """Read and convert a single entity file."""
+        with open(path, 'rb') as f:
+            return self.loader(orjson.loads(f.read()))
+
+    def load(self):
+        """Load every entity from disk, replacing the current contents."""
+        with self._lock:
+            for entity_id in list(self._entries):
+                self._drop(entity_id)
+            self._stamps.clear()
+            self._loaded = True
+            self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        """
+        Synchronize with the directory, re-reading only changed files.
+
+        Args:
+            force: Scan even if the refresh interval has not elapsed
+        """
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                force = True
+
+            now = time.monotonic()
+            if not force and now - self._last_scan < self.refresh_interval:
+                return
+            self._last_scan = now
+
+            seen = set()
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    entity_id = entry.name[:-len(".json")]
+                    seen.add(entity_id)
+
+                    stamp = self._stamp(entry.stat())
+                    if self._stamps.get(entity_id) == stamp:
+                        continue
+
+                    try:
+                        self._set(entity_id, self._read(Path(entry.path)))
+                        self._stamps[entity_id] = stamp
+                    except Exception as e:
+                        print(f"Error loading {entry.path}: {e}")
+                        self._drop(entity_id)
+                        # Remember the stamp so a broken file is not re-read every scan
+                        self._stamps[entity_id] = stamp
+
+            for entity_id in set(self._stamps) - seen:
+                self._stamps.pop(entity_id, None)
+                self._drop(entity_id)
+
+    def get(self, entity_id: str) -> Optional[T]:
+        """
+        Get a single entity, checking only its own file for changes.
+
+        Args:
+            entity_id: Entity ID
+
+        Returns:
+            Cached value or None if not found
+        """
+        path = self._path(entity_id)
+        with self._lock:
+            if not self._loaded:
+                self.refresh()
+
+            try:
+                stamp = self._stamp(path.stat())
+            except FileNotFoundError:
+                self._stamps.pop(entity_id, None)
+                self._drop(entity_id)
+                return None
+
+            if self._stamps.get(entity_id) != stamp:
+                try:
+                    self._set(entity_id, self._read(path))
+                except Exception as e:
+                    print(f"Error loading {path}: {e}")
+                    self._drop(entity_id)
+                self._stamps[entity_id] = stamp
+
+            return self._entries.get(entity_id)
+
+    def values(self) -> List[T]:
+        """
+        List all cached entities.
+
+        Returns:
+            Cached values, refreshed from disk if the interval has elapsed
+        """
+        with self._lock:
+            self.refresh()
+            return list(self._entries.values())
+
+    def put(self, entity_id: str, value: T):
+        """
+        Record an entity just written to disk by the owning service.
+
+        Args:
+            entity_id: Entity ID
+            value: Value matching the file contents
+        """
+        with self._lock:
+            try:
+                self._stamps[entity_id] = self._stamp(self._path(entity_id).stat())
+            except FileNotFoundError:
+                self._stamps.pop(entity_id, None)
+            self._set(entity_id, value)
+
+    def discard(self, entity_id: str):
+        """
+        Forget an entity that was deleted by the owning service.
+
+        Args:
+            entity_id: Entity ID
+        """
+        with self._lock:
+            self._stamps.pop(entity_id, None)
+            self._drop(entity_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._entries)
@@ -0,0 +1,193 @@
+"""Step-level simulation checkpoints stored as JSON files."""
+
+import os
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.locking import atomic_write
+
+
+class CheckpointStore:
+    """
+    Checkpoints of running simulations, one world file per checkpointed step.
+
+    A checkpoint is the encoded TinyWorld (including every agent's state)
+    after a step, plus the interactions recorded up to and including that
+    step, so a simulation can continue from it without repeating earlier
+    LLM calls. Files are laid out as::
+
+        <checkpoints_dir>/<simulation_id>/step-NNNN.json          world state
+        <checkpoints_dir>/<simulation_id>/interactions-NNNN.json  interactions since the previous checkpoint
+
+    Interaction files are append-only deltas, so the transcript is stored
+    once however many checkpoints a run writes. Every world file is kept
+    by default, so any checkpointed step can be resumed or forked; with
+    ``keep`` set, only that many of the latest are kept, plus any shared
+    with a fork, and older ones are pruned when a newer checkpoint is
+    written.
+    """
+
+    def __init__(self, checkpoints_dir: str, keep: int = 0):
+        """
+        Initialize the store.
+
+        Args:
+            checkpoints_dir: Directory holding checkpoints
+            keep: Latest world files kept per simulation (0 keeps all)
+        """
+        self.checkpoints_dir = Path(checkpoints_dir)
+        self.keep = keep
+
+    def _simulation_dir(self, simulation_id: str) -> Path:
+        """Get the directory of a simulation's checkpoints."""
+        return self.checkpoints_dir / simulation_id
+
+    def _path(self, simulation_id: str, step: int) -> Path:
+        """Get the file path of a checkpoint's world state."""
+        return self._simulation_dir(simulation_id) / f"step-{step:04d}.json"
+
+    def _interactions_path(self, simulation_id: str, step: int) -> Path:
+        """Get the file path of the interactions recorded up to a checkpoint."""
+        return self._simulation_dir(simulation_id) / f"interactions-{step:04d}.json"
+
+    def _numbered(self, simulation_id: str, prefix: str) -> List[int]:
+        """List the step numbers of a simulation's files with a prefix, ascending."""
+        directory = self._simulation_dir(simulation_id)
+        if not directory.is_dir():
+            return []
+        return sorted(
+            int(path.stem.split("-", 1)[1])
+            for path in directory.glob(f"{prefix}-*.json")
+        )
+
+    def save(self, simulation_id: str, step: int, world: Dict[str, Any], interactions: List[Dict[str, Any]]):
+        """
+        Write a checkpoint, pruning world files beyond ``keep``.
+
+        Interactions are written before the world state, so a checkpoint is
+        never visible without its transcript. Interaction files left past
+        the previous checkpoint by an interrupted run are dropped first.
+
+        Args:
+            simulation_id: Simulation ID
+            step: Last completed step
+            world: Encoded TinyWorld state
+            interactions: Interactions recorded since the previous checkpoint
+        """
+        previous = self.latest(simulation_id)
+        self._simulation_dir(simulation_id).mkdir(parents=True, exist_ok=True)
+        for stale in self._numbered(simulation_id, "interactions"):
+            if previous is None or stale > previous:
+                self._interactions_path(simulation_id, stale).unlink(missing_ok=True)
+
+        atomic_write(
+            self._interactions_path(simulation_id, step),
+            json.dumps(interactions, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        )
+        atomic_write(
+            self._path(simulation_id, step),
+            json.dumps({"step": step, "world": world}, ensure_ascii=False, separators=(",", ":"), default=str)
+            .encode("utf-8")
+        )
+
+        if not self.keep:
+            return
+        older_steps = [older for older in self.steps(simulation_id) if older < step]
+        # The new checkpoint takes one of the kept slots
+        for older in older_steps[:max(len(older_steps) - self.keep + 1, 0)]:
+            path = self._path(simulation_id, older)
+            try:
+                # A second hard link means a fork branches off this step
+                if path.stat().st_nlink == 1:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+    def load(self, simulation_id: str, step: int) -> Optional[Dict[str, Any]]:
+        """
+        Read a checkpoint.
+
+        Args:
+            simulation_id: Simulation ID
+            step: Checkpointed step
+
+        Returns:
+            Dict with the step, world state and all interactions up to the
+            step, or None if there is no checkpoint for the step
+        """
+        try:
+            with open(self._path(simulation_id, step), 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        interactions = []
+        for delta in self._numbered(simulation_id, "interactions"):
+            if delta > step:
+                break
+            with open(self._interactions_path(simulation_id, delta), 'r', encoding='utf-8') as f:
+                interactions.extend(json.load(f))
+        checkpoint["interactions"] = interactions
+        return checkpoint
+
+    @staticmethod
+    def _link_file(source: Path, target: Path):
+        """Hard link a file, copying it where hard links are not supported."""
+        try:
+            os.link(source, target)
+        except FileNotFoundError:
+            raise
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(source, target)
+
+    def link(self, source_id: str, step: int, target_id: str):
+        """
+        Share a checkpoint with another simulation without copying it.
+
+        Checkpoint files are never modified in place (``save`` replaces
+        them), so hard links behave copy-on-write. The shared world file
+        keeps a link count above one, which stops either simulation from
+        pruning it. Where hard links are not supported the files are copied.
+
+        Args:
+            source_id: Simulation owning the checkpoint
+            step: Checkpointed step
+            target_id: Simulation receiving the checkpoint
+
+        Raises:
+            FileNotFoundError: If the source has no checkpoint for the step
+        """
+        source = self._path(source_id, step)
+        if not source.exists():
+            raise FileNotFoundError(f"No checkpoint for step {step} of simulation {source_id}")
+        self._simulation_dir(target_id).mkdir(parents=True, exist_ok=True)
+        for delta in self._numbered(source_id, "interactions"):
+            if delta > step:
+                break
+            self._link_file(self._interactions_path(source_id, delta), self._interactions_path(target_id, delta))
+        self._link_file(source, self._path(target_id, step))
+
+    def steps(self, simulation_id: str) -> List[int]:
+        """
+        List the checkpointed steps of a simulation.
+
+        Args:
+            simulation_id: Simulation ID
+
+        Returns:
+            Steps in ascending order
+        """
+        return self._numbered(simulation_id, "step")
+
+    def latest(self, simulation_id: str) -> Optional[int]:
+        """Get the last checkpointed step of a simulation, if any."""
+        steps = self.steps(simulation_id)
+        return steps[-1] if steps else None
+
+    def delete(self, simulation_id: str):
+        """Remove all checkpoints of a simulation."""
+        shutil.rmtree(self._simulation_dir(simulation_id), ignore_errors=True)
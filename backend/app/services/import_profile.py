@@ -0,0 +1,130 @@
+"""
+Import-time profile of the modules simulation workers preload.
+
+Runs a fresh interpreter with ``-X importtime`` so results are not skewed
+by modules already imported in the current process.
+
+Usage:
+    python -m app.services.import_profile [--top 25] [--json] [module ...]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from app.services.simulation_worker import TINYTROUPE_PATH, WARM_MODULES
+
+
+@dataclass
+class ImportTiming:
+    """Time spent importing one module, in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def profile_imports(modules: List[str], python: str = sys.executable) -> List[ImportTiming]:
+    """
+    Measure how long importing modules takes in a fresh interpreter.
+
+    Args:
+        modules: Modules to import
+        python: Interpreter to run
+
+    Returns:
+        One timing per imported module, in import order
+
+    Raises:
+        RuntimeError: If the imports fail
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (TINYTROUPE_PATH, env.get("PYTHONPATH")) if path
+    )
+    code = "\n".join(f"import {module}" for module in modules)
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env
+    )
+
+    timings = []
+    errors = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            errors.append(line)
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        timings.append(ImportTiming(
+            module=fields[2].strip(),
+            self_us=int(fields[0]),
+            cumulative_us=int(fields[1])
+        ))
+
+    if completed.returncode != 0:
+        raise RuntimeError("\n".join(errors[-5:]) or f"Import failed ({completed.returncode})")
+    return timings
+
+
+def summarize(timings: List[ImportTiming], top: int = 25) -> Dict:
+    """
+    Summarize an import profile.
+
+    Args:
+        timings: Output of profile_imports
+        top: Number of entries in each ranking
+
+    Returns:
+        Total time, slowest modules by cumulative time, and slowest
+        top-level packages by their own import time
+    """
+    packages: Dict[str, int] = {}
+    for timing in timings:
+        package = timing.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + timing.self_us
+
+    slowest = sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]
+    return {
+        "total_seconds": sum(t.self_us for t in timings) / 1e6,
+        "modules": len(timings),
+        "slowest_modules": [asdict(t) for t in slowest],
+        "slowest_packages": [
+            {"package": name, "self_us": us}
+            for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print the import profile of the worker preload."""
+    parser = argparse.ArgumentParser(description="Profile simulation worker imports")
+    parser.add_argument("modules", nargs="*", default=list(WARM_MODULES),
+                        help="Modules to import (default: the worker preload)")
+    parser.add_argument("--top", type=int, default=25, help="Entries per ranking")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    args = parser.parse_args(argv)
+
+    report = summarize(profile_imports(args.modules), top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Imported {report['modules']} modules in {report['total_seconds']:.2f}s\n")
+    print("Slowest packages (own import time):")
+    for entry in report["slowest_packages"]:
+        print(f"  {entry['self_us'] / 1000:9.1f} ms  {entry['package']}")
+    print("\nSlowest modules (cumulative):")
+    for entry in report["slowest_modules"]:
+        print(f"  {entry['cumulative_us'] / 1000:9.1f} ms  {entry['module']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Columnar copies of completed transcripts for cross-simulation analytics."""
+
+import importlib.util
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.core.locking import atomic_write
+
+# Group-by dimensions and the columns each one adds to a result row
+GROUP_FIELDS = {
+    "simulation": ("simulation_id",),
+    "agent": ("agent_id", "agent_name"),
+    "message_type": ("message_type",),
+    "step": ("step",),
+    "time": ("bucket_start",),
+}
+
+BUCKET_UNITS = ("minute", "hour", "day", "week")
+
+# Stored columns that are dictionary encoded, and cast back to strings in results
+DICTIONARY_COLUMNS = ("simulation_id", "agent_id", "agent_name", "message_type")
+
+COMPLETED_AT_KEY = b"completed_at"
+
+
+def _utc(timestamp: str) -> datetime:
+    """Parse an ISO 8601 timestamp, reading naive times as UTC."""
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _schema():
+    """Get the Arrow schema of stored interactions."""
+    import pyarrow as pa
+
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("simulation_id", text),
+        ("seq", pa.int64()),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("agent_id", text),
+        ("agent_name", text),
+        ("message_type", text),
+        ("step", pa.int32()),
+        ("words", pa.int32()),
+        ("content", pa.string()),
+    ])
+
+
+class InteractionStore:
+    """
+    Interactions of completed simulations in Arrow IPC files.
+
+    Each simulation's transcript is written once, when it completes, to
+    ``<directory>/<simulation_id>.arrow`` with one column per field and the
+    completion time in the schema metadata. Files are uncompressed so reads
+    memory-map them and only touch the columns a query needs; aggregates
+    over many simulations run in Arrow without building SimulationResponse
+    objects. pyarrow is imported on first use, so the rest of the API runs
+    without it.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding one file per simulation
+        """
+        self.directory = Path(directory)
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether pyarrow is installed."""
+        return importlib.util.find_spec("pyarrow") is not None
+
+    def _path(self, simulation_id: str) -> Path:
+        """Get the file path of a simulation's interactions."""
+        return self.directory / f"{simulation_id}.arrow"
+
+    def _paths(self, simulation_ids: Optional[List[str]] = None) -> List[Path]:
+        """Get the files of stored simulations, optionally only the given ones."""
+        if simulation_ids is not None:
+            return [path for path in map(self._path, dict.fromkeys(simulation_ids)) if path.exists()]
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("*.arrow"))
+
+    def write(
+        self,
+        simulation_id: str,
+        batches: Iterable[List[Dict[str, Any]]],
+        completed_at: Optional[str] = None
+    ) -> int:
+        """
+        Store a simulation's interactions, replacing any earlier version.
+
+        Args:
+            simulation_id: Simulation ID
+            batches: Interactions in order, in one or more lists
+            completed_at: Completion time, used to detect stale files
+
+        Returns:
+            Number of interactions stored
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        import pyarrow as pa
+
+        schema = _schema().with_metadata({COMPLETED_AT_KEY: (completed_at or "").encode("utf-8")})
+        # Batches are built with plain strings, then encoded with one
+        # dictionary per column, as the IPC file format requires
+        plain = pa.schema([
+            pa.field(field.name, pa.string()) if field.name in DICTIONARY_COLUMNS else field
+            for field in schema
+        ])
+        tables = []
+        seq = 0
+        for batch in batches:
+            if not batch:
+                continue
+            contents = [interaction["content"] for interaction in batch]
+            tables.append(pa.Table.from_arrays([
+                pa.array([simulation_id] * len(batch), pa.string()),
+                pa.array(range(seq, seq + len(batch)), pa.int64()),
+                pa.array([_utc(interaction["timestamp"]) for interaction in batch], schema.field("timestamp").type),
+                pa.array([interaction["agent_id"] for interaction in batch], pa.string()),
+                pa.array([interaction["agent_name"] for interaction in batch], pa.string()),
+                pa.array([interaction["message_type"] for interaction in batch], pa.string()),
+                pa.array([interaction.get("step") for interaction in batch], pa.int32()),
+                pa.array([len(content.split()) for content in contents], pa.int32()),
+                pa.array(contents, pa.string()),
+            ], schema=plain))
+            seq += len(batch)
+        table = pa.concat_tables(tables).combine_chunks() if tables else plain.empty_table()
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table.cast(schema))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self._path(simulation_id), sink.getvalue().to_pybytes())
+        return seq
+
+    def remove(self, simulation_id: str):
+        """
+        Remove a simulation's interactions.
+
+        Args:
+            simulation_id: Simulation ID
+        """
+        self._path(simulation_id).unlink(missing_ok=True)
+
+    def stored(self) -> Dict[str, Optional[str]]:
+        """
+        Get the stored simulations.
+
+        Returns:
+            Dict mapping simulation ID to the completion time it was stored at
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        import pyarrow as pa
+
+        stored = {}
+        for path in self._paths():
+            try:
+                with pa.memory_map(str(path)) as source:
+                    metadata = pa.ipc.open_file(source).schema.metadata or {}
+            except (OSError, pa.ArrowInvalid):
+                # Deleted meanwhile, or unreadable and due to be rewritten
+                stored[path.stem] = None
+                continue
+            stored[path.stem] = metadata.get(COMPLETED_AT_KEY, b"").decode("utf-8") or None
+        return stored
+
+    def _read(
+        self,
+        simulation_ids: Optional[List[str]],
+        columns: List[str],
+        conditions: Iterable[Callable[[Any], Any]] = ()
+    ):
+        """
+        Read matching rows of stored files through memory maps.
+
+        Each file is projected and filtered on its own, so only the rows
+        that match are copied out of the mapping; without conditions
+        nothing is copied.
+
+        Args:
+            simulation_ids: Only read these simulations' files
+            columns: Columns to read, including any the conditions use
+            conditions: Functions giving a boolean mask for a table; rows
+                must match all of them
+
+        Returns:
+            Table with one chunk per file
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        conditions = list(conditions)
+        tables = []
+        for path in self._paths(simulation_ids):
+            try:
+                # Buffers keep the mapping alive after the file is closed
+                with pa.memory_map(str(path)) as source:
+                    table = pa.ipc.open_file(source).read_all().select(columns)
+            except FileNotFoundError:
+                # Deleted since the directory was listed
+                continue
+            if conditions:
+                # Masks from compute kernels; an expression filter costs more per file
+                mask = conditions[0](table)
+                for condition in conditions[1:]:
+                    mask = pc.and_(mask, condition(table))
+                table = table.filter(mask)
+            if table.num_rows:
+                tables.append(table)
+        if not tables:
+            return _schema().empty_table().select(columns)
+        # Every file has its own dictionaries, which grouping cannot mix
+        return pa.concat_tables(tables).unify_dictionaries()
+
+    def aggregate(
+        self,
+        group_by: List[str],
+        bucket: str = "hour",
+        bucket_size: int = 1,
+        simulation_ids: Optional[List[str]] = None,
+        agent_ids: Optional[List[str]] = None,
+        message_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any], int]:
+        """
+        Aggregate stored interactions by simulation, agent, message type, step or time.
+
+        Every group reports its message count, total and mean words per
+        message, distinct simulations and agents, and first and last
+        message times. Groups are ordered by their key columns.
+
+        Args:
+            group_by: Dimensions from GROUP_FIELDS; none gives a single total row
+            bucket: Unit of time buckets when grouping by time
+            bucket_size: Number of units per time bucket
+            simulation_ids: Only include these simulations
+            agent_ids: Only include messages of these agents
+            message_types: Only include these message types
+            since: Only include messages at or after this time
+            until: Only include messages before this time
+            limit: Maximum number of groups to return
+
+        Returns:
+            Tuple of (groups, totals over all matching messages, number of groups)
+
+        Raises:
+            ValueError: If a dimension or bucket unit is unknown
+            ImportError: If pyarrow is not installed
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        unknown = [dimension for dimension in group_by if dimension not in GROUP_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown group_by dimension(s): {', '.join(unknown)}")
+        if bucket not in BUCKET_UNITS:
+            raise ValueError(f"Unknown bucket unit: {bucket}")
+        if bucket_size < 1:
+            raise ValueError("bucket_size must be at least 1")
+
+        keys = list(dict.fromkeys(column for dimension in group_by for column in GROUP_FIELDS[dimension]))
+        columns = list(dict.fromkeys(
+            ["simulation_id", "agent_id", "timestamp", "words"]
+            + [column for column in keys if column != "bucket_start"]
+            + (["message_type"] if message_types else [])
+        ))
+
+        filters = []
+        for column, values in (("agent_id", agent_ids), ("message_type", message_types)):
+            if values:
+                value_set = pa.array(values, pa.string())
+                filters.append(lambda table, column=column, value_set=value_set: pc.is_in(
+                    table[column], value_set=value_set
+                ))
+        timestamp_type = _schema().field("timestamp").type
+        for moment, compare in ((since, pc.greater_equal), (until, pc.less)):
+            if moment is not None:
+                if moment.tzinfo is None:
+                    moment = moment.replace(tzinfo=timezone.utc)
+                bound = pa.scalar(moment, timestamp_type)
+                filters.append(lambda table, compare=compare, bound=bound: compare(table["timestamp"], bound))
+        table = self._read(simulation_ids, columns, filters)
+
+        # Unified dictionaries make indices comparable across files; distinct
+        # counts run on them since Arrow has no such kernel for dictionaries
+        for column in ("simulation_id", "agent_id"):
+            table = table.append_column(
+                f"{column}_index", pa.chunked_array([chunk.indices for chunk in table[column].chunks], pa.int32())
+            )
+        if "bucket_start" in keys:
+            table = table.append_column(
+                "bucket_start", pc.floor_temporal(table["timestamp"], multiple=bucket_size, unit=bucket)
+            )
+
+        # Arrow's output column name -> (input column, function, result name)
+        aggregations = {
+            "count_all": ([], "count_all", "messages"),
+            "words_sum": ("words", "sum", "words"),
+            "words_mean": ("words", "mean", "mean_words"),
+            "simulation_id_index_count_distinct": ("simulation_id_index", "count_distinct", "simulations"),
+            "agent_id_index_count_distinct": ("agent_id_index", "count_distinct", "agents"),
+            "timestamp_min": ("timestamp", "min", "first_timestamp"),
+            "timestamp_max": ("timestamp", "max", "last_timestamp"),
+        }
+        names = [name for _, _, name in aggregations.values()]
+
+        def summarize(grouped):
+            result = grouped.aggregate([(column, function) for column, function, _ in aggregations.values()])
+            return result.rename_columns([
+                aggregations[column][2] if column in aggregations else column
+                for column in result.column_names
+            ])
+
+        overall = summarize(table.group_by([]))
+        groups = summarize(table.group_by(keys)) if keys else overall
+        for column in keys:
+            if column in DICTIONARY_COLUMNS:
+                index = groups.column_names.index(column)
+                groups = groups.set_column(index, column, groups[column].cast(pa.string()))
+        if keys:
+            groups = groups.sort_by([(column, "ascending") for column in keys])
+
+        def row(values: Dict[str, Any]) -> Dict[str, Any]:
+            for column in ("first_timestamp", "last_timestamp", "bucket_start"):
+                if values.get(column) is not None:
+                    values[column] = values[column].isoformat()
+            return values
+
+        return (
+            [row(values) for values in groups.slice(0, limit).select(keys + names).to_pylist()],
+            row(overall.to_pylist()[0]),
+            groups.num_rows,
+        )
@@ -0,0 +1,273 @@
+"""Durable simulation job queue backed by SQLite."""
+
+import os
+import time
+import uuid
+import socket
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.storage.sqlite import SQLiteDatabase
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    simulation_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, enqueued_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_simulation
+    ON jobs(simulation_id) WHERE state IN ('queued', 'leased');
+"""
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobAlreadyActiveError(Exception):
+    """Raised when a simulation already has a queued or leased job."""
+
+
+@dataclass
+class Job:
+    """A claimed simulation job."""
+
+    id: str
+    simulation_id: str
+    attempts: int
+
+
+def make_owner_id() -> str:
+    """Build a lease owner ID identifying this host and process."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobQueue:
+    """
+    Persistent FIFO of simulation jobs with lease and heartbeat semantics.
+
+    A worker claims a job by taking a time-limited lease and must renew it
+    with :meth:`heartbeat` while the simulation runs. Jobs whose lease ran
+    out, or whose owner process is gone, are handed back by :meth:`recover`.
+
+    A lease is identified by the job and its attempt number, so a worker
+    that lost its lease can neither renew nor finish the attempt that
+    replaced it, even when the same process claimed the job again.
+    """
+
+    def __init__(self, path: str, owner: Optional[str] = None):
+        """
+        Initialize the queue.
+
+        Args:
+            path: Path of the job database file
+            owner: Lease owner ID for this process
+        """
+        self.db = SQLiteDatabase(path, schema=JOBS_SCHEMA)
+        self.owner = owner or make_owner_id()
+
+    def _owner_is_dead(self, owner: Optional[str]) -> bool:
+        """
+        Check whether a lease owner is a process on this host that is gone.
+
+        Owners on other hosts are only recovered once their lease expires.
+        """
+        if not owner:
+            return True
+        try:
+            host, pid, _ = owner.split(":")
+            pid = int(pid)
+        except ValueError:
+            return True
+        if host != socket.gethostname():
+            return False
+        if pid == os.getpid():
+            # Same PID but a different owner is an earlier incarnation (e.g. container restart)
+            return owner != self.owner
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+    def enqueue(self, simulation_id: str, max_queued: Optional[int] = None) -> Optional[str]:
+        """
+        Add a job for a simulation.
+
+        Args:
+            simulation_id: Simulation ID
+            max_queued: Refuse the job if this many are already waiting
+
+        Returns:
+            Job ID, or None if the queue is full
+
+        Raises:
+            JobAlreadyActiveError: If the simulation is already queued or leased
+        """
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        try:
+            with self.db.transaction() as conn:
+                if max_queued is not None:
+                    queued = conn.execute(
+                        "SELECT COUNT(*) FROM jobs WHERE state = ?", (QUEUED,)
+                    ).fetchone()[0]
+                    if queued >= max_queued:
+                        return None
+                conn.execute(
+                    "INSERT INTO jobs (id, simulation_id, state, enqueued_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (job_id, simulation_id, QUEUED, now, now)
+                )
+        except sqlite3.IntegrityError:
+            raise JobAlreadyActiveError(f"Simulation {simulation_id} is already scheduled")
+        return job_id
+
+    def claim(self, lease_seconds: float) -> Optional[Job]:
+        """
+        Lease the oldest queued job.
+
+        Args:
+            lease_seconds: Lease duration
+
+        Returns:
+            Claimed job or None if the queue is empty
+        """
+        now = time.time()
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                "SELECT id, simulation_id, attempts FROM jobs WHERE state = ? "
+                "ORDER BY enqueued_at LIMIT 1",
+                (QUEUED,)
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (LEASED, self.owner, now + lease_seconds, now, row["id"])
+            )
+        return Job(id=row["id"], simulation_id=row["simulation_id"], attempts=row["attempts"] + 1)
+
+    def heartbeat(self, job: Job, lease_seconds: float) -> bool:
+        """
+        Extend the lease on a job held by this process.
+
+        Args:
+            job: Claimed job
+            lease_seconds: New lease duration from now
+
+        Returns:
+            False if the lease was lost to recovery
+        """
+        now = time.time()
+        with self.db.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND state = ? AND lease_owner = ? AND attempts = ?",
+                (now + lease_seconds, now, job.id, LEASED, self.owner, job.attempts)
+            )
+        return cursor.rowcount > 0
+
+    def _finish(self, job: Job, state: str, error: Optional[str] = None):
+        """Move a leased job to a terminal state."""
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, "
+                "lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND state = ? AND lease_owner = ? AND attempts = ?",
+                (state, error, time.time(), job.id, LEASED, self.owner, job.attempts)
+            )
+
+    def complete(self, job: Job):
+        """Mark a job as done."""
+        self._finish(job, DONE)
+
+    def fail(self, job: Job, error: str):
+        """Mark a job as failed."""
+        self._finish(job, FAILED, error)
+
+    def recover(
+        self,
+        max_attempts: int,
+        on_requeue: Optional[Callable[[List[str]], None]] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Release orphaned leases.
+
+        A lease is orphaned when it expired or its owner process on this host
+        has exited. Orphaned jobs are re-queued until they reach
+        ``max_attempts``, after which they are failed.
+
+        ``on_requeue`` runs before the re-queued jobs are committed, while
+        the queue's write lock keeps every worker from claiming them. If it
+        raises, nothing is released and the next recovery tries again.
+
+        Args:
+            max_attempts: Maximum number of times a job may be leased
+            on_requeue: Called with the re-queued simulation IDs
+
+        Returns:
+            Tuple of (re-queued simulation IDs, failed simulation IDs)
+        """
+        now = time.time()
+        requeued, failed = [], []
+        with self.db.transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, simulation_id, attempts, lease_owner, lease_expires_at "
+                "FROM jobs WHERE state = ?",
+                (LEASED,)
+            ).fetchall()
+            for row in rows:
+                if row["lease_expires_at"] > now and not self._owner_is_dead(row["lease_owner"]):
+                    continue
+                if row["attempts"] < max_attempts:
+                    conn.execute(
+                        "UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                        "updated_at = ? WHERE id = ?",
+                        (QUEUED, now, row["id"])
+                    )
+                    requeued.append(row["simulation_id"])
+                else:
+                    conn.execute(
+                        "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, "
+                        "lease_expires_at = NULL, updated_at = ? WHERE id = ?",
+                        (FAILED, "Worker lost too many times", now, row["id"])
+                    )
+                    failed.append(row["simulation_id"])
+            if requeued and on_requeue is not None:
+                on_requeue(requeued)
+        return requeued, failed
+
+    def is_active(self, simulation_id: str) -> bool:
+        """Check whether a simulation has a queued or leased job."""
+        row = self.db.connection().execute(
+            "SELECT 1 FROM jobs WHERE simulation_id = ? AND state IN (?, ?)",
+            (simulation_id, QUEUED, LEASED)
+        ).fetchone()
+        return row is not None
+
+    def depth(self) -> Dict[str, int]:
+        """
+        Count jobs per state.
+
+        Returns:
+            Mapping of state to job count
+        """
+        counts = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for row in self.db.connection().execute(
+            "SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"
+        ):
+            counts[row["state"]] = row["n"]
+        return counts
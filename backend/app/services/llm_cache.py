@@ -0,0 +1,341 @@
+"""Content-addressed, disk-backed cache for LLM completions."""
+
+import json
+import time
+import hashlib
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.core.config import settings
+from app.storage.sqlite import SQLiteDatabase
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_completions_last_access ON completions(last_access);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0), ('size_bytes', 0);
+"""
+
+
+class LLMCache:
+    """
+    LLM completions keyed by a hash of the full request.
+
+    Entries live in a SQLite file shared by every worker process, so a
+    completion computed by one simulation is reused by all later ones.
+    The total payload size is capped; least recently used entries are
+    evicted first.
+
+    Lookups read in autocommit mode and never take the write lock. Hit and
+    miss counts are buffered per process, and an entry's ``last_access``
+    is only refreshed once it is older than ``touch_interval``. Both are
+    written in batches by :meth:`flush`, at most every ``flush_interval``
+    seconds and on every put.
+    """
+
+    def __init__(self, path: str, max_bytes: int, touch_interval: float = 60.0, flush_interval: float = 5.0):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path of the cache database file
+            max_bytes: Maximum total size of cached payloads
+            touch_interval: Seconds before a hit refreshes an entry's last access time
+            flush_interval: Maximum seconds buffered counters and access times wait
+        """
+        self.db = SQLiteDatabase(path, schema=CACHE_SCHEMA)
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.flush_interval = flush_interval
+        self._pending_lock = threading.Lock()
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._pending_touches: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """
+        Hash a completion request.
+
+        Args:
+            request: Model, temperature, messages and any other parameters
+
+        Returns:
+            Hex digest identifying the request
+        """
+        canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _bump(self, conn, name: str, amount: int = 1):
+        """Increment a counter inside the current transaction."""
+        if amount:
+            conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a completion, counting the hit or miss.
+
+        Args:
+            key: Request key from make_key
+
+        Returns:
+            Cached completion or None
+        """
+        row = self.db.connection().execute(
+            "SELECT value, last_access FROM completions WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        with self._pending_lock:
+            if row is None:
+                self._pending_misses += 1
+            else:
+                self._pending_hits += 1
+                if now - row["last_access"] >= self.touch_interval:
+                    self._pending_touches[key] = now
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+        return json.loads(row["value"]) if row is not None else None
+
+    def _write_pending(self, conn):
+        """Write buffered counters and access times inside the current transaction."""
+        with self._pending_lock:
+            hits, misses, touches = self._pending_hits, self._pending_misses, self._pending_touches
+            self._pending_hits = self._pending_misses = 0
+            self._pending_touches = {}
+            self._last_flush = time.monotonic()
+        self._bump(conn, "hits", hits)
+        self._bump(conn, "misses", misses)
+        conn.executemany(
+            "UPDATE completions SET last_access = MAX(last_access, ?) WHERE key = ?",
+            ((accessed, key) for key, accessed in touches.items())
+        )
+
+    def flush(self):
+        """Write buffered hit/miss counts and access times to the database."""
+        with self._pending_lock:
+            if not (self._pending_hits or self._pending_misses or self._pending_touches):
+                self._last_flush = time.monotonic()
+                return
+        with self.db.transaction() as conn:
+            self._write_pending(conn)
+
+    def put(self, key: str, value: Any):
+        """
+        Store a completion and evict old entries beyond the size cap.
+
+        Args:
+            key: Request key from make_key
+            value: JSON-serializable completion
+        """
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self.db.transaction() as conn:
+            old = conn.execute("SELECT size FROM completions WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now)
+            )
+            self._bump(conn, "size_bytes", size - (old["size"] if old else 0))
+            self._write_pending(conn)
+            self._evict(conn)
+
+    def _evict(self, conn):
+        """Delete least recently used entries until under the size cap."""
+        total = conn.execute("SELECT value FROM counters WHERE name = 'size_bytes'").fetchone()[0]
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM completions ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                conn.execute("DELETE FROM completions WHERE key = ?", (row["key"],))
+                self._bump(conn, "size_bytes", -row["size"])
+                total -= row["size"]
+                if total <= self.max_bytes:
+                    break
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._pending_lock:
+            self._pending_hits = self._pending_misses = 0
+            self._pending_touches = {}
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM completions")
+            conn.execute("UPDATE counters SET value = 0")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache size and effectiveness.
+
+        Returns:
+            Entry count, size, cap, hit/miss counters and hit ratio
+        """
+        self.flush()
+        conn = self.db.connection()
+        counters = {row["name"]: row["value"] for row in conn.execute("SELECT name, value FROM counters")}
+        entries = conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            "entries": entries,
+            "size_bytes": counters["size_bytes"],
+            "max_bytes": self.max_bytes,
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "hit_ratio": counters["hits"] / lookups if lookups else 0.0,
+        }
+
+
+class _CacheScope:
+    """Per-process state of the TinyTroupe client patch."""
+
+    cache: Optional[LLMCache] = None
+    default_model: Optional[str] = None
+    default_temperature: Optional[float] = None
+
+
+_scope = _CacheScope()
+_usage_lock = threading.Lock()
+_usage: Dict[str, Any] = {}
+_current_agent = threading.local()
+_patched = False
+
+
+def _record(name: str, amount: int = 1):
+    """Increment a usage counter of the current simulation and acting agent."""
+    if not amount:
+        return
+    agent = getattr(_current_agent, "name", None)
+    with _usage_lock:
+        _usage[name] = _usage.get(name, 0) + amount
+        if agent is not None:
+            counters = _usage.setdefault("agents", {}).setdefault(agent, {})
+            counters[name] = counters.get(name, 0) + amount
+
+
+def patch_tinytroupe():
+    """
+    Route TinyTroupe completions through the active LLMCache and count them.
+
+    Wraps ``OpenAIClient.send_message`` (caching), ``OpenAIClient._raw_model_call``
+    (token usage reported by the API) and ``TinyPerson.act`` (attributing
+    calls to the acting agent), once per process. Outside of a
+    :func:`llm_cache_scope` with caching enabled, calls go straight through.
+    """
+    global _patched
+    if _patched:
+        return
+
+    from tinytroupe import openai_utils
+    from tinytroupe.agent import TinyPerson
+
+    original = openai_utils.OpenAIClient.send_message
+    signature = inspect.signature(original)
+
+    @functools.wraps(original)
+    def send_message(self, *args, **kwargs):
+        _record("calls")
+        cache = _scope.cache
+        if cache is None:
+            return original(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        request = {name: value for name, value in bound.arguments.items() if name != "self"}
+        if request.get("model") is None:
+            request["model"] = _scope.default_model
+        if request.get("temperature") is None:
+            request["temperature"] = _scope.default_temperature
+
+        key = cache.make_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            _record("cache_hits")
+            return cached
+
+        _record("cache_misses")
+        response = original(self, *args, **kwargs)
+        if isinstance(response, dict):
+            cache.put(key, response)
+        return response
+
+    openai_utils.OpenAIClient.send_message = send_message
+
+    raw_model_call = getattr(openai_utils.OpenAIClient, "_raw_model_call", None)
+    if raw_model_call is not None:
+        @functools.wraps(raw_model_call)
+        def _raw_model_call(self, *args, **kwargs):
+            response = raw_model_call(self, *args, **kwargs)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                _record("prompt_tokens", getattr(usage, "prompt_tokens", 0) or 0)
+                _record("completion_tokens", getattr(usage, "completion_tokens", 0) or 0)
+            return response
+
+        openai_utils.OpenAIClient._raw_model_call = _raw_model_call
+
+    original_act = TinyPerson.act
+
+    @functools.wraps(original_act)
+    def act(self, *args, **kwargs):
+        previous = getattr(_current_agent, "name", None)
+        _current_agent.name = self.name
+        try:
+            return original_act(self, *args, **kwargs)
+        finally:
+            _current_agent.name = previous
+
+    TinyPerson.act = act
+    _patched = True
+
+
+@contextmanager
+def llm_cache_scope(
+    cache: Optional[LLMCache],
+    default_model: Optional[str] = None,
+    default_temperature: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Count (and optionally cache) TinyTroupe completions for one simulation.
+
+    Args:
+        cache: Cache to use, or None to only count calls
+        default_model: Model assumed when a call does not name one
+        default_temperature: Temperature assumed when a call does not set one
+
+    Yields:
+        Usage counters (calls, cache_hits, cache_misses, prompt_tokens,
+        completion_tokens), with the same counters per agent name under
+        "agents", filled in as calls happen
+    """
+    patch_tinytroupe()
+    _usage.clear()
+    _scope.cache = cache
+    _scope.default_model = default_model
+    _scope.default_temperature = default_temperature
+    try:
+        yield _usage
+    finally:
+        _scope.cache = None
+        if cache is not None:
+            cache.flush()
+
+
+# Global instance
+llm_cache = LLMCache(settings.llm_cache_path, settings.llm_cache_max_mb * 1024 * 1024)
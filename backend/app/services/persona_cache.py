@@ -0,0 +1,114 @@
+"""Per-process cache of configured TinyPerson specs."""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+def persona_hash(agent_data: Dict[str, Any]) -> str:
+    """
+    Hash everything that determines how an agent's TinyPerson is built.
+
+    Args:
+        agent_data: Stored agent data
+
+    Returns:
+        Hex digest of the agent's type and persona
+    """
+    payload = json.dumps(
+        [agent_data.get("type"), agent_data["persona"]],
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PersonaCache:
+    """
+    Specs of fully configured TinyPersons, keyed by agent ID.
+
+    A spec is the complete state of a freshly configured agent, before it
+    has heard or done anything, so later runs restore it in one step
+    instead of re-applying every persona field. Each entry remembers the
+    hash of the persona it was built from: once ``update_agent`` stores a
+    new persona the hash no longer matches, and the stale spec is dropped
+    and rebuilt on the next lookup. Least recently used entries are
+    evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached specs (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self,
+        agent_data: Dict[str, Any],
+        build: Callable[[], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Get an agent's spec, building and caching it on a miss.
+
+        Args:
+            agent_data: Stored agent data
+            build: Callable configuring the agent and returning its spec
+
+        Returns:
+            The spec and whether it came from the cache
+        """
+        agent_id = agent_data["id"]
+        digest = persona_hash(agent_data)
+        with self._lock:
+            entry = self._entries.get(agent_id)
+            if entry is not None and entry[0] == digest:
+                self._entries.move_to_end(agent_id)
+                self.hits += 1
+                return entry[1], True
+            self.misses += 1
+
+        spec = build()
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[agent_id] = (digest, spec)
+                self._entries.move_to_end(agent_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return spec, False
+
+    def invalidate(self, agent_id: Optional[str] = None):
+        """
+        Drop cached specs.
+
+        Args:
+            agent_id: Agent whose spec to drop, or None to clear the cache
+        """
+        with self._lock:
+            if agent_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(agent_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Cached entries, hits and misses in this process
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Global instance, one per worker process
+persona_cache = PersonaCache(settings.persona_cache_size)
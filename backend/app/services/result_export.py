@@ -0,0 +1,119 @@
+"""Streaming encoders for exporting simulation interactions."""
+
+import io
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Columns of every exported row, in order
+EXPORT_COLUMNS = (
+    "simulation_id", "seq", "timestamp", "agent_id", "agent_name", "message_type", "content", "step"
+)
+
+# Media type and file extension of each export format
+EXPORT_FORMATS = {
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+Batch = List[Dict[str, Any]]
+
+
+def encode_jsonl(batches: Iterable[Batch]) -> Iterator[bytes]:
+    """
+    Encode row batches as JSON lines.
+
+    Args:
+        batches: Lists of export rows
+
+    Yields:
+        One chunk of lines per batch
+    """
+    for batch in batches:
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch).encode("utf-8")
+
+
+def encode_csv(batches: Iterable[Batch]) -> Iterator[bytes]:
+    """
+    Encode row batches as CSV with a header row.
+
+    Args:
+        batches: Lists of export rows
+
+    Yields:
+        The header, then one chunk of rows per batch
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        # Parquet footers store absolute offsets, so keep counting across drains
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def encode_parquet(batches: Iterable[Batch]) -> Iterator[bytes]:
+    """
+    Encode row batches as a Parquet file, one row group per batch.
+
+    Args:
+        batches: Lists of export rows
+
+    Yields:
+        Bytes of each row group as it is written, then the footer
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("simulation_id", pa.string()),
+        ("seq", pa.int64()),
+        ("timestamp", pa.string()),
+        ("agent_id", pa.string()),
+        ("agent_name", pa.string()),
+        ("message_type", pa.string()),
+        ("content", pa.string()),
+        ("step", pa.int64()),
+    ])
+
+    def generate() -> Iterator[bytes]:
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+            for batch in batches:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                yield sink.drain()
+        yield sink.drain()
+
+    return generate()
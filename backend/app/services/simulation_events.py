@@ -0,0 +1,264 @@
+"""Per-simulation event logs and live fan-out to stream subscribers."""
+
+import json
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+from pathlib import Path
+
+from app.core.locking import atomic_write, file_lock
+
+# Event types
+STATUS_EVENT = "status"
+STEP_EVENT = "step"
+INTERACTION_EVENT = "interaction"
+
+# Statuses after which no more events are written for a run
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+class SimulationEventLog:
+    """
+    Append-only JSONL log of one simulation's events.
+
+    The worker process running the simulation and any API process
+    publishing its status append to the same file. Appends hold the log's
+    lock file, and a writer recounts the log whenever someone else has
+    appended since its last write, so sequence numbers stay contiguous;
+    subscribers use them to resume.
+
+    The API process asks a run to stop by creating a cancel marker next to
+    the log; the worker checks for it between steps. Markers are keyed by
+    run ID, so a stale one never stops a later run of the simulation.
+    """
+
+    def __init__(self, events_dir: str, simulation_id: str):
+        """
+        Initialize the log.
+
+        Args:
+            events_dir: Directory holding event logs
+            simulation_id: Simulation ID
+        """
+        directory = Path(events_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / f"{simulation_id}.jsonl"
+        self.progress_path = directory / f"{simulation_id}.progress.json"
+        self.lock_path = directory / f"{simulation_id}.lock"
+        self.simulation_id = simulation_id
+        self._next_seq: Optional[int] = None
+        # Log size after this writer's last append
+        self._size: Optional[int] = None
+
+    def _count_events(self) -> int:
+        """Count events already in the log."""
+        if not self.path.exists():
+            return 0
+        with open(self.path, 'rb') as f:
+            return sum(1 for _ in f)
+
+    def append(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append an event.
+
+        Args:
+            event_type: Event type
+            data: Event payload
+
+        Returns:
+            The written event
+        """
+        with file_lock(self.lock_path):
+            size = self.path.stat().st_size if self.path.exists() else 0
+            if self._next_seq is None or size != self._size:
+                self._next_seq = self._count_events()
+
+            event = {
+                "seq": self._next_seq,
+                "type": event_type,
+                "timestamp": datetime.utcnow().isoformat(),
+                "data": data,
+            }
+            with open(self.path, 'ab') as f:
+                f.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                self._size = f.tell()
+        self._next_seq += 1
+        return event
+
+    def write_progress(self, current_step: int, total_steps: int):
+        """
+        Record step progress for status polling.
+
+        Args:
+            current_step: Number of completed steps
+            total_steps: Total number of steps
+        """
+        progress = {"current_step": current_step, "total_steps": total_steps}
+        atomic_write(self.progress_path, json.dumps(progress).encode("utf-8"))
+
+    def read_progress(self) -> Optional[Dict[str, int]]:
+        """
+        Read the last recorded step progress.
+
+        Returns:
+            Dict with current_step and total_steps, or None if not started
+        """
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _cancel_path(self, run_id: str) -> Path:
+        """Get the path of a run's cancel marker."""
+        return self.path.with_name(f"{self.simulation_id}.{run_id}.cancel")
+
+    def request_cancel(self, run_id: str):
+        """
+        Ask a run to stop before its next step.
+
+        Args:
+            run_id: ID of the run to stop
+        """
+        self._cancel_path(run_id).touch()
+
+    def cancel_requested(self, run_id: str) -> bool:
+        """Check whether a run was asked to stop."""
+        return self._cancel_path(run_id).exists()
+
+    def clear_cancel(self, run_id: str):
+        """Remove a run's cancel marker once the run has stopped."""
+        self._cancel_path(run_id).unlink(missing_ok=True)
+
+    def delete(self):
+        """Remove the log, progress and cancel marker files."""
+        self.path.unlink(missing_ok=True)
+        self.progress_path.unlink(missing_ok=True)
+        self.lock_path.unlink(missing_ok=True)
+        for marker in self.path.parent.glob(f"{self.simulation_id}.*.cancel"):
+            marker.unlink(missing_ok=True)
+
+
+class _Channel:
+    """Tail of one simulation's event log shared by all its subscribers."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.events: List[Dict[str, Any]] = []
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.finished = False
+        self.offset = 0
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def read_new_events(self) -> List[Dict[str, Any]]:
+        """Read complete lines appended since the last call."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return []
+
+        # Leave a partially written trailing line for the next read
+        end = chunk.rfind(b"\n") + 1
+        self.offset += end
+        return [json.loads(line) for line in chunk[:end].splitlines() if line]
+
+
+class SimulationEventBroker:
+    """
+    Fans simulation events out to stream subscribers.
+
+    Each simulation with at least one subscriber gets a single task tailing
+    its event log, so the cost per event is one read regardless of how many
+    clients are listening.
+    """
+
+    def __init__(self, events_dir: str, poll_interval: float = 0.25):
+        """
+        Initialize the broker.
+
+        Args:
+            events_dir: Directory holding event logs
+            poll_interval: Seconds between reads of an active log
+        """
+        self.events_dir = events_dir
+        self.poll_interval = poll_interval
+        self._channels: Dict[str, _Channel] = {}
+
+    def _get_channel(self, simulation_id: str) -> _Channel:
+        """Get or start the channel for a simulation."""
+        channel = self._channels.get(simulation_id)
+        if channel is None:
+            channel = _Channel(Path(self.events_dir) / f"{simulation_id}.jsonl")
+            channel.task = asyncio.create_task(self._tail(channel))
+            self._channels[simulation_id] = channel
+        return channel
+
+    async def _tail(self, channel: _Channel):
+        """Read new events from a log and hand them to subscribers."""
+        while True:
+            for event in channel.read_new_events():
+                channel.events.append(event)
+                for queue in channel.subscribers:
+                    queue.put_nowait(event)
+                if event["type"] == STATUS_EVENT:
+                    # A failed run may be resumed later, so only the latest status counts
+                    channel.finished = event["data"].get("status") in TERMINAL_STATUSES
+            channel.ready.set()
+
+            if channel.finished:
+                for queue in channel.subscribers:
+                    queue.put_nowait(None)
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def subscribe(
+        self,
+        simulation_id: str,
+        since: int = -1,
+        idle_timeout: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Stream a simulation's events, replaying those after ``since`` first.
+
+        The stream ends after the run's terminal status event.
+
+        Args:
+            simulation_id: Simulation ID
+            since: Last sequence number the client already has
+            idle_timeout: Yield None after this many idle seconds (for keepalives)
+
+        Yields:
+            Events in sequence order, or None on idle timeout
+        """
+        channel = self._get_channel(simulation_id)
+        queue: asyncio.Queue = asyncio.Queue()
+        channel.subscribers.add(queue)
+        try:
+            await channel.ready.wait()
+            last_seq = since
+            for event in list(channel.events):
+                if event["seq"] > last_seq:
+                    last_seq = event["seq"]
+                    yield event
+            if channel.finished:
+                return
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=idle_timeout)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    return
+                if event["seq"] > last_seq:
+                    last_seq = event["seq"]
+                    yield event
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers and self._channels.get(simulation_id) is channel:
+                channel.task.cancel()
+                del self._channels[simulation_id]
@@ -0,0 +1,306 @@
+"""Bounded process pool that runs queued simulations off the event loop."""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.job_queue import Job, JobQueue, JobAlreadyActiveError
+from app.services.simulation_worker import warm_up_worker, worker_status
+
+RecoveryHandler = Callable[[List[str], List[str]], Any]
+
+
+class SimulationQueueFullError(Exception):
+    """Raised when the overflow queue has no room for another simulation."""
+
+
+class SimulationAlreadyScheduledError(Exception):
+    """Raised when a simulation is already queued or running."""
+
+
+class SimulationRunner:
+    """
+    Schedules simulations onto a fixed-size process pool.
+
+    Starts are written to a durable :class:`JobQueue`; at most
+    ``max_workers`` dispatchers lease jobs from it and run them in worker
+    processes, so the API event loop stays responsive. Leases are renewed
+    by a heartbeat while a simulation runs, and expired leases are handed
+    back to the queue (or failed) by periodic recovery.
+
+    With ``prewarm`` every worker process imports TinyTroupe when it boots,
+    and all workers are started with the pool rather than on first use.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue_size: int,
+        job_queue: JobQueue,
+        lease_seconds: float = 60.0,
+        heartbeat_seconds: float = 15.0,
+        poll_interval: float = 1.0,
+        max_attempts: int = 3,
+        prewarm: bool = True
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            max_workers: Maximum number of simulations running concurrently
+            max_queue_size: Maximum number of simulations waiting to run
+            job_queue: Durable job store
+            lease_seconds: Lease duration for a claimed job
+            heartbeat_seconds: Interval between lease renewals
+            poll_interval: Seconds between queue polls when idle
+            max_attempts: Times a job may be leased before it is failed
+            prewarm: Start workers up front with TinyTroupe preloaded
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.jobs = job_queue
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.prewarm = prewarm
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running: Set[str] = set()
+        self._recovery_handler: Optional[RecoveryHandler] = None
+
+    async def start(
+        self,
+        handler: Callable[[str], Awaitable[Any]],
+        recovery_handler: Optional[RecoveryHandler] = None
+    ):
+        """
+        Start the process pool and the dispatchers feeding it.
+
+        Args:
+            handler: Coroutine run for each leased simulation ID
+            recovery_handler: Called with (re-queued, failed) simulation IDs
+                whenever orphaned jobs are recovered. Re-queued IDs are
+                reported on their own, before any worker can claim the jobs
+        """
+        self._recovery_handler = recovery_handler
+        self.recover()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_up_worker if self.prewarm else None
+        )
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._dispatch(handler))
+            for _ in range(self.max_workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._recover_periodically()))
+        if self.prewarm:
+            self._tasks.append(asyncio.create_task(self._warm_up()))
+
+    async def shutdown(self):
+        """
+        Stop dispatching and shut the process pool down.
+
+        Running simulations are stopped before their next step, and their
+        jobs are left for recovery on the next start, which re-queues them
+        immediately because their owner is gone.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def submit(self, simulation_id: str):
+        """
+        Queue a simulation for execution.
+
+        Safe to call from threads other than the event loop's.
+
+        Args:
+            simulation_id: Simulation ID
+
+        Raises:
+            SimulationAlreadyScheduledError: If the simulation is queued or running
+            SimulationQueueFullError: If the overflow queue is full
+        """
+        try:
+            job_id = self.jobs.enqueue(simulation_id, max_queued=self.max_queue_size)
+        except JobAlreadyActiveError as e:
+            raise SimulationAlreadyScheduledError(str(e))
+        if job_id is None:
+            raise SimulationQueueFullError(
+                f"Simulation queue is full ({self.max_queue_size} waiting)"
+            )
+        self._wake()
+
+    def _wake(self):
+        """Wake idle dispatchers, from the event loop or any other thread."""
+        if self._wakeup is None:
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is self._loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def is_scheduled(self, simulation_id: str) -> bool:
+        """Check whether a simulation is queued or running."""
+        return self.jobs.is_active(simulation_id)
+
+    def recover(self) -> Tuple[List[str], List[str]]:
+        """
+        Hand orphaned jobs back to the queue, or fail them.
+
+        Returns:
+            Tuple of (re-queued simulation IDs, failed simulation IDs)
+        """
+        requeued, failed = self.jobs.recover(self.max_attempts, on_requeue=self._reset_requeued)
+        self._apply_recovery(requeued, failed)
+        return requeued, failed
+
+    def _reset_requeued(self, requeued: List[str]):
+        """Report re-queued jobs while the queue still holds them back."""
+        if self._recovery_handler is not None:
+            self._recovery_handler(requeued, [])
+
+    def _apply_recovery(self, requeued: List[str], failed: List[str]):
+        """Report failed jobs and wake dispatchers for re-queued ones."""
+        if failed and self._recovery_handler is not None:
+            self._recovery_handler([], failed)
+        if requeued:
+            self._wake()
+
+    async def run_in_pool(self, fn: Callable, *args) -> Any:
+        """
+        Run a picklable function in a worker process.
+
+        Args:
+            fn: Module-level function to call
+            *args: Picklable arguments
+
+        Returns:
+            The function's return value
+        """
+        if self._pool is None:
+            raise RuntimeError("Simulation runner is not started")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
+
+    async def _warm_up(self):
+        """Boot every worker process now and report how long preloading took."""
+        # The pool spawns a new process per task while none is idle
+        loop = asyncio.get_running_loop()
+        statuses = await asyncio.gather(
+            *(loop.run_in_executor(self._pool, worker_status) for _ in range(self.max_workers)),
+            return_exceptions=True
+        )
+        for status in {s["pid"]: s for s in statuses if isinstance(s, dict)}.values():
+            if status.get("error"):
+                print(f"✗ Simulation worker {status['pid']} could not preload TinyTroupe: {status['error']}")
+            else:
+                print(f"✓ Simulation worker {status['pid']} preloaded TinyTroupe in {status['seconds']:.2f}s")
+
+    async def _next_job(self) -> Job:
+        """Wait until a job can be leased."""
+        while True:
+            # Clear before claiming so a submit during the claim is not missed
+            self._wakeup.clear()
+            job = await asyncio.to_thread(self.jobs.claim, self.lease_seconds)
+            if job is not None:
+                return job
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _heartbeat(self, job: Job):
+        """Keep renewing a job's lease until cancelled, returning once it is lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                if not await asyncio.to_thread(self.jobs.heartbeat, job, self.lease_seconds):
+                    print(f"✗ Lost lease on job {job.id} for simulation {job.simulation_id}")
+                    return
+            except Exception as e:
+                # The lease may still be valid; try again on the next beat
+                print(f"Error renewing lease on job {job.id}: {e}")
+
+    async def _dispatch(self, handler: Callable[[str], Awaitable[Any]]):
+        """Lease jobs and run them one at a time."""
+        while True:
+            job = await self._next_job()
+            self._running.add(job.simulation_id)
+            run = asyncio.create_task(handler(job.simulation_id))
+            heartbeat = asyncio.create_task(self._heartbeat(job))
+            try:
+                await asyncio.wait({run, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+                if not run.done():
+                    # Recovery re-queued the job, so the next attempt owns the
+                    # simulation: cancel the run without recording an outcome.
+                    # The handler returns once its worker has stopped, so
+                    # this dispatcher only takes another job after that
+                    run.cancel()
+                    await asyncio.gather(run, return_exceptions=True)
+                    continue
+                run.result()
+                await asyncio.to_thread(self.jobs.complete, job)
+            except Exception as e:
+                print(f"Error running simulation {job.simulation_id}: {e}")
+                await asyncio.to_thread(self.jobs.fail, job, str(e))
+            finally:
+                run.cancel()
+                heartbeat.cancel()
+                self._running.discard(job.simulation_id)
+
+    async def _recover_periodically(self):
+        """Recover expired leases left behind by other processes."""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                requeued, failed = await asyncio.to_thread(
+                    self.jobs.recover, self.max_attempts, self._reset_requeued
+                )
+                self._apply_recovery(requeued, failed)
+            except Exception as e:
+                print(f"Error recovering simulation jobs: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report pool utilisation.
+
+        Returns:
+            Worker count, running and queued simulations, and queue capacity
+        """
+        depth = self.jobs.depth()
+        return {
+            "max_workers": self.max_workers,
+            "running": depth["leased"],
+            "queued": depth["queued"],
+            "queue_capacity": self.max_queue_size,
+        }
+
+
+# Global instance
+simulation_runner = SimulationRunner(
+    max_workers=settings.simulation_max_workers,
+    max_queue_size=settings.simulation_queue_size,
+    job_queue=JobQueue(settings.job_queue_path),
+    lease_seconds=settings.job_lease_seconds,
+    heartbeat_seconds=settings.job_heartbeat_seconds,
+    max_attempts=settings.job_max_attempts,
+    prewarm=settings.simulation_worker_prewarm
+)
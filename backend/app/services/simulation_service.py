@@ -1,50 +1,93 @@
 """Service layer for simulation management with TinyTroupe integration."""
 
-import os
-import json
 import uuid
-from datetime import datetime
-from typing import List, Optional, Dict, Any
-from pathlib import Path
 import asyncio
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Any, Tuple
 
 from app.core.config import settings
+from app.core.metrics import InstrumentedRepository, record_simulation_run
 from app.models.simulation import (
     SimulationCreate,
+    SimulationForkRequest,
     SimulationResponse,
     SimulationStatus,
-    SimulationResult,
-    InteractionMessage
+    SimulationSummary
 )
+from app.services.checkpoints import CheckpointStore
+from app.services.interaction_store import InteractionStore
+from app.services.llm_cache import llm_cache
+from app.services.simulation_events import SimulationEventBroker, SimulationEventLog, STATUS_EVENT
+from app.services.simulation_runner import simulation_runner
+from app.services.simulation_worker import execute_tinytroupe_simulation
+from app.services.transcript_index import TranscriptIndex
+from app.storage import SimulationRepository, get_simulation_repository
+from app.storage.cursor import decode_cursor, encode_cursor
+
+
+class SimulationStatusConflictError(Exception):
+    """Raised when a simulation is not in the status an operation requires."""
 
 
 class SimulationService:
     """Service for managing TinyTroupe simulations."""
 
-    def __init__(self):
-        """Initialize the simulation service."""
-        self.simulations_dir = Path(settings.simulations_dir)
-        self.simulations_dir.mkdir(parents=True, exist_ok=True)
-        self.active_simulations: Dict[str, Any] = {}
+    def __init__(self, repository: Optional[SimulationRepository] = None):
+        """
+        Initialize the simulation service.
 
-    def _get_simulation_file_path(self, simulation_id: str) -> Path:
-        """Get the file path for a simulation."""
-        return self.simulations_dir / f"{simulation_id}.json"
+        Args:
+            repository: Storage backend, defaults to the configured one
+        """
+        self.repository = repository or InstrumentedRepository(
+            get_simulation_repository(), "simulations", SimulationRepository.__abstractmethods__
+        )
+        self.events = SimulationEventBroker(settings.events_dir)
+        self.checkpoints = CheckpointStore(settings.checkpoints_dir, settings.checkpoint_keep)
+        self.transcripts = TranscriptIndex(settings.search_index_path)
+        self.interaction_store = InteractionStore(settings.interaction_store_dir)
+        # Called with the ID of every simulation that finishes or fails
+        self.completion_handlers: List[Callable[[str], Any]] = []
+
+    def _event_log(self, simulation_id: str) -> SimulationEventLog:
+        """Get the event log of a simulation."""
+        return SimulationEventLog(settings.events_dir, simulation_id)
+
+    def _publish_status(self, simulation_data: Dict[str, Any], resume_step: Optional[int] = None):
+        """
+        Append a status event reflecting the stored simulation state.
 
-    def _load_simulation_from_file(self, simulation_id: str) -> Optional[Dict[str, Any]]:
-        """Load simulation data from file."""
-        file_path = self._get_simulation_file_path(simulation_id)
-        if not file_path.exists():
-            return None
+        Args:
+            simulation_data: Simulation data, or at least its ID and changed fields
+            resume_step: Checkpointed step a starting run continues after, if any
+        """
+        self._event_log(simulation_data["id"]).append(STATUS_EVENT, {
+            "status": SimulationStatus(simulation_data["status"]).value,
+            "started_at": simulation_data.get("started_at"),
+            "completed_at": simulation_data.get("completed_at"),
+            "error": simulation_data.get("error"),
+            "resume_step": resume_step,
+        })
+
+    def _notify_finished(self, simulation_id: str):
+        """Run the completion handlers for a finished simulation."""
+        for handler in self.completion_handlers:
+            try:
+                handler(simulation_id)
+            except Exception as e:
+                print(f"Error handling completion of simulation {simulation_id}: {e}")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    def get_progress(self, simulation_id: str) -> Optional[Dict[str, int]]:
+        """
+        Get step progress of a running simulation.
 
-    def _save_simulation_to_file(self, simulation_id: str, simulation_data: Dict[str, Any]):
-        """Save simulation data to file."""
-        file_path = self._get_simulation_file_path(simulation_id)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(simulation_data, f, indent=2, ensure_ascii=False)
+        Args:
+            simulation_id: Simulation ID
+
+        Returns:
+            Dict with current_step and total_steps, or None if no step ran yet
+        """
+        return self._event_log(simulation_id).read_progress()
 
     def create_simulation(self, simulation_create: SimulationCreate) -> SimulationResponse:
         """
@@ -72,7 +115,67 @@ class SimulationService:
             "error": None
         }
 
-        self._save_simulation_to_file(simulation_id, simulation_data)
+        self.repository.save(simulation_data)
+
+        return SimulationResponse(**simulation_data)
+
+    def fork_simulation(
+        self,
+        simulation_id: str,
+        step: int,
+        fork_request: SimulationForkRequest
+    ) -> Optional[SimulationResponse]:
+        """
+        Create a simulation that continues another one from a checkpointed step.
+
+        The fork shares the parent's checkpoint for ``step`` instead of
+        copying it, so starting the fork only runs the steps after it.
+
+        Args:
+            simulation_id: Parent simulation ID
+            step: Last parent step the fork shares
+            fork_request: Changes to the prompt, agents, steps and name
+
+        Returns:
+            Created simulation response or None if the parent is not found
+
+        Raises:
+            ValueError: If the parent has no checkpoint for the step, or the
+                fork would not run any further steps
+        """
+        parent = self.repository.get(simulation_id)
+        if not parent:
+            return None
+
+        available = self.checkpoints.steps(simulation_id)
+        if step not in available:
+            raise ValueError(
+                f"Simulation has no checkpoint for step {step} "
+                f"(checkpointed steps: {', '.join(map(str, available)) or 'none'})"
+            )
+
+        config = dict(parent["config"])
+        if fork_request.steps is not None:
+            config["steps"] = fork_request.steps
+        if config["steps"] <= step:
+            raise ValueError(f"Fork needs more than {step} steps to run, got {config['steps']}")
+
+        simulation_data = {
+            "id": str(uuid.uuid4()),
+            "name": fork_request.name or f"{parent['name']} (fork at step {step})",
+            "agent_ids": fork_request.agent_ids or parent["agent_ids"],
+            "config": config,
+            "status": SimulationStatus.PENDING,
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "completed_at": None,
+            "result": None,
+            "error": None,
+            "fork": {"parent_id": simulation_id, "step": step, "prompt": fork_request.prompt},
+        }
+
+        self.checkpoints.link(simulation_id, step, simulation_data["id"])
+        self.repository.save(simulation_data)
 
         return SimulationResponse(**simulation_data)
 
@@ -86,32 +189,98 @@ class SimulationService:
         Returns:
             Simulation response or None if not found
         """
-        simulation_data = self._load_simulation_from_file(simulation_id)
+        simulation_data = self.repository.get(simulation_id)
         if not simulation_data:
             return None
 
         return SimulationResponse(**simulation_data)
 
-    def list_simulations(self) -> List[SimulationResponse]:
+    def list_simulations(
+        self,
+        statuses: Optional[List[SimulationStatus]] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[SimulationSummary], int, Optional[str]]:
         """
-        List all simulations.
+        List simulation summaries, newest first, one page at a time.
+
+        Reads only the summary index, never result payloads.
+
+        Args:
+            statuses: Only include simulations with one of these statuses
+            created_after: Only include simulations created at or after this ISO timestamp
+            created_before: Only include simulations created before this ISO timestamp
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of summaries to return
 
         Returns:
-            List of simulation responses
+            Tuple of (page of summaries, total matching count, next cursor or None)
         """
-        simulations = []
-        for simulation_file in self.simulations_dir.glob("*.json"):
-            try:
-                with open(simulation_file, 'r', encoding='utf-8') as f:
-                    simulation_data = json.load(f)
-                    simulations.append(SimulationResponse(**simulation_data))
-            except Exception as e:
-                print(f"Error loading simulation from {simulation_file}: {e}")
-                continue
+        after_key = decode_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to learn whether another page exists
+        page, total = self.repository.list_summaries(
+            statuses=statuses,
+            created_after=created_after,
+            created_before=created_before,
+            after_key=after_key,
+            limit=limit + 1
+        )
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+        return page, total, next_cursor
+
+    def iter_simulation_ids(self, statuses: Optional[List[SimulationStatus]] = None) -> Iterator[str]:
+        """
+        Iterate over the IDs of all simulations, newest first.
+
+        Args:
+            statuses: Only include simulations with these statuses
+
+        Yields:
+            Simulation IDs, read a page of summaries at a time
+        """
+        cursor_key = None
+        while True:
+            page, _ = self.repository.list_summaries(statuses=statuses, after_key=cursor_key, limit=200)
+            if not page:
+                return
+            for summary in page:
+                yield summary.id
+            cursor_key = (page[-1].created_at, page[-1].id)
+
+    def iter_export_rows(
+        self,
+        simulation_ids: Iterable[str],
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read the interactions of simulations as flat export rows.
 
-        # Sort by created_at descending
-        simulations.sort(key=lambda x: x.created_at, reverse=True)
-        return simulations
+        Only one batch is held in memory at a time (the file backend reads
+        one simulation file at a time).
+
+        Args:
+            simulation_ids: Simulations to export, in order
+            batch_size: Maximum rows per batch
+
+        Yields:
+            Lists of interactions tagged with simulation ID and sequence number
+        """
+        for simulation_id in simulation_ids:
+            seq = 0
+            for batch in self.repository.iter_interactions(simulation_id, batch_size):
+                rows = []
+                for interaction in batch:
+                    rows.append({"simulation_id": simulation_id, "seq": seq, **interaction})
+                    seq += 1
+                yield rows
 
     def delete_simulation(self, simulation_id: str) -> bool:
         """
@@ -123,113 +292,436 @@ class SimulationService:
         Returns:
             True if deleted, False if not found
         """
-        file_path = self._get_simulation_file_path(simulation_id)
-        if not file_path.exists():
-            return False
+        deleted = self.repository.delete(simulation_id)
+        if deleted:
+            self._event_log(simulation_id).delete()
+            self.checkpoints.delete(simulation_id)
+            self.transcripts.remove(simulation_id)
+            self.interaction_store.remove(simulation_id)
+        return deleted
+
+    def _index_transcript(self, simulation_id: str, interactions: List[Dict[str, Any]], completed_at: str):
+        """Add a finished transcript to the search index, leaving failures to sync_transcript_index."""
+        try:
+            self.transcripts.index(simulation_id, [interactions], completed_at)
+        except Exception as e:
+            print(f"✗ Failed to index transcript of simulation {simulation_id}: {e}")
 
-        file_path.unlink()
-        return True
+    def _store_interactions(self, simulation_id: str, interactions: List[Dict[str, Any]], completed_at: str):
+        """Add a finished transcript to the columnar store, leaving failures to sync_interaction_store."""
+        try:
+            self.interaction_store.write(simulation_id, [interactions], completed_at)
+        except Exception as e:
+            print(f"✗ Failed to store interactions of simulation {simulation_id}: {e}")
+
+    def _completion_times(self) -> Dict[str, Optional[str]]:
+        """Get the completion time of every completed simulation."""
+        completed: Dict[str, Optional[str]] = {}
+        after_key = None
+        while True:
+            page, _ = self.repository.list_summaries(
+                statuses=[SimulationStatus.COMPLETED], after_key=after_key, limit=200
+            )
+            if not page:
+                break
+            for summary in page:
+                completed[summary.id] = summary.completed_at
+            after_key = (page[-1].created_at, page[-1].id)
+        return completed
+
+    def sync_transcript_index(self) -> int:
+        """
+        Bring the transcript search index up to date with storage.
 
-    async def run_simulation(self, simulation_id: str):
+        Completed simulations that are missing from the index, or were
+        indexed at a different completion time, are (re)indexed; entries of
+        simulations that were deleted are dropped.
+
+        Returns:
+            Number of simulations indexed
+        """
+        indexed = self.transcripts.indexed()
+        completed = self._completion_times()
+
+        for simulation_id in indexed.keys() - completed.keys():
+            self.transcripts.remove(simulation_id)
+
+        stale = [
+            simulation_id for simulation_id, completed_at in completed.items()
+            if simulation_id not in indexed or indexed[simulation_id] != completed_at
+        ]
+        for simulation_id in stale:
+            self.transcripts.index(
+                simulation_id, self.repository.iter_interactions(simulation_id), completed[simulation_id]
+            )
+        return len(stale)
+
+    def sync_interaction_store(self) -> int:
+        """
+        Bring the columnar interaction store up to date with storage.
+
+        Completed simulations that are missing from the store, or were
+        stored at a different completion time, are (re)written; files of
+        simulations that were deleted are removed.
+
+        Returns:
+            Number of simulations written
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        stored = self.interaction_store.stored()
+        completed = self._completion_times()
+
+        for simulation_id in stored.keys() - completed.keys():
+            self.interaction_store.remove(simulation_id)
+
+        stale = [
+            simulation_id for simulation_id, completed_at in completed.items()
+            if simulation_id not in stored or stored[simulation_id] != completed_at
+        ]
+        for simulation_id in stale:
+            self.interaction_store.write(
+                simulation_id, self.repository.iter_interactions(simulation_id), completed[simulation_id]
+            )
+        return len(stale)
+
+    def aggregate_interactions(
+        self,
+        group_by: List[str],
+        bucket: str = "hour",
+        bucket_size: int = 1,
+        simulation_ids: Optional[List[str]] = None,
+        agent_ids: Optional[List[str]] = None,
+        message_types: Optional[List[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 1000
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any], int]:
         """
-        Run a simulation asynchronously.
+        Aggregate the interactions of completed simulations.
 
         Args:
-            simulation_id: Simulation ID
+            group_by: Dimensions (simulation, agent, message_type, step, time)
+            bucket: Unit of time buckets when grouping by time
+            bucket_size: Number of units per time bucket
+            simulation_ids: Only include these simulations
+            agent_ids: Only include messages of these agents
+            message_types: Only include these message types
+            since: Only include messages at or after this time
+            until: Only include messages before this time
+            limit: Maximum number of groups to return
+
+        Returns:
+            Tuple of (groups, with simulation names when grouped by
+            simulation, totals over all matching messages, number of groups)
+
+        Raises:
+            ValueError: If a dimension or bucket unit is unknown
+            ImportError: If pyarrow is not installed
         """
-        simulation_data = self._load_simulation_from_file(simulation_id)
-        if not simulation_data:
-            raise ValueError(f"Simulation {simulation_id} not found")
+        groups, totals, count = self.interaction_store.aggregate(
+            group_by, bucket, bucket_size, simulation_ids, agent_ids, message_types, since, until, limit
+        )
+        if "simulation" in group_by:
+            names: Dict[str, Optional[str]] = {}
+            for group in groups:
+                simulation_id = group["simulation_id"]
+                if simulation_id not in names:
+                    summary = self.repository.get_summary(simulation_id)
+                    names[simulation_id] = summary.name if summary else None
+                group["simulation_name"] = names[simulation_id]
+        return groups, totals, count
+
+    def search_transcripts(
+        self,
+        query: str,
+        simulation_ids: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        Search the transcripts of completed simulations.
 
-        # Update status to running
-        simulation_data["status"] = SimulationStatus.RUNNING
-        simulation_data["started_at"] = datetime.utcnow().isoformat()
-        self._save_simulation_to_file(simulation_id, simulation_data)
+        Args:
+            query: FTS5 query, or plain words
+            simulation_ids: Only search these simulations
+            limit: Maximum hits to return
+            offset: Hits to skip
 
-        try:
-            # This is where we'll integrate with TinyTroupe
-            # For now, create a placeholder result
-            result = await self._execute_tinytroupe_simulation(simulation_data)
+        Returns:
+            Tuple of (page of hits with simulation names, total hits, matching simulations)
 
-            # Update with result
-            simulation_data["status"] = SimulationStatus.COMPLETED
-            simulation_data["completed_at"] = datetime.utcnow().isoformat()
-            simulation_data["result"] = result
-            simulation_data["error"] = None
+        Raises:
+            ValueError: If the query is invalid
+        """
+        hits, total, simulations = self.transcripts.search(query, simulation_ids, limit, offset)
+        names: Dict[str, Optional[str]] = {}
+        for hit in hits:
+            simulation_id = hit["simulation_id"]
+            if simulation_id not in names:
+                summary = self.repository.get_summary(simulation_id)
+                names[simulation_id] = summary.name if summary else None
+            hit["simulation_name"] = names[simulation_id]
+        return hits, total, simulations
+
+    def start_simulation(self, simulation_id: str):
+        """
+        Queue a pending simulation for execution.
 
-        except Exception as e:
-            # Handle error
-            simulation_data["status"] = SimulationStatus.FAILED
-            simulation_data["completed_at"] = datetime.utcnow().isoformat()
-            simulation_data["error"] = str(e)
+        Args:
+            simulation_id: Simulation ID
 
-        finally:
-            self._save_simulation_to_file(simulation_id, simulation_data)
-            if simulation_id in self.active_simulations:
-                del self.active_simulations[simulation_id]
+        Raises:
+            SimulationStatusConflictError: If the simulation is no longer pending
+            SimulationAlreadyScheduledError: If the simulation is queued or running
+            SimulationQueueFullError: If the overflow queue is full
+        """
+        summary = self.repository.get_summary(simulation_id)
+        if summary and summary.status != SimulationStatus.PENDING:
+            raise SimulationStatusConflictError(f"Simulation is already {summary.status.value}")
+        # A duplicate job that slips past this check is skipped by run_simulation
+        simulation_runner.submit(simulation_id)
 
-    async def _execute_tinytroupe_simulation(self, simulation_data: Dict[str, Any]) -> Dict[str, Any]:
+    def resume_simulation(self, simulation_id: str) -> bool:
         """
-        Execute the actual TinyTroupe simulation.
+        Queue a failed simulation to continue from its last checkpoint.
+
+        Simulations without a checkpoint start over from the first step.
 
         Args:
-            simulation_data: Simulation configuration data
+            simulation_id: Simulation ID
 
         Returns:
-            Simulation results
+            True if queued, False if not found
+
+        Raises:
+            SimulationStatusConflictError: If the simulation is no longer failed
+            SimulationAlreadyScheduledError: If the simulation is queued or running
+            SimulationQueueFullError: If the overflow queue is full
         """
-        # Import TinyTroupe components
+        summary = self.repository.get_summary(simulation_id)
+        if not summary:
+            return False
+
+        # Claim the simulation first, so only one API worker can resume it
+        reset = {"status": SimulationStatus.PENDING, "started_at": None, "completed_at": None, "error": None}
+        if not self.repository.transition(simulation_id, [SimulationStatus.FAILED], reset):
+            raise SimulationStatusConflictError("Only failed simulations can be resumed")
         try:
-            import sys
-            tinytroupe_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "TinyTroupe")
-            if tinytroupe_path not in sys.path:
-                sys.path.insert(0, tinytroupe_path)
+            simulation_runner.submit(simulation_id)
+        except Exception:
+            self.repository.transition(simulation_id, [SimulationStatus.PENDING], {
+                "status": SimulationStatus.FAILED,
+                "completed_at": summary.completed_at,
+                "error": summary.error,
+            })
+            raise
+        self._publish_status({"id": simulation_id, **reset})
+        return True
+
+    def _checkpoint_options(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Build the worker's checkpoint options for a simulation.
+
+        A run continues from the simulation's latest checkpoint, so resumed
+        and re-queued simulations skip the steps they already completed.
+
+        Args:
+            simulation_id: Simulation ID
+
+        Returns:
+            Checkpoint options, or None if checkpointing is disabled
+        """
+        latest = self.checkpoints.latest(simulation_id)
+        if not settings.checkpoint_interval and latest is None:
+            return None
+        return {
+            "dir": settings.checkpoints_dir,
+            "interval": settings.checkpoint_interval,
+            "keep": settings.checkpoint_keep,
+            "resume_step": latest,
+        }
+
+    async def run_simulation(self, simulation_id: str):
+        """
+        Run a simulation in the worker pool.
 
-            from tinytroupe.agent import TinyPerson
-            from tinytroupe.environment import TinyWorld
+        If this task is cancelled (a lost lease or shutdown), the worker is
+        asked to stop before its next step and the task only ends once it
+        has, so the pool slot is free for the next job. The simulation is
+        left running for recovery to re-queue.
+
+        Args:
+            simulation_id: Simulation ID
+        """
+        # Compare-and-set from pending only, so a job whose simulation is
+        # running or finished elsewhere is skipped instead of run twice.
+        # Recovery resets a re-queued job's simulation to pending before any
+        # worker can claim it again
+        started = {
+            "status": SimulationStatus.RUNNING,
+            "started_at": datetime.utcnow().isoformat(),
+            "completed_at": None,
+            "error": None,
+        }
+        if not self.repository.transition(simulation_id, [SimulationStatus.PENDING], started):
+            if not self.repository.get_summary(simulation_id):
+                raise ValueError(f"Simulation {simulation_id} not found")
+            print(f"Skipping simulation {simulation_id}: it is no longer pending")
+            return
+        simulation_data = self.repository.get(simulation_id)
+        checkpoint_options = self._checkpoint_options(simulation_id)
+        # Lets live views keep the interactions up to the checkpoint
+        self._publish_status(simulation_data, (checkpoint_options or {}).get("resume_step"))
+
+        outcome = None
+        try:
             from app.services.agent_service import agent_service
 
-            # Load agents
-            agents = []
+            # Resolve agents here so workers only receive plain data
+            agents_data = []
             for agent_id in simulation_data["agent_ids"]:
                 agent = agent_service.get_agent(agent_id)
                 if not agent:
                     raise ValueError(f"Agent {agent_id} not found")
+                agents_data.append(agent.model_dump())
+
+            run_id = uuid.uuid4().hex
+            run = asyncio.ensure_future(simulation_runner.run_in_pool(
+                execute_tinytroupe_simulation,
+                simulation_data,
+                agents_data,
+                settings.events_dir,
+                self._llm_cache_options(simulation_data),
+                settings.simulation_action_fanout,
+                checkpoint_options,
+                run_id
+            ))
+            try:
+                result = await asyncio.shield(run)
+            except asyncio.CancelledError:
+                # Cancelling this task does not stop the worker process: ask
+                # it to stop before its next step, and hold the pool slot
+                # until it has
+                events = self._event_log(simulation_id)
+                await asyncio.to_thread(events.request_cancel, run_id)
+                await asyncio.wait({run})
+                raise
+            finally:
+                if run.done():
+                    await asyncio.to_thread(self._event_log(simulation_id).clear_cancel, run_id)
+
+            record_simulation_run(SimulationStatus.COMPLETED.value, result)
+            result.pop("step_seconds", None)
+            result.pop("persona_cache", None)
+
+            outcome = {
+                "status": SimulationStatus.COMPLETED,
+                "completed_at": datetime.utcnow().isoformat(),
+                "result": result,
+                "error": None,
+            }
 
-                # Create TinyPerson from agent data
-                # Note: This is simplified - actual implementation needs proper TinyPerson creation
-                tiny_person = TinyPerson(agent.persona.name)
-                # TODO: Properly configure TinyPerson from persona data
-                agents.append(tiny_person)
-
-            # Create TinyWorld
-            world_name = simulation_data["name"]
-            world = TinyWorld(world_name, agents)
-            world.make_everyone_accessible()
-
-            # Give initial prompt to first agent
-            config = simulation_data["config"]
-            if agents:
-                agents[0].listen(config["initial_prompt"])
-
-            # Run simulation
-            steps = config["steps"]
-            world.run(steps)
-
-            # Extract results
-            # TODO: Properly extract and format interaction results
-            interactions = []
-            result = {
-                "interactions": interactions,
-                "summary": f"Simulation completed with {steps} steps",
-                "extracted_data": {}
+        except Exception as e:
+            record_simulation_run(SimulationStatus.FAILED.value, {})
+            outcome = {
+                "status": SimulationStatus.FAILED,
+                "completed_at": datetime.utcnow().isoformat(),
+                "error": str(e),
             }
 
-            return result
+        finally:
+            # Left running if cancelled by shutdown or a lost lease; recovery re-queues it
+            if outcome is not None:
+                if self.repository.transition(simulation_id, [SimulationStatus.RUNNING], outcome):
+                    if outcome["status"] == SimulationStatus.COMPLETED:
+                        await asyncio.to_thread(
+                            self._index_transcript,
+                            simulation_id, outcome["result"]["interactions"], outcome["completed_at"]
+                        )
+                        await asyncio.to_thread(
+                            self._store_interactions,
+                            simulation_id, outcome["result"]["interactions"], outcome["completed_at"]
+                        )
+                    self._publish_status({**simulation_data, **outcome})
+                    # Sweep handlers read and write catalog files
+                    await asyncio.to_thread(self._notify_finished, simulation_id)
+                else:
+                    print(f"✗ Discarded outcome of simulation {simulation_id}: "
+                          "it was changed or deleted while running")
+
+    @staticmethod
+    def _llm_cache_options(simulation_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Build the worker's LLM cache options for a simulation.
 
-        except Exception as e:
-            raise Exception(f"Failed to execute TinyTroupe simulation: {str(e)}")
+        Args:
+            simulation_data: Simulation data
+
+        Returns:
+            Cache options, or None if the simulation does not use the cache
+        """
+        if not (simulation_data["config"].get("cache_enabled") or settings.tinytroupe_cache_api_calls):
+            return None
+        return {
+            "path": str(llm_cache.db.path),
+            "max_bytes": llm_cache.max_bytes,
+            "model": settings.tinytroupe_model,
+            "temperature": settings.tinytroupe_temperature,
+        }
+
+    def handle_recovered_jobs(self, requeued: List[str], failed: List[str]):
+        """
+        Reset simulations whose worker was lost.
+
+        Re-queued simulations go back to pending, before any worker can
+        claim their job again, so they are run again; simulations that ran
+        out of attempts are marked as failed.
 
+        Args:
+            requeued: IDs of simulations whose job was re-queued
+            failed: IDs of simulations whose job was given up
+        """
+        for simulation_id in requeued:
+            reset = {"status": SimulationStatus.PENDING, "started_at": None}
+            if self.repository.transition(simulation_id, [SimulationStatus.RUNNING], reset):
+                self._publish_status({"id": simulation_id, **reset})
+            print(f"↻ Re-queued interrupted simulation {simulation_id}")
+
+        for simulation_id in failed:
+            self._mark_interrupted(simulation_id, "Simulation worker was lost too many times")
+            print(f"✗ Gave up on interrupted simulation {simulation_id}")
+
+    def recover_interrupted_simulations(self) -> int:
+        """
+        Fail simulations left running without any job to finish them.
+
+        Returns:
+            Number of simulations marked as failed
+        """
+        orphaned = [
+            simulation_id
+            for simulation_id in self.iter_simulation_ids([SimulationStatus.RUNNING])
+            if not simulation_runner.is_scheduled(simulation_id)
+        ]
+
+        for simulation_id in orphaned:
+            self._mark_interrupted(simulation_id, "Simulation was interrupted by a server restart")
+        return len(orphaned)
+
+    def _mark_interrupted(self, simulation_id: str, error: str):
+        """Mark a simulation as failed after its worker disappeared."""
+        failed = {
+            "status": SimulationStatus.FAILED,
+            "completed_at": datetime.utcnow().isoformat(),
+            "error": error,
+        }
+        if self.repository.transition(
+            simulation_id, [SimulationStatus.PENDING, SimulationStatus.RUNNING], failed
+        ):
+            self._publish_status({"id": simulation_id, **failed})
+            self._notify_finished(simulation_id)
 
 # Global instance
 simulation_service = SimulationService()
@@ -0,0 +1,402 @@
+"""
+TinyTroupe simulation execution.
+
+Everything in this module runs inside simulation worker processes, so it
+must only receive and return plain, picklable data.
+"""
+
+import os
+import sys
+import json
+import time
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.checkpoints import CheckpointStore
+from app.services.llm_cache import LLMCache, llm_cache_scope, patch_tinytroupe
+from app.services.persona_cache import persona_cache
+from app.services.simulation_events import SimulationEventLog, INTERACTION_EVENT, STEP_EVENT
+from app.services.transcript_analytics import TranscriptAnalytics
+
+TINYTROUPE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "TinyTroupe")
+
+# Modules imported once when a worker process boots
+WARM_MODULES = ("tinytroupe.openai_utils", "tinytroupe.agent", "tinytroupe.environment")
+
+# Outcome of this process's warm-up, reported by worker_status()
+_warm_up: Dict[str, Any] = {}
+
+
+class SimulationCancelledError(Exception):
+    """Raised in a worker when its run was asked to stop."""
+
+
+def ensure_tinytroupe_on_path():
+    """Make the bundled TinyTroupe checkout importable."""
+    if TINYTROUPE_PATH not in sys.path:
+        sys.path.insert(0, TINYTROUPE_PATH)
+
+
+def warm_up_worker():
+    """
+    Preload TinyTroupe in a freshly started worker process.
+
+    Used as the process pool initializer so the first simulation on a worker
+    does not pay for importing TinyTroupe and its dependencies. A failed
+    import is recorded rather than raised, so the simulation itself reports
+    the error.
+    """
+    started = time.perf_counter()
+    try:
+        ensure_tinytroupe_on_path()
+        for module in WARM_MODULES:
+            importlib.import_module(module)
+        # Loads TinyTroupe's config and installs the LLM cache hooks
+        patch_tinytroupe()
+        _warm_up["error"] = None
+    except Exception as e:
+        _warm_up["error"] = str(e)
+    _warm_up["seconds"] = time.perf_counter() - started
+
+
+def worker_status() -> Dict[str, Any]:
+    """
+    Report how this worker process warmed up.
+
+    Returns:
+        Process ID, warm-up duration and error (if TinyTroupe failed to load)
+    """
+    return {"pid": os.getpid(), **_warm_up}
+
+
+# One cache handle per worker process, reused across simulations
+_llm_caches: Dict[str, LLMCache] = {}
+
+
+def _get_llm_cache(options: Optional[Dict[str, Any]]) -> Optional[LLMCache]:
+    """Get this process's handle on the shared LLM cache, if enabled."""
+    if not options:
+        return None
+    cache = _llm_caches.get(options["path"])
+    if cache is None:
+        cache = LLMCache(options["path"], options["max_bytes"])
+        _llm_caches[options["path"]] = cache
+    return cache
+
+
+def _configure_tiny_person(tiny_person, persona: Dict[str, Any]):
+    """Define every set persona field on a new TinyPerson."""
+    for key, value in persona.items():
+        if key == "name" or value in (None, [], {}):
+            continue
+        tiny_person.define(key, value)
+
+
+def _load_agent(TinyPerson, agent_data: Dict[str, Any], counters: Dict[str, int]):
+    """
+    Create the TinyPerson of a stored agent.
+
+    The first run of an agent in this process configures it field by field
+    and caches its complete state; later runs with the same persona restore
+    that state onto a new TinyPerson instead.
+
+    Args:
+        TinyPerson: TinyPerson class
+        agent_data: Stored agent data
+        counters: Per-run persona cache hits and misses, updated in place
+
+    Returns:
+        Configured TinyPerson
+    """
+    name = agent_data["persona"]["name"]
+    built = []
+
+    def build() -> Dict[str, Any]:
+        tiny_person = TinyPerson(name)
+        _configure_tiny_person(tiny_person, agent_data["persona"])
+        built.append(tiny_person)
+        return tiny_person.encode_complete_state()
+
+    spec, cached = persona_cache.get_or_build(agent_data, build)
+    counters["hits" if cached else "misses"] += 1
+    if built:
+        return built[0]
+    # decode_complete_state copies the state, so the cached spec stays pristine
+    tiny_person = TinyPerson(name)
+    tiny_person.decode_complete_state(spec)
+    return tiny_person
+
+
+def _clear_registries(TinyPerson, TinyWorld):
+    """
+    Forget every agent and environment TinyTroupe registered in this process.
+
+    TinyTroupe refuses a second agent or environment with a name it has
+    already seen, and warm workers run many simulations, so each run
+    starts and ends with empty registries.
+    """
+    TinyPerson.clear_agents()
+    TinyWorld.clear_environments()
+
+
+def _action_to_interaction(
+    action: Dict[str, Any],
+    agent_data: Dict[str, Any],
+    step: int,
+    timestamp: str
+) -> Dict[str, Any]:
+    """Convert a TinyTroupe action into an InteractionMessage dict."""
+    # TinyPerson.act returns {"action": {...}, "cognitive_state": {...}} items
+    action = action.get("action", action)
+    content = action.get("content")
+    if not isinstance(content, str):
+        content = "" if content is None else json.dumps(content, ensure_ascii=False)
+
+    return {
+        "timestamp": timestamp,
+        "agent_id": agent_data["id"],
+        "agent_name": agent_data["persona"]["name"],
+        "message_type": str(action.get("type", "UNKNOWN")),
+        "content": content,
+        "step": step,
+    }
+
+
+def _act(agent) -> Tuple[List, str]:
+    """Let an agent act, noting when its actions were produced."""
+    actions = agent.act(return_actions=True)
+    return actions, datetime.utcnow().isoformat()
+
+
+def _run_step(world, pool: Optional[ThreadPoolExecutor]) -> Dict[str, Tuple[List, str]]:
+    """
+    Advance the world by one step.
+
+    This is TinyWorld._step, timing each agent's actions as they are
+    produced. Without a pool agents act in turn, each hearing what the
+    previous ones said. With a pool, all agents act concurrently on the
+    state left by the previous step, and their actions are then delivered
+    to the world in the world's agent order, so the outcome does not
+    depend on thread timing. Either way the world's clock is advanced
+    first, as TinyWorld.run does.
+
+    Args:
+        world: TinyWorld to advance
+        pool: Thread pool for concurrent actions, or None to act in turn
+
+    Returns:
+        Actions taken by each agent and when they were produced, by agent name
+    """
+    # run() passes no timedelta unless asked to, which leaves the clock as is
+    world._advance_datetime(None)
+    agents = list(world.agents)
+    actions_by_agent = {}
+    if pool is None:
+        for agent in agents:
+            actions_by_agent[agent.name] = _act(agent)
+            world._handle_actions(agent, agent.pop_latest_actions())
+        return actions_by_agent
+
+    futures = [pool.submit(_act, agent) for agent in agents]
+    for agent, future in zip(agents, futures):
+        actions_by_agent[agent.name] = future.result()
+    for agent in agents:
+        world._handle_actions(agent, agent.pop_latest_actions())
+    return actions_by_agent
+
+
+def execute_tinytroupe_simulation(
+    simulation_data: Dict[str, Any],
+    agents_data: List[Dict[str, Any]],
+    events_dir: str,
+    llm_cache: Optional[Dict[str, Any]] = None,
+    action_fanout: int = 1,
+    checkpoints: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute the actual TinyTroupe simulation.
+
+    The world is advanced one step at a time so that step progress and
+    each interaction can be published to the simulation's event log as
+    soon as they happen. With ``parallel_actions`` set in the config,
+    agents act concurrently within each step, at most ``action_fanout``
+    at a time.
+
+    TinyTroupe's agent and environment registries are cleared before and
+    after the run, so a warm worker can run the same cast or simulation
+    name again.
+
+    The world is checkpointed every ``interval`` steps (and after the last
+    one); with a ``resume_step`` the run restores that checkpoint and only
+    executes the remaining steps. A fork resuming at its branch step gets
+    its agent set reconciled with the checkpoint and its prompt delivered.
+
+    With a ``run_id``, the run stops before its next step once a cancel is
+    requested on the simulation's event log for that ID.
+
+    Args:
+        simulation_data: Simulation configuration data
+        agents_data: Stored data of the participating agents, in order
+        events_dir: Directory holding simulation event logs
+        llm_cache: Shared LLM cache options (path, max_bytes, model,
+            temperature), or None to call the LLM directly
+        action_fanout: Maximum agents acting concurrently in a step
+        checkpoints: Checkpoint options (dir, interval, keep, resume_step), or
+            None to run without checkpoints
+        run_id: ID under which the run can be cancelled
+
+    Returns:
+        Simulation results
+    """
+    events = SimulationEventLog(events_dir, simulation_data["id"])
+    pool = None
+    registered = False
+
+    # Import TinyTroupe components
+    try:
+        ensure_tinytroupe_on_path()
+
+        from tinytroupe.agent import TinyPerson
+        from tinytroupe.environment import TinyWorld
+
+        _clear_registries(TinyPerson, TinyWorld)
+        registered = True
+
+        options = llm_cache or {}
+        with llm_cache_scope(
+            _get_llm_cache(llm_cache),
+            default_model=options.get("model"),
+            default_temperature=options.get("temperature")
+        ) as llm_usage:
+            # Load agents, restoring recurring personas from the cache
+            persona_counters = {"hits": 0, "misses": 0}
+            agents = [
+                _load_agent(TinyPerson, agent_data, persona_counters)
+                for agent_data in agents_data
+            ]
+
+            # Create TinyWorld
+            world_name = simulation_data["name"]
+            world = TinyWorld(world_name, agents)
+            world.make_everyone_accessible()
+
+            config = simulation_data["config"]
+            steps = config["steps"]
+            agents_by_name = {agent_data["persona"]["name"]: agent_data for agent_data in agents_data}
+            checkpoint_options = checkpoints or {}
+            store = CheckpointStore(checkpoint_options["dir"], checkpoint_options.get("keep", 0)) if checkpoints else None
+            interval = checkpoint_options.get("interval", 0)
+            resume_step = checkpoint_options.get("resume_step")
+            # Transcript analytics are updated after every step
+            analytics = TranscriptAnalytics()
+
+            if resume_step:
+                # Continue from a checkpoint instead of replaying its steps
+                checkpoint = store.load(simulation_data["id"], resume_step)
+                if checkpoint is None:
+                    raise ValueError(f"Checkpoint for step {resume_step} not found")
+                # Agents dropped from a fork are left out; added ones join
+                world_state = dict(checkpoint["world"])
+                world_state["agents"] = [
+                    agent_state for agent_state in world_state["agents"]
+                    if agent_state["name"] in agents_by_name
+                ]
+                world.decode_complete_state(world_state)
+                restored = {agent_state["name"] for agent_state in world_state["agents"]}
+                added = [agent for agent in agents if agent.name not in restored]
+                for agent in added:
+                    world.add_agent(agent)
+                if added:
+                    world.make_everyone_accessible()
+
+                fork = simulation_data.get("fork") or {}
+                if fork.get("prompt") and fork["step"] == resume_step and agents:
+                    agents[0].listen(fork["prompt"])
+
+                interactions = checkpoint["interactions"]
+                analytics.add_all(interactions)
+                first_step = resume_step + 1
+            else:
+                # Give initial prompt to first agent
+                if agents:
+                    agents[0].listen(config["initial_prompt"])
+                interactions = []
+                first_step = 1
+
+            # Interactions already held by a checkpoint
+            checkpointed = len(interactions)
+
+            # Run simulation
+            events.write_progress(first_step - 1, steps)
+
+            step_seconds = []
+
+            fanout = min(action_fanout, len(agents)) if config.get("parallel_actions") else 1
+            if fanout > 1:
+                pool = ThreadPoolExecutor(max_workers=fanout, thread_name_prefix="agent")
+
+            for step in range(first_step, steps + 1):
+                if run_id and events.cancel_requested(run_id):
+                    raise SimulationCancelledError(f"Simulation run {run_id} was cancelled after step {step - 1}")
+                step_started = time.perf_counter()
+                actions_by_agent = _run_step(world, pool)
+                step_interactions = []
+                for agent in agents:
+                    actions, acted_at = actions_by_agent.get(agent.name, ([], None))
+                    for action in actions:
+                        interaction = _action_to_interaction(action, agents_by_name[agent.name], step, acted_at)
+                        step_interactions.append(interaction)
+                        events.append(INTERACTION_EVENT, interaction)
+                interactions.extend(step_interactions)
+                analytics.add(step_interactions)
+
+                if store and interval and (step % interval == 0 or step == steps):
+                    # Each checkpoint only stores the interactions since the previous one
+                    store.save(
+                        simulation_data["id"],
+                        step,
+                        world.encode_complete_state(),
+                        interactions[checkpointed:]
+                    )
+                    checkpointed = len(interactions)
+
+                step_seconds.append(time.perf_counter() - step_started)
+                events.write_progress(step, steps)
+                events.append(STEP_EVENT, {
+                    "current_step": step,
+                    "total_steps": steps,
+                    "duration_seconds": step_seconds[-1]
+                })
+
+            usage = dict(llm_usage)
+            usage["agents"] = {
+                agents_by_name[name]["id"]: counters
+                for name, counters in llm_usage.get("agents", {}).items()
+                if name in agents_by_name
+            }
+            result = {
+                "interactions": interactions,
+                "summary": f"Simulation completed with {steps} steps",
+                "extracted_data": analytics.to_dict(),
+                "llm_usage": usage,
+                # Popped by the service and recorded as metrics, not stored
+                "step_seconds": step_seconds,
+                "persona_cache": persona_counters
+            }
+
+        return result
+
+    except SimulationCancelledError:
+        raise
+
+    except Exception as e:
+        raise Exception(f"Failed to execute TinyTroupe simulation: {str(e)}")
+
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if registered:
+            _clear_registries(TinyPerson, TinyWorld)
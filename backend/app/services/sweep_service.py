@@ -0,0 +1,394 @@
+"""Service layer for parameter sweeps over batches of simulations."""
+
+import json
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.locking import atomic_write, file_lock
+from app.models.simulation import SimulationConfig, SimulationCreate, SimulationStatus, SimulationSummary
+from app.models.sweep import (
+    SweepCreate,
+    SweepParameters,
+    SweepProgress,
+    SweepResponse,
+    SweepResultRow,
+    SweepResultsResponse,
+    SweepRun
+)
+from app.services.agent_service import agent_service
+from app.services.simulation_runner import (
+    SimulationAlreadyScheduledError,
+    SimulationQueueFullError,
+    simulation_runner
+)
+from app.services.simulation_service import (
+    SimulationService,
+    SimulationStatusConflictError,
+    simulation_service
+)
+
+FINISHED_STATUSES = (SimulationStatus.COMPLETED, SimulationStatus.FAILED)
+
+
+class SweepService:
+    """
+    Service for parameter sweeps.
+
+    A sweep expands a grid of prompts, agent subsets, step counts and
+    environments into ordinary simulations, all sharing the LLM cache.
+    At most ``max_concurrency`` of them are queued or running at once:
+    whenever a simulation finishes, the next pending ones are submitted.
+    Sweeps are stored as JSON files listing their simulations; status and
+    progress are always derived from the simulations themselves. Any API
+    worker may schedule a sweep, so scheduling holds the sweep's lock file
+    and works from the stored simulation statuses.
+    """
+
+    def __init__(self, sweeps_dir: str, simulations: SimulationService):
+        """
+        Initialize the sweep service.
+
+        Args:
+            sweeps_dir: Directory holding sweep files
+            simulations: Service running the sweeps' simulations
+        """
+        self.sweeps_dir = Path(sweeps_dir)
+        self.simulations = simulations
+        self.sweeps: Dict[str, Dict[str, Any]] = {}
+        # Simulation ID -> ID of the sweep it belongs to
+        self._sweep_of: Dict[str, str] = {}
+        simulations.completion_handlers.append(self._on_simulation_finished)
+
+    def load(self):
+        """Read all stored sweeps, including ones created by other workers."""
+        self.sweeps_dir.mkdir(parents=True, exist_ok=True)
+        sweeps = {}
+        for path in self.sweeps_dir.glob("*.json"):
+            try:
+                sweep = self._read(path)
+                sweeps[sweep["id"]] = sweep
+            except Exception as e:
+                print(f"Error loading sweep from {path}: {e}")
+        self.sweeps = {}
+        self._sweep_of = {}
+        for sweep in sweeps.values():
+            self._register(sweep)
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, Any]:
+        """Read a sweep file."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _path(self, sweep_id: str) -> Path:
+        """Get the file path of a sweep."""
+        return self.sweeps_dir / f"{sweep_id}.json"
+
+    def _register(self, sweep: Dict[str, Any]):
+        """Index a sweep and its simulations."""
+        self.sweeps[sweep["id"]] = sweep
+        for run in sweep["runs"]:
+            self._sweep_of[run["simulation_id"]] = sweep["id"]
+
+    def _save(self, sweep: Dict[str, Any]):
+        """Write a sweep file atomically."""
+        self.sweeps_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(self._path(sweep["id"]), json.dumps(sweep, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def _refresh(self):
+        """Load sweeps if another worker created one since the last load."""
+        if any(path.stem not in self.sweeps for path in self.sweeps_dir.glob("*.json")):
+            self.load()
+
+    def _get(self, sweep_id: str) -> Optional[Dict[str, Any]]:
+        """Get a sweep, reloading if it was created by another worker."""
+        if sweep_id not in self.sweeps and self._path(sweep_id).exists():
+            self.load()
+        return self.sweeps.get(sweep_id)
+
+    def create_sweep(self, sweep_create: SweepCreate) -> SweepResponse:
+        """
+        Create a sweep's simulations and start scheduling them.
+
+        Args:
+            sweep_create: Grid and options of the sweep
+
+        Returns:
+            Created sweep
+
+        Raises:
+            ValueError: If the grid is too large or names unknown agents
+        """
+        grid = sweep_create.grid
+        if grid.size() > settings.sweep_max_runs:
+            raise ValueError(
+                f"Sweep grid has {grid.size()} combinations, the limit is {settings.sweep_max_runs}"
+            )
+        unknown = sorted({
+            agent_id for agent_ids in grid.agent_ids for agent_id in agent_ids
+            if agent_service.get_agent(agent_id) is None
+        })
+        if unknown:
+            raise ValueError(f"Unknown agent IDs: {', '.join(unknown)}")
+
+        sweep_id = str(uuid.uuid4())
+        runs = []
+        for index, parameters in enumerate(grid.combinations(), start=1):
+            simulation = self.simulations.create_simulation(SimulationCreate(
+                name=f"{sweep_create.name} #{index}",
+                agent_ids=parameters.agent_ids,
+                config=SimulationConfig(
+                    steps=parameters.steps,
+                    initial_prompt=parameters.initial_prompt,
+                    environment_type=parameters.environment_type,
+                    parallel_actions=sweep_create.parallel_actions,
+                    # Runs of a sweep overlap heavily, so they share completions
+                    cache_enabled=True
+                )
+            ))
+            runs.append({"simulation_id": simulation.id, "parameters": parameters.model_dump(mode="json")})
+
+        sweep = {
+            "id": sweep_id,
+            "name": sweep_create.name,
+            "max_concurrency": sweep_create.max_concurrency or settings.sweep_concurrency,
+            "created_at": datetime.utcnow().isoformat(),
+            "completed_at": None,
+            "runs": runs,
+        }
+        self._save(sweep)
+        self._register(sweep)
+        self.schedule(sweep_id)
+        return self.get_sweep(sweep_id)
+
+    def _summaries(self, sweep: Dict[str, Any]) -> List[Optional[SimulationSummary]]:
+        """Get the current summary of each simulation of a sweep."""
+        return [self.simulations.repository.get_summary(run["simulation_id"]) for run in sweep["runs"]]
+
+    @staticmethod
+    def _status(summary: Optional[SimulationSummary]) -> SimulationStatus:
+        """Status of a sweep simulation; deleted ones count as failed."""
+        return summary.status if summary else SimulationStatus.FAILED
+
+    def schedule(self, sweep_id: str) -> int:
+        """
+        Submit pending simulations of a sweep up to its concurrency limit.
+
+        Args:
+            sweep_id: Sweep ID
+
+        Returns:
+            Number of simulations submitted
+        """
+        if not self._get(sweep_id):
+            return 0
+
+        with file_lock(self.sweeps_dir / ".locks" / f"{sweep_id}.lock"):
+            # Another worker may have recorded completion since this copy was read
+            sweep = self._read(self._path(sweep_id))
+            self._register(sweep)
+            return self._schedule_locked(sweep)
+
+    def _schedule_locked(self, sweep: Dict[str, Any]) -> int:
+        """Submit pending simulations of a sweep while holding its lock."""
+        summaries = self._summaries(sweep)
+        waiting = []
+        in_flight = 0
+        for summary in summaries:
+            if summary is None or summary.status in FINISHED_STATUSES:
+                continue
+            if summary.status == SimulationStatus.RUNNING or simulation_runner.is_scheduled(summary.id):
+                in_flight += 1
+            else:
+                waiting.append(summary.id)
+
+        submitted = 0
+        for simulation_id in waiting[:max(sweep["max_concurrency"] - in_flight, 0)]:
+            try:
+                self.simulations.start_simulation(simulation_id)
+            except (SimulationAlreadyScheduledError, SimulationStatusConflictError):
+                continue
+            except SimulationQueueFullError:
+                # Retried when the next simulation finishes
+                break
+            submitted += 1
+
+        finished = not waiting and in_flight == 0
+        if finished != bool(sweep["completed_at"]):
+            sweep["completed_at"] = None
+            if finished:
+                sweep["completed_at"] = max(
+                    (summary.completed_at or "" for summary in summaries if summary), default=""
+                ) or datetime.utcnow().isoformat()
+            self._save(sweep)
+        return submitted
+
+    def schedule_all(self, skip: Optional[str] = None) -> int:
+        """
+        Top up every unfinished sweep, oldest first.
+
+        Sweeps finished by another worker may still look unfinished here;
+        scheduling one rereads its file and updates this copy.
+
+        Args:
+            skip: ID of a sweep that was just scheduled
+
+        Returns:
+            Number of simulations submitted
+        """
+        self._refresh()
+        unfinished = sorted(
+            (sweep for sweep in self.sweeps.values() if not sweep["completed_at"] and sweep["id"] != skip),
+            key=lambda sweep: sweep["created_at"]
+        )
+        return sum(self.schedule(sweep["id"]) for sweep in unfinished)
+
+    def _on_simulation_finished(self, simulation_id: str):
+        """Refill sweeps once a simulation frees its slot."""
+        if simulation_id not in self._sweep_of:
+            self._refresh()
+        sweep_id = self._sweep_of.get(simulation_id)
+        if sweep_id:
+            # Also records completion of a sweep whose resumed simulation finished
+            self.schedule(sweep_id)
+        if not any(not sweep["completed_at"] and sweep["id"] != sweep_id for sweep in self.sweeps.values()):
+            return
+        # Sweeps held back by a full queue get the freed slot too
+        self.schedule_all(skip=sweep_id)
+
+    def _progress(self, sweep: Dict[str, Any], summaries: List[Optional[SimulationSummary]]) -> SweepProgress:
+        """Aggregate the status and step progress of a sweep's simulations."""
+        statuses = Counter(self._status(summary) for summary in summaries)
+        completed_steps = 0
+        total_steps = 0
+        for run, summary in zip(sweep["runs"], summaries):
+            steps = run["parameters"]["steps"]
+            total_steps += steps
+            status = self._status(summary)
+            if status in FINISHED_STATUSES:
+                completed_steps += steps
+            elif status == SimulationStatus.RUNNING:
+                step_progress = self.simulations.get_progress(summary.id)
+                completed_steps += step_progress["current_step"] if step_progress else 0
+
+        return SweepProgress(
+            total=len(summaries),
+            pending=statuses[SimulationStatus.PENDING],
+            running=statuses[SimulationStatus.RUNNING],
+            completed=statuses[SimulationStatus.COMPLETED],
+            failed=statuses[SimulationStatus.FAILED],
+            completed_steps=completed_steps,
+            total_steps=total_steps,
+            progress=int(completed_steps / total_steps * 100) if total_steps else 100
+        )
+
+    @staticmethod
+    def _sweep_status(progress: SweepProgress) -> SimulationStatus:
+        """Derive a sweep's status from its simulations."""
+        if progress.pending or progress.running:
+            return SimulationStatus.RUNNING
+        return SimulationStatus.COMPLETED if progress.completed else SimulationStatus.FAILED
+
+    def get_sweep(self, sweep_id: str) -> Optional[SweepResponse]:
+        """
+        Get a sweep with the status of its simulations.
+
+        Args:
+            sweep_id: Sweep ID
+
+        Returns:
+            Sweep response or None if not found
+        """
+        sweep = self._get(sweep_id)
+        if not sweep:
+            return None
+
+        summaries = self._summaries(sweep)
+        progress = self._progress(sweep, summaries)
+        status = self._sweep_status(progress)
+        return SweepResponse(
+            id=sweep["id"],
+            name=sweep["name"],
+            status=status,
+            max_concurrency=sweep["max_concurrency"],
+            created_at=sweep["created_at"],
+            completed_at=sweep["completed_at"] if status != SimulationStatus.RUNNING else None,
+            progress=progress,
+            runs=[
+                SweepRun(
+                    simulation_id=run["simulation_id"],
+                    parameters=SweepParameters(**run["parameters"]),
+                    status=self._status(summary)
+                )
+                for run, summary in zip(sweep["runs"], summaries)
+            ]
+        )
+
+    def list_sweeps(self) -> List[SweepResponse]:
+        """
+        List all sweeps, newest first.
+
+        Returns:
+            List of sweep responses
+        """
+        self.load()
+        ordered = sorted(self.sweeps.values(), key=lambda sweep: sweep["created_at"], reverse=True)
+        return [self.get_sweep(sweep["id"]) for sweep in ordered]
+
+    def get_results(self, sweep_id: str) -> Optional[SweepResultsResponse]:
+        """
+        Combine the outcomes of a sweep's simulations into one table.
+
+        Only completed simulations have their results read, without their
+        interactions; the rest are reported with their status and error.
+
+        Args:
+            sweep_id: Sweep ID
+
+        Returns:
+            One row per simulation, in grid order, or None if not found
+        """
+        sweep = self._get(sweep_id)
+        if not sweep:
+            return None
+
+        summaries = self._summaries(sweep)
+        progress = self._progress(sweep, summaries)
+        rows = []
+        for run, summary in zip(sweep["runs"], summaries):
+            row = SweepResultRow(
+                simulation_id=run["simulation_id"],
+                status=self._status(summary),
+                error=summary.error if summary else "Simulation was deleted",
+                **run["parameters"]
+            )
+            if summary and summary.started_at and summary.completed_at:
+                row.duration_seconds = (
+                    datetime.fromisoformat(summary.completed_at) - datetime.fromisoformat(summary.started_at)
+                ).total_seconds()
+            if row.status == SimulationStatus.COMPLETED:
+                result = self.simulations.repository.get_result_summary(run["simulation_id"]) or {}
+                usage = result.get("llm_usage") or {}
+                row.message_types = result.get("message_types") or {}
+                row.interactions = sum(row.message_types.values())
+                row.llm_calls = usage.get("calls", 0)
+                row.llm_cache_hits = usage.get("cache_hits", 0)
+                row.llm_tokens = usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+                row.summary = result.get("summary")
+                row.extracted_data = result.get("extracted_data")
+            rows.append(row)
+
+        return SweepResultsResponse(
+            sweep_id=sweep_id,
+            status=self._sweep_status(progress),
+            progress=progress,
+            rows=rows
+        )
+
+
+# Global instance
+sweep_service = SweepService(settings.sweeps_dir, simulation_service)
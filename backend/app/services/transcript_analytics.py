@@ -0,0 +1,387 @@
+"""Incremental conversation analytics over simulation transcripts."""
+
+import re
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Bumped whenever the shape or meaning of the extracted data changes
+ANALYTICS_VERSION = 1
+
+# Messages that count as turns of the conversation
+TURN_TYPES = frozenset({"TALK"})
+
+# Messages whose text feeds keywords, topics and sentiment
+TEXT_TYPES = frozenset({"TALK", "THINK"})
+
+TOP_KEYWORDS = 25
+TOP_TOPICS = 15
+TOP_AGENT_KEYWORDS = 10
+
+# Separates messages in the token stream of a batch; never part of a word
+MESSAGE_SEPARATOR = "\x01"
+SEPARATOR_ID = -2
+NOT_A_WORD_ID = -1
+
+WORD_PATTERN = re.compile(r"[a-z][a-z']+")
+STRIPPED_CHARS = "'\"`.,;:!?()[]{}<>*_~#@$%^&+=|/\\-–—…“”‘’«»"
+
+# Topic pairs are keyed by both word IDs in one integer
+PAIR_SHIFT = 32
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before being
+below between both but by can can't cannot could couldn't did didn't do does doesn't doing don't down
+during each even few for from further get gets got had hadn't has hasn't have haven't having he he'd
+he'll he's her here here's hers herself him himself his how how's i i'd i'll i'm i've if in into is
+isn't it it's its itself just let's like me more most much must mustn't my myself no nor not now of off
+on once one only or other ought our ours ourselves out over own really same shall shan't she she'd
+she'll she's should shouldn't so some such than that that's the their theirs them themselves then there
+there's these they they'd they'll they're they've this those through to too under until up us very was
+wasn't we we'd we'll we're we've well were weren't what what's when when's where where's which while who
+who's whom why why's will with won't would wouldn't yes yet you you'd you'll you're you've your yours
+yourself yourselves think know going want make see say said way thing things lot
+""".split())
+
+POSITIVE_WORDS = frozenset("""
+good great excellent amazing awesome love loved loving liked enjoy enjoyed happy glad pleased
+delighted wonderful fantastic nice best better perfect beautiful brilliant positive helpful useful
+valuable affordable cheap convenient easy reliable trust trusted recommend recommended satisfied
+excited exciting impressive interesting comfortable fair friendly favorite agree appreciate
+appreciated benefit benefits worth quality success successful win improve improved innovative
+fun fresh clean safe smart
+""".split())
+
+NEGATIVE_WORDS = frozenset("""
+bad poor terrible awful horrible hate hated dislike disliked unhappy sad angry annoyed annoying
+disappointed disappointing frustrated frustrating worse worst negative useless expensive overpriced
+costly difficult hard complicated confusing unreliable broken problem problems issue issues fail
+failed failure risk risky concern concerned worried worry afraid boring slow dirty unsafe wrong
+doubt doubtful skeptical unfair waste lacking missing complaint complain scam
+""".split())
+
+# Per-agent totals combined by addition and by maximum
+SUM_STATS = (
+    "messages", "turns", "words", "responses", "latency_seconds",
+    "scored", "sentiment", "positive", "negative", "neutral",
+)
+MAX_STATS = ("max_words", "max_latency_seconds")
+
+
+def _grow(values: np.ndarray, size: int, axis: int = 0, spare: bool = False) -> np.ndarray:
+    """Pad an array with zeros up to a size along an axis, doubling it if spare."""
+    current = values.shape[axis]
+    if size <= current:
+        return values
+    padding = [(0, 0)] * values.ndim
+    padding[axis] = (0, max(size, 2 * current) - current if spare else size - current)
+    return np.pad(values, padding)
+
+
+def _seconds(timestamp: str) -> float:
+    """Convert an ISO 8601 timestamp to seconds, reading naive times as UTC."""
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _top_indices(counts: np.ndarray, n: int) -> np.ndarray:
+    """Get the indices of the n largest non-zero counts and any ties, unordered."""
+    if len(counts) > n:
+        threshold = np.partition(counts, len(counts) - n)[len(counts) - n]
+        return np.flatnonzero(counts >= max(threshold, 1))
+    return np.flatnonzero(counts > 0)
+
+
+def _ranked(terms: Iterable[str], counts: Iterable[int], n: int) -> List[Dict[str, Any]]:
+    """Most frequent terms first, ties broken alphabetically."""
+    ranked = sorted(zip(terms, counts), key=lambda item: (-item[1], item[0]))[:n]
+    return [{"term": term, "count": int(count)} for term, count in ranked]
+
+
+class TranscriptAnalytics:
+    """
+    Conversation statistics updated one step of interactions at a time.
+
+    Each batch is tokenized once and aggregated with numpy over integer
+    agent and word IDs into running totals, so a step costs time in
+    proportion to its own messages and the extracted data is ready as soon
+    as the last step ends instead of after a rescan. Per agent it
+    tracks message and talk counts, turn lengths in words, response latency
+    (seconds from another agent's turn to this agent's reply) and
+    lexicon-based sentiment; overall it tracks keyword and two-word topic
+    frequencies and sentiment per step.
+    """
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self.messages = 0
+        self._agent_ids: List[str] = []
+        self._agent_names: List[str] = []
+        self._agent_index: Dict[str, int] = {}
+        self._stats = {name: np.zeros(0) for name in SUM_STATS + MAX_STATS}
+        self._message_types: Counter = Counter()
+        # Raw whitespace-separated tokens map to word IDs, or NOT_A_WORD_ID
+        self._tokens: Dict[str, int] = {MESSAGE_SEPARATOR: SEPARATOR_ID}
+        self._words: List[str] = []
+        self._word_index: Dict[str, int] = {}
+        self._stopword = np.zeros(0, dtype=bool)
+        self._polarity = np.zeros(0)
+        # Keyword counts per (agent, word), with spare columns for new words
+        self._keywords = np.zeros((0, 0), dtype=np.int64)
+        # Topic counts keyed by both word IDs, see PAIR_SHIFT
+        self._topics: Counter = Counter()
+        self._steps: Dict[int, List[float]] = {}
+        # Last turn seen, so the first reply of the next batch has a latency
+        self._last_turn: Optional[tuple] = None
+
+    def _agent_codes(self, interactions: List[Dict[str, Any]]) -> np.ndarray:
+        """Map the agents of a batch to their indexes, registering new ones."""
+        for interaction in interactions:
+            agent_id = interaction["agent_id"]
+            if agent_id not in self._agent_index:
+                self._agent_index[agent_id] = len(self._agent_ids)
+                self._agent_ids.append(agent_id)
+                self._agent_names.append(interaction["agent_name"])
+        for name, values in self._stats.items():
+            self._stats[name] = _grow(values, len(self._agent_ids))
+        return np.fromiter(
+            (self._agent_index[interaction["agent_id"]] for interaction in interactions),
+            dtype=np.int64, count=len(interactions)
+        )
+
+    def _word_id(self, token: str) -> int:
+        """Normalize a new raw token into a word and get its ID."""
+        word = token.strip(STRIPPED_CHARS)
+        if not WORD_PATTERN.fullmatch(word):
+            return NOT_A_WORD_ID
+        if word not in self._word_index:
+            self._word_index[word] = len(self._words)
+            self._words.append(word)
+        return self._word_index[word]
+
+    def _token_ids(self, texts: List[str]) -> np.ndarray:
+        """Split texts into one stream of word IDs, with separators between texts."""
+        stream = f" {MESSAGE_SEPARATOR} ".join(texts).lower().replace("’", "'").split()
+        for token in set(stream).difference(self._tokens):
+            self._tokens[token] = self._word_id(token)
+        if len(self._stopword) < len(self._words):
+            new_words = self._words[len(self._stopword):]
+            self._stopword = np.concatenate([
+                self._stopword, np.fromiter((word in STOPWORDS for word in new_words), dtype=bool)
+            ])
+            self._polarity = np.concatenate([self._polarity, np.fromiter(
+                (1.0 if word in POSITIVE_WORDS else -1.0 if word in NEGATIVE_WORDS else 0.0
+                 for word in new_words), dtype=float
+            )])
+        return np.fromiter(map(self._tokens.__getitem__, stream), dtype=np.int64, count=len(stream))
+
+    def add(self, interactions: List[Dict[str, Any]]):
+        """
+        Fold a batch of interactions, in transcript order, into the totals.
+
+        Args:
+            interactions: InteractionMessage dicts, typically one step's worth
+        """
+        if not interactions:
+            return
+        self.messages += len(interactions)
+        agents = self._agent_codes(interactions)
+        self._stats["messages"] += np.bincount(agents, minlength=len(self._agent_ids))
+        self._message_types.update(
+            (interaction["agent_id"], interaction["message_type"]) for interaction in interactions
+        )
+
+        texts = [
+            interaction for interaction in interactions
+            if interaction["message_type"] in TEXT_TYPES
+        ]
+        if not texts:
+            return
+        text_agents = agents[np.fromiter(
+            (interaction["message_type"] in TEXT_TYPES for interaction in interactions),
+            dtype=bool, count=len(interactions)
+        )]
+        tokens = self._token_ids([interaction.get("content") or "" for interaction in texts])
+        separators = tokens == SEPARATOR_ID
+        # Text of every token
+        message = np.cumsum(separators)
+        is_word = tokens >= 0
+        word_ids, word_message = tokens[is_word], message[is_word]
+
+        is_turn = np.fromiter(
+            (interaction["message_type"] in TURN_TYPES for interaction in texts),
+            dtype=bool, count=len(texts)
+        )
+        if is_turn.any():
+            whitespace_words = np.bincount(message[~separators], minlength=len(texts))
+            self._add_turns(
+                [interaction for interaction, turn in zip(texts, is_turn) if turn],
+                text_agents[is_turn], whitespace_words[is_turn]
+            )
+        self._add_sentiment(texts, text_agents, word_ids, word_message)
+        self._add_terms(text_agents, word_ids, word_message)
+
+    def _add_turns(self, turns: List[Dict[str, Any]], agents: np.ndarray, words: np.ndarray):
+        """Count turns, their lengths and response latencies per agent."""
+        size = len(self._agent_ids)
+        stats = self._stats
+        stats["turns"] += np.bincount(agents, minlength=size)
+        stats["words"] += np.bincount(agents, weights=words, minlength=size)
+        np.maximum.at(stats["max_words"], agents, words)
+
+        seconds = np.fromiter((_seconds(turn["timestamp"]) for turn in turns), dtype=float, count=len(turns))
+        previous_agents = np.concatenate([[-1], agents[:-1]])
+        previous_seconds = np.concatenate([[np.nan], seconds[:-1]])
+        if self._last_turn is not None:
+            previous_agents[0], previous_seconds[0] = self._last_turn
+        self._last_turn = (agents[-1], seconds[-1])
+
+        # A turn answers the previous one only when another agent spoke it
+        is_response = (previous_agents >= 0) & (previous_agents != agents)
+        latency = (seconds - previous_seconds)[is_response]
+        responders = agents[is_response]
+        stats["responses"] += np.bincount(responders, minlength=size)
+        stats["latency_seconds"] += np.bincount(responders, weights=latency, minlength=size)
+        np.maximum.at(stats["max_latency_seconds"], responders, latency)
+
+    def _add_sentiment(
+        self,
+        texts: List[Dict[str, Any]],
+        agents: np.ndarray,
+        word_ids: np.ndarray,
+        word_message: np.ndarray
+    ):
+        """Score each text's sentiment as (positive - negative) / matched words."""
+        size = len(self._agent_ids)
+        polarity = self._polarity[word_ids]
+        balance = np.bincount(word_message, weights=polarity, minlength=len(texts))
+        matched = np.bincount(word_message, weights=np.abs(polarity), minlength=len(texts))
+        score = np.divide(balance, matched, out=np.zeros(len(texts)), where=matched > 0)
+
+        stats = self._stats
+        stats["scored"] += np.bincount(agents, minlength=size)
+        stats["sentiment"] += np.bincount(agents, weights=score, minlength=size)
+        stats["positive"] += np.bincount(agents, weights=score > 0, minlength=size)
+        stats["negative"] += np.bincount(agents, weights=score < 0, minlength=size)
+        stats["neutral"] += np.bincount(agents, weights=score == 0, minlength=size)
+
+        steps = np.array([interaction.get("step") for interaction in texts], dtype=float)
+        has_step = ~np.isnan(steps)
+        if has_step.any():
+            unique_steps, step_codes = np.unique(steps[has_step], return_inverse=True)
+            sums = np.bincount(step_codes, weights=score[has_step])
+            counts = np.bincount(step_codes)
+            for step, total, count in zip(unique_steps.tolist(), sums.tolist(), counts.tolist()):
+                running = self._steps.setdefault(int(step), [0.0, 0])
+                running[0] += total
+                running[1] += count
+
+    def _add_terms(self, agents: np.ndarray, word_ids: np.ndarray, word_message: np.ndarray):
+        """Count keywords per agent and topics over adjacent content words."""
+        is_keyword = ~self._stopword[word_ids]
+        self._keywords = _grow(
+            _grow(self._keywords, len(self._agent_ids), axis=0), len(self._words), axis=1, spare=True
+        )
+        np.add.at(self._keywords, (agents[word_message[is_keyword]], word_ids[is_keyword]), 1)
+
+        # Topics: two content words in a row within the same text
+        is_pair = (word_message[:-1] == word_message[1:]) & is_keyword[:-1] & is_keyword[1:]
+        if is_pair.any():
+            pairs = (word_ids[:-1][is_pair] << PAIR_SHIFT) | word_ids[1:][is_pair]
+            unique_pairs, pair_counts = np.unique(pairs, return_counts=True)
+            self._topics.update(dict(zip(unique_pairs.tolist(), pair_counts.tolist())))
+
+    def add_all(self, interactions: Iterable[Dict[str, Any]], batch_size: int = 1000):
+        """
+        Fold a whole transcript into the totals in batches.
+
+        Args:
+            interactions: InteractionMessage dicts in transcript order
+            batch_size: Interactions aggregated at a time
+        """
+        batch: List[Dict[str, Any]] = []
+        for interaction in interactions:
+            batch.append(interaction)
+            if len(batch) == batch_size:
+                self.add(batch)
+                batch = []
+        self.add(batch)
+
+    def _top_keywords(self, counts: np.ndarray, n: int) -> List[Dict[str, Any]]:
+        """Get the n most frequent keywords from counts per word ID."""
+        indices = _top_indices(counts, n)
+        return _ranked((self._words[index] for index in indices), counts[indices].tolist(), n)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the extracted data of the transcript so far.
+
+        Returns:
+            JSON-serializable analytics, per agent and overall
+        """
+        stats = {name: values.tolist() for name, values in self._stats.items()}
+        message_types: Dict[str, Dict[str, int]] = {}
+        for (agent_id, message_type), count in self._message_types.items():
+            message_types.setdefault(agent_id, {})[message_type] = count
+
+        agents: Dict[str, Any] = {}
+        for index, agent_id in enumerate(self._agent_ids):
+            turns = int(stats["turns"][index])
+            responses = int(stats["responses"][index])
+            scored = int(stats["scored"][index])
+            keywords = self._keywords[index] if index < len(self._keywords) else np.zeros(0, dtype=np.int64)
+            agents[agent_id] = {
+                "agent_name": self._agent_names[index],
+                "messages": int(stats["messages"][index]),
+                "message_types": dict(sorted(message_types.get(agent_id, {}).items())),
+                "talk_count": turns,
+                "turn_words": {
+                    "total": int(stats["words"][index]),
+                    "mean": round(stats["words"][index] / turns, 2) if turns else None,
+                    "max": int(stats["max_words"][index]) if turns else None,
+                },
+                "response_latency_seconds": {
+                    "responses": responses,
+                    "mean": round(stats["latency_seconds"][index] / responses, 3) if responses else None,
+                    "max": round(stats["max_latency_seconds"][index], 3) if responses else None,
+                },
+                "sentiment": {
+                    "mean": round(stats["sentiment"][index] / scored, 4) if scored else None,
+                    "positive": int(stats["positive"][index]),
+                    "negative": int(stats["negative"][index]),
+                    "neutral": int(stats["neutral"][index]),
+                },
+                "keywords": self._top_keywords(keywords, TOP_AGENT_KEYWORDS),
+            }
+
+        pairs = np.fromiter(self._topics.keys(), dtype=np.int64, count=len(self._topics))
+        pair_counts = np.fromiter(self._topics.values(), dtype=np.int64, count=len(self._topics))
+        indices = _top_indices(pair_counts, TOP_TOPICS)
+        mask = (1 << PAIR_SHIFT) - 1
+        topics = _ranked(
+            (
+                f"{self._words[pair >> PAIR_SHIFT]} {self._words[pair & mask]}"
+                for pair in pairs[indices].tolist()
+            ),
+            pair_counts[indices].tolist(), TOP_TOPICS
+        )
+
+        scored = sum(stats["scored"])
+        return {
+            "analytics_version": ANALYTICS_VERSION,
+            "messages": self.messages,
+            "agents": agents,
+            "keywords": self._top_keywords(self._keywords.sum(axis=0, dtype=np.int64), TOP_KEYWORDS),
+            "topics": topics,
+            "sentiment": {
+                "mean": round(sum(stats["sentiment"]) / scored, 4) if scored else None,
+                "by_step": {
+                    str(step): round(total / count, 4)
+                    for step, (total, count) in sorted(self._steps.items()) if count
+                },
+            },
+        }
@@ -0,0 +1,223 @@
+"""Full-text index over simulation transcripts backed by SQLite FTS5."""
+
+import html
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.storage.sqlite import SQLiteDatabase
+
+TRANSCRIPTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcript_simulations (
+    simulation_id TEXT PRIMARY KEY,
+    completed_at TEXT,
+    messages INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transcript_messages (
+    id INTEGER PRIMARY KEY,
+    simulation_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    step INTEGER,
+    timestamp TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    agent_name TEXT NOT NULL,
+    message_type TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transcript_messages_simulation ON transcript_messages(simulation_id, seq);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+    content, agent_name, message_type,
+    content='transcript_messages', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+"""
+
+FTS_COLUMNS = "content, agent_name, message_type"
+
+# Markers around matched terms in snippets
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+
+# Private-use characters FTS5 puts around matches, swapped for the markers
+# once the rest of the snippet is HTML-escaped
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+
+
+def _highlight(snippet: str) -> str:
+    """Escape a raw snippet as HTML and mark its matched terms."""
+    return html.escape(snippet).replace(_MATCH_START, SNIPPET_START).replace(_MATCH_END, SNIPPET_END)
+
+
+def _plain_query(query: str) -> str:
+    """Quote every word of a query so FTS5 operators and punctuation are literal."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class TranscriptIndex:
+    """
+    Ranked full-text search over the interactions of completed simulations.
+
+    Messages are stored once in ``transcript_messages``; the FTS5 table is
+    an external-content index over their content, agent name and message
+    type. Each simulation is indexed in a single transaction, replacing any
+    earlier version, so the index can be shared by several API processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the index.
+
+        Args:
+            path: Path of the index database file
+        """
+        self.db = SQLiteDatabase(path, schema=TRANSCRIPTS_SCHEMA)
+
+    @staticmethod
+    def _remove(conn: sqlite3.Connection, simulation_id: str):
+        """Drop a simulation's messages and their index entries."""
+        # External-content rows are un-indexed with the values they were indexed with
+        conn.execute(
+            f"INSERT INTO transcript_fts(transcript_fts, rowid, {FTS_COLUMNS}) "
+            f"SELECT 'delete', id, {FTS_COLUMNS} FROM transcript_messages WHERE simulation_id = ?",
+            (simulation_id,)
+        )
+        conn.execute("DELETE FROM transcript_messages WHERE simulation_id = ?", (simulation_id,))
+        conn.execute("DELETE FROM transcript_simulations WHERE simulation_id = ?", (simulation_id,))
+
+    def index(
+        self,
+        simulation_id: str,
+        batches: Iterable[List[Dict[str, Any]]],
+        completed_at: Optional[str] = None
+    ) -> int:
+        """
+        Index a simulation's transcript, replacing any earlier version.
+
+        Args:
+            simulation_id: Simulation ID
+            batches: Interactions in order, in one or more lists
+            completed_at: Completion time, used to detect stale entries
+
+        Returns:
+            Number of messages indexed
+        """
+        with self.db.transaction() as conn:
+            self._remove(conn, simulation_id)
+            seq = 0
+            for batch in batches:
+                conn.executemany(
+                    "INSERT INTO transcript_messages "
+                    "(simulation_id, seq, step, timestamp, agent_id, agent_name, message_type, content) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            simulation_id, seq + offset, interaction.get("step"),
+                            interaction["timestamp"], interaction["agent_id"], interaction["agent_name"],
+                            interaction["message_type"], interaction["content"]
+                        )
+                        for offset, interaction in enumerate(batch)
+                    ]
+                )
+                seq += len(batch)
+            conn.execute(
+                f"INSERT INTO transcript_fts(rowid, {FTS_COLUMNS}) "
+                f"SELECT id, {FTS_COLUMNS} FROM transcript_messages WHERE simulation_id = ?",
+                (simulation_id,)
+            )
+            conn.execute(
+                "INSERT INTO transcript_simulations (simulation_id, completed_at, messages) VALUES (?, ?, ?)",
+                (simulation_id, completed_at, seq)
+            )
+        return seq
+
+    def remove(self, simulation_id: str):
+        """
+        Remove a simulation from the index.
+
+        Args:
+            simulation_id: Simulation ID
+        """
+        with self.db.transaction() as conn:
+            self._remove(conn, simulation_id)
+
+    def indexed(self) -> Dict[str, Optional[str]]:
+        """
+        Get the indexed simulations.
+
+        Returns:
+            Dict mapping simulation ID to the completion time it was indexed at
+        """
+        rows = self.db.connection().execute("SELECT simulation_id, completed_at FROM transcript_simulations")
+        return {row["simulation_id"]: row["completed_at"] for row in rows}
+
+    def _search(
+        self,
+        match: str,
+        simulation_ids: Optional[List[str]],
+        limit: int,
+        offset: int
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Run a search with an FTS5 match expression."""
+        where = "transcript_fts MATCH ?"
+        params: List[Any] = [match]
+        if simulation_ids:
+            where += f" AND m.simulation_id IN ({', '.join('?' * len(simulation_ids))})"
+            params.extend(simulation_ids)
+        conn = self.db.connection()
+        totals = conn.execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT m.simulation_id) FROM transcript_fts "
+            f"JOIN transcript_messages m ON m.id = transcript_fts.rowid WHERE {where}",
+            params
+        ).fetchone()
+        rows = conn.execute(
+            "SELECT m.simulation_id, m.seq, m.step, m.timestamp, m.agent_id, m.agent_name, m.message_type, "
+            f"snippet(transcript_fts, -1, ?, ?, '…', 16) AS snippet, bm25(transcript_fts) AS rank "
+            f"FROM transcript_fts JOIN transcript_messages m ON m.id = transcript_fts.rowid "
+            f"WHERE {where} ORDER BY rank, m.id LIMIT ? OFFSET ?",
+            [_MATCH_START, _MATCH_END, *params, limit, offset]
+        ).fetchall()
+        hits = []
+        for row in rows:
+            hit = dict(row)
+            # bm25() is lower for better matches
+            hit["score"] = -hit.pop("rank")
+            hit["snippet"] = _highlight(hit["snippet"])
+            hits.append(hit)
+        return hits, totals[0], totals[1]
+
+    def search(
+        self,
+        query: str,
+        simulation_ids: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        Find messages matching a query, best matches first.
+
+        The query uses FTS5 syntax (``"exact phrase"``, ``OR``, ``NOT``,
+        ``price*``, ``agent_name: alice``). A query that is not valid syntax,
+        such as ``$49.99``, is searched as plain words instead.
+
+        Args:
+            query: Search query
+            simulation_ids: Only search these simulations
+            limit: Maximum hits to return
+            offset: Hits to skip
+
+        Returns:
+            Tuple of (page of hits, total matching messages, matching simulations)
+
+        Raises:
+            ValueError: If the query contains no searchable words
+        """
+        try:
+            return self._search(query, simulation_ids, limit, offset)
+        except sqlite3.OperationalError:
+            plain = _plain_query(query)
+            if not plain:
+                raise ValueError("Search query is empty")
+            try:
+                return self._search(plain, simulation_ids, limit, offset)
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Invalid search query: {e}")
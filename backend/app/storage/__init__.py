@@ -0,0 +1,54 @@
+"""Pluggable storage backends for agents and simulations."""
+
+from functools import lru_cache
+
+from app.core.config import settings
+from app.storage.base import AgentRepository, SimulationRepository
+from app.storage.file import FileAgentRepository, FileSimulationRepository
+from app.storage.sqlite import SQLiteDatabase, SQLiteAgentRepository, SQLiteSimulationRepository
+
+__all__ = [
+    "AgentRepository",
+    "SimulationRepository",
+    "FileAgentRepository",
+    "FileSimulationRepository",
+    "SQLiteDatabase",
+    "SQLiteAgentRepository",
+    "SQLiteSimulationRepository",
+    "get_agent_repository",
+    "get_simulation_repository",
+]
+
+
+@lru_cache
+def get_database() -> SQLiteDatabase:
+    """Get the shared SQLite database configured in settings."""
+    return SQLiteDatabase(settings.database_path)
+
+
+def get_agent_repository() -> AgentRepository:
+    """
+    Create the agent repository for the configured storage backend.
+
+    Returns:
+        Agent repository
+    """
+    if settings.storage_backend == "sqlite":
+        return SQLiteAgentRepository(get_database())
+    if settings.storage_backend == "file":
+        return FileAgentRepository(settings.agents_dir, settings.catalog_refresh_interval)
+    raise ValueError(f"Invalid STORAGE_BACKEND: {settings.storage_backend}")
+
+
+def get_simulation_repository() -> SimulationRepository:
+    """
+    Create the simulation repository for the configured storage backend.
+
+    Returns:
+        Simulation repository
+    """
+    if settings.storage_backend == "sqlite":
+        return SQLiteSimulationRepository(get_database())
+    if settings.storage_backend == "file":
+        return FileSimulationRepository(settings.simulations_dir, settings.catalog_refresh_interval)
+    raise ValueError(f"Invalid STORAGE_BACKEND: {settings.storage_backend}")
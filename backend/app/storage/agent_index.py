@@ -0,0 +1,205 @@
+"""Secondary indexes over persona attributes for agent search."""
+
+import re
+import bisect
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.models.agent import AgentResponse, AgentSearchQuery
+
+# Sort key of search results: (created_at, id), agents without a creation time first
+AgentKey = Tuple[str, str]
+
+# Indexed term: (field, normalized word)
+Term = Tuple[str, str]
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase words without accents."""
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return WORD_PATTERN.findall(stripped)
+
+
+def persona_terms(persona: Dict[str, Any]) -> Set[Term]:
+    """
+    Get the indexed terms of a persona.
+
+    Args:
+        persona: Persona data
+
+    Returns:
+        Set of (field, word) pairs
+    """
+    occupation = persona.get("occupation") or {}
+    personality = persona.get("personality") or {}
+    texts = {
+        "name": [persona.get("name")],
+        "occupation": [occupation.get("title")],
+        "nationality": [persona.get("nationality")],
+        "residence": [persona.get("residence")],
+        "skills": persona.get("skills") or [],
+        "traits": personality.get("traits") or [],
+    }
+    return {
+        (field, word)
+        for field, values in texts.items()
+        for value in values
+        for word in tokenize(value)
+    }
+
+
+def query_terms(query: AgentSearchQuery) -> Set[Term]:
+    """
+    Get the terms an agent must have to match a search query.
+
+    Args:
+        query: Search filters
+
+    Returns:
+        Set of (field, word) pairs
+    """
+    texts = {
+        "name": [query.name],
+        "occupation": [query.occupation],
+        "nationality": [query.nationality],
+        "residence": [query.residence],
+        "skills": query.skills,
+        "traits": query.traits,
+    }
+    return {
+        (field, word)
+        for field, values in texts.items()
+        for value in values
+        for word in tokenize(value)
+    }
+
+
+def agent_key(agent: AgentResponse) -> AgentKey:
+    """Get the sort key of an agent in search results."""
+    return (agent.created_at or "", agent.id)
+
+
+class AgentSearchIndex:
+    """
+    In-memory inverted index for agents kept in a FileCatalog.
+
+    Holds a posting set per (field, word) term, a sorted age list and every
+    agent's sort key in order, so a search intersects the postings of the
+    query's terms and age range instead of scanning personas. The catalog
+    reports every change through :meth:`update`, including files changed
+    outside the API.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._agents: Dict[str, AgentResponse] = {}
+        self._terms: Dict[str, Set[Term]] = {}
+        self._postings: Dict[Term, Set[str]] = {}
+        self._ages: List[Tuple[int, str]] = []
+        self._order: List[AgentKey] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _discard_sorted(items: List[Any], item: Any):
+        """Remove an item from a sorted list if present."""
+        position = bisect.bisect_left(items, item)
+        if position < len(items) and items[position] == item:
+            del items[position]
+
+    def _remove(self, agent_id: str):
+        """Drop an agent's postings and sort key."""
+        agent = self._agents.pop(agent_id, None)
+        if agent is None:
+            return
+        for term in self._terms.pop(agent_id):
+            postings = self._postings[term]
+            postings.discard(agent_id)
+            if not postings:
+                del self._postings[term]
+        if agent.persona.age is not None:
+            self._discard_sorted(self._ages, (agent.persona.age, agent_id))
+        self._discard_sorted(self._order, agent_key(agent))
+
+    def update(self, agent_id: str, agent: Optional[AgentResponse]):
+        """
+        Index a new or changed agent, or forget a deleted one.
+
+        Args:
+            agent_id: Agent ID
+            agent: Current agent, or None if it was deleted
+        """
+        with self._lock:
+            self._remove(agent_id)
+            if agent is None:
+                return
+            terms = persona_terms(agent.persona.model_dump())
+            self._agents[agent_id] = agent
+            self._terms[agent_id] = terms
+            for term in terms:
+                self._postings.setdefault(term, set()).add(agent_id)
+            if agent.persona.age is not None:
+                bisect.insort(self._ages, (agent.persona.age, agent_id))
+            bisect.insort(self._order, agent_key(agent))
+
+    def _age_range(self, age_min: Optional[int], age_max: Optional[int]) -> Set[str]:
+        """Get the IDs of agents aged within an inclusive range."""
+        start = bisect.bisect_left(self._ages, (age_min, "")) if age_min is not None else 0
+        # IDs are never empty, so (age_max + 1, "") sorts after every agent aged age_max
+        end = bisect.bisect_left(self._ages, (age_max + 1, "")) if age_max is not None else len(self._ages)
+        return {agent_id for _, agent_id in self._ages[start:end]}
+
+    def search(
+        self,
+        query: AgentSearchQuery,
+        after_key: Optional[AgentKey] = None,
+        limit: int = 50
+    ) -> Tuple[List[AgentResponse], int]:
+        """
+        Find agents matching a query, ordered by (created_at, id).
+
+        Args:
+            query: Search filters
+            after_key: Only include agents sorting after this key
+            limit: Maximum number of agents to return
+
+        Returns:
+            Tuple of (page of agents, total count matching the filters)
+        """
+        with self._lock:
+            filters = [self._postings.get(term, set()) for term in query_terms(query)]
+            if query.age_min is not None or query.age_max is not None:
+                filters.append(self._age_range(query.age_min, query.age_max))
+
+            candidates: Optional[Set[str]] = None
+            # Intersect the most selective filters first
+            for matching in sorted(filters, key=len):
+                candidates = set(matching) if candidates is None else candidates & matching
+                if not candidates:
+                    break
+
+            start = bisect.bisect_right(self._order, after_key) if after_key else 0
+            if candidates is None:
+                keys = self._order[start:start + limit]
+                total = len(self._order)
+            elif len(candidates) * 8 < len(self._order):
+                # Few matches: sort them rather than walk the whole order
+                ordered = sorted(agent_key(self._agents[agent_id]) for agent_id in candidates)
+                position = bisect.bisect_right(ordered, after_key) if after_key else 0
+                keys = ordered[position:position + limit]
+                total = len(candidates)
+            else:
+                keys = []
+                for key in self._order[start:]:
+                    if key[1] in candidates:
+                        keys.append(key)
+                        if len(keys) == limit:
+                            break
+                total = len(candidates)
+
+            return [self._agents[agent_id] for _, agent_id in keys], total
@@ -0,0 +1,243 @@
+"""Repository interfaces shared by all storage backends."""
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.models.agent import AgentResponse, AgentSearchQuery
+from app.models.simulation import SimulationStatus, SimulationSummary
+
+
+def summarize_result(result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Reduce a simulation result to its fields other than interactions.
+
+    Args:
+        result: Simulation result, or None
+
+    Returns:
+        The result without ``interactions``, plus ``message_types`` counting
+        interactions per message type, or None if there is no result
+    """
+    if result is None:
+        return None
+    summary = {key: value for key, value in result.items() if key != "interactions"}
+    summary["message_types"] = dict(Counter(i["message_type"] for i in result.get("interactions") or []))
+    return summary
+
+
+class AgentRepository(ABC):
+    """Persistence for agents."""
+
+    @abstractmethod
+    def load(self):
+        """Prepare the backend and warm any in-memory state."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored agents."""
+
+    @abstractmethod
+    def get(self, agent_id: str) -> Optional[AgentResponse]:
+        """
+        Get an agent by ID.
+
+        Args:
+            agent_id: Agent ID
+
+        Returns:
+            Agent response or None if not found
+        """
+
+    @abstractmethod
+    def list(self) -> List[AgentResponse]:
+        """
+        List all agents.
+
+        Returns:
+            List of agent responses
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        query: AgentSearchQuery,
+        after_key: Optional[Tuple[str, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[AgentResponse], int]:
+        """
+        Find agents by persona attributes using the backend's secondary indexes.
+
+        Args:
+            query: Search filters
+            after_key: Only include agents sorting after this (created_at, id) key
+            limit: Maximum number of agents to return
+
+        Returns:
+            Tuple of (page of agents ordered by (created_at, id), total count matching the filters)
+        """
+
+    @abstractmethod
+    def save(self, agent_data: Dict[str, Any]) -> AgentResponse:
+        """
+        Insert or replace an agent.
+
+        Args:
+            agent_data: Full agent data including its ``id``
+
+        Returns:
+            Stored agent response
+        """
+
+    @abstractmethod
+    def save_many(self, agents_data: List[Dict[str, Any]]) -> List[AgentResponse]:
+        """
+        Insert or replace a batch of agents.
+
+        Args:
+            agents_data: Full agent data including each agent's ``id``
+
+        Returns:
+            Stored agent responses, in input order
+        """
+
+    @abstractmethod
+    def delete(self, agent_id: str) -> bool:
+        """
+        Delete an agent.
+
+        Args:
+            agent_id: Agent ID
+
+        Returns:
+            True if deleted, False if not found
+        """
+
+
+class SimulationRepository(ABC):
+    """Persistence for simulations."""
+
+    @abstractmethod
+    def load(self):
+        """Prepare the backend and warm any in-memory state."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of stored simulations."""
+
+    @abstractmethod
+    def get(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the full data of a simulation, result included.
+
+        Args:
+            simulation_id: Simulation ID
+
+        Returns:
+            Simulation data or None if not found
+        """
+
+    @abstractmethod
+    def get_summary(self, simulation_id: str) -> Optional[SimulationSummary]:
+        """
+        Get a simulation's summary without reading its result.
+
+        Args:
+            simulation_id: Simulation ID
+
+        Returns:
+            Simulation summary or None if not found
+        """
+
+    @abstractmethod
+    def get_result_summary(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a simulation's result without reading its interactions.
+
+        Args:
+            simulation_id: Simulation ID
+
+        Returns:
+            The result as built by :func:`summarize_result`, or None if the
+            simulation is not found or has no result
+        """
+
+    @abstractmethod
+    def save(self, simulation_data: Dict[str, Any]):
+        """
+        Insert or replace a simulation.
+
+        Args:
+            simulation_data: Full simulation data including its ``id``
+        """
+
+    @abstractmethod
+    def transition(
+        self,
+        simulation_id: str,
+        from_statuses: Iterable[SimulationStatus],
+        changes: Dict[str, Any]
+    ) -> bool:
+        """
+        Atomically update a simulation if it is in one of the given statuses.
+
+        The status check and the write happen as one compare-and-set, so
+        concurrent API workers cannot both move a simulation out of the
+        same status or overwrite each other's transition.
+
+        Args:
+            simulation_id: Simulation ID
+            from_statuses: Statuses the simulation must currently have
+            changes: Fields to set (status, timestamps, error, result)
+
+        Returns:
+            True if updated, False if not found or in another status
+        """
+
+    @abstractmethod
+    def iter_interactions(self, simulation_id: str, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read a simulation's interactions in order, a batch at a time.
+
+        Args:
+            simulation_id: Simulation ID
+            batch_size: Maximum interactions per batch
+
+        Yields:
+            Lists of interaction data; nothing if the simulation has no result
+        """
+
+    @abstractmethod
+    def delete(self, simulation_id: str) -> bool:
+        """
+        Delete a simulation.
+
+        Args:
+            simulation_id: Simulation ID
+
+        Returns:
+            True if deleted, False if not found
+        """
+
+    @abstractmethod
+    def list_summaries(
+        self,
+        statuses: Optional[List[SimulationStatus]] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        after_key: Optional[Tuple[str, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[SimulationSummary], int]:
+        """
+        List simulation summaries ordered by (created_at, id) descending.
+
+        Args:
+            statuses: Only include simulations with one of these statuses
+            created_after: Only include simulations created at or after this ISO timestamp
+            created_before: Only include simulations created before this ISO timestamp
+            after_key: Only include simulations sorting after this (created_at, id) key
+            limit: Maximum number of summaries to return
+
+        Returns:
+            Tuple of (page of summaries, total count matching the filters)
+        """
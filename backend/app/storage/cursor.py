@@ -0,0 +1,40 @@
+"""Opaque cursors for keyset pagination over (created_at, id)."""
+
+import json
+import base64
+from typing import Optional, Tuple
+
+
+def encode_cursor(created_at: Optional[str], item_id: str) -> str:
+    """
+    Encode the sort key of the last item on a page as an opaque cursor.
+
+    Args:
+        created_at: Creation time of the item
+        item_id: Item ID
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([created_at or "", item_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (created_at, id) to pass as a repository's after_key
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), str(item_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
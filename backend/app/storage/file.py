@@ -0,0 +1,410 @@
+"""JSON file storage backend: one file per entity."""
+
+import json
+import bisect
+import heapq
+import threading
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+
+import orjson
+
+from app.core.locking import atomic_write, file_lock
+from app.models.agent import AgentResponse, AgentSearchQuery
+from app.models.simulation import SimulationStatus, SimulationSummary
+from app.services.catalog import FileCatalog
+from app.storage.agent_index import AgentSearchIndex
+from app.storage.base import AgentRepository, SimulationRepository, summarize_result
+from app.storage.json_stream import iter_json_array
+
+# Fields copied into the summary sidecar written next to each simulation
+SUMMARY_FIELDS = tuple(SimulationSummary.model_fields)
+
+# Sort key of simulation lists: (created_at, id)
+SummaryKey = Tuple[str, str]
+
+
+class SummaryIndex:
+    """
+    Simulation summaries in (created_at, id) order, overall and per status.
+
+    List pages bisect to their cursor and date bounds and merge the lists of
+    the requested statuses, so a page costs O(log n + limit) however many
+    simulations are stored. The summary catalog reports every change
+    through :meth:`update`, including files changed outside the API.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._summaries: Dict[str, SimulationSummary] = {}
+        self._order: List[SummaryKey] = []
+        self._by_status: Dict[SimulationStatus, List[SummaryKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _discard_sorted(items: List[SummaryKey], item: SummaryKey):
+        """Remove an item from a sorted list if present."""
+        position = bisect.bisect_left(items, item)
+        if position < len(items) and items[position] == item:
+            del items[position]
+
+    def update(self, simulation_id: str, summary: Optional[SimulationSummary]):
+        """
+        Index a new or changed summary, or forget a deleted one.
+
+        Args:
+            simulation_id: Simulation ID
+            summary: Current summary, or None if the simulation was deleted
+        """
+        with self._lock:
+            previous = self._summaries.pop(simulation_id, None)
+            if previous is not None:
+                key = (previous.created_at, simulation_id)
+                self._discard_sorted(self._order, key)
+                self._discard_sorted(self._by_status[previous.status], key)
+            if summary is None:
+                return
+            key = (summary.created_at, simulation_id)
+            self._summaries[simulation_id] = summary
+            bisect.insort(self._order, key)
+            bisect.insort(self._by_status.setdefault(summary.status, []), key)
+
+    def page(
+        self,
+        statuses: Optional[List[SimulationStatus]] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        after_key: Optional[SummaryKey] = None,
+        limit: int = 50
+    ) -> Tuple[List[SimulationSummary], int]:
+        """
+        Get a page of summaries ordered by (created_at, id) descending.
+
+        Args:
+            statuses: Only include simulations with one of these statuses
+            created_after: Only include simulations created at or after this ISO timestamp
+            created_before: Only include simulations created before this ISO timestamp
+            after_key: Only include simulations sorting after this (created_at, id) key
+            limit: Maximum number of summaries to return
+
+        Returns:
+            Tuple of (page of summaries, total count matching the filters)
+        """
+        with self._lock:
+            if statuses:
+                lists = [self._by_status.get(status, []) for status in {SimulationStatus(s) for s in statuses}]
+            else:
+                lists = [self._order]
+
+            total = 0
+            candidates = []
+            for keys in lists:
+                # IDs are never empty, so (timestamp, "") sorts before every key at that time
+                start = bisect.bisect_left(keys, (created_after, "")) if created_after else 0
+                end = bisect.bisect_left(keys, (created_before, "")) if created_before else len(keys)
+                total += max(0, end - start)
+                stop = min(end, bisect.bisect_left(keys, after_key)) if after_key else end
+                # Newest first: at most a page from just before the cursor
+                candidates.append(reversed(keys[max(start, stop - limit):stop]))
+
+            keys = islice(heapq.merge(*candidates, reverse=True), limit)
+            return [self._summaries[simulation_id] for _, simulation_id in keys], total
+
+
+class FileAgentRepository(AgentRepository):
+    """
+    Agents stored as ``<agents_dir>/<id>.json`` and served from a FileCatalog.
+
+    Searches are answered from an in-memory AgentSearchIndex that the
+    catalog updates on every change it sees.
+    """
+
+    def __init__(self, agents_dir: str, refresh_interval: float = 2.0):
+        """
+        Initialize the repository.
+
+        Args:
+            agents_dir: Directory holding agent files
+            refresh_interval: Minimum seconds between directory scans
+        """
+        self.agents_dir = Path(agents_dir)
+        self.agents_dir.mkdir(parents=True, exist_ok=True)
+        self.index = AgentSearchIndex()
+        self.catalog: FileCatalog[AgentResponse] = FileCatalog(
+            self.agents_dir,
+            loader=lambda data: AgentResponse(**data),
+            refresh_interval=refresh_interval,
+            on_change=self.index.update
+        )
+
+    def _get_agent_file_path(self, agent_id: str) -> Path:
+        """Get the file path for an agent."""
+        return self.agents_dir / f"{agent_id}.json"
+
+    def _save_agent_to_file(self, agent_id: str, agent_data: Dict[str, Any]):
+        """Save agent data to file, replacing it atomically."""
+        file_path = self._get_agent_file_path(agent_id)
+        atomic_write(file_path, json.dumps(agent_data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+    def load(self):
+        """Load all agents from disk into the in-memory catalog."""
+        self.catalog.load()
+
+    def count(self) -> int:
+        """Return the number of stored agents."""
+        return len(self.catalog)
+
+    def get(self, agent_id: str) -> Optional[AgentResponse]:
+        """Get an agent by ID."""
+        return self.catalog.get(agent_id)
+
+    def list(self) -> List[AgentResponse]:
+        """
+        List all agents.
+
+        Served from the in-memory catalog; files changed on disk are
+        picked up by the catalog's periodic stat scan.
+        """
+        return self.catalog.values()
+
+    def search(
+        self,
+        query: AgentSearchQuery,
+        after_key: Optional[Tuple[str, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[AgentResponse], int]:
+        """Find agents in the in-memory index, after picking up changed files."""
+        self.catalog.refresh()
+        return self.index.search(query, after_key, limit)
+
+    def save(self, agent_data: Dict[str, Any]) -> AgentResponse:
+        """Insert or replace an agent."""
+        agent_id = agent_data["id"]
+        self._save_agent_to_file(agent_id, agent_data)
+
+        agent = AgentResponse(**agent_data)
+        self.catalog.put(agent_id, agent)
+        return agent
+
+    def save_many(self, agents_data: List[Dict[str, Any]]) -> List[AgentResponse]:
+        """Insert or replace a batch of agents, one file each."""
+        return [self.save(agent_data) for agent_data in agents_data]
+
+    def delete(self, agent_id: str) -> bool:
+        """Delete an agent."""
+        file_path = self._get_agent_file_path(agent_id)
+        if not file_path.exists():
+            return False
+
+        file_path.unlink()
+        self.catalog.discard(agent_id)
+        return True
+
+
+class FileSimulationRepository(SimulationRepository):
+    """
+    Simulations stored as ``<simulations_dir>/<id>.json``.
+
+    Each save also writes a small summary sidecar to
+    ``<simulations_dir>/summaries/<id>.json``; list queries are answered
+    from a SummaryIndex over those summaries so result payloads are never
+    read and pages do not scan the whole history. Results are summarized
+    the same way in ``<simulations_dir>/results/<id>.json``, without their
+    interactions.
+
+    Files are replaced atomically, and writes to a simulation hold its
+    lock file in ``<simulations_dir>/.locks`` so several API processes can
+    share the directory.
+    """
+
+    def __init__(self, simulations_dir: str, refresh_interval: float = 2.0):
+        """
+        Initialize the repository.
+
+        Args:
+            simulations_dir: Directory holding simulation files
+            refresh_interval: Minimum seconds between directory scans
+        """
+        self.simulations_dir = Path(simulations_dir)
+        self.simulations_dir.mkdir(parents=True, exist_ok=True)
+        self.summaries_dir = self.simulations_dir / "summaries"
+        self.summaries_dir.mkdir(parents=True, exist_ok=True)
+        self.results_dir = self.simulations_dir / "results"
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.locks_dir = self.simulations_dir / ".locks"
+        self.index = SummaryIndex()
+        self.summaries: FileCatalog[SimulationSummary] = FileCatalog(
+            self.summaries_dir,
+            loader=lambda data: SimulationSummary(**data),
+            refresh_interval=refresh_interval,
+            on_change=self.index.update
+        )
+
+    def _get_simulation_file_path(self, simulation_id: str) -> Path:
+        """Get the file path for a simulation."""
+        return self.simulations_dir / f"{simulation_id}.json"
+
+    def _get_summary_file_path(self, simulation_id: str) -> Path:
+        """Get the file path for a simulation summary."""
+        return self.summaries_dir / f"{simulation_id}.json"
+
+    def _get_result_file_path(self, simulation_id: str) -> Path:
+        """Get the file path for a simulation's result summary."""
+        return self.results_dir / f"{simulation_id}.json"
+
+    def _lock(self, simulation_id: str):
+        """Lock a simulation's files against writers in any process."""
+        return file_lock(self.locks_dir / f"{simulation_id}.lock")
+
+    def _load_simulation_from_file(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """Load simulation data from file."""
+        file_path = self._get_simulation_file_path(simulation_id)
+        if not file_path.exists():
+            return None
+
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+
+    def _save_simulation_to_file(self, simulation_id: str, simulation_data: Dict[str, Any]):
+        """Save simulation data to file as compact UTF-8 JSON."""
+        atomic_write(self._get_simulation_file_path(simulation_id), orjson.dumps(simulation_data))
+        self._save_summary_to_file(simulation_id, simulation_data)
+        self._save_result_summary_to_file(simulation_id, simulation_data)
+
+    def _save_result_summary_to_file(self, simulation_id: str, simulation_data: Dict[str, Any]):
+        """Save the result of a simulation without its interactions, if it has one."""
+        result = summarize_result(simulation_data.get("result"))
+        if result is None:
+            self._get_result_file_path(simulation_id).unlink(missing_ok=True)
+        else:
+            atomic_write(self._get_result_file_path(simulation_id), orjson.dumps(result))
+
+    def _save_summary_to_file(self, simulation_id: str, simulation_data: Dict[str, Any]):
+        """Save the summary projection of a simulation next to its full file."""
+        summary_data = {field: simulation_data.get(field) for field in SUMMARY_FIELDS}
+        atomic_write(self._get_summary_file_path(simulation_id), orjson.dumps(summary_data))
+        self.summaries.put(simulation_id, SimulationSummary(**summary_data))
+
+    def load(self):
+        """
+        Build missing or stale summary files and load them into memory.
+
+        Only simulations whose full file is newer than its summary are read,
+        so this is a one-off cost for data written before summaries existed.
+        """
+        for simulation_file in self.simulations_dir.glob("*.json"):
+            summary_file = self._get_summary_file_path(simulation_file.stem)
+            if summary_file.exists() and summary_file.stat().st_mtime_ns >= simulation_file.stat().st_mtime_ns:
+                continue
+            try:
+                with open(simulation_file, 'rb') as f:
+                    self._save_summary_to_file(simulation_file.stem, orjson.loads(f.read()))
+            except Exception as e:
+                print(f"Error indexing simulation from {simulation_file}: {e}")
+
+        for derived_file in [*self.summaries_dir.glob("*.json"), *self.results_dir.glob("*.json")]:
+            if not self._get_simulation_file_path(derived_file.stem).exists():
+                derived_file.unlink()
+
+        self.summaries.load()
+
+    def count(self) -> int:
+        """Return the number of stored simulations."""
+        return len(self.summaries)
+
+    def get(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """Get the full data of a simulation."""
+        return self._load_simulation_from_file(simulation_id)
+
+    def get_summary(self, simulation_id: str) -> Optional[SimulationSummary]:
+        """Get a simulation's summary from the in-memory catalog."""
+        return self.summaries.get(simulation_id)
+
+    def get_result_summary(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a simulation's result from its sidecar, building it if missing or stale."""
+        result_file = self._get_result_file_path(simulation_id)
+        simulation_file = self._get_simulation_file_path(simulation_id)
+        try:
+            if result_file.stat().st_mtime_ns >= simulation_file.stat().st_mtime_ns:
+                with open(result_file, 'rb') as f:
+                    return orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+
+        # Written before result sidecars existed, or without a result
+        with self._lock(simulation_id):
+            simulation_data = self._load_simulation_from_file(simulation_id)
+            if simulation_data is None:
+                return None
+            self._save_result_summary_to_file(simulation_id, simulation_data)
+        return summarize_result(simulation_data.get("result"))
+
+    def save(self, simulation_data: Dict[str, Any]):
+        """Insert or replace a simulation."""
+        with self._lock(simulation_data["id"]):
+            self._save_simulation_to_file(simulation_data["id"], simulation_data)
+
+    def transition(
+        self,
+        simulation_id: str,
+        from_statuses: Iterable[SimulationStatus],
+        changes: Dict[str, Any]
+    ) -> bool:
+        """Update a simulation under its lock if its status on disk matches."""
+        allowed = {SimulationStatus(status) for status in from_statuses}
+        with self._lock(simulation_id):
+            simulation_data = self._load_simulation_from_file(simulation_id)
+            if simulation_data is None or SimulationStatus(simulation_data["status"]) not in allowed:
+                return False
+            simulation_data.update(changes)
+            self._save_simulation_to_file(simulation_id, simulation_data)
+        return True
+
+    def iter_interactions(self, simulation_id: str, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read a simulation's interactions in batches, streaming them from its file.
+
+        Only the current batch is held in memory. Files are replaced
+        atomically, so the open file stays one consistent version.
+        """
+        try:
+            f = open(self._get_simulation_file_path(simulation_id), 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            batch = []
+            for interaction in iter_json_array(f, ("result", "interactions")):
+                batch.append(interaction)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    def delete(self, simulation_id: str) -> bool:
+        """Delete a simulation."""
+        with self._lock(simulation_id):
+            file_path = self._get_simulation_file_path(simulation_id)
+            if not file_path.exists():
+                return False
+
+            file_path.unlink()
+            self._get_summary_file_path(simulation_id).unlink(missing_ok=True)
+            self._get_result_file_path(simulation_id).unlink(missing_ok=True)
+            self.summaries.discard(simulation_id)
+            # Unlinked while held: anyone waiting on it retries on a new file
+            (self.locks_dir / f"{simulation_id}.lock").unlink(missing_ok=True)
+        return True
+
+    def list_summaries(
+        self,
+        statuses: Optional[List[SimulationStatus]] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        after_key: Optional[Tuple[str, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[SimulationSummary], int]:
+        """List simulation summaries from the sorted index, after picking up changed files."""
+        self.summaries.refresh()
+        return self.index.page(statuses, created_after, created_before, after_key, limit)
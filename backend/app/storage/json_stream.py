@@ -0,0 +1,110 @@
+"""Incremental reading of one array nested in a large JSON document."""
+
+import json
+from typing import Any, Iterator, Sequence, TextIO
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Buffered cursor over a text file that keeps only unconsumed text."""
+
+    def __init__(self, f: TextIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read the next chunk, dropping consumed text; False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at the end."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        """Consume a structural character."""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the buffered JSON")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete value, reading more text until it is."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(f: TextIO, path: Sequence[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the elements of an array inside nested JSON objects one at a time.
+
+    Only the current element and the text of sibling values on the way
+    are held in memory, so a long array of small items is read in bounded
+    memory whatever the document's size.
+
+    Args:
+        f: Text file positioned at the start of a JSON object
+        path: Keys leading from the top-level object to the array
+        chunk_size: Characters read at a time
+
+    Yields:
+        Decoded array elements; nothing if a key is missing or a value on
+        the path is null
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    reader = _Reader(f, chunk_size)
+    decoder = json.JSONDecoder()
+    for depth, key in enumerate(path):
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                return
+            name = reader.value(decoder)
+            reader.expect(":")
+            if name == key:
+                break
+            reader.value(decoder)
+            if reader.peek() == ",":
+                reader.pos += 1
+        if reader.peek() == "n":
+            return
+        if depth == len(path) - 1:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value(decoder)
+                if reader.peek() == ",":
+                    reader.pos += 1
+                    continue
+                reader.expect("]")
+                return
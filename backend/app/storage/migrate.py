@@ -0,0 +1,67 @@
+"""
+Import JSON file storage into the SQLite backend.
+
+Usage:
+    python -m app.storage.migrate [--agents-dir agents] [--simulations-dir simulations] [--database data/optimus.db]
+
+Records are upserted by ID, so the import can be re-run safely.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from app.core.config import settings
+from app.storage.sqlite import SQLiteDatabase, SQLiteAgentRepository, SQLiteSimulationRepository
+
+
+def import_directory(directory: Path, save) -> tuple[int, int]:
+    """
+    Import every ``*.json`` file in a directory.
+
+    Args:
+        directory: Directory of entity files
+        save: Repository save function
+
+    Returns:
+        Tuple of (imported count, failed count)
+    """
+    imported = failed = 0
+    if not directory.exists():
+        return imported, failed
+
+    for entity_file in sorted(directory.glob("*.json")):
+        try:
+            with open(entity_file, 'r', encoding='utf-8') as f:
+                save(json.load(f))
+            imported += 1
+        except Exception as e:
+            print(f"✗ {entity_file}: {e}")
+            failed += 1
+
+    return imported, failed
+
+
+def main():
+    """Run the migration from the command line."""
+    parser = argparse.ArgumentParser(description="Import agents and simulations into SQLite")
+    parser.add_argument("--agents-dir", default=settings.agents_dir)
+    parser.add_argument("--simulations-dir", default=settings.simulations_dir)
+    parser.add_argument("--database", default=settings.database_path)
+    args = parser.parse_args()
+
+    database = SQLiteDatabase(args.database)
+    agents = SQLiteAgentRepository(database)
+    simulations = SQLiteSimulationRepository(database)
+
+    imported, failed = import_directory(Path(args.agents_dir), agents.save)
+    print(f"Agents: {imported} imported, {failed} failed")
+
+    imported, failed = import_directory(Path(args.simulations_dir), simulations.save)
+    print(f"Simulations: {imported} imported, {failed} failed")
+
+    print(f"\nDatabase written to {database.path}. Set STORAGE_BACKEND=sqlite to use it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,588 @@
+"""Embedded SQLite storage backend."""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from pathlib import Path
+
+from app.models.agent import AgentResponse, AgentSearchQuery
+from app.models.simulation import SimulationStatus, SimulationSummary
+from app.storage.agent_index import persona_terms, query_terms
+from app.storage.base import AgentRepository, SimulationRepository, summarize_result
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    age INTEGER,
+    gender TEXT,
+    nationality TEXT,
+    residence TEXT,
+    occupation_title TEXT,
+    persona TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_agents_name ON agents(name);
+CREATE INDEX IF NOT EXISTS idx_agents_age ON agents(age);
+CREATE INDEX IF NOT EXISTS idx_agents_nationality ON agents(nationality);
+CREATE INDEX IF NOT EXISTS idx_agents_residence ON agents(residence);
+CREATE INDEX IF NOT EXISTS idx_agents_occupation_title ON agents(occupation_title);
+CREATE INDEX IF NOT EXISTS idx_agents_created_at ON agents(created_at);
+
+-- Search index: a compact integer key per agent, and one row per persona word
+CREATE TABLE IF NOT EXISTS agent_search (
+    key INTEGER PRIMARY KEY,
+    agent_id TEXT NOT NULL UNIQUE REFERENCES agents(id) ON DELETE CASCADE,
+    created_at TEXT NOT NULL,
+    age INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_agent_search_order ON agent_search(created_at, agent_id);
+CREATE INDEX IF NOT EXISTS idx_agent_search_age ON agent_search(age);
+
+CREATE TABLE IF NOT EXISTS agent_terms (
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    agent_key INTEGER NOT NULL REFERENCES agent_search(key) ON DELETE CASCADE,
+    PRIMARY KEY (field, term, agent_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_agent_terms_agent ON agent_terms(agent_key);
+
+CREATE TABLE IF NOT EXISTS simulations (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    agent_ids TEXT NOT NULL,
+    config TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    error TEXT,
+    result TEXT,
+    fork TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_simulations_created_at ON simulations(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_simulations_status ON simulations(status, created_at, id);
+
+CREATE TABLE IF NOT EXISTS interactions (
+    simulation_id TEXT NOT NULL REFERENCES simulations(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    agent_id TEXT NOT NULL,
+    agent_name TEXT NOT NULL,
+    message_type TEXT NOT NULL,
+    content TEXT NOT NULL,
+    step INTEGER,
+    PRIMARY KEY (simulation_id, seq)
+);
+"""
+
+SUMMARY_COLUMNS = "id, name, agent_ids, config, status, created_at, started_at, completed_at, error, fork"
+
+INTERACTION_FIELDS = ("timestamp", "agent_id", "agent_name", "message_type", "content", "step")
+
+
+class SQLiteDatabase:
+    """
+    Shared SQLite database file with one connection per thread.
+
+    The database runs in WAL mode so readers never block the single writer.
+    """
+
+    def __init__(self, path: str, schema: str = SCHEMA):
+        """
+        Initialize the database.
+
+        Args:
+            path: Path of the database file
+            schema: DDL script applied when the first connection opens
+        """
+        self.path = Path(path)
+        self.schema = schema
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self) -> sqlite3.Connection:
+        """Get the connection for the current thread, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; writes use explicit transactions via transaction()
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        """Create tables and indexes once per process."""
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(self.schema)
+                self._schema_ready = True
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in a write transaction, committing on success."""
+        conn = self.connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+class SQLiteAgentRepository(AgentRepository):
+    """
+    Agents stored in the ``agents`` table, persona kept as JSON.
+
+    Search entries in ``agent_search`` and ``agent_terms`` are rewritten in
+    the same transaction as their agent.
+    """
+
+    def __init__(self, database: SQLiteDatabase):
+        """
+        Initialize the repository.
+
+        Args:
+            database: Shared database
+        """
+        self.db = database
+
+    @staticmethod
+    def _row_to_agent(row: sqlite3.Row) -> AgentResponse:
+        """Convert an agents row into a response model."""
+        return AgentResponse(
+            id=row["id"],
+            type=row["type"],
+            persona=json.loads(row["persona"]),
+            created_at=row["created_at"],
+            updated_at=row["updated_at"]
+        )
+
+    @staticmethod
+    def _agent_to_row(agent_data: Dict[str, Any]) -> Tuple:
+        """Flatten agent data into column values, indexed persona fields first."""
+        persona = agent_data["persona"]
+        occupation = persona.get("occupation") or {}
+        return (
+            agent_data["id"],
+            agent_data.get("type", "TinyPerson"),
+            persona["name"],
+            persona.get("age"),
+            persona.get("gender"),
+            persona.get("nationality"),
+            persona.get("residence"),
+            occupation.get("title"),
+            json.dumps(persona, ensure_ascii=False),
+            agent_data.get("created_at"),
+            agent_data.get("updated_at"),
+        )
+
+    @staticmethod
+    def _index_agents(conn: sqlite3.Connection, agents: List[AgentResponse]):
+        """Rewrite the search index entries of agents."""
+        # The last version wins when a batch repeats an ID
+        agents = list({agent.id: agent for agent in agents}.values())
+        # Deleting the key row cascades to its terms
+        conn.executemany("DELETE FROM agent_search WHERE agent_id = ?", ((agent.id,) for agent in agents))
+        for agent in agents:
+            key = conn.execute(
+                "INSERT INTO agent_search (agent_id, created_at, age) VALUES (?, ?, ?)",
+                (agent.id, agent.created_at or "", agent.persona.age)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO agent_terms (field, term, agent_key) VALUES (?, ?, ?)",
+                ((field, term, key) for field, term in persona_terms(agent.persona.model_dump()))
+            )
+
+    def load(self):
+        """Open the database and index agents written without search entries."""
+        conn = self.db.connection()
+        rows = conn.execute(
+            "SELECT * FROM agents a WHERE NOT EXISTS (SELECT 1 FROM agent_search s WHERE s.agent_id = a.id)"
+        ).fetchall()
+        if rows:
+            with self.db.transaction() as conn:
+                self._index_agents(conn, [self._row_to_agent(row) for row in rows])
+
+    def count(self) -> int:
+        """Return the number of stored agents."""
+        return self.db.connection().execute("SELECT COUNT(*) FROM agents").fetchone()[0]
+
+    def get(self, agent_id: str) -> Optional[AgentResponse]:
+        """Get an agent by ID."""
+        row = self.db.connection().execute(
+            "SELECT * FROM agents WHERE id = ?", (agent_id,)
+        ).fetchone()
+        return self._row_to_agent(row) if row else None
+
+    def list(self) -> List[AgentResponse]:
+        """List all agents."""
+        rows = self.db.connection().execute("SELECT * FROM agents ORDER BY created_at, id")
+        return [self._row_to_agent(row) for row in rows]
+
+    def search(
+        self,
+        query: AgentSearchQuery,
+        after_key: Optional[Tuple[str, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[AgentResponse], int]:
+        """
+        Find agents through the agent_search and agent_terms indexes.
+
+        Matches are counted by walking the smallest posting list and probing
+        the others by primary key. A page is read either by sorting those
+        matches or, when matches are common enough that a page is found
+        sooner, by walking the result order and probing every filter.
+        """
+        conn = self.db.connection()
+        postings = []
+        for field, term in query_terms(query):
+            size = conn.execute(
+                "SELECT COUNT(*) FROM agent_terms WHERE field = ? AND term = ?", (field, term)
+            ).fetchone()[0]
+            if size == 0:
+                return [], 0
+            postings.append((size, field, term))
+        postings.sort()
+
+        # Filters on an agent_search row "s", most selective first
+        clauses = []
+        params: List[Any] = []
+        for _, field, term in postings:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM agent_terms t WHERE t.field = ? AND t.term = ? AND t.agent_key = s.key)"
+            )
+            params.extend((field, term))
+        if query.age_min is not None:
+            clauses.append("s.age >= ?")
+            params.append(query.age_min)
+        if query.age_max is not None:
+            clauses.append("s.age <= ?")
+            params.append(query.age_max)
+
+        if postings:
+            # The smallest posting list drives; its own probe is redundant
+            driver = "FROM agent_terms d JOIN agent_search s ON s.key = d.agent_key WHERE d.field = ? AND d.term = ?"
+            driver_params = [postings[0][1], postings[0][2], *params[2:]]
+            driver_clauses = clauses[1:]
+        else:
+            driver = "FROM agent_search s WHERE 1"
+            driver_params = list(params)
+            driver_clauses = clauses
+        driver += "".join(f" AND {clause}" for clause in driver_clauses)
+
+        total = conn.execute(f"SELECT COUNT(*) {driver}", driver_params).fetchone()[0]
+        if total == 0:
+            return [], 0
+
+        after = ""
+        if after_key:
+            after = " AND (s.created_at, s.agent_id) > (?, ?)"
+        # Rows read to fill the page: the driving rows when sorting the
+        # matches, about limit / selectivity when walking the result order
+        driver_rows = postings[0][0] if postings else total
+        if clauses and driver_rows * total < limit * self.count():
+            rows = conn.execute(
+                f"SELECT s.agent_id {driver}{after} ORDER BY s.created_at, s.agent_id LIMIT ?",
+                [*driver_params, *(after_key or ()), limit]
+            )
+        else:
+            # Unary + keeps the planner off the age index
+            walk = " AND ".join(clause.replace("s.age", "+s.age") for clause in clauses) or "1"
+            rows = conn.execute(
+                f"SELECT s.agent_id FROM agent_search s INDEXED BY idx_agent_search_order "
+                f"WHERE {walk}{after} ORDER BY s.created_at, s.agent_id LIMIT ?",
+                [*params, *(after_key or ()), limit]
+            )
+        agent_ids = [row[0] for row in rows]
+        if not agent_ids:
+            return [], total
+
+        agents = {
+            row["id"]: self._row_to_agent(row)
+            for row in conn.execute(
+                f"SELECT * FROM agents WHERE id IN ({', '.join('?' * len(agent_ids))})", agent_ids
+            )
+        }
+        return [agents[agent_id] for agent_id in agent_ids], total
+
+    def save(self, agent_data: Dict[str, Any]) -> AgentResponse:
+        """Insert or replace an agent."""
+        agent = AgentResponse(**agent_data)
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._agent_to_row(agent.model_dump())
+            )
+            self._index_agents(conn, [agent])
+        return agent
+
+    def save_many(self, agents_data: List[Dict[str, Any]]) -> List[AgentResponse]:
+        """Insert or replace a batch of agents in one transaction."""
+        agents = [AgentResponse(**agent_data) for agent_data in agents_data]
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._agent_to_row(agent.model_dump()) for agent in agents)
+            )
+            self._index_agents(conn, agents)
+        return agents
+
+    def delete(self, agent_id: str) -> bool:
+        """Delete an agent."""
+        with self.db.transaction() as conn:
+            cursor = conn.execute("DELETE FROM agents WHERE id = ?", (agent_id,))
+        return cursor.rowcount > 0
+
+
+class SQLiteSimulationRepository(SimulationRepository):
+    """
+    Simulations stored in the ``simulations`` table.
+
+    Interactions live in their own table so summary queries never touch
+    them; the ``result`` column keeps only the remaining result fields.
+    """
+
+    def __init__(self, database: SQLiteDatabase):
+        """
+        Initialize the repository.
+
+        Args:
+            database: Shared database
+        """
+        self.db = database
+
+    @staticmethod
+    def _row_to_summary(row: sqlite3.Row) -> SimulationSummary:
+        """Convert a simulations row into a summary model."""
+        return SimulationSummary(
+            id=row["id"],
+            name=row["name"],
+            agent_ids=json.loads(row["agent_ids"]),
+            config=json.loads(row["config"]),
+            status=row["status"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            completed_at=row["completed_at"],
+            error=row["error"],
+            fork=json.loads(row["fork"]) if row["fork"] else None
+        )
+
+    def load(self):
+        """Open the database, create the schema and add columns introduced later."""
+        conn = self.db.connection()
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(interactions)")}
+        if "step" not in columns:
+            conn.execute("ALTER TABLE interactions ADD COLUMN step INTEGER")
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(simulations)")}
+        if "fork" not in columns:
+            conn.execute("ALTER TABLE simulations ADD COLUMN fork TEXT")
+
+    def count(self) -> int:
+        """Return the number of stored simulations."""
+        return self.db.connection().execute("SELECT COUNT(*) FROM simulations").fetchone()[0]
+
+    def get(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """Get the full data of a simulation, reassembling its interactions."""
+        conn = self.db.connection()
+        row = conn.execute("SELECT * FROM simulations WHERE id = ?", (simulation_id,)).fetchone()
+        if not row:
+            return None
+
+        simulation_data = self._row_to_summary(row).model_dump(mode="json")
+        result = json.loads(row["result"]) if row["result"] else None
+        if result is not None:
+            result["interactions"] = [
+                dict(zip(INTERACTION_FIELDS, interaction))
+                for interaction in conn.execute(
+                    f"SELECT {', '.join(INTERACTION_FIELDS)} FROM interactions "
+                    "WHERE simulation_id = ? ORDER BY seq",
+                    (simulation_id,)
+                )
+            ]
+        simulation_data["result"] = result
+        return simulation_data
+
+    def get_summary(self, simulation_id: str) -> Optional[SimulationSummary]:
+        """Get a simulation's summary without touching its interactions."""
+        row = self.db.connection().execute(
+            f"SELECT {SUMMARY_COLUMNS} FROM simulations WHERE id = ?", (simulation_id,)
+        ).fetchone()
+        return self._row_to_summary(row) if row else None
+
+    def get_result_summary(self, simulation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a simulation's result, counting its interactions in SQL."""
+        conn = self.db.connection()
+        row = conn.execute("SELECT result FROM simulations WHERE id = ?", (simulation_id,)).fetchone()
+        if not row or not row["result"]:
+            return None
+
+        summary = summarize_result(json.loads(row["result"]))
+        summary["message_types"] = {
+            message_type: count
+            for message_type, count in conn.execute(
+                "SELECT message_type, COUNT(*) FROM interactions WHERE simulation_id = ? GROUP BY message_type",
+                (simulation_id,)
+            )
+        }
+        return summary
+
+    def save(self, simulation_data: Dict[str, Any]):
+        """Insert or replace a simulation and its interactions."""
+        simulation_id = simulation_data["id"]
+        summary = SimulationSummary(**simulation_data)
+
+        result = simulation_data.get("result")
+        interactions = []
+        if result is not None:
+            result = dict(result)
+            interactions = result.pop("interactions", None) or []
+
+        with self.db.transaction() as conn:
+            conn.execute(
+                f"INSERT INTO simulations ({SUMMARY_COLUMNS}, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET "
+                "name = excluded.name, agent_ids = excluded.agent_ids, config = excluded.config, "
+                "status = excluded.status, created_at = excluded.created_at, "
+                "started_at = excluded.started_at, completed_at = excluded.completed_at, "
+                "error = excluded.error, fork = excluded.fork, result = excluded.result",
+                (
+                    simulation_id,
+                    summary.name,
+                    json.dumps(summary.agent_ids),
+                    summary.config.model_dump_json(),
+                    summary.status.value,
+                    summary.created_at,
+                    summary.started_at,
+                    summary.completed_at,
+                    summary.error,
+                    summary.fork.model_dump_json() if summary.fork else None,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                )
+            )
+            self._replace_interactions(conn, simulation_id, interactions)
+
+    @staticmethod
+    def _replace_interactions(conn: sqlite3.Connection, simulation_id: str, interactions: List[Dict[str, Any]]):
+        """Replace a simulation's interaction rows inside the caller's transaction."""
+        conn.execute("DELETE FROM interactions WHERE simulation_id = ?", (simulation_id,))
+        conn.executemany(
+            f"INSERT INTO interactions (simulation_id, seq, {', '.join(INTERACTION_FIELDS)}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (simulation_id, seq, *(interaction.get(field) for field in INTERACTION_FIELDS))
+                for seq, interaction in enumerate(interactions)
+            )
+        )
+
+    def transition(
+        self,
+        simulation_id: str,
+        from_statuses: Iterable[SimulationStatus],
+        changes: Dict[str, Any]
+    ) -> bool:
+        """Update a simulation with a conditional UPDATE in one write transaction."""
+        changes = dict(changes)
+        assignments = {}
+        for field in ("status", "started_at", "completed_at", "error"):
+            if field in changes:
+                value = changes.pop(field)
+                assignments[field] = SimulationStatus(value).value if field == "status" else value
+        interactions = None
+        if "result" in changes:
+            result = changes.pop("result")
+            interactions = []
+            if result is not None:
+                result = dict(result)
+                interactions = result.pop("interactions", None) or []
+            assignments["result"] = json.dumps(result, ensure_ascii=False) if result is not None else None
+        if changes:
+            raise ValueError(f"Unsupported transition fields: {', '.join(sorted(changes))}")
+
+        statuses = [SimulationStatus(status).value for status in from_statuses]
+        with self.db.transaction() as conn:
+            cursor = conn.execute(
+                f"UPDATE simulations SET {', '.join(f'{field} = ?' for field in assignments) or 'id = id'} "
+                f"WHERE id = ? AND status IN ({', '.join('?' for _ in statuses)})",
+                (*assignments.values(), simulation_id, *statuses)
+            )
+            if cursor.rowcount == 0:
+                return False
+            if interactions is not None:
+                self._replace_interactions(conn, simulation_id, interactions)
+        return True
+
+    def iter_interactions(self, simulation_id: str, batch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Read a simulation's interactions in batches.
+
+        Each batch is a separate keyset query on the calling thread's
+        connection, so no cursor or read transaction outlives a batch and
+        consumers may resume iteration from another thread.
+        """
+        last_seq = -1
+        while True:
+            rows = self.db.connection().execute(
+                f"SELECT seq, {', '.join(INTERACTION_FIELDS)} FROM interactions "
+                "WHERE simulation_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (simulation_id, last_seq, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            last_seq = rows[-1]["seq"]
+            yield [dict(zip(INTERACTION_FIELDS, tuple(row)[1:])) for row in rows]
+
+    def delete(self, simulation_id: str) -> bool:
+        """Delete a simulation and its interactions."""
+        with self.db.transaction() as conn:
+            cursor = conn.execute("DELETE FROM simulations WHERE id = ?", (simulation_id,))
+        return cursor.rowcount > 0
+
+    def list_summaries(
+        self,
+        statuses: Optional[List[SimulationStatus]] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        after_key: Optional[Tuple[str, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[SimulationSummary], int]:
+        """List simulation summaries ordered by (created_at, id) descending."""
+        clauses = []
+        params: List[Any] = []
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(SimulationStatus(s).value for s in statuses)
+        if created_after:
+            clauses.append("created_at >= ?")
+            params.append(created_after)
+        if created_before:
+            clauses.append("created_at < ?")
+            params.append(created_before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        conn = self.db.connection()
+        total = conn.execute(f"SELECT COUNT(*) FROM simulations {where}", params).fetchone()[0]
+
+        if after_key:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(after_key)
+            where = f"WHERE {' AND '.join(clauses)}"
+
+        rows = conn.execute(
+            f"SELECT {SUMMARY_COLUMNS} FROM simulations {where} "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit)
+        )
+        return [self._row_to_summary(row) for row in rows], total
@@ -0,0 +1 @@
+"""Offline benchmarks for the OptimusSim backend (run with ``python -m benchmarks``)."""
@@ -0,0 +1,161 @@
+"""
+Run the offline benchmark suite.
+
+No API key or network access is needed: TinyTroupe and the LLM are
+replaced by deterministic fakes, and all storage goes to a temporary
+directory.
+
+Usage (from the backend directory):
+    python -m benchmarks [--quick] [--suite NAME ...] [--output results.json]
+    python -m benchmarks --compare baseline.json [--threshold 0.2]
+"""
+
+import os
+import sys
+import json
+import argparse
+import shutil
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _git_revision() -> Optional[str]:
+    """Get the current git commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _latency_metrics(results: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Yield (dotted path, value) for every millisecond metric in results."""
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from _latency_metrics(value, path)
+        elif key.endswith("_ms") and isinstance(value, (int, float)):
+            yield path, value
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Find latency metrics that got slower than a baseline run.
+
+    Args:
+        current: Results of this run
+        baseline: Results of an earlier run
+        threshold: Allowed relative slowdown (0.2 = 20%)
+
+    Returns:
+        Descriptions of regressed metrics
+    """
+    previous = dict(_latency_metrics(baseline["results"]))
+    regressions = []
+    for path, value in _latency_metrics(current["results"]):
+        # Ignore sub-millisecond noise
+        before = previous.get(path)
+        if before and max(before, value) >= 1.0 and value > before * (1 + threshold):
+            regressions.append(f"{path}: {before:.2f} ms -> {value:.2f} ms (+{(value / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the selected suites and print or save their results."""
+    parser = argparse.ArgumentParser(description="Offline OptimusSim benchmarks")
+    parser.add_argument("--suite", action="append", dest="suites",
+                        help="Suite to run (repeatable; default: all)")
+    parser.add_argument("--quick", action="store_true",
+                        help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        help="Entity counts for list_latency (default: 10 1000 10000)")
+    parser.add_argument("--interactions", type=int, default=5000,
+                        help="Interactions in the serialization and response_encoding results")
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="Fake LLM latency per call in seconds")
+    parser.add_argument("--tokens", type=int, default=40,
+                        help="Words per fake LLM completion")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output).resolve() if args.output else None
+    baseline_path = Path(args.compare).resolve() if args.compare else None
+
+    # The app creates its data directories relative to the working directory
+    sys.path.insert(0, str(BACKEND_DIR))
+    workdir = Path(tempfile.mkdtemp(prefix="optimus-bench-"))
+    os.chdir(workdir)
+
+    from benchmarks.suites import SUITES
+
+    names = args.suites or list(SUITES)
+    unknown = set(names) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suite(s): {', '.join(sorted(unknown))}")
+
+    options = {
+        "agent_crud": {"operations": 100 if args.quick else 300},
+        "list_latency": {"sizes": args.sizes or ([10, 1000] if args.quick else [10, 1000, 10000])},
+        "scheduling": {"jobs": 10 if args.quick else 50},
+        "serialization": {"interactions": args.interactions},
+        "response_encoding": {"interactions": args.interactions},
+        "fake_simulation": {"latency": args.latency, "tokens": args.tokens},
+        "persona_cache": {"agents": 50 if args.quick else 200},
+        "agent_search": {"agents": 2000 if args.quick else 50000},
+        "transcript_analytics": {"interactions": 1000 if args.quick else 10000},
+        "interaction_analytics": {"simulations": 30 if args.quick else 300},
+    }
+
+    results: Dict[str, Any] = {}
+    try:
+        for name in names:
+            print(f"Running {name}...", file=sys.stderr)
+            suite_dir = workdir / name
+            suite_dir.mkdir()
+            results[name] = SUITES[name](suite_dir, **options[name])
+    finally:
+        os.chdir(BACKEND_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {name: options[name] for name in names},
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if output:
+        output.write_text(text + "\n", encoding="utf-8")
+        print(f"Results written to {output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if baseline_path:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"✗ {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"✓ No regressions beyond {args.threshold:.0%}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
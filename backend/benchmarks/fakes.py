@@ -0,0 +1,246 @@
+"""
+Deterministic stand-ins for TinyTroupe and the LLM.
+
+:func:`install_fake_tinytroupe` registers fake ``tinytroupe`` modules in
+``sys.modules`` so the real simulation code paths run without network
+access or an API key. Completions are derived from a hash of the request,
+so repeated runs produce identical transcripts.
+"""
+
+import sys
+import copy
+import json
+import time
+import types
+import hashlib
+import threading
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+WORDS = (
+    "price", "quality", "brand", "delivery", "support", "design", "value",
+    "trust", "feature", "habit", "budget", "review", "friend", "store",
+)
+
+
+@dataclass
+class FakeLLMConfig:
+    """Behaviour of the fake LLM."""
+
+    latency: float = 0.0
+    tokens: int = 40
+    thoughts_per_action: int = 1
+
+
+class FakeLLM:
+    """Deterministic completion generator with configurable latency and size."""
+
+    def __init__(self, config: FakeLLMConfig):
+        """
+        Initialize the fake LLM.
+
+        Args:
+            config: Latency and completion size
+        """
+        self.config = config
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages: List[Dict[str, Any]]) -> str:
+        """
+        Produce a completion for messages.
+
+        Args:
+            messages: Chat messages
+
+        Returns:
+            Completion text of ``config.tokens`` words
+        """
+        with self._lock:
+            self.calls += 1
+        if self.config.latency:
+            time.sleep(self.config.latency)
+        digest = hashlib.sha256(repr(messages).encode("utf-8")).digest()
+        return " ".join(WORDS[digest[i % len(digest)] % len(WORDS)] for i in range(self.config.tokens))
+
+
+def install_fake_tinytroupe(config: Optional[FakeLLMConfig] = None) -> FakeLLM:
+    """
+    Replace TinyTroupe with fakes backed by a FakeLLM.
+
+    Args:
+        config: Fake LLM behaviour
+
+    Returns:
+        The FakeLLM used by the fake modules
+    """
+    llm = FakeLLM(config or FakeLLMConfig())
+
+    class OpenAIClient:
+        """Fake client answering from the FakeLLM, reporting word counts as tokens."""
+
+        def _raw_model_call(self, model, chat_api_params):
+            messages = chat_api_params["messages"]
+            content = llm.complete(messages)
+            usage = types.SimpleNamespace(
+                prompt_tokens=sum(len(str(m.get("content", "")).split()) for m in messages),
+                completion_tokens=len(content.split())
+            )
+            return types.SimpleNamespace(content=content, usage=usage)
+
+        def send_message(self, current_messages, model=None, temperature=None, max_tokens=None):
+            response = self._raw_model_call(model, {"messages": current_messages})
+            return {"role": "assistant", "content": response.content}
+
+    _client = OpenAIClient()
+
+    class TinyPerson:
+        """Fake agent that thinks, then talks, once per step."""
+
+        all_agents: Dict[str, "TinyPerson"] = {}
+
+        def __init__(self, name: str):
+            self.name = name
+            self._persona: Dict[str, Any] = {"name": name}
+            self._prompt = ""
+            self._messages: List[Dict[str, Any]] = []
+            self._actions: List[Dict[str, Any]] = []
+            # Like TinyTroupe, names are unique until the registry is cleared
+            if name in TinyPerson.all_agents:
+                raise ValueError(f"Agent names must be unique, but '{name}' is already defined.")
+            TinyPerson.all_agents[name] = self
+
+        def define(self, key: str, value: Any):
+            # Like TinyTroupe, every definition re-renders the system prompt
+            self._persona[key] = copy.deepcopy(value)
+            self._prompt = json.dumps(self._persona, indent=2, sort_keys=True)
+            return self
+
+        def encode_complete_state(self) -> Dict[str, Any]:
+            return copy.deepcopy({"name": self.name, "persona": self._persona,
+                                  "prompt": self._prompt, "messages": self._messages})
+
+        def decode_complete_state(self, state: Dict[str, Any]):
+            state = copy.deepcopy(state)
+            self.name = state["name"]
+            self._persona = state["persona"]
+            self._prompt = state["prompt"]
+            self._messages = state["messages"]
+            return self
+
+        @classmethod
+        def get_agent_by_name(cls, name: str) -> "TinyPerson":
+            return cls.all_agents[name]
+
+        @classmethod
+        def clear_agents(cls):
+            cls.all_agents = {}
+
+        def listen(self, speech: str):
+            self._messages.append({"role": "user", "content": speech})
+            return self
+
+        def act(self, return_actions: bool = False):
+            actions = []
+            for _ in range(llm.config.thoughts_per_action):
+                thought = _client.send_message(self._messages + [{"role": "system", "content": "think"}])
+                actions.append({"action": {"type": "THINK", "content": thought["content"]}})
+            talk = _client.send_message(self._messages + [{"role": "system", "content": "talk"}])
+            actions.append({"action": {"type": "TALK", "content": talk["content"]}})
+            actions.append({"action": {"type": "DONE", "content": ""}})
+            self._messages.append({"role": "assistant", "content": talk["content"]})
+            self._actions = actions
+            return actions if return_actions else None
+
+        def pop_latest_actions(self) -> List[Dict[str, Any]]:
+            actions, self._actions = self._actions, []
+            return actions
+
+    class TinyWorld:
+        """Fake world broadcasting each agent's talk to the others."""
+
+        all_environments: Dict[str, "TinyWorld"] = {}
+
+        def __init__(self, name: str, agents: List[TinyPerson]):
+            if name in TinyWorld.all_environments:
+                raise ValueError(f"Environment names must be unique, but '{name}' is already defined.")
+            self.name = name
+            self.agents = list(agents)
+            self.current_datetime = datetime(2025, 1, 1)
+            TinyWorld.all_environments[name] = self
+
+        @classmethod
+        def clear_environments(cls):
+            cls.all_environments = {}
+
+        def make_everyone_accessible(self):
+            pass
+
+        def encode_complete_state(self) -> Dict[str, Any]:
+            return {"name": self.name,
+                    "agents": [{"name": a.name, "messages": list(a._messages)} for a in self.agents]}
+
+        def decode_complete_state(self, state: Dict[str, Any]):
+            self.agents = []
+            for agent_state in state["agents"]:
+                agent = TinyPerson.get_agent_by_name(agent_state["name"])
+                agent._messages = list(agent_state["messages"])
+                self.agents.append(agent)
+            return self
+
+        def add_agent(self, agent: TinyPerson):
+            if agent not in self.agents:
+                self.agents.append(agent)
+            return self
+
+        def _handle_actions(self, source: TinyPerson, actions: List[Dict[str, Any]]):
+            for item in actions:
+                action = item["action"]
+                if action["type"] == "TALK":
+                    for agent in self.agents:
+                        if agent is not source:
+                            agent.listen(action["content"])
+
+        def _advance_datetime(self, timedelta):
+            if timedelta is not None:
+                self.current_datetime += timedelta
+
+        def _step(self, timedelta_per_step=None):
+            self._advance_datetime(timedelta_per_step)
+            step_actions = {}
+            for agent in self.agents:
+                step_actions[agent.name] = agent.act(return_actions=True)
+                self._handle_actions(agent, agent.pop_latest_actions())
+            return step_actions
+
+        def run(self, steps: int, timedelta_per_step=None, return_actions: bool = False):
+            results = [self._step(timedelta_per_step) for _ in range(steps)]
+            return results if return_actions else None
+
+    class TinyPersonFactory:
+        """Fake factory producing deterministic personas."""
+
+        def __init__(self, context: str):
+            self.context = context
+            self.generated = 0
+
+        def generate_person(self, agent_particularities: Optional[str] = None):
+            self.generated += 1
+            text = llm.complete([{"role": "user", "content": f"{self.context}|{agent_particularities}|{self.generated}"}])
+            return {"name": f"Person {self.generated}", "age": 20 + self.generated % 50, "occupation": text[:40]}
+
+    package = types.ModuleType("tinytroupe")
+    modules = {
+        "tinytroupe.openai_utils": {"OpenAIClient": OpenAIClient},
+        "tinytroupe.agent": {"TinyPerson": TinyPerson},
+        "tinytroupe.environment": {"TinyWorld": TinyWorld},
+        "tinytroupe.factory": {"TinyPersonFactory": TinyPersonFactory},
+    }
+    sys.modules["tinytroupe"] = package
+    for name, attributes in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        setattr(package, name.split(".")[1], module)
+        sys.modules[name] = module
+    return llm
@@ -0,0 +1,631 @@
+"""
+Benchmark suites.
+
+Each suite takes a working directory and options and returns a dict of
+statistics. Suites only touch files below the working directory.
+"""
+
+import os
+import json
+import time
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.models.agent import AgentCreate, AgentSearchQuery, AgentUpdate, Persona
+from app.models.simulation import SimulationResponse, SimulationStatus
+from app.services.agent_service import AgentService
+from app.services.interaction_store import InteractionStore
+from app.services.job_queue import JobQueue
+from app.services.llm_cache import LLMCache
+from app.services.simulation_runner import SimulationRunner
+from app.services.simulation_service import SimulationService
+from app.services.transcript_analytics import TranscriptAnalytics
+from app.storage import (
+    AgentRepository,
+    SimulationRepository,
+    FileAgentRepository,
+    FileSimulationRepository,
+    SQLiteDatabase,
+    SQLiteAgentRepository,
+    SQLiteSimulationRepository,
+)
+from benchmarks.fakes import FakeLLMConfig, install_fake_tinytroupe
+from benchmarks.timing import measure, measure_each, summarize
+
+BACKENDS = ("file", "sqlite")
+STATUSES = list(SimulationStatus)
+
+
+def make_repositories(backend: str, root: Path) -> Tuple[AgentRepository, SimulationRepository]:
+    """
+    Create empty repositories of a backend below a directory.
+
+    Args:
+        backend: "file" or "sqlite"
+        root: Directory for the backend's files
+
+    Returns:
+        Tuple of (agent repository, simulation repository)
+    """
+    if backend == "sqlite":
+        database = SQLiteDatabase(str(root / "bench.db"))
+        repositories = SQLiteAgentRepository(database), SQLiteSimulationRepository(database)
+    else:
+        repositories = (
+            FileAgentRepository(str(root / "agents"), refresh_interval=0.0),
+            FileSimulationRepository(str(root / "simulations"), refresh_interval=0.0),
+        )
+    for repository in repositories:
+        repository.load()
+    return repositories
+
+
+def make_persona(i: int) -> Persona:
+    """Build a representative persona."""
+    return Persona(
+        name=f"Agent {i}",
+        age=20 + i % 50,
+        gender=("female", "male", "non-binary")[i % 3],
+        nationality=("Brazilian", "German", "Japanese", "Nigerian")[i % 4],
+        residence=("São Paulo", "Berlin", "Tokyo", "Lagos")[i % 4],
+        education="University degree",
+        occupation={"title": ("Nurse", "Engineer", "Teacher")[i % 3], "description": "Works full time"},
+        skills=["communication", "planning"],
+        beliefs=["Quality matters more than price"],
+        other_facts=[f"Fact {n} about agent {i}" for n in range(5)],
+    )
+
+
+def make_simulation_data(i: int, interactions: int = 0) -> Dict[str, Any]:
+    """
+    Build stored simulation data.
+
+    Args:
+        i: Sequence number, used for names and creation time
+        interactions: Number of interactions in the result (0 for no result)
+
+    Returns:
+        Simulation data as saved by SimulationService
+    """
+    created = datetime(2024, 1, 1) + timedelta(minutes=i)
+    agent_ids = [str(uuid.UUID(int=i * 10 + n)) for n in range(3)]
+    data = {
+        "id": str(uuid.UUID(int=i)),
+        "name": f"Simulation {i}",
+        "agent_ids": agent_ids,
+        "config": {"steps": 5, "initial_prompt": "What do you think of the new product?",
+                   "environment_type": "chat_room", "parallel_actions": True, "cache_enabled": False},
+        "status": STATUSES[i % len(STATUSES)].value,
+        "created_at": created.isoformat(),
+        "started_at": None,
+        "completed_at": None,
+        "error": None,
+        "result": None,
+    }
+    if interactions:
+        data["result"] = {
+            "interactions": [
+                {
+                    "timestamp": (created + timedelta(seconds=n)).isoformat(),
+                    "agent_id": agent_ids[n % 3],
+                    "agent_name": f"Agent {n % 3}",
+                    "message_type": ("THINK", "TALK", "DONE")[n % 3],
+                    "content": f"Message {n}: " + "I would pay more for better quality. " * 4,
+                    "step": n // 30 + 1,
+                }
+                for n in range(interactions)
+            ],
+            "summary": f"Simulation completed with {interactions // 30 + 1} steps",
+            "extracted_data": {},
+        }
+    return data
+
+
+def bench_agent_crud(workdir: Path, operations: int = 300) -> Dict[str, Any]:
+    """
+    Measure agent create, get, update, list and delete throughput.
+
+    Args:
+        workdir: Directory for storage files
+        operations: Agents created (and then read, updated and deleted)
+
+    Returns:
+        Per-backend statistics of each operation
+    """
+    results = {}
+    for backend in BACKENDS:
+        agent_repository, _ = make_repositories(backend, workdir / f"crud-{backend}")
+        service = AgentService(agent_repository)
+        personas = [make_persona(i) for i in range(operations)]
+
+        ids: List[str] = []
+        create = measure_each(lambda p: ids.append(service.create_agent(AgentCreate(persona=p)).id), personas)
+        get = measure_each(service.get_agent, ids)
+        update = measure_each(
+            lambda agent_id: service.update_agent(agent_id, AgentUpdate(persona=make_persona(operations))),
+            ids
+        )
+        list_all = measure(service.list_agents, repeat=20)
+        delete = measure_each(service.delete_agent, ids)
+        results[backend] = {"create": create, "get": get, "update": update,
+                            "list": list_all, "delete": delete}
+    return results
+
+
+def bench_list_latency(workdir: Path, sizes: List[int]) -> Dict[str, Any]:
+    """
+    Measure list endpoints' service latency as the number of entities grows.
+
+    Args:
+        workdir: Directory for storage files
+        sizes: Entity counts to measure
+
+    Returns:
+        Per-backend, per-size statistics
+    """
+    results: Dict[str, Any] = {}
+    for backend in BACKENDS:
+        results[backend] = {}
+        for size in sizes:
+            agent_repository, simulation_repository = make_repositories(
+                backend, workdir / f"list-{backend}-{size}"
+            )
+            for i in range(size):
+                agent_repository.save({"id": str(uuid.UUID(int=i)), "type": "TinyPerson",
+                                       "persona": make_persona(i).model_dump()})
+                simulation_repository.save(make_simulation_data(i))
+
+            agents = AgentService(agent_repository)
+            simulations = SimulationService(simulation_repository)
+            first_page = simulations.list_simulations(limit=50)
+            cursor = first_page[2]
+            results[backend][str(size)] = {
+                "agents": measure(agents.list_agents, repeat=10),
+                "simulations_first_page": measure(lambda: simulations.list_simulations(limit=50), repeat=20),
+                "simulations_next_page": measure(
+                    lambda: simulations.list_simulations(cursor=cursor, limit=50), repeat=20
+                ) if cursor else None,
+                "simulations_by_status": measure(
+                    lambda: simulations.list_simulations(statuses=[SimulationStatus.COMPLETED], limit=50),
+                    repeat=20
+                ),
+            }
+    return results
+
+
+def bench_scheduling(workdir: Path, jobs: int = 50) -> Dict[str, Any]:
+    """
+    Measure the overhead of scheduling simulations onto the worker pool.
+
+    Args:
+        workdir: Directory for the job queue
+        jobs: Number of jobs scheduled
+
+    Returns:
+        Submit-to-start latency, submit cost and worker round-trip statistics
+    """
+    async def run() -> Dict[str, Any]:
+        # One worker: jobs run one at a time, and no process is left
+        # spawning when the pool shuts down
+        runner = SimulationRunner(
+            max_workers=1,
+            max_queue_size=jobs,
+            job_queue=JobQueue(str(workdir / "jobs.db")),
+            poll_interval=1.0,
+            prewarm=False
+        )
+        started: Dict[str, float] = {}
+        done = asyncio.Event()
+
+        async def handler(simulation_id: str):
+            started[simulation_id] = time.perf_counter()
+            done.set()
+
+        await runner.start(handler)
+        try:
+            # One job at a time so each sample is pure scheduling overhead
+            submit_samples, start_samples = [], []
+            for i in range(jobs):
+                simulation_id = f"bench-{i}"
+                done.clear()
+                submitted = time.perf_counter()
+                runner.submit(simulation_id)
+                submit_samples.append(time.perf_counter() - submitted)
+                await done.wait()
+                start_samples.append(started[simulation_id] - submitted)
+
+            # The first call spawns a worker process
+            spawn_started = time.perf_counter()
+            await runner.run_in_pool(os.getpid)
+            spawn = time.perf_counter() - spawn_started
+
+            round_trips = []
+            for _ in range(jobs):
+                call_started = time.perf_counter()
+                await runner.run_in_pool(os.getpid)
+                round_trips.append(time.perf_counter() - call_started)
+        finally:
+            await runner.shutdown()
+
+        return {
+            "submit": summarize(submit_samples),
+            "submit_to_start": summarize(start_samples),
+            "worker_spawn_ms": spawn * 1000,
+            "worker_round_trip": summarize(round_trips),
+        }
+
+    return asyncio.run(run())
+
+
+def bench_serialization(workdir: Path, interactions: int = 5000) -> Dict[str, Any]:
+    """
+    Measure the cost of validating, encoding and storing a large result.
+
+    Args:
+        workdir: Directory for storage files
+        interactions: Interactions in the simulation result
+
+    Returns:
+        Statistics per serialization path, plus payload size
+    """
+    data = make_simulation_data(1, interactions=interactions)
+    response = SimulationResponse(**data)
+    payload = json.dumps(data)
+
+    results: Dict[str, Any] = {
+        "interactions": interactions,
+        "json_bytes": len(payload.encode("utf-8")),
+        "validate": measure(lambda: SimulationResponse(**data), repeat=10),
+        "model_dump_json": measure(response.model_dump_json, repeat=10),
+        "json_dumps": measure(lambda: json.dumps(data), repeat=10),
+        "json_loads": measure(lambda: json.loads(payload), repeat=10),
+    }
+    for backend in BACKENDS:
+        _, simulation_repository = make_repositories(backend, workdir / f"serialize-{backend}")
+        results[backend] = {
+            "save": measure(lambda: simulation_repository.save(data), repeat=10),
+            "get": measure(lambda: simulation_repository.get(data["id"]), repeat=10),
+        }
+    return results
+
+
+def bench_response_encoding(workdir: Path, interactions: int = 5000) -> Dict[str, Any]:
+    """
+    Compare the legacy and current encoding of a large simulation result.
+
+    Covers the on-disk file format (indented json vs compact orjson), and
+    GET latency and bytes on the wire for FastAPI's default response_model
+    path vs the single-pass path with compression.
+
+    Args:
+        workdir: Directory for the files written
+        interactions: Interactions in the simulation result
+
+    Returns:
+        Sizes and timings of each encoding
+    """
+    import orjson
+    from fastapi import FastAPI, Response
+    from fastapi.responses import ORJSONResponse
+    from fastapi.testclient import TestClient
+
+    from app.api.simulations import _model_response
+    from app.core.compression import CompressionMiddleware, brotli
+
+    data = make_simulation_data(1, interactions=interactions)
+    simulation = SimulationResponse(**data)
+    pretty_path, compact_path = workdir / "pretty.json", workdir / "compact.json"
+
+    def write_pretty():
+        with open(pretty_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def write_compact():
+        compact_path.write_bytes(orjson.dumps(data))
+
+    disk = {
+        "pretty_bytes": 0,
+        "compact_bytes": 0,
+        "write_pretty": measure(write_pretty, repeat=10),
+        "write_compact": measure(write_compact, repeat=10),
+        "read_json": measure(lambda: json.loads(pretty_path.read_text(encoding="utf-8")), repeat=10),
+        "read_orjson": measure(lambda: orjson.loads(compact_path.read_bytes()), repeat=10),
+    }
+    disk["pretty_bytes"] = pretty_path.stat().st_size
+    disk["compact_bytes"] = compact_path.stat().st_size
+
+    legacy = FastAPI()
+
+    @legacy.get("/simulation", response_model=SimulationResponse)
+    def legacy_simulation():
+        return simulation
+
+    current = FastAPI(default_response_class=ORJSONResponse)
+    current.add_middleware(CompressionMiddleware)
+
+    @current.get("/simulation", response_model=SimulationResponse)
+    def current_simulation(response: Response):
+        return _model_response(simulation, response)
+
+    variants = {
+        "legacy": (legacy, "identity"),
+        "current_identity": (current, "identity"),
+        "current_gzip": (current, "gzip"),
+    }
+    if brotli is not None:
+        variants["current_brotli"] = (current, "br")
+
+    http = {}
+    for name, (app, encoding) in variants.items():
+        with TestClient(app) as client:
+            headers = {"Accept-Encoding": encoding}
+            response = client.get("/simulation", headers=headers)
+            http[name] = {
+                "wire_bytes": int(response.headers["content-length"]),
+                "get": measure(lambda: client.get("/simulation", headers=headers), repeat=20),
+            }
+
+    return {"interactions": interactions, "disk": disk, "http": http}
+
+
+def bench_fake_simulation(
+    workdir: Path,
+    agents: int = 3,
+    steps: int = 5,
+    latency: float = 0.01,
+    tokens: int = 40
+) -> Dict[str, Any]:
+    """
+    Run the simulation worker end to end against the fake TinyTroupe.
+
+    Runs without the LLM cache (sequential and with parallel agent
+    actions), then twice with it (cold and warm).
+
+    Args:
+        workdir: Directory for event logs and the LLM cache
+        agents: Number of agents
+        steps: Number of steps
+        latency: Fake LLM latency per call in seconds
+        tokens: Words per fake completion
+
+    Returns:
+        Duration, per-step time and LLM usage of each run
+    """
+    llm = install_fake_tinytroupe(FakeLLMConfig(latency=latency, tokens=tokens))
+    from app.services.simulation_worker import execute_tinytroupe_simulation
+
+    simulation_data = make_simulation_data(1)
+    simulation_data["config"]["steps"] = steps
+    agents_data = [
+        {"id": str(uuid.UUID(int=i)), "type": "TinyPerson", "persona": make_persona(i).model_dump()}
+        for i in range(agents)
+    ]
+    cache_path = workdir / "llm_cache.db"
+    LLMCache(str(cache_path), 1 << 30).clear()
+    cache_options = {"path": str(cache_path), "max_bytes": 1 << 30, "model": "fake", "temperature": 1.0}
+
+    runs = {}
+    for name, options, fanout in (
+        ("uncached", None, 1),
+        ("parallel", None, agents),
+        ("cache_cold", cache_options, 1),
+        ("cache_warm", cache_options, 1),
+    ):
+        calls_before = llm.calls
+        started = time.perf_counter()
+        result = execute_tinytroupe_simulation(
+            simulation_data, agents_data, str(workdir / "events" / name), options, fanout
+        )
+        elapsed = time.perf_counter() - started
+        runs[name] = {
+            "seconds": elapsed,
+            "step_ms": elapsed / steps * 1000,
+            "interactions": len(result["interactions"]),
+            "llm_requests": llm.calls - calls_before,
+            "llm_usage": result["llm_usage"],
+        }
+    return {"agents": agents, "steps": steps, "latency": latency, "tokens": tokens, "runs": runs}
+
+
+def bench_persona_cache(workdir: Path, agents: int = 200) -> Dict[str, Any]:
+    """
+    Measure building a simulation's cast with and without the persona cache.
+
+    Args:
+        workdir: Unused; the cache lives in memory
+        agents: Number of agents in the cast
+
+    Returns:
+        Load time of the cast without the cache, then cold and warm, and
+        the cache lookups after one persona update
+    """
+    install_fake_tinytroupe()
+    from tinytroupe.agent import TinyPerson
+    from app.services.persona_cache import persona_cache
+    from app.services.simulation_worker import _load_agent
+
+    agents_data = [
+        {"id": str(uuid.UUID(int=i)), "type": "TinyPerson", "persona": make_persona(i).model_dump()}
+        for i in range(agents)
+    ]
+
+    def load_cast() -> Dict[str, int]:
+        # Every run starts with an empty registry, as in the worker
+        TinyPerson.clear_agents()
+        counters = {"hits": 0, "misses": 0}
+        for agent_data in agents_data:
+            _load_agent(TinyPerson, agent_data, counters)
+        return counters
+
+    max_entries = persona_cache.max_entries
+    try:
+        persona_cache.max_entries = 0
+        uncached = measure(load_cast, repeat=5, warmup=0)
+        persona_cache.max_entries = max(max_entries, agents)
+        persona_cache.invalidate()
+        cold = measure(load_cast, repeat=1, warmup=0)
+        warm = measure(load_cast, repeat=5)
+        agents_data[0]["persona"]["age"] += 1
+        after_update = load_cast()
+    finally:
+        persona_cache.max_entries = max_entries
+        persona_cache.invalidate()
+    return {"agents": agents, "uncached": uncached, "cold": cold, "warm": warm,
+            "after_update": after_update}
+
+
+def bench_agent_search(workdir: Path, agents: int = 50000) -> Dict[str, Any]:
+    """
+    Measure indexed agent search against filtering the full agent list.
+
+    Args:
+        workdir: Directory for storage files
+        agents: Number of agents in the library
+
+    Returns:
+        Per-backend statistics of each search, and of listing all agents and
+        filtering them in Python by occupation as clients did before
+    """
+    queries = {
+        "first_page": AgentSearchQuery(),
+        "occupation": AgentSearchQuery(occupation="engineer"),
+        "occupation_age": AgentSearchQuery(occupation="engineer", age_min=30, age_max=39),
+        "nationality_residence": AgentSearchQuery(nationality="japanese", residence="tokyo"),
+        "no_match": AgentSearchQuery(skills=["juggling"]),
+    }
+    results: Dict[str, Any] = {}
+    for backend in BACKENDS:
+        agent_repository, _ = make_repositories(backend, workdir / backend)
+        for start in range(0, agents, 1000):
+            agent_repository.save_many([
+                {"id": str(uuid.UUID(int=i)), "type": "TinyPerson", "persona": make_persona(i).model_dump()}
+                for i in range(start, min(start + 1000, agents))
+            ])
+        service = AgentService(agent_repository)
+
+        results[backend] = {
+            name: measure(lambda: service.search_agents(query, limit=50), repeat=20)
+            for name, query in queries.items()
+        }
+        cursor = service.search_agents(queries["occupation"], limit=50)[2]
+        results[backend]["occupation_next_page"] = measure(
+            lambda: service.search_agents(queries["occupation"], cursor=cursor, limit=50), repeat=20
+        )
+        results[backend]["list_and_filter"] = measure(
+            lambda: [
+                agent for agent in service.list_agents()
+                if agent.persona.occupation and "engineer" in agent.persona.occupation.title.lower()
+            ],
+            repeat=3
+        )
+    return {"agents": agents, **results}
+
+
+def bench_transcript_analytics(workdir: Path, interactions: int = 10000) -> Dict[str, Any]:
+    """
+    Measure incremental transcript analytics.
+
+    Args:
+        workdir: Unused, analytics run in memory
+        interactions: Interactions in the transcript
+
+    Returns:
+        Statistics of updating the analytics per step, of extracting the
+        data once the last step ends, and of analyzing the whole transcript
+        in one batch after completion
+    """
+    transcript = make_simulation_data(1, interactions=interactions)["result"]["interactions"]
+    steps: Dict[int, List[Dict[str, Any]]] = {}
+    for interaction in transcript:
+        steps.setdefault(interaction["step"], []).append(interaction)
+
+    analytics = TranscriptAnalytics()
+    per_step = measure_each(analytics.add, list(steps.values()))
+
+    def whole():
+        batch = TranscriptAnalytics()
+        batch.add(transcript)
+        return batch.to_dict()
+
+    return {
+        "interactions": interactions,
+        "steps": len(steps),
+        "add_step": per_step,
+        "to_dict": measure(analytics.to_dict, repeat=20),
+        "whole_transcript": measure(whole, repeat=5),
+    }
+
+
+def bench_interaction_analytics(
+    workdir: Path,
+    simulations: int = 300,
+    interactions: int = 1000
+) -> Dict[str, Any]:
+    """
+    Measure aggregate queries over the columnar interaction store.
+
+    Args:
+        workdir: Directory for storage files
+        simulations: Completed simulations stored
+        interactions: Interactions per simulation
+
+    Returns:
+        Statistics of writing a simulation's interactions, of aggregate
+        queries, and per backend of loading every simulation as a
+        SimulationResponse and counting messages per agent in Python as
+        clients did before
+    """
+    store = InteractionStore(str(workdir / "interactions"))
+    data = [make_simulation_data(i, interactions=interactions) for i in range(simulations)]
+    for item in data:
+        item["status"] = SimulationStatus.COMPLETED.value
+        item["completed_at"] = item["created_at"]
+
+    results: Dict[str, Any] = {
+        "simulations": simulations,
+        "interactions": simulations * interactions,
+        "write": measure_each(
+            lambda item: store.write(item["id"], [item["result"]["interactions"]], item["completed_at"]), data
+        ),
+        "total": measure(lambda: store.aggregate([]), repeat=10),
+        "by_agent": measure(lambda: store.aggregate(["agent"]), repeat=10),
+        "by_simulation_and_type": measure(lambda: store.aggregate(["simulation", "message_type"]), repeat=10),
+        "by_agent_per_minute": measure(
+            lambda: store.aggregate(["agent", "time"], bucket="minute"), repeat=10
+        ),
+        "talk_by_agent": measure(lambda: store.aggregate(["agent"], message_types=["TALK"]), repeat=10),
+    }
+
+    def load_and_count(repository: SimulationRepository) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for item in data:
+            response = SimulationResponse(**repository.get(item["id"]))
+            for interaction in response.result.interactions:
+                counts[interaction.agent_id] = counts.get(interaction.agent_id, 0) + 1
+        return counts
+
+    for backend in BACKENDS:
+        _, simulation_repository = make_repositories(backend, workdir / backend)
+        for item in data:
+            simulation_repository.save(item)
+        results[backend] = {
+            "load_and_count_by_agent": measure(lambda: load_and_count(simulation_repository), repeat=3),
+        }
+    return results
+
+
+SUITES: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "agent_crud": bench_agent_crud,
+    "list_latency": bench_list_latency,
+    "scheduling": bench_scheduling,
+    "serialization": bench_serialization,
+    "response_encoding": bench_response_encoding,
+    "fake_simulation": bench_fake_simulation,
+    "persona_cache": bench_persona_cache,
+    "agent_search": bench_agent_search,
+    "transcript_analytics": bench_transcript_analytics,
+    "interaction_analytics": bench_interaction_analytics,
+}
@@ -0,0 +1,68 @@
+"""Timing helpers producing machine-readable statistics."""
+
+import time
+import statistics
+from typing import Any, Callable, Dict, List
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples.
+
+    Args:
+        samples: Durations in seconds
+
+    Returns:
+        Sample count, mean/p50/p95/max in milliseconds and operations per second
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "n": len(ordered),
+        "mean_ms": total / len(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_sec": len(ordered) / total if total else 0.0,
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """
+    Time repeated calls of a function.
+
+    Args:
+        fn: Function to call
+        repeat: Number of timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        Statistics from summarize()
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def measure_each(fn: Callable[[Any], Any], items: List[Any]) -> Dict[str, float]:
+    """
+    Time one call of a function per item.
+
+    Args:
+        fn: Function to call with each item
+        items: Arguments, one per call
+
+    Returns:
+        Statistics from summarize()
+    """
+    samples = []
+    for item in items:
+        started = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
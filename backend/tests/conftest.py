@@ -0,0 +1,83 @@
+"""Shared fixtures for backend tests."""
+
+import os
+import tempfile
+
+# Point every data path at a scratch directory before app.core.config is
+# imported, so module-level services never touch a real deployment's data
+_data_dir = tempfile.mkdtemp(prefix="optimus-tests-")
+for _name in (
+    "AGENTS_DIR", "SIMULATIONS_DIR", "UPLOAD_DIR", "EVENTS_DIR", "CHECKPOINTS_DIR",
+    "SWEEPS_DIR", "INTERACTION_STORE_DIR",
+):
+    os.environ.setdefault(_name, os.path.join(_data_dir, _name.lower()))
+for _name in ("DATABASE_PATH", "JOB_QUEUE_PATH", "LLM_CACHE_PATH", "SEARCH_INDEX_PATH"):
+    os.environ.setdefault(_name, os.path.join(_data_dir, f"{_name.lower()}.db"))
+os.environ.setdefault("STORAGE_BACKEND", "file")
+
+import pytest
+
+from app.storage import (
+    FileAgentRepository,
+    FileSimulationRepository,
+    SQLiteAgentRepository,
+    SQLiteDatabase,
+    SQLiteSimulationRepository,
+)
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def agent_repository(request, tmp_path):
+    """An empty, loaded agent repository of each storage backend."""
+    if request.param == "file":
+        repository = FileAgentRepository(str(tmp_path / "agents"), refresh_interval=0)
+    else:
+        repository = SQLiteAgentRepository(SQLiteDatabase(str(tmp_path / "optimus.db")))
+    repository.load()
+    return repository
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def simulation_repository(request, tmp_path):
+    """An empty, loaded simulation repository of each storage backend."""
+    if request.param == "file":
+        repository = FileSimulationRepository(str(tmp_path / "simulations"), refresh_interval=0)
+    else:
+        repository = SQLiteSimulationRepository(SQLiteDatabase(str(tmp_path / "optimus.db")))
+    repository.load()
+    return repository
+
+
+@pytest.fixture
+def agent_service(tmp_path, monkeypatch):
+    """The API's agent service, on an empty file repository."""
+    from app.services.agent_service import agent_service
+
+    repository = FileAgentRepository(str(tmp_path / "agents"), refresh_interval=0)
+    repository.load()
+    monkeypatch.setattr(agent_service, "repository", repository)
+    return agent_service
+
+
+@pytest.fixture
+def simulation_service(tmp_path, monkeypatch):
+    """The API's simulation service, on an empty file repository and event logs."""
+    from app.core.config import settings
+    from app.services.simulation_events import SimulationEventBroker
+    from app.services.simulation_service import simulation_service
+
+    repository = FileSimulationRepository(str(tmp_path / "simulations"), refresh_interval=0)
+    repository.load()
+    monkeypatch.setattr(simulation_service, "repository", repository)
+    monkeypatch.setattr(settings, "events_dir", str(tmp_path / "events"))
+    monkeypatch.setattr(simulation_service, "events", SimulationEventBroker(settings.events_dir))
+    return simulation_service
+
+
+@pytest.fixture
+def client(simulation_service):
+    """A test client for the API, without running startup."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
@@ -0,0 +1,51 @@
+"""Builders for stored entity data used across tests."""
+
+
+def make_agent(agent_id, name="Lisa", created_at="2025-01-01T00:00:00", **persona):
+    """Build stored agent data with a minimal persona."""
+    return {
+        "id": agent_id,
+        "type": "TinyPerson",
+        "persona": {"name": name, **persona},
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def make_simulation(
+    simulation_id,
+    created_at="2025-01-01T00:00:00",
+    status="pending",
+    interactions=None,
+    **fields
+):
+    """Build stored simulation data, with a result when interactions are given."""
+    data = {
+        "id": simulation_id,
+        "name": f"Simulation {simulation_id}",
+        "agent_ids": ["a1", "a2"],
+        "config": {"steps": 3, "initial_prompt": "Discuss the product"},
+        "status": status,
+        "created_at": created_at,
+        "started_at": None,
+        "completed_at": None,
+        "error": None,
+        "result": None,
+        "fork": None,
+    }
+    if interactions is not None:
+        data["result"] = {"interactions": interactions, "summary": None, "extracted_data": None}
+    data.update(fields)
+    return data
+
+
+def make_interaction(seq, step=1, agent_id="a1", agent_name="Lisa", message_type="TALK", content=None, timestamp=None):
+    """Build one interaction message."""
+    return {
+        "timestamp": timestamp or f"2025-01-01T00:{seq // 60 % 60:02d}:{seq % 60:02d}",
+        "agent_id": agent_id,
+        "agent_name": agent_name,
+        "message_type": message_type,
+        "content": content if content is not None else f"message {seq}",
+        "step": step,
+    }
@@ -0,0 +1,97 @@
+"""Concurrent batch generation of agents streamed as NDJSON."""
+
+import json
+import threading
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from app.models.agent import AgentBatchGenerateRequest
+
+
+class FakeFactory:
+    """Generates a person per description, slowly, tracking calls in flight."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.descriptions = []
+
+    def generate_person(self, description):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.descriptions.append(description)
+        try:
+            # "<name> <seconds>" lets each test choose the completion order
+            name, _, delay = (description or "Anyone 0.01").partition(" ")
+            time.sleep(float(delay))
+            if name == "fail":
+                raise RuntimeError("LLM unavailable")
+            return {"name": name, "age": 30}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def factory(agent_service, monkeypatch):
+    factory = FakeFactory()
+    monkeypatch.setattr(agent_service, "create_factory", lambda context=None: factory)
+    return factory
+
+
+def _generate(client, **body):
+    response = client.post("/api/agents/generate/batch", json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_items_stream_in_completion_order_with_their_index(client, factory):
+    items = _generate(client, descriptions=["Slow 0.2", "Fast 0.01", "Medium 0.1"], concurrency=3)
+
+    assert [item["index"] for item in items] == [1, 2, 0]
+    assert [item["agent"]["persona"]["name"] for item in items] == ["Fast", "Medium", "Slow"]
+
+
+def test_failed_generations_are_reported_per_item(client, agent_service, factory):
+    items = _generate(client, descriptions=["Lisa 0", "fail 0", "Oscar 0"], concurrency=1)
+
+    by_index = {item["index"]: item for item in items}
+    assert sorted(by_index) == [0, 1, 2]
+    assert by_index[1]["agent"] is None
+    assert "LLM unavailable" in by_index[1]["error"]
+    assert by_index[0]["error"] is None and by_index[2]["error"] is None
+    assert sorted(agent.persona.name for agent in agent_service.list_agents()) == ["Lisa", "Oscar"]
+
+
+def test_generations_in_flight_are_bounded(client, factory):
+    items = _generate(client, count=8, description="Clone 0.05", concurrency=3)
+
+    assert len(items) == 8
+    assert sorted(item["index"] for item in items) == list(range(8))
+    assert factory.descriptions == ["Clone 0.05"] * 8
+    assert factory.max_in_flight == 3
+
+
+@pytest.mark.parametrize("body", [
+    {"descriptions": ["A"], "count": 2},
+    {},
+    {"descriptions": []},
+    {"count": 0},
+    {"count": 2, "concurrency": 33},
+])
+def test_batch_requests_need_exactly_one_valid_source(client, factory, body):
+    assert client.post("/api/agents/generate/batch", json=body).status_code == 422
+    assert factory.descriptions == []
+
+
+def test_validator_rejects_descriptions_with_count():
+    with pytest.raises(ValidationError, match="either descriptions or count"):
+        AgentBatchGenerateRequest(descriptions=["A"], count=1)
+
+    assert AgentBatchGenerateRequest(count=2, description="A").expand() == ["A", "A"]
+    assert AgentBatchGenerateRequest(descriptions=["A", "B"]).expand() == ["A", "B"]
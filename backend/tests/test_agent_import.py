@@ -0,0 +1,97 @@
+"""Bulk agent imports streamed from the request body."""
+
+import asyncio
+import io
+import json
+import zipfile
+
+import pytest
+
+from app.services.agent_import import AsyncStreamReader, iter_jsonl_records
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def _record(name, **persona):
+    return {"type": "TinyPerson", "persona": {"name": name, **persona}}
+
+
+def _jsonl(*lines):
+    return "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines).encode()
+
+
+def _names(agent_service):
+    return sorted(agent.persona.name for agent in agent_service.list_agents())
+
+
+def test_jsonl_import_reports_each_rejected_record(client, agent_service):
+    body = _jsonl(_record("Lisa"), "", "{not json", {"type": "TinyPerson"}, _record("Oscar"))
+
+    response = client.post("/api/agents/import", content=body, headers=NDJSON)
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["imported"], summary["failed"], summary["errors_truncated"]) == (2, 2, False)
+    assert [error["record"] for error in summary["errors"]] == ["line 3", "line 4"]
+    assert summary["errors"][0]["error"].startswith("Invalid JSON")
+    assert "persona" in summary["errors"][1]["error"]
+    assert _names(agent_service) == ["Lisa", "Oscar"]
+
+
+def test_zip_import_reads_json_and_jsonl_members(client, agent_service):
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("people/lisa.json", json.dumps(_record("Lisa")))
+        zf.writestr("people/broken.json", "{")
+        zf.writestr("more.jsonl", _jsonl(_record("Oscar"), {"persona": {}}))
+        zf.writestr("__MACOSX/._lisa.json", "junk")
+        zf.writestr("README.txt", "not an agent")
+
+    response = client.post(
+        "/api/agents/import", content=archive.getvalue(), headers={"Content-Type": "application/zip"}
+    )
+
+    summary = response.json()
+    assert (summary["imported"], summary["failed"]) == (2, 2)
+    assert [error["record"] for error in summary["errors"]] == ["people/broken.json", "more.jsonl line 2"]
+    assert _names(agent_service) == ["Lisa", "Oscar"]
+
+
+@pytest.mark.parametrize("content_type, body, expected", [
+    ("application/zip", b"not a zip", 400),
+    ("multipart/form-data; boundary=x", b"", 415),
+    ("application/json", b"{}", 415),
+])
+def test_unsupported_or_invalid_uploads_are_rejected(client, agent_service, content_type, body, expected):
+    response = client.post("/api/agents/import", content=body, headers={"Content-Type": content_type})
+
+    assert response.status_code == expected
+    assert _names(agent_service) == []
+
+
+def test_rejected_records_beyond_max_errors_are_only_counted(agent_service):
+    records = iter_jsonl_records(io.BytesIO(_jsonl(*["{"] * 5, _record("Lisa"))))
+
+    summary = agent_service.import_agents(records, batch_size=2, max_errors=3)
+
+    assert (summary.imported, summary.failed, summary.errors_truncated) == (1, 5, True)
+    assert [error.record for error in summary.errors] == ["line 1", "line 2", "line 3"]
+
+
+def test_body_is_parsed_while_it_arrives():
+    received = []
+
+    async def body():
+        for n in range(100):
+            received.append(n)
+            yield (json.dumps(_record(f"Agent {n}")) + "\n").encode()
+
+    async def first_record():
+        reader = io.BufferedReader(AsyncStreamReader(body(), asyncio.get_running_loop()), buffer_size=64)
+        records = iter_jsonl_records(reader)
+        return await asyncio.to_thread(next, records)
+
+    source, data = asyncio.run(first_record())
+
+    assert (source, data["persona"]["name"]) == ("line 1", "Agent 0")
+    assert len(received) < 5
@@ -0,0 +1,111 @@
+"""Agent search by persona attributes on both storage backends."""
+
+import pytest
+
+from app.models.agent import AgentSearchQuery
+from app.services.agent_service import AgentService
+from app.storage.cursor import decode_cursor, encode_cursor
+
+from factories import make_agent
+
+
+def _save_people(repository):
+    repository.save_many([
+        make_agent(
+            "a1", name="Lisa Carter", created_at="2025-01-01T00:00:00", age=28, nationality="Canadian",
+            occupation={"title": "Data Scientist", "description": ""},
+            skills=["Python programming", "statistics"], personality={"traits": ["curious", "patient"]},
+        ),
+        make_agent(
+            "a2", name="Oscar Müller", created_at="2025-01-02T00:00:00", age=45, nationality="German",
+            residence="São Paulo", occupation={"title": "Architect", "description": ""},
+            skills=["drawing"], personality={"traits": ["meticulous"]},
+        ),
+        make_agent(
+            "a3", name="José García", created_at="2025-01-02T00:00:00", age=35, nationality="Spanish",
+            residence="Sao Paulo", occupation={"title": "Data Engineer", "description": ""},
+            skills=["Python", "cloud infrastructure"], personality={"traits": ["curious"]},
+        ),
+        make_agent("a4", name="Maria", created_at="2025-01-03T00:00:00"),
+    ])
+
+
+def _ids(repository, **filters):
+    agents, total = repository.search(AgentSearchQuery(**filters))
+    assert total == len(agents)
+    return [agent.id for agent in agents]
+
+
+def test_search_without_filters_lists_oldest_first(agent_repository):
+    _save_people(agent_repository)
+
+    # The created_at tie between a2 and a3 is broken by ID
+    assert _ids(agent_repository) == ["a1", "a2", "a3", "a4"]
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"name": "lisa"}, ["a1"]),
+    ({"name": "jose garcia"}, ["a3"]),
+    ({"name": "MÜLLER"}, ["a2"]),
+    ({"occupation": "data"}, ["a1", "a3"]),
+    ({"occupation": "engineer data"}, ["a3"]),
+    ({"occupation": "data architect"}, []),
+    ({"nationality": "german"}, ["a2"]),
+    ({"residence": "são paulo"}, ["a2", "a3"]),
+    ({"age_min": 30}, ["a2", "a3"]),
+    ({"age_min": 30, "age_max": 40}, ["a3"]),
+    ({"age_max": 30}, ["a1"]),
+    ({"skills": ["python"]}, ["a1", "a3"]),
+    # Words of a filter may come from different entries of the list
+    ({"skills": ["python statistics"]}, ["a1"]),
+    ({"skills": ["python", "cloud"]}, ["a3"]),
+    ({"traits": ["curious"], "age_min": 30}, ["a3"]),
+    ({"traits": ["curious"], "occupation": "scientist"}, ["a1"]),
+])
+def test_search_filters(agent_repository, filters, expected):
+    _save_people(agent_repository)
+
+    assert _ids(agent_repository, **filters) == expected
+
+
+def test_search_follows_updates_and_deletes(agent_repository):
+    _save_people(agent_repository)
+
+    agent_repository.save(make_agent(
+        "a1", name="Lisa Carter", created_at="2025-01-01T00:00:00", occupation={"title": "Teacher", "description": ""}
+    ))
+    agent_repository.delete("a3")
+
+    assert _ids(agent_repository, occupation="data") == []
+    assert _ids(agent_repository, occupation="teacher") == ["a1"]
+    assert _ids(agent_repository, skills=["python"]) == []
+
+
+def test_search_pages_with_cursors(agent_repository):
+    _save_people(agent_repository)
+    service = AgentService(agent_repository)
+
+    pages = []
+    cursor = None
+    while True:
+        page, total, cursor = service.search_agents(AgentSearchQuery(), cursor=cursor, limit=1)
+        assert total == 4
+        pages.append([agent.id for agent in page])
+        if cursor is None:
+            break
+
+    assert pages == [["a1"], ["a2"], ["a3"], ["a4"]]
+
+    page, total, cursor = service.search_agents(AgentSearchQuery(occupation="data"), limit=1)
+    assert ([agent.id for agent in page], total) == (["a1"], 2)
+    page, total, cursor = service.search_agents(AgentSearchQuery(occupation="data"), cursor=cursor, limit=1)
+    assert ([agent.id for agent in page], total, cursor) == (["a3"], 2, None)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("2025-01-02T00:00:00", "a3")) == ("2025-01-02T00:00:00", "a3")
+    # Items without a creation time sort first
+    assert decode_cursor(encode_cursor(None, "a1")) == ("", "a1")
+
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
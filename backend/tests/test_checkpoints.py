@@ -0,0 +1,207 @@
+"""Simulation checkpoints, resume and forks."""
+
+import pytest
+
+from app.services.checkpoints import CheckpointStore
+
+from factories import make_interaction
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints"))
+
+
+def _world(step):
+    return {"name": "World", "agents": [], "step": step}
+
+
+def _files(store, simulation_id):
+    return sorted(path.name for path in (store.checkpoints_dir / simulation_id).iterdir())
+
+
+def test_save_keeps_every_world_and_interaction_deltas(store):
+    for step in (1, 2, 3):
+        store.save("s1", step, _world(step), [make_interaction(step, step=step)])
+
+    assert store.steps("s1") == [1, 2, 3]
+    checkpoint = store.load("s1", 3)
+    assert checkpoint["step"] == 3
+    assert checkpoint["world"] == _world(3)
+    assert [i["step"] for i in checkpoint["interactions"]] == [1, 2, 3]
+    intermediate = store.load("s1", 2)
+    assert intermediate["world"] == _world(2)
+    assert [i["step"] for i in intermediate["interactions"]] == [1, 2]
+    assert _files(store, "s1") == [
+        "interactions-0001.json", "interactions-0002.json", "interactions-0003.json",
+        "step-0001.json", "step-0002.json", "step-0003.json",
+    ]
+
+
+@pytest.mark.parametrize("keep, expected", [(1, [4]), (2, [3, 4])])
+def test_keep_prunes_older_worlds(tmp_path, keep, expected):
+    store = CheckpointStore(str(tmp_path / "checkpoints"), keep=keep)
+    for step in (1, 2, 3, 4):
+        store.save("s1", step, _world(step), [make_interaction(step, step=step)])
+
+    assert store.steps("s1") == expected
+    assert store.load("s1", 2) is None
+    # Interaction deltas are never pruned
+    assert [i["step"] for i in store.load("s1", 4)["interactions"]] == [1, 2, 3, 4]
+
+
+def test_save_drops_interactions_of_an_interrupted_checkpoint(store):
+    store.save("s1", 1, _world(1), [make_interaction(1, step=1)])
+    # Interactions written for step 2, but the run died before its world state
+    store._interactions_path("s1", 2).write_text('[{"step": 2, "content": "lost"}]')
+
+    store.save("s1", 3, _world(3), [make_interaction(2, step=2), make_interaction(3, step=3)])
+
+    assert [i["step"] for i in store.load("s1", 3)["interactions"]] == [1, 2, 3]
+
+
+def test_link_shares_checkpoint_and_pins_it(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints"), keep=1)
+    store.save("parent", 1, _world(1), [make_interaction(1, step=1)])
+    store.save("parent", 2, _world(2), [make_interaction(2, step=2)])
+    store.link("parent", 2, "fork")
+
+    # The parent moves on; the step the fork branches off survives
+    store.save("parent", 3, _world(3), [make_interaction(3, step=3)])
+    store.save("parent", 4, _world(4), [make_interaction(4, step=4)])
+    assert store.steps("parent") == [2, 4]
+
+    fork = store.load("fork", 2)
+    assert fork["world"] == _world(2)
+    assert [i["step"] for i in fork["interactions"]] == [1, 2]
+
+    # The fork's own checkpoints never leak into the parent
+    store.save("fork", 3, _world(3), [make_interaction(30, step=3, content="forked")])
+    assert [i["content"] for i in store.load("fork", 3)["interactions"]][-1] == "forked"
+    assert [i["content"] for i in store.load("parent", 4)["interactions"]][2] == "message 3"
+
+
+def test_link_requires_a_checkpoint(store):
+    store.save("parent", 2, _world(2), [])
+
+    with pytest.raises(FileNotFoundError):
+        store.link("parent", 1, "fork")
+
+
+def test_delete_removes_every_file(store):
+    store.save("s1", 1, _world(1), [])
+
+    store.delete("s1")
+
+    assert store.steps("s1") == []
+    assert store.load("s1", 1) is None
+
+
+# Resume and fork through the worker, on the benchmark suite's fake TinyTroupe
+
+@pytest.fixture(scope="module")
+def run():
+    from benchmarks.fakes import install_fake_tinytroupe
+    from app.services.simulation_worker import execute_tinytroupe_simulation
+
+    install_fake_tinytroupe()
+
+    def run(simulation_data, agents_data, tmp_path, resume_step=None):
+        return execute_tinytroupe_simulation(
+            simulation_data,
+            agents_data,
+            str(tmp_path / "events"),
+            checkpoints={"dir": str(tmp_path / "checkpoints"), "interval": 1, "resume_step": resume_step},
+        )
+
+    return run
+
+
+def _agent(agent_id, name):
+    return {"id": agent_id, "type": "TinyPerson", "persona": {"name": name, "occupation": {"title": name, "description": ""}}}
+
+
+def _simulation(simulation_id, steps, **fields):
+    return {
+        "id": simulation_id,
+        "name": "World",
+        "config": {"steps": steps, "initial_prompt": "What do you think of the product?", "parallel_actions": False},
+        **fields,
+    }
+
+
+def _transcript(result):
+    return [(i["step"], i["agent_id"], i["message_type"], i["content"]) for i in result["interactions"]]
+
+
+def test_resumed_run_matches_an_uninterrupted_one(run, tmp_path):
+    agents = [_agent("a1", "Lisa"), _agent("a2", "Oscar")]
+    uninterrupted = run(_simulation("full", 4), agents, tmp_path)
+
+    # Run two steps, then continue the same simulation to four
+    run(_simulation("resumed", 2), agents, tmp_path)
+    resumed = run(_simulation("resumed", 4), agents, tmp_path, resume_step=2)
+
+    assert _transcript(resumed) == _transcript(uninterrupted)
+    # Analytics carry on from the checkpoint's interactions (latencies depend on timing)
+    counts = lambda result: {
+        agent_id: (stats["messages"], stats["message_types"], stats["talk_count"])
+        for agent_id, stats in result["extracted_data"]["agents"].items()
+    }
+    assert counts(resumed) == counts(uninterrupted)
+    store = CheckpointStore(str(tmp_path / "checkpoints"))
+    assert store.steps("resumed") == [1, 2, 3, 4]
+    assert len(store.load("resumed", 4)["interactions"]) == len(uninterrupted["interactions"])
+
+
+def test_fork_reconciles_agents_and_delivers_prompt(run, tmp_path):
+    parent_agents = [_agent("a1", "Lisa"), _agent("a2", "Oscar")]
+    # Fork the parent after step 2, then let the parent finish
+    run(_simulation("parent", 2), parent_agents, tmp_path)
+    store = CheckpointStore(str(tmp_path / "checkpoints"))
+    store.link("parent", 2, "fork")
+    parent = run(_simulation("parent", 3), parent_agents, tmp_path, resume_step=2)
+
+    # Oscar leaves and Maria joins after step 2, with a new prompt for Lisa
+    fork_agents = [_agent("a1", "Lisa"), _agent("a3", "Maria")]
+    fork = run(
+        _simulation("fork", 3, fork={"parent_id": "parent", "step": 2, "prompt": "Now consider the price."}),
+        fork_agents,
+        tmp_path,
+        resume_step=2,
+    )
+
+    shared = [entry for entry in _transcript(parent) if entry[0] <= 2]
+    assert _transcript(fork)[:len(shared)] == shared
+    step_three = [entry for entry in _transcript(fork) if entry[0] == 3]
+    assert {agent_id for _, agent_id, _, _ in step_three} == {"a1", "a3"}
+    # The prompt changes what Lisa hears, so her step 3 differs from the parent's
+    parent_lisa = [entry for entry in _transcript(parent) if entry[0] == 3 and entry[1] == "a1"]
+    assert [entry for entry in step_three if entry[1] == "a1"] != parent_lisa
+    assert store.steps("parent") == [1, 2, 3]
+    assert store.steps("fork") == [2, 3]
+
+
+def test_fork_at_an_intermediate_step_of_a_completed_run(run, tmp_path, client, simulation_service, monkeypatch):
+    from factories import make_simulation
+
+    monkeypatch.setattr(simulation_service, "checkpoints", CheckpointStore(str(tmp_path / "checkpoints")))
+    agents = [_agent("a1", "Lisa"), _agent("a2", "Oscar")]
+    parent = run(_simulation("parent", 3), agents, tmp_path)
+    simulation_service.repository.save(make_simulation(
+        "parent", status="completed", config=_simulation("parent", 3)["config"],
+        interactions=parent["interactions"],
+    ))
+
+    response = client.post("/api/simulations/parent/fork", params={"step": 1})
+
+    assert response.status_code == 201
+    created = response.json()
+    assert created["status"] == "pending"
+    assert created["fork"] == {"parent_id": "parent", "step": 1, "prompt": None}
+    assert simulation_service.checkpoints.steps(created["id"]) == [1]
+
+    fork = run(_simulation(created["id"], 3, fork=created["fork"]), agents, tmp_path, resume_step=1)
+    # Without a new prompt the fork replays the parent's remaining steps
+    assert _transcript(fork) == _transcript(parent)
+    assert client.post("/api/simulations/parent/fork", params={"step": 3}).status_code == 400
@@ -0,0 +1,118 @@
+"""Response compression negotiated per request."""
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+from app.core.etag import conditional
+
+LARGE = "interaction " * 500
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/large")
+    async def large(request: Request, response: Response):
+        return conditional(request, response, '"v1"') or {"text": LARGE}
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(iter([LARGE]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def _get(client, url, accept_encoding="gzip", **headers):
+    # Read the raw bytes so the test sees what the server sent
+    with client.stream("GET", url, headers={"Accept-Encoding": accept_encoding, **headers}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_bodies_below_the_threshold_are_sent_as_is(client):
+    response, body = _get(client, "/small")
+
+    assert body == b"tiny"
+    assert "content-encoding" not in response.headers
+
+
+def test_large_bodies_are_gzipped_with_a_weak_etag(client):
+    response, body = _get(client, "/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body) < len(LARGE)
+    assert gzip.decompress(body) == f'{{"text":"{LARGE}"}}'.encode()
+    assert response.headers["etag"] == 'W/"v1"'
+
+    # The weak tag sent back still revalidates
+    not_modified, body = _get(client, "/large", **{"If-None-Match": 'W/"v1"'})
+    assert not_modified.status_code == 304
+    assert body == b""
+
+
+@pytest.mark.parametrize("accept_encoding", ["", "identity", "deflate", "gzip;q=0", "br"])
+def test_clients_not_accepting_gzip_get_identity(client, accept_encoding):
+    response, body = _get(client, "/large", accept_encoding)
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+    assert len(body) > len(LARGE)
+
+
+def test_streams_are_compressed_chunk_by_chunk():
+    async def app(scope, receive, send):
+        headers = [(b"content-type", b"application/x-ndjson")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for n in range(3):
+            await send({"type": "http.response.body", "body": b'{"index": %d}\n' % n, "more_body": n < 2})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=1024)(scope, None, send))
+
+    start, *chunks = sent
+    assert (b"content-encoding", b"gzip") in start["headers"]
+    assert not any(name == b"content-length" for name, _ in start["headers"])
+    # Every chunk is flushed, so each line decodes as soon as it arrives
+    decoder = zlib.decompressobj(31)
+    lines = [decoder.decompress(chunk["body"]) for chunk in chunks]
+    assert lines == [b'{"index": 0}\n', b'{"index": 1}\n', b'{"index": 2}\n']
+    assert decoder.eof
+
+
+def test_event_streams_are_never_compressed(client):
+    response, body = _get(client, "/events")
+
+    assert "content-encoding" not in response.headers
+    assert body == LARGE.encode()
+
+
+@pytest.mark.parametrize("header, with_brotli, expected", [
+    ("gzip, deflate, br", False, "gzip"),
+    ("gzip, deflate, br", True, "br"),
+    ("br;q=0, gzip", True, "gzip"),
+    ("GZIP;q=0.5", False, "gzip"),
+    ("gzip;q=bogus", False, None),
+])
+def test_negotiate_encoding(monkeypatch, header, with_brotli, expected):
+    monkeypatch.setattr(compression, "brotli", object() if with_brotli else None)
+
+    assert negotiate_encoding(header) == expected
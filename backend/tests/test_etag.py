@@ -0,0 +1,67 @@
+"""Conditional GETs answered from resource ETags."""
+
+import pytest
+
+from app.models.simulation import SimulationStatus
+
+from factories import make_agent, make_interaction, make_simulation
+
+
+def _revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+def test_agent_etag_revalidates_until_the_agent_is_updated(client, agent_service):
+    agent_service.repository.save(make_agent("a1"))
+
+    first = client.get("/api/agents/a1")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    not_modified = _revalidate(client, "/api/agents/a1", etag)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    updated = client.put("/api/agents/a1", json={"persona": {"name": "Lisa Carter"}})
+    assert updated.status_code == 200
+
+    changed = _revalidate(client, "/api/agents/a1", etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["persona"]["name"] == "Lisa Carter"
+    assert _revalidate(client, "/api/agents/a1", changed.headers["ETag"]).status_code == 304
+
+
+def test_simulation_etag_changes_with_its_status(client, simulation_service):
+    simulation_service.repository.save(make_simulation("s1", status="running"))
+    etag = client.get("/api/simulations/s1").headers["ETag"]
+    assert _revalidate(client, "/api/simulations/s1", etag).status_code == 304
+
+    simulation_service.repository.transition("s1", [SimulationStatus.RUNNING], {
+        "status": SimulationStatus.COMPLETED,
+        "completed_at": "2025-01-01T00:00:30",
+        "result": {"interactions": [make_interaction(0)], "summary": "Done", "extracted_data": None},
+    })
+
+    response = _revalidate(client, "/api/simulations/s1", etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["status"] == "completed"
+
+
+@pytest.mark.parametrize("header, expected", [
+    ('"stale"', 200),
+    ('"stale", {etag}', 304),
+    ("W/{etag}", 304),
+    ("*", 304),
+])
+def test_if_none_match_forms(client, agent_service, header, expected):
+    agent_service.repository.save(make_agent("a1"))
+    etag = client.get("/api/agents/a1").headers["ETag"]
+
+    response = _revalidate(client, "/api/agents/a1", header.format(etag=etag))
+
+    assert response.status_code == expected
+    assert response.headers["ETag"] == etag
@@ -0,0 +1,171 @@
+"""Columnar interaction store and cross-simulation aggregates."""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.services.interaction_store import InteractionStore
+
+from factories import make_interaction, make_simulation
+
+
+def _message(seq, time, agent_id, content, step=1, message_type="TALK"):
+    name = {"a1": "Lisa", "a2": "Oscar"}[agent_id]
+    return make_interaction(
+        seq, step=step, agent_id=agent_id, agent_name=name, message_type=message_type,
+        content=content, timestamp=f"2025-01-01T{time}",
+    )
+
+
+S1 = [
+    _message(0, "00:00:00", "a1", "one two three"),
+    _message(1, "00:30:00", "a2", "four five"),
+    _message(2, "01:10:00", "a1", "six", step=2, message_type="THINK"),
+]
+S2 = [_message(0, "02:00:00", "a1", "seven eight nine ten")]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = InteractionStore(str(tmp_path / "interactions"))
+    # Batches may split a transcript anywhere
+    store.write("s1", [S1[:2], [], S1[2:]], "2025-01-01T01:15:00")
+    store.write("s2", [S2], "2025-01-01T02:05:00")
+    return store
+
+
+def _keyed(rows, *keys):
+    return {tuple(row[key] for key in keys): row["messages"] for row in rows}
+
+
+def test_write_stored_and_remove(store):
+    assert store.stored() == {"s1": "2025-01-01T01:15:00", "s2": "2025-01-01T02:05:00"}
+
+    assert store.write("s2", [S2 + S2], "2025-01-01T03:00:00") == 2
+    assert store.stored()["s2"] == "2025-01-01T03:00:00"
+    assert store.aggregate([], simulation_ids=["s2"])[1]["messages"] == 2
+
+    store.remove("s1")
+    store.remove("s1")
+    assert list(store.stored()) == ["s2"]
+
+
+def test_unreadable_file_is_reported_for_rewrite(store):
+    store._path("s3").write_bytes(b"not arrow")
+
+    assert store.stored()["s3"] is None
+
+
+def test_totals_without_grouping(store):
+    groups, totals, count = store.aggregate([])
+
+    assert count == 1
+    assert groups == [totals]
+    assert totals == {
+        "messages": 4,
+        "words": 10,
+        "mean_words": 2.5,
+        "simulations": 2,
+        "agents": 2,
+        "first_timestamp": "2025-01-01T00:00:00+00:00",
+        "last_timestamp": "2025-01-01T02:00:00+00:00",
+    }
+
+
+def test_group_by_agent(store):
+    groups, totals, count = store.aggregate(["agent"])
+
+    assert count == 2
+    assert [(g["agent_id"], g["agent_name"], g["messages"], g["words"], g["simulations"]) for g in groups] == [
+        ("a1", "Lisa", 3, 8, 2),
+        ("a2", "Oscar", 1, 2, 1),
+    ]
+    assert totals["messages"] == 4
+
+
+def test_group_by_several_dimensions(store):
+    groups, _, _ = store.aggregate(["simulation", "message_type", "step"])
+
+    assert _keyed(groups, "simulation_id", "message_type", "step") == {
+        ("s1", "TALK", 1): 2, ("s1", "THINK", 2): 1, ("s2", "TALK", 1): 1,
+    }
+
+
+@pytest.mark.parametrize("bucket, bucket_size, expected", [
+    ("hour", 1, {"00:00": 2, "01:00": 1, "02:00": 1}),
+    ("hour", 2, {"00:00": 3, "02:00": 1}),
+    ("day", 1, {"00:00": 4}),
+])
+def test_group_by_time_buckets(store, bucket, bucket_size, expected):
+    groups, _, _ = store.aggregate(["time"], bucket=bucket, bucket_size=bucket_size)
+
+    assert {g["bucket_start"][11:16]: g["messages"] for g in groups} == expected
+
+
+def test_filters(store):
+    assert store.aggregate([], agent_ids=["a1"], message_types=["TALK"])[1]["messages"] == 2
+    assert store.aggregate([], simulation_ids=["s2", "missing"])[1]["messages"] == 1
+    # Naive bounds are UTC; until is exclusive
+    totals = store.aggregate([], since=datetime(2025, 1, 1, 0, 30), until=datetime(2025, 1, 1, 2))[1]
+    assert totals["messages"] == 2
+    assert totals["words"] == 3
+
+
+def test_limit_keeps_the_group_count(store):
+    groups, totals, count = store.aggregate(["simulation"], limit=1)
+
+    assert [g["simulation_id"] for g in groups] == ["s1"]
+    assert count == 2
+    assert totals["messages"] == 4
+
+
+def test_empty_store(tmp_path):
+    groups, totals, count = InteractionStore(str(tmp_path / "empty")).aggregate(["agent"])
+
+    assert (groups, count) == ([], 0)
+    assert totals["messages"] == 0
+
+
+@pytest.mark.parametrize("arguments", [
+    {"group_by": ["planet"]},
+    {"group_by": ["time"], "bucket": "fortnight"},
+    {"group_by": ["time"], "bucket_size": 0},
+])
+def test_invalid_arguments(store, arguments):
+    with pytest.raises(ValueError):
+        store.aggregate(**arguments)
+
+
+def test_sync_follows_completed_simulations(simulation_service, tmp_path, monkeypatch):
+    store = InteractionStore(str(tmp_path / "interactions"))
+    monkeypatch.setattr(simulation_service, "interaction_store", store)
+    repository = simulation_service.repository
+    repository.save(make_simulation("s1", status="completed", completed_at="2025-01-01T01:15:00", interactions=S1))
+    repository.save(make_simulation("s2", status="failed", interactions=S2))
+
+    assert simulation_service.sync_interaction_store() == 1
+    assert store.stored() == {"s1": "2025-01-01T01:15:00"}
+    assert simulation_service.sync_interaction_store() == 0
+
+    # A rerun completes at a new time and is written again
+    repository.save(make_simulation("s1", status="completed", completed_at="2025-01-01T05:00:00", interactions=S2))
+    assert simulation_service.sync_interaction_store() == 1
+    assert store.aggregate([])[1]["words"] == 4
+
+    repository.delete("s1")
+    assert simulation_service.sync_interaction_store() == 0
+    assert store.stored() == {}
+
+
+def test_read_filters_each_file_before_combining(store):
+    import pyarrow.compute as pc
+
+    table = store._read(None, ["simulation_id", "agent_id", "words"], [lambda t: pc.equal(t["agent_id"], "a1")])
+
+    # s1 and s2 each keep their a1 rows, in a chunk of their own
+    assert table.num_rows == 3
+    assert table["agent_id"].num_chunks == 2
+    assert sorted(table["words"].to_pylist()) == [1, 3, 4]
+    assert store._read(None, ["agent_id"], [lambda t: pc.equal(t["agent_id"], "nobody")]).num_rows == 0
@@ -0,0 +1,198 @@
+"""Durable job queue, lease recovery and dispatch."""
+
+import asyncio
+
+import pytest
+
+from app.models.simulation import SimulationStatus
+from app.services.job_queue import DONE, LEASED, QUEUED, JobAlreadyActiveError, JobQueue
+from app.services.simulation_runner import SimulationRunner
+
+from factories import make_simulation
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.db"))
+
+
+def _expire_leases(queue):
+    queue.db.connection().execute("UPDATE jobs SET lease_expires_at = 0")
+
+
+def _job_state(queue, simulation_id):
+    row = queue.db.connection().execute(
+        "SELECT state, attempts FROM jobs WHERE simulation_id = ? ORDER BY updated_at DESC", (simulation_id,)
+    ).fetchone()
+    return row["state"], row["attempts"]
+
+
+def test_claims_in_enqueue_order(queue):
+    queue.enqueue("s1")
+    queue.enqueue("s2")
+
+    assert queue.claim(60).simulation_id == "s1"
+    assert queue.claim(60).simulation_id == "s2"
+    assert queue.claim(60) is None
+    assert queue.depth() == {QUEUED: 0, LEASED: 2, DONE: 0, "failed": 0}
+
+
+def test_enqueue_refuses_duplicates_and_overflow(queue):
+    queue.enqueue("s1")
+
+    with pytest.raises(JobAlreadyActiveError):
+        queue.enqueue("s1")
+    assert queue.enqueue("s2", max_queued=1) is None
+
+    queue.complete(queue.claim(60))
+    # A finished job no longer blocks the simulation
+    assert queue.enqueue("s1") is not None
+
+
+def test_recover_requeues_expired_leases_then_fails_them(queue):
+    queue.enqueue("s1")
+    queue.claim(60)
+    _expire_leases(queue)
+
+    assert queue.recover(max_attempts=2) == (["s1"], [])
+    assert _job_state(queue, "s1") == (QUEUED, 1)
+
+    queue.claim(60)
+    _expire_leases(queue)
+    assert queue.recover(max_attempts=2) == ([], ["s1"])
+    assert _job_state(queue, "s1") == ("failed", 2)
+
+
+def test_recover_leaves_live_leases_alone(queue, tmp_path):
+    queue.enqueue("s1")
+    queue.claim(60)
+
+    assert queue.recover(max_attempts=3) == ([], [])
+    # Another process on this host sees a live owner too
+    other = JobQueue(str(tmp_path / "jobs.db"), owner=queue.owner)
+    assert other.recover(max_attempts=3) == ([], [])
+
+
+def test_recover_releases_leases_of_an_earlier_incarnation(queue, tmp_path):
+    queue.enqueue("s1")
+    queue.claim(60)
+
+    # Same host and PID, different owner: the process restarted
+    restarted = JobQueue(str(tmp_path / "jobs.db"))
+    assert restarted.recover(max_attempts=3) == (["s1"], [])
+
+
+def test_lost_lease_cannot_renew_or_finish_the_next_attempt(queue):
+    queue.enqueue("s1")
+    first = queue.claim(60)
+    _expire_leases(queue)
+    queue.recover(max_attempts=3)
+    # The same process claims the job again
+    second = queue.claim(60)
+
+    assert queue.heartbeat(first, 60) is False
+    queue.complete(first)
+    assert _job_state(queue, "s1") == (LEASED, 2)
+
+    assert queue.heartbeat(second, 60) is True
+    queue.complete(second)
+    assert _job_state(queue, "s1") == (DONE, 2)
+
+
+def test_on_requeue_runs_before_jobs_can_be_claimed(queue, tmp_path):
+    queue.enqueue("s1")
+    queue.claim(60)
+    _expire_leases(queue)
+    observer = JobQueue(str(tmp_path / "jobs.db"))
+    seen = []
+
+    def on_requeue(requeued):
+        seen.append((requeued, observer.depth()[QUEUED]))
+
+    queue.recover(max_attempts=3, on_requeue=on_requeue)
+
+    assert seen == [(["s1"], 0)]
+    assert observer.depth()[QUEUED] == 1
+
+
+def test_failing_on_requeue_releases_nothing(queue):
+    queue.enqueue("s1")
+    queue.claim(60)
+    _expire_leases(queue)
+
+    def on_requeue(requeued):
+        raise RuntimeError("repository unavailable")
+
+    with pytest.raises(RuntimeError):
+        queue.recover(max_attempts=3, on_requeue=on_requeue)
+    assert _job_state(queue, "s1") == (LEASED, 1)
+    assert queue.recover(max_attempts=3) == (["s1"], [])
+
+
+# Dispatch
+
+def _runner(queue, **options):
+    return SimulationRunner(
+        max_workers=1,
+        max_queue_size=10,
+        job_queue=queue,
+        heartbeat_seconds=0.05,
+        poll_interval=0.01,
+        prewarm=False,
+        **options
+    )
+
+
+def test_dispatch_stops_a_run_whose_lease_was_lost(queue):
+    calls = []
+
+    async def handler(simulation_id):
+        calls.append(simulation_id)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                calls.append("cancelled")
+                raise
+
+    async def scenario():
+        runner = _runner(queue)
+        await runner.start(handler)
+        try:
+            runner.submit("s1")
+            while not calls:
+                await asyncio.sleep(0.01)
+            # Recovery elsewhere hands the job back to the queue
+            queue.db.connection().execute(
+                "UPDATE jobs SET state = ?, lease_owner = NULL, lease_expires_at = NULL", (QUEUED,)
+            )
+            while queue.depth()[DONE] == 0:
+                await asyncio.sleep(0.01)
+        finally:
+            await runner.shutdown()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=10))
+
+    assert calls == ["s1", "cancelled", "s1"]
+    assert _job_state(queue, "s1") == (DONE, 2)
+
+
+def test_recovery_resets_simulations_before_requeueing(queue, simulation_service, tmp_path):
+    simulation_service.repository.save(make_simulation("s1", status="running"))
+    queue.enqueue("s1")
+    queue.claim(60)
+    _expire_leases(queue)
+    observer = JobQueue(str(tmp_path / "jobs.db"))
+    seen = []
+
+    def handle_recovered_jobs(requeued, failed):
+        simulation_service.handle_recovered_jobs(requeued, failed)
+        seen.append((requeued, observer.depth()[QUEUED], simulation_service.repository.get_summary("s1").status))
+
+    runner = _runner(queue)
+    runner._recovery_handler = handle_recovered_jobs
+
+    assert runner.recover() == (["s1"], [])
+    # The simulation was pending before any worker could claim its job
+    assert seen == [(["s1"], 0, SimulationStatus.PENDING)]
+    assert observer.depth()[QUEUED] == 1
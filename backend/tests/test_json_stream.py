@@ -0,0 +1,60 @@
+"""Incremental reading of a nested JSON array."""
+
+import io
+import json
+
+import pytest
+
+from app.storage.json_stream import iter_json_array
+
+
+def _stream(document, path=("result", "interactions"), chunk_size=7):
+    return list(iter_json_array(io.StringIO(document), path, chunk_size=chunk_size))
+
+
+INTERACTIONS = [
+    {"content": 'Said "hi", then {left}] — ünïcode', "step": 1, "score": 12345.678e-2},
+    {"content": "", "step": 22, "tags": [1, [2, 3]], "done": True, "extra": None},
+    -1234567,
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_elements_match_a_full_parse(chunk_size, indent):
+    document = json.dumps({
+        "id": "s1",
+        "config": {"interactions": ["not", "this"], "nested": {"result": 1}},
+        "result": {"summary": "a } tricky ] string", "interactions": INTERACTIONS, "extracted_data": {}},
+        "after": [1, 2],
+    }, ensure_ascii=False, indent=indent)
+
+    assert _stream(document, chunk_size=chunk_size) == INTERACTIONS
+
+
+@pytest.mark.parametrize("document", [
+    '{"id": "s1", "result": null}',
+    '{"id": "s1"}',
+    '{"result": {"summary": "Done"}}',
+    '{"result": {"interactions": null}}',
+    '{"result": {"interactions": []}}',
+    '{}',
+])
+def test_missing_or_empty_array_yields_nothing(document):
+    assert _stream(document) == []
+
+
+def test_elements_are_read_lazily():
+    document = json.dumps({"result": {"interactions": [{"n": n} for n in range(1000)]}})
+    source = io.StringIO(document)
+
+    elements = iter_json_array(source, ("result", "interactions"), chunk_size=64)
+
+    assert next(elements) == {"n": 0}
+    assert source.tell() < len(document) // 10
+
+
+@pytest.mark.parametrize("document", ['{"result": {"interactions": [1, 2', '[1, 2]', '{"result": {"interactions": [1 2]}}'])
+def test_malformed_documents_raise(document):
+    with pytest.raises(ValueError):
+        _stream(document)
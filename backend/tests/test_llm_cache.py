@@ -0,0 +1,107 @@
+"""Persistent LLM response cache."""
+
+import sqlite3
+
+import pytest
+
+from app.services.llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A cache with a large size cap that never flushes on its own."""
+    return LLMCache(str(tmp_path / "cache.db"), max_bytes=1 << 20, flush_interval=3600)
+
+
+def _last_access(cache, key):
+    return cache.db.connection().execute(
+        "SELECT last_access FROM completions WHERE key = ?", (key,)
+    ).fetchone()[0]
+
+
+def test_make_key_ignores_argument_order():
+    first = LLMCache.make_key({"model": "gpt", "messages": [{"role": "user", "content": "hi"}]})
+    second = LLMCache.make_key({"messages": [{"role": "user", "content": "hi"}], "model": "gpt"})
+    assert first == second
+    assert first != LLMCache.make_key({"model": "gpt", "messages": []})
+
+
+def test_get_and_put_round_trip(cache):
+    assert cache.get("k") is None
+
+    cache.put("k", {"role": "assistant", "content": "Hello"})
+
+    assert cache.get("k") == {"role": "assistant", "content": "Hello"}
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_get_does_not_wait_for_the_write_lock(cache, tmp_path):
+    cache.put("k", {"content": "cached"})
+    writer = sqlite3.connect(tmp_path / "cache.db", isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        # Would block until the connection's 30 s busy timeout if reads wrote
+        assert cache.get("k") == {"content": "cached"}
+        assert cache.get("missing") is None
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_hits_touch_only_stale_entries(cache):
+    cache.put("k", {"content": "cached"})
+    created = _last_access(cache, "k")
+
+    cache.get("k")
+    cache.flush()
+    assert _last_access(cache, "k") == created
+
+    cache.db.connection().execute("UPDATE completions SET last_access = last_access - 3600")
+    cache.get("k")
+    cache.flush()
+    assert _last_access(cache, "k") >= created
+
+
+def test_counters_flush_once_the_interval_elapses(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.db"), max_bytes=1 << 20, flush_interval=0)
+    reader = LLMCache(str(tmp_path / "cache.db"), max_bytes=1 << 20)
+
+    cache.get("missing")
+
+    assert reader.stats()["misses"] == 1
+
+
+def test_put_evicts_least_recently_used(tmp_path):
+    # Each payload is 12 bytes of JSON, so three fit under the cap
+    cache = LLMCache(str(tmp_path / "cache.db"), max_bytes=40, touch_interval=0, flush_interval=3600)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 10)
+    cache.db.connection().execute(
+        "UPDATE completions SET last_access = CASE key WHEN 'a' THEN 1 WHEN 'b' THEN 2 ELSE 3 END"
+    )
+
+    # Reading "a" makes "b" the least recently used once the touch is written
+    cache.get("a")
+    cache.put("d", "x" * 10)
+
+    keys = {row[0] for row in cache.db.connection().execute("SELECT key FROM completions")}
+    assert keys == {"a", "c", "d"}
+    assert cache.stats()["size_bytes"] == 36
+
+
+def test_clear_resets_entries_and_counters(cache):
+    cache.put("k", {"content": "cached"})
+    cache.get("k")
+    cache.get("missing")
+
+    cache.clear()
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["size_bytes"], stats["hits"], stats["misses"]) == (0, 0, 0, 0)
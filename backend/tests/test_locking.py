@@ -0,0 +1,103 @@
+"""Cross-process file locks and atomic file replacement."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.locking import atomic_write, file_lock
+
+
+def test_file_lock_is_exclusive_across_threads(tmp_path):
+    lock_path = tmp_path / "locks" / "counter.lock"
+    counter = tmp_path / "counter"
+    counter.write_text("0")
+
+    def increment():
+        for _ in range(20):
+            with file_lock(lock_path):
+                value = int(counter.read_text())
+                time.sleep(0.0005)
+                counter.write_text(str(value + 1))
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.read_text() == "80"
+
+
+def test_file_lock_is_released_on_error(tmp_path):
+    with pytest.raises(RuntimeError):
+        with file_lock(tmp_path / "a.lock"):
+            raise RuntimeError("boom")
+
+    acquired = threading.Event()
+
+    def take():
+        with file_lock(tmp_path / "a.lock"):
+            acquired.set()
+
+    thread = threading.Thread(target=take)
+    thread.start()
+    thread.join(timeout=5)
+    assert acquired.is_set()
+
+
+def test_atomic_write_replaces_without_leftovers(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write(path, b'{"v": 1}')
+    atomic_write(path, b'{"v": 2}')
+
+    assert path.read_bytes() == b'{"v": 2}'
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_atomic_write_keeps_old_contents_on_failure(tmp_path, monkeypatch):
+    import app.core.locking as locking
+
+    path = tmp_path / "data.json"
+    atomic_write(path, b"old")
+
+    def replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(locking.os, "replace", replace)
+    with pytest.raises(OSError):
+        atomic_write(path, b"new")
+
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="open files cannot be unlinked on Windows")
+def test_file_lock_survives_the_lock_file_being_unlinked(tmp_path):
+    lock_path = tmp_path / "s1.lock"
+    holders = []
+    waiting = threading.Event()
+
+    def take(name):
+        waiting.set()
+        with file_lock(lock_path):
+            holders.append(name)
+            time.sleep(0.05)
+            holders.append(name)
+
+    with file_lock(lock_path):
+        # The waiter opens the file that is about to be unlinked
+        waiter = threading.Thread(target=take, args=("waiter",))
+        waiter.start()
+        waiting.wait()
+        time.sleep(0.05)
+        lock_path.unlink()
+    # A newcomer locks a fresh file; the waiter must retry on it, not run alongside
+    newcomer = threading.Thread(target=take, args=("newcomer",))
+    newcomer.start()
+    waiter.join()
+    newcomer.join()
+
+    assert holders[0] == holders[1] and holders[2] == holders[3]
+    assert lock_path.exists()
@@ -0,0 +1,42 @@
+"""Prometheus metrics recorded for finished simulations and served at /metrics."""
+
+from prometheus_client import REGISTRY, generate_latest
+
+from app.core import metrics
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_per_agent_usage_is_bucketed_without_agent_labels():
+    before = _sample("optimus_agent_llm_calls_count")
+    usage = {
+        "calls": 7, "cache_hits": 2, "prompt_tokens": 300, "completion_tokens": 40,
+        "agents": {
+            "a1": {"calls": 3, "prompt_tokens": 100, "completion_tokens": 10},
+            "a2": {"calls": 4, "prompt_tokens": 200, "completion_tokens": 30},
+        },
+    }
+
+    metrics.record_simulation_run("completed", {"llm_usage": usage})
+
+    assert _sample("optimus_agent_llm_calls_count") - before == 2
+    assert _sample("optimus_agent_llm_calls_bucket", le="5.0") - _sample("optimus_agent_llm_calls_bucket", le="1.0") >= 2
+    assert b'agent_id="' not in generate_latest(REGISTRY)
+
+
+def test_multiprocess_mode_merges_process_files_and_keeps_runtime_gauges(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_runtime_collector", metrics.RuntimeCollector(
+        lambda: {"queued": 3, "running": 1, "max_workers": 2},
+        lambda: {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size_bytes": 10, "entries": 1},
+    ))
+    assert metrics.scrape_registry() is REGISTRY
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    registry = metrics.scrape_registry()
+
+    assert registry is not REGISTRY
+    assert registry.get_sample_value("optimus_simulation_queue_depth", {"state": "queued"}) == 3
+    # In-process samples are not served; other processes' files would be
+    assert registry.get_sample_value("optimus_simulations_finished_total", {"status": "completed"}) is None
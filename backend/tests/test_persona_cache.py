@@ -0,0 +1,128 @@
+"""Per-process cache of configured TinyPersons."""
+
+import pytest
+
+from app.services.persona_cache import PersonaCache, persona_hash
+
+
+def _agent(agent_id="a1", name="Lisa", **persona):
+    return {"id": agent_id, "type": "TinyPerson", "persona": {"name": name, **persona}}
+
+
+class Builder:
+    """Build callback counting how often a spec is built."""
+
+    def __init__(self):
+        self.builds = 0
+
+    def __call__(self):
+        self.builds += 1
+        return {"build": self.builds}
+
+
+def test_hit_after_miss():
+    cache = PersonaCache(max_entries=10)
+    build = Builder()
+
+    assert cache.get_or_build(_agent(age=30), build) == ({"build": 1}, False)
+    assert cache.get_or_build(_agent(age=30), build) == ({"build": 1}, True)
+    assert build.builds == 1
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+
+def test_changed_persona_is_rebuilt():
+    cache = PersonaCache(max_entries=10)
+    build = Builder()
+    cache.get_or_build(_agent(age=30), build)
+
+    assert cache.get_or_build(_agent(age=31), build) == ({"build": 2}, False)
+    assert cache.get_or_build(_agent(age=31), build) == ({"build": 2}, True)
+    assert cache.stats()["entries"] == 1
+
+
+def test_hash_ignores_key_order_but_not_type():
+    assert persona_hash(_agent(age=30, nationality="Canadian")) == persona_hash(
+        {"id": "other", "type": "TinyPerson", "persona": {"nationality": "Canadian", "age": 30, "name": "Lisa"}}
+    )
+    assert persona_hash(_agent()) != persona_hash({**_agent(), "type": "TinyWorld"})
+
+
+def test_invalidate_one_or_all():
+    cache = PersonaCache(max_entries=10)
+    build = Builder()
+    cache.get_or_build(_agent("a1"), build)
+    cache.get_or_build(_agent("a2", "Oscar"), build)
+
+    cache.invalidate("a1")
+    assert cache.get_or_build(_agent("a1"), build)[1] is False
+    assert cache.get_or_build(_agent("a2", "Oscar"), build)[1] is True
+
+    cache.invalidate()
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = PersonaCache(max_entries=2)
+    build = Builder()
+    for agent_id in ("a1", "a2"):
+        cache.get_or_build(_agent(agent_id), build)
+    cache.get_or_build(_agent("a1"), build)
+
+    cache.get_or_build(_agent("a3"), build)
+
+    assert cache.get_or_build(_agent("a1"), build)[1] is True
+    assert cache.get_or_build(_agent("a2"), build)[1] is False
+
+
+def test_zero_entries_disables_caching():
+    cache = PersonaCache(max_entries=0)
+    build = Builder()
+
+    cache.get_or_build(_agent(), build)
+
+    assert cache.get_or_build(_agent(), build) == ({"build": 2}, False)
+
+
+# Through the worker, on the benchmark suite's fake TinyTroupe
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    from benchmarks.fakes import install_fake_tinytroupe
+    from app.services import simulation_worker
+
+    install_fake_tinytroupe()
+    monkeypatch.setattr(simulation_worker, "persona_cache", PersonaCache(max_entries=10))
+
+    def run(agents_data):
+        simulation_data = {
+            "id": "s1", "name": "World", "config": {"steps": 1, "initial_prompt": "What do you think?"},
+        }
+        return simulation_worker.execute_tinytroupe_simulation(simulation_data, agents_data, str(tmp_path))
+
+    return run
+
+
+def test_recurring_cast_is_restored_from_the_cache(run):
+    cast = [
+        _agent("a1", occupation={"title": "Nurse", "description": "Cares"}, age=30),
+        _agent("a2", "Oscar", skills=["drawing"]),
+    ]
+
+    first = run(cast)
+    second = run(cast)
+
+    assert first["persona_cache"] == {"hits": 0, "misses": 2}
+    assert second["persona_cache"] == {"hits": 2, "misses": 0}
+    # A restored agent behaves exactly like a freshly configured one
+    assert second["interactions"] == [
+        {**interaction, "timestamp": second["interactions"][index]["timestamp"]}
+        for index, interaction in enumerate(first["interactions"])
+    ]
+
+
+def test_updated_persona_misses_the_cache(run):
+    run([_agent("a1", age=30), _agent("a2", "Oscar")])
+
+    result = run([_agent("a1", age=31), _agent("a2", "Oscar")])
+
+    assert result["persona_cache"] == {"hits": 1, "misses": 1}
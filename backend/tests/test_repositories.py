@@ -0,0 +1,280 @@
+"""Behaviour shared by the file and SQLite storage backends."""
+
+import threading
+
+from app.models.simulation import SimulationStatus
+
+from factories import make_agent, make_interaction, make_simulation
+
+
+# Agents
+
+def test_agent_get_save_delete(agent_repository):
+    assert agent_repository.get("a1") is None
+
+    saved = agent_repository.save(make_agent("a1", age=30, occupation={"title": "Nurse", "description": "Cares"}))
+    assert saved.persona.name == "Lisa"
+
+    loaded = agent_repository.get("a1")
+    assert loaded.id == "a1"
+    assert loaded.persona.age == 30
+    assert loaded.persona.occupation.title == "Nurse"
+    assert agent_repository.count() == 1
+
+    agent_repository.save(make_agent("a1", name="Lisa Carter", age=31))
+    assert agent_repository.get("a1").persona.name == "Lisa Carter"
+    assert agent_repository.count() == 1
+
+    assert agent_repository.delete("a1") is True
+    assert agent_repository.get("a1") is None
+    assert agent_repository.delete("a1") is False
+    assert agent_repository.count() == 0
+
+
+def test_agent_save_many_and_list(agent_repository):
+    saved = agent_repository.save_many([
+        make_agent("a2", name="Oscar", created_at="2025-01-02T00:00:00"),
+        make_agent("a1", name="Lisa", created_at="2025-01-01T00:00:00"),
+    ])
+    assert [agent.id for agent in saved] == ["a2", "a1"]
+    assert sorted(agent.id for agent in agent_repository.list()) == ["a1", "a2"]
+
+
+# Simulations
+
+def test_simulation_get_save_delete(simulation_repository):
+    assert simulation_repository.get("s1") is None
+    assert simulation_repository.get_summary("s1") is None
+
+    simulation_repository.save(make_simulation("s1", interactions=[make_interaction(0), make_interaction(1)]))
+
+    data = simulation_repository.get("s1")
+    assert data["name"] == "Simulation s1"
+    assert data["status"] == "pending"
+    assert data["config"]["steps"] == 3
+    assert [i["content"] for i in data["result"]["interactions"]] == ["message 0", "message 1"]
+
+    summary = simulation_repository.get_summary("s1")
+    assert summary.id == "s1"
+    assert summary.status == SimulationStatus.PENDING
+    assert summary.agent_ids == ["a1", "a2"]
+    assert simulation_repository.count() == 1
+
+    simulation_repository.save(make_simulation("s1", name="Renamed"))
+    assert simulation_repository.get("s1")["name"] == "Renamed"
+    assert simulation_repository.get("s1")["result"] is None
+    assert simulation_repository.count() == 1
+
+    assert simulation_repository.delete("s1") is True
+    assert simulation_repository.get("s1") is None
+    assert simulation_repository.get_summary("s1") is None
+    assert simulation_repository.delete("s1") is False
+    assert simulation_repository.count() == 0
+
+
+def _save_history(repository):
+    """Store five simulations with a created_at tie between s2 and s3."""
+    for simulation_id, created_at, status in [
+        ("s1", "2025-01-01T00:00:00", "completed"),
+        ("s2", "2025-01-02T00:00:00", "failed"),
+        ("s3", "2025-01-02T00:00:00", "completed"),
+        ("s4", "2025-01-03T00:00:00", "pending"),
+        ("s5", "2025-01-04T00:00:00", "running"),
+    ]:
+        repository.save(make_simulation(simulation_id, created_at=created_at, status=status))
+
+
+def test_list_summaries_orders_newest_first_with_id_tiebreak(simulation_repository):
+    _save_history(simulation_repository)
+
+    summaries, total = simulation_repository.list_summaries()
+
+    assert [s.id for s in summaries] == ["s5", "s4", "s3", "s2", "s1"]
+    assert total == 5
+
+
+def test_list_summaries_keyset_paging(simulation_repository):
+    _save_history(simulation_repository)
+
+    pages = []
+    after_key = None
+    while True:
+        page, total = simulation_repository.list_summaries(after_key=after_key, limit=2)
+        assert total == 5
+        if not page:
+            break
+        pages.append([s.id for s in page])
+        after_key = (page[-1].created_at, page[-1].id)
+
+    # The cursor splits the s3/s2 created_at tie without skipping or repeating
+    assert pages == [["s5", "s4"], ["s3", "s2"], ["s1"]]
+
+
+def test_list_summaries_filters(simulation_repository):
+    _save_history(simulation_repository)
+
+    summaries, total = simulation_repository.list_summaries(statuses=[SimulationStatus.COMPLETED])
+    assert [s.id for s in summaries] == ["s3", "s1"]
+    assert total == 2
+
+    summaries, total = simulation_repository.list_summaries(
+        created_after="2025-01-02T00:00:00", created_before="2025-01-04T00:00:00"
+    )
+    assert [s.id for s in summaries] == ["s4", "s3", "s2"]
+    assert total == 3
+
+    summaries, total = simulation_repository.list_summaries(
+        statuses=[SimulationStatus.COMPLETED, SimulationStatus.FAILED],
+        created_after="2025-01-02T00:00:00",
+        after_key=("2025-01-02T00:00:00", "s3"),
+        limit=10
+    )
+    # total counts every match, not only those after the cursor
+    assert [s.id for s in summaries] == ["s2"]
+    assert total == 2
+
+
+def test_transition_compare_and_set(simulation_repository):
+    simulation_repository.save(make_simulation("s1"))
+
+    assert simulation_repository.transition(
+        "s1", [SimulationStatus.PENDING], {"status": SimulationStatus.RUNNING, "started_at": "2025-01-01T00:00:01"}
+    ) is True
+    summary = simulation_repository.get_summary("s1")
+    assert summary.status == SimulationStatus.RUNNING
+    assert summary.started_at == "2025-01-01T00:00:01"
+
+    # A second claim from PENDING loses and changes nothing
+    assert simulation_repository.transition(
+        "s1", [SimulationStatus.PENDING], {"status": SimulationStatus.FAILED, "error": "late"}
+    ) is False
+    summary = simulation_repository.get_summary("s1")
+    assert summary.status == SimulationStatus.RUNNING
+    assert summary.error is None
+
+    assert simulation_repository.transition("missing", [SimulationStatus.PENDING], {"status": "running"}) is False
+
+
+def test_transition_admits_one_of_concurrent_claims(simulation_repository):
+    simulation_repository.save(make_simulation("s1"))
+    barrier = threading.Barrier(8)
+    results = []
+
+    def claim(worker):
+        barrier.wait()
+        results.append(simulation_repository.transition(
+            "s1", [SimulationStatus.PENDING], {"status": SimulationStatus.RUNNING, "started_at": f"worker {worker}"}
+        ))
+
+    threads = [threading.Thread(target=claim, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1
+    assert simulation_repository.get_summary("s1").status == SimulationStatus.RUNNING
+    assert simulation_repository.get_summary("s1").started_at.startswith("worker ")
+
+
+def test_transition_stores_result(simulation_repository):
+    simulation_repository.save(make_simulation("s1", status="running"))
+
+    interactions = [make_interaction(seq) for seq in range(3)]
+    assert simulation_repository.transition("s1", [SimulationStatus.RUNNING], {
+        "status": SimulationStatus.COMPLETED,
+        "completed_at": "2025-01-01T00:05:00",
+        "result": {"interactions": interactions, "summary": "Done", "extracted_data": None},
+    }) is True
+
+    data = simulation_repository.get("s1")
+    assert data["status"] == "completed"
+    assert data["completed_at"] == "2025-01-01T00:05:00"
+    assert data["result"]["summary"] == "Done"
+    assert [i["content"] for i in data["result"]["interactions"]] == ["message 0", "message 1", "message 2"]
+    assert simulation_repository.get_summary("s1").status == SimulationStatus.COMPLETED
+
+
+def test_iter_interactions_batches_in_order(simulation_repository):
+    interactions = [make_interaction(seq, step=seq // 4 + 1) for seq in range(10)]
+    simulation_repository.save(make_simulation("s1", status="completed", interactions=interactions))
+
+    batches = list(simulation_repository.iter_interactions("s1", batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [i for batch in batches for i in batch] == interactions
+
+
+def test_iter_interactions_without_result(simulation_repository):
+    simulation_repository.save(make_simulation("s1"))
+
+    assert list(simulation_repository.iter_interactions("s1")) == []
+    assert list(simulation_repository.iter_interactions("missing")) == []
+
+
+def test_get_result_summary_counts_interactions_per_type(simulation_repository):
+    interactions = [make_interaction(seq, message_type="THINK" if seq % 3 else "TALK") for seq in range(5)]
+    simulation_repository.save(make_simulation("s1", status="completed"))
+    simulation_repository.transition("s1", [SimulationStatus.COMPLETED], {"result": {
+        "interactions": interactions, "summary": "Done", "extracted_data": {"messages": 5}, "llm_usage": {"calls": 7},
+    }})
+    simulation_repository.save(make_simulation("s2"))
+
+    assert simulation_repository.get_result_summary("s1") == {
+        "summary": "Done",
+        "extracted_data": {"messages": 5},
+        "llm_usage": {"calls": 7},
+        "message_types": {"TALK": 2, "THINK": 3},
+    }
+    assert simulation_repository.get_result_summary("s2") is None
+    assert simulation_repository.get_result_summary("missing") is None
+
+    simulation_repository.delete("s1")
+    assert simulation_repository.get_result_summary("s1") is None
+
+
+def test_file_result_summary_is_built_for_older_data(tmp_path):
+    from app.storage import FileSimulationRepository
+
+    repository = FileSimulationRepository(str(tmp_path), refresh_interval=0)
+    repository.save(make_simulation("s1", status="completed", interactions=[make_interaction(0)]))
+    # Saved before result sidecars existed
+    repository._get_result_file_path("s1").unlink()
+
+    assert repository.get_result_summary("s1")["message_types"] == {"TALK": 1}
+    assert repository._get_result_file_path("s1").exists()
+
+
+def test_list_summaries_follows_status_changes_and_deletes(simulation_repository):
+    _save_history(simulation_repository)
+
+    simulation_repository.transition("s4", [SimulationStatus.PENDING], {"status": SimulationStatus.COMPLETED})
+    simulation_repository.delete("s1")
+
+    summaries, total = simulation_repository.list_summaries(statuses=[SimulationStatus.COMPLETED])
+    assert [s.id for s in summaries] == ["s4", "s3"]
+    assert total == 2
+    summaries, total = simulation_repository.list_summaries(statuses=[SimulationStatus.PENDING])
+    assert summaries == []
+    assert total == 0
+
+
+def test_file_list_summaries_sees_other_processes_writes(tmp_path):
+    from app.storage import FileSimulationRepository
+
+    reader = FileSimulationRepository(str(tmp_path), refresh_interval=0)
+    writer = FileSimulationRepository(str(tmp_path), refresh_interval=0)
+    reader.load()
+    writer.load()
+    writer.save(make_simulation("s1", created_at="2025-01-01T00:00:00"))
+    writer.save(make_simulation("s2", created_at="2025-01-02T00:00:00"))
+    writer.transition("s1", [SimulationStatus.PENDING], {"status": SimulationStatus.FAILED})
+
+    summaries, total = reader.list_summaries(statuses=[SimulationStatus.FAILED])
+    assert [s.id for s in summaries] == ["s1"]
+    assert total == 1
+
+    writer.delete("s2")
+    summaries, total = reader.list_summaries()
+    assert [s.id for s in summaries] == ["s1"]
+    assert total == 1
@@ -0,0 +1,117 @@
+"""Streaming export encoders and export routes."""
+
+import io
+import csv
+import json
+
+import pytest
+
+from app.services.result_export import EXPORT_COLUMNS, encode_csv, encode_jsonl, encode_parquet
+
+from factories import make_interaction, make_simulation
+
+
+def _rows(simulation_id, count, start=0, **fields):
+    return [
+        {"simulation_id": simulation_id, "seq": seq, **make_interaction(seq, step=seq // 2 + 1, **fields)}
+        for seq in range(start, start + count)
+    ]
+
+
+def _batches():
+    return [
+        _rows("s1", 2, content='Hello, "world"\nsecond line — ünïcode'),
+        [],
+        _rows("s1", 1, start=2) + _rows("s2", 2),
+    ]
+
+
+def test_jsonl_yields_one_chunk_per_batch():
+    chunks = list(encode_jsonl(_batches()))
+
+    assert len(chunks) == 3
+    assert chunks[1] == b""
+    rows = [json.loads(line) for line in b"".join(chunks).decode("utf-8").splitlines()]
+    assert rows == [row for batch in _batches() for row in batch]
+
+
+def test_csv_has_header_and_round_trips():
+    chunks = list(encode_csv(_batches()))
+
+    assert chunks[0].decode("utf-8").startswith(",".join(EXPORT_COLUMNS) + "\r\n")
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    expected = [row for batch in _batches() for row in batch]
+    assert [row["content"] for row in rows] == [row["content"] for row in expected]
+    assert [(row["simulation_id"], int(row["seq"]), int(row["step"])) for row in rows] == [
+        (row["simulation_id"], row["seq"], row["step"]) for row in expected
+    ]
+
+
+def test_csv_of_nothing_is_only_the_header():
+    assert b"".join(encode_csv([])) == (",".join(EXPORT_COLUMNS) + "\r\n").encode("utf-8")
+
+
+def test_encoders_read_batches_lazily():
+    consumed = []
+
+    def batches():
+        for index, batch in enumerate(_batches()):
+            consumed.append(index)
+            yield batch
+
+    for encode in (encode_jsonl, encode_csv):
+        consumed.clear()
+        chunks = encode(batches())
+        next(chunks)
+        assert consumed == [0]
+
+
+def test_parquet_writes_a_row_group_per_batch():
+    pq = pytest.importorskip("pyarrow.parquet")
+    import pyarrow as pa
+
+    data = b"".join(encode_parquet([_rows("s1", 3), _rows("s2", 2)]))
+
+    parquet = pq.ParquetFile(pa.BufferReader(data))
+    assert parquet.metadata.num_row_groups == 2
+    table = parquet.read()
+    assert table.column_names == list(EXPORT_COLUMNS)
+    assert table.to_pylist() == _rows("s1", 3) + _rows("s2", 2)
+
+
+# Routes
+
+def test_export_completed_simulation(client, simulation_service):
+    interactions = [make_interaction(seq) for seq in range(3)]
+    simulation_service.repository.save(make_simulation("s1", status="completed", interactions=interactions))
+
+    response = client.get("/api/simulations/s1/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="simulation-s1.jsonl"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{"simulation_id": "s1", "seq": seq, **interaction} for seq, interaction in enumerate(interactions)]
+
+    cached = client.get("/api/simulations/s1/export", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_export_refuses_unfinished_and_missing_simulations(client, simulation_service):
+    simulation_service.repository.save(make_simulation("s1", status="running"))
+
+    assert client.get("/api/simulations/s1/export").status_code == 400
+    assert client.get("/api/simulations/missing/export").status_code == 404
+    assert client.get("/api/simulations/export", params={"id": ["s1", "missing"]}).status_code == 404
+
+
+def test_export_many_defaults_to_completed_simulations(client, simulation_service):
+    for simulation_id, status in (("s1", "completed"), ("s2", "failed"), ("s3", "completed")):
+        simulation_service.repository.save(make_simulation(
+            simulation_id, status=status, interactions=[make_interaction(0)]
+        ))
+
+    response = client.get("/api/simulations/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert sorted(row["simulation_id"] for row in rows) == ["s1", "s3"]
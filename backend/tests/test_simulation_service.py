@@ -0,0 +1,104 @@
+"""Running simulations through the service."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.models.simulation import SimulationStatus
+from app.services.simulation_events import SimulationEventLog
+from app.services.simulation_runner import simulation_runner
+from app.services.simulation_worker import SimulationCancelledError
+
+from factories import make_simulation
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Record worker runs instead of starting TinyTroupe in a process pool."""
+    runs = []
+
+    async def run_in_pool(fn, simulation_data, agents_data, events_dir, *options):
+        runs.append(simulation_data["id"])
+        if simulation_data["config"].get("block"):
+            # Like a worker between steps, stop only once asked to
+            events, run_id = SimulationEventLog(events_dir, simulation_data["id"]), options[-1]
+            while not events.cancel_requested(run_id):
+                await asyncio.sleep(0.01)
+            runs.append("stopped")
+            raise SimulationCancelledError(f"Simulation run {run_id} was cancelled")
+        return {"interactions": [], "summary": "Done", "extracted_data": None}
+
+    monkeypatch.setattr(simulation_runner, "run_in_pool", run_in_pool)
+    return runs
+
+
+def _status(simulation_service, simulation_id):
+    return simulation_service.repository.get_summary(simulation_id).status
+
+
+def test_run_simulation_starts_only_pending_simulations(simulation_service, runs):
+    simulation_service.repository.save(make_simulation("s1", agent_ids=[]))
+    simulation_service.repository.save(make_simulation("s2", agent_ids=[], status="running"))
+
+    # A duplicate job for a simulation running elsewhere is skipped
+    asyncio.run(simulation_service.run_simulation("s2"))
+    assert runs == []
+    assert _status(simulation_service, "s2") == SimulationStatus.RUNNING
+
+    asyncio.run(simulation_service.run_simulation("s1"))
+    assert runs == ["s1"]
+    assert _status(simulation_service, "s1") == SimulationStatus.COMPLETED
+    assert simulation_service.repository.get("s1")["result"]["summary"] == "Done"
+
+    # ...and so is one for a simulation that already finished
+    asyncio.run(simulation_service.run_simulation("s1"))
+    assert runs == ["s1"]
+
+    with pytest.raises(ValueError):
+        asyncio.run(simulation_service.run_simulation("missing"))
+
+
+def test_cancelled_run_stops_its_worker_and_leaves_the_simulation_to_recovery(simulation_service, runs, tmp_path):
+    simulation_service.repository.save(make_simulation(
+        "s1", agent_ids=[], config={"steps": 3, "initial_prompt": "Discuss the product", "block": True}
+    ))
+
+    async def cancel_when_running():
+        task = asyncio.create_task(simulation_service.run_simulation("s1"))
+        while not runs:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(cancel_when_running())
+
+    # The task ended only after the worker had stopped
+    assert runs == ["s1", "stopped"]
+    assert list((tmp_path / "events").glob("*.cancel")) == []
+    assert _status(simulation_service, "s1") == SimulationStatus.RUNNING
+    simulation_service.handle_recovered_jobs(["s1"], [])
+    assert _status(simulation_service, "s1") == SimulationStatus.PENDING
+
+
+def test_completion_handlers_run_off_the_event_loop(simulation_service, runs, monkeypatch):
+    simulation_service.repository.save(make_simulation("s1", agent_ids=[]))
+    threads = []
+    monkeypatch.setattr(simulation_service, "completion_handlers", [lambda _: threads.append(threading.get_ident())])
+
+    asyncio.run(simulation_service.run_simulation("s1"))
+
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
+
+
+@pytest.mark.parametrize("method", ["_index_transcript", "_store_interactions"])
+def test_transcript_is_recorded_off_the_event_loop(simulation_service, runs, monkeypatch, method):
+    simulation_service.repository.save(make_simulation("s1", agent_ids=[]))
+    threads = []
+    monkeypatch.setattr(simulation_service, method, lambda *args: threads.append(threading.get_ident()))
+
+    asyncio.run(simulation_service.run_simulation("s1"))
+
+    assert len(threads) == 1
+    assert threads[0] != threading.get_ident()
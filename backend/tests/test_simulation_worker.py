@@ -0,0 +1,143 @@
+"""Simulations executed in a worker process, on the benchmark suite's fake TinyTroupe."""
+
+from datetime import datetime
+
+import pytest
+
+from benchmarks.fakes import install_fake_tinytroupe
+
+
+@pytest.fixture(scope="module")
+def llm():
+    return install_fake_tinytroupe()
+
+
+@pytest.fixture(scope="module")
+def tinytroupe(llm):
+    from tinytroupe.agent import TinyPerson
+    from tinytroupe.environment import TinyWorld
+
+    return TinyPerson, TinyWorld
+
+
+@pytest.fixture
+def run(tinytroupe, tmp_path):
+    from app.services.simulation_worker import execute_tinytroupe_simulation
+
+    def run(simulation_data, agents_data, **options):
+        return execute_tinytroupe_simulation(simulation_data, agents_data, str(tmp_path / "events"), **options)
+
+    return run
+
+
+def _agent(agent_id, name, **persona):
+    return {"id": agent_id, "type": "TinyPerson", "persona": {"name": name, **persona}}
+
+
+def _simulation(simulation_id, steps=2, name="World", **config):
+    return {
+        "id": simulation_id,
+        "name": name,
+        "config": {"steps": steps, "initial_prompt": "What do you think of the product?", **config},
+    }
+
+
+CAST = [_agent("a1", "Lisa"), _agent("a2", "Oscar")]
+
+
+def test_same_cast_and_name_run_twice_in_one_worker(tinytroupe, run):
+    TinyPerson, TinyWorld = tinytroupe
+
+    first = run(_simulation("s1"), CAST)
+    second = run(_simulation("s2"), CAST)
+
+    assert second["interactions"]
+    assert [i["content"] for i in second["interactions"]] == [i["content"] for i in first["interactions"]]
+    assert TinyPerson.all_agents == {}
+    assert TinyWorld.all_environments == {}
+
+
+def test_failed_run_leaves_no_registered_agents(tinytroupe, run):
+    TinyPerson, TinyWorld = tinytroupe
+
+    with pytest.raises(Exception, match="Checkpoint for step 3 not found"):
+        run(_simulation("s1"), CAST, checkpoints={"dir": "missing", "interval": 0, "resume_step": 3})
+
+    assert TinyPerson.all_agents == {}
+    assert TinyWorld.all_environments == {}
+    assert run(_simulation("s1"), CAST)["interactions"]
+
+
+def test_interactions_are_timed_as_each_agent_acts(run, llm, monkeypatch):
+    # Each act thinks, then talks: two LLM calls
+    monkeypatch.setattr(llm.config, "latency", 0.02)
+
+    result = run(_simulation("s1", steps=1), CAST)
+
+    talks = [i for i in result["interactions"] if i["message_type"] == "TALK"]
+    assert [i["agent_id"] for i in talks] == ["a1", "a2"]
+    waited = datetime.fromisoformat(talks[1]["timestamp"]) - datetime.fromisoformat(talks[0]["timestamp"])
+    assert waited.total_seconds() >= 0.04
+    assert result["extracted_data"]["agents"]["a2"]["response_latency_seconds"]["mean"] >= 0.04
+
+
+def test_parallel_step_orders_interactions_like_the_sequential_one(tinytroupe, run, monkeypatch):
+    import time
+
+    TinyPerson, TinyWorld = tinytroupe
+    act, advance = TinyPerson.act, TinyWorld._advance_datetime
+    delays = {"Lisa": 0.03, "Oscar": 0.015, "Maria": 0.0}
+    advanced = []
+
+    def slow_act(self, return_actions=False):
+        # Later agents finish first
+        time.sleep(delays[self.name])
+        return act(self, return_actions)
+
+    def counted_advance(self, timedelta):
+        advanced.append(timedelta)
+        return advance(self, timedelta)
+
+    monkeypatch.setattr(TinyPerson, "act", slow_act)
+    monkeypatch.setattr(TinyWorld, "_advance_datetime", counted_advance)
+    cast = CAST + [_agent("a3", "Maria")]
+    order = lambda result: [(i["step"], i["agent_id"], i["message_type"]) for i in result["interactions"]]
+    transcript = lambda result: [(*entry, i["content"]) for entry, i in zip(order(result), result["interactions"])]
+
+    sequential = run(_simulation("s1", steps=2), cast)
+    parallel = run(_simulation("s2", steps=2, parallel_actions=True), cast, action_fanout=3)
+    again = run(_simulation("s3", steps=2, parallel_actions=True), cast, action_fanout=3)
+
+    assert order(parallel) == order(sequential)
+    assert transcript(again) == transcript(parallel)
+    # Both paths advance the world's clock once per step
+    assert advanced == [None] * 6
+
+
+def test_cancelled_run_stops_before_its_next_step(tinytroupe, run, tmp_path, monkeypatch):
+    from app.services.checkpoints import CheckpointStore
+    from app.services.simulation_events import SimulationEventLog
+    from app.services.simulation_worker import SimulationCancelledError
+
+    TinyPerson, _ = tinytroupe
+    act = TinyPerson.act
+    events = SimulationEventLog(str(tmp_path / "events"), "s1")
+
+    def act_then_cancel(self, return_actions=False):
+        # Asked to stop while step 2 is running
+        if len(self._messages) > 2:
+            events.request_cancel("run-1")
+        return act(self, return_actions)
+
+    monkeypatch.setattr(TinyPerson, "act", act_then_cancel)
+    checkpoints = {"dir": str(tmp_path / "checkpoints"), "interval": 1, "resume_step": None}
+
+    # Another run's marker is ignored
+    events.request_cancel("run-0")
+    with pytest.raises(SimulationCancelledError, match="cancelled after step 2"):
+        run(_simulation("s1", steps=4), CAST, checkpoints=checkpoints, run_id="run-1")
+
+    assert events.read_progress() == {"current_step": 2, "total_steps": 4}
+    assert CheckpointStore(checkpoints["dir"]).steps("s1") == [1, 2]
+    events.delete()
+    assert list((tmp_path / "events").glob("*.cancel")) == []
@@ -0,0 +1,73 @@
+"""Simulation API routes."""
+
+import pytest
+
+from factories import make_interaction, make_simulation
+
+
+@pytest.fixture
+def no_full_reads(simulation_service, monkeypatch):
+    """Fail the test if a route loads a simulation's full data."""
+    def get(simulation_id):
+        raise AssertionError(f"full simulation {simulation_id} loaded")
+
+    monkeypatch.setattr(simulation_service.repository, "get", get)
+
+
+def test_status_reads_only_the_summary(client, simulation_service, no_full_reads):
+    simulation_service.repository.save(make_simulation(
+        "s1", status="failed", error="LLM unavailable", interactions=[make_interaction(0)]
+    ))
+
+    response = client.get("/api/simulations/s1/status")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
+    assert response.json()["message"] == "LLM unavailable"
+    assert client.get("/api/simulations/missing/status").status_code == 404
+
+
+def test_status_reports_step_progress(client, simulation_service, no_full_reads):
+    simulation_service.repository.save(make_simulation("s1", status="running"))
+    simulation_service._event_log("s1").write_progress(1, 3)
+
+    body = client.get("/api/simulations/s1/status").json()
+
+    assert body["current_step"] == 1
+    assert body["total_steps"] == 3
+    assert body["progress"] == 33
+
+
+def test_events_of_finished_run_without_log(client, simulation_service, no_full_reads):
+    simulation_service.repository.save(make_simulation("s1", status="completed"))
+
+    response = client.get("/api/simulations/s1/events")
+
+    assert response.status_code == 200
+    assert response.text == 'event: status\ndata: {"status": "completed", "error": null}\n\nevent: end\ndata: {}\n\n'
+    assert client.get("/api/simulations/missing/events").status_code == 404
+
+
+def test_events_replay_resumed_runs_and_end_once(client, simulation_service):
+    simulation_service.repository.save(make_simulation("s1", status="completed"))
+    log = simulation_service._event_log("s1")
+    log.append("status", {"status": "running", "resume_step": None})
+    log.append("interaction", make_interaction(0, step=1))
+    log.append("status", {"status": "failed", "resume_step": None})
+    log.append("status", {"status": "pending", "resume_step": None})
+    log.append("status", {"status": "running", "resume_step": 1})
+    log.append("interaction", make_interaction(1, step=2))
+    log.append("status", {"status": "completed", "resume_step": None})
+    log.write_progress(2, 2)
+
+    response = client.get("/api/simulations/s1/events")
+
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    names = [line[len("event: "):] for block in events for line in block if line.startswith("event: ")]
+    # The old failure is replayed without ending the stream
+    assert names == ["status", "interaction", "status", "status", "status", "interaction", "status", "end"]
+    assert '"resume_step": 1' in response.text
+
+    # Reconnecting after the last event only gets the end of the stream
+    response = client.get("/api/simulations/s1/events", headers={"Last-Event-ID": "6"})
+    assert response.text == "event: end\ndata: {}\n\n"
@@ -0,0 +1,157 @@
+"""Parameter sweeps: scheduling, completion and combined results."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.simulation import SimulationStatus
+from app.models.sweep import SweepCreate
+from app.services import sweep_service as sweep_module
+from app.services.simulation_runner import SimulationQueueFullError, simulation_runner
+from app.services.sweep_service import SweepService
+
+from factories import make_interaction
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """Jobs submitted to the runner, with room for ``capacity`` of them."""
+    queue = SimpleNamespace(jobs=[], capacity=100)
+
+    def submit(simulation_id):
+        if len(queue.jobs) >= queue.capacity:
+            raise SimulationQueueFullError("Simulation queue is full")
+        queue.jobs.append(simulation_id)
+
+    monkeypatch.setattr(simulation_runner, "submit", submit)
+    monkeypatch.setattr(simulation_runner, "is_scheduled", lambda simulation_id: simulation_id in queue.jobs)
+    return queue
+
+
+@pytest.fixture
+def sweeps(tmp_path, simulation_service, queue, monkeypatch):
+    monkeypatch.setattr(simulation_service, "completion_handlers", [])
+    monkeypatch.setattr(sweep_module, "agent_service", SimpleNamespace(
+        get_agent=lambda agent_id: None if agent_id == "unknown" else SimpleNamespace(id=agent_id)
+    ))
+    service = SweepService(str(tmp_path / "sweeps"), simulation_service)
+    service.load()
+    return service
+
+
+def _create(sweeps, name="Pricing", prompts=("Cheap?", "Expensive?"), max_concurrency=1):
+    return sweeps.create_sweep(SweepCreate(
+        name=name,
+        grid={"initial_prompt": list(prompts), "agent_ids": [["a1", "a2"]], "steps": [2]},
+        max_concurrency=max_concurrency,
+    ))
+
+
+def _finish(simulation_service, queue, simulation_id, interactions=(), status=SimulationStatus.COMPLETED):
+    """Run a queued simulation to the end and fire the completion handlers."""
+    queue.jobs.remove(simulation_id)
+    repository = simulation_service.repository
+    repository.transition(simulation_id, [SimulationStatus.PENDING], {
+        "status": SimulationStatus.RUNNING, "started_at": "2025-01-01T00:00:00",
+    })
+    changes = {"status": status, "completed_at": "2025-01-01T00:00:30"}
+    if status == SimulationStatus.COMPLETED:
+        changes["result"] = {
+            "interactions": list(interactions),
+            "summary": "Done",
+            "extracted_data": {"messages": len(interactions)},
+            "llm_usage": {"calls": 4, "cache_hits": 1, "prompt_tokens": 10, "completion_tokens": 5},
+        }
+    else:
+        changes["error"] = "LLM unavailable"
+    repository.transition(simulation_id, [SimulationStatus.RUNNING], changes)
+    simulation_service._notify_finished(simulation_id)
+
+
+def test_create_expands_the_grid_and_respects_concurrency(sweeps, queue):
+    sweep = _create(sweeps, prompts=("A", "B", "C"), max_concurrency=2)
+
+    assert [run.parameters.initial_prompt for run in sweep.runs] == ["A", "B", "C"]
+    assert queue.jobs == [run.simulation_id for run in sweep.runs[:2]]
+    assert sweep.status == SimulationStatus.RUNNING
+    assert sweep.progress.pending == 3
+
+
+def test_create_rejects_unknown_agents_and_large_grids(sweeps, monkeypatch):
+    with pytest.raises(ValueError, match="Unknown agent IDs: unknown"):
+        sweeps.create_sweep(SweepCreate(name="x", grid={"initial_prompt": ["A"], "agent_ids": [["unknown"]]}))
+
+    monkeypatch.setattr(sweep_module.settings, "sweep_max_runs", 1)
+    with pytest.raises(ValueError, match="2 combinations"):
+        _create(sweeps)
+
+
+def test_finished_simulation_schedules_the_next_and_completes_the_sweep(sweeps, simulation_service, queue):
+    sweep = _create(sweeps)
+    first, second = (run.simulation_id for run in sweep.runs)
+
+    _finish(simulation_service, queue, first)
+    assert queue.jobs == [second]
+
+    _finish(simulation_service, queue, second, status=SimulationStatus.FAILED)
+    finished = sweeps.get_sweep(sweep.id)
+    assert finished.status == SimulationStatus.COMPLETED
+    assert finished.completed_at == "2025-01-01T00:00:30"
+    assert (finished.progress.completed, finished.progress.failed) == (1, 1)
+
+
+def test_simulation_outside_sweeps_does_not_schedule(sweeps, simulation_service, queue, monkeypatch):
+    sweep = _create(sweeps, prompts=("A",))
+    _finish(simulation_service, queue, sweep.runs[0].simulation_id)
+    scheduled = []
+    monkeypatch.setattr(sweeps, "schedule", lambda sweep_id: scheduled.append(sweep_id))
+
+    # Every sweep has finished, so there is nothing to refill
+    sweeps._on_simulation_finished("not-in-a-sweep")
+
+    assert scheduled == []
+
+
+def test_sweep_held_back_by_a_full_queue_gets_a_freed_slot(sweeps, simulation_service, queue):
+    queue.capacity = 0
+    sweep = _create(sweeps, prompts=("A",))
+    assert queue.jobs == []
+
+    # Any finished simulation frees a slot, even one outside a sweep
+    queue.capacity = 1
+    sweeps._on_simulation_finished("not-in-a-sweep")
+
+    assert queue.jobs == [sweep.runs[0].simulation_id]
+
+
+def test_sweep_created_by_another_worker_is_scheduled(sweeps, simulation_service, queue, tmp_path):
+    other = SweepService(str(tmp_path / "sweeps"), simulation_service)
+    # Only this worker's handler sees the completion
+    simulation_service.completion_handlers.remove(other._on_simulation_finished)
+    sweep = _create(other)
+
+    _finish(simulation_service, queue, sweep.runs[0].simulation_id)
+
+    assert queue.jobs == [sweep.runs[1].simulation_id]
+
+
+def test_results_combine_outcomes_without_reading_interactions(sweeps, simulation_service, queue, monkeypatch):
+    sweep = _create(sweeps, max_concurrency=2)
+    first, second = (run.simulation_id for run in sweep.runs)
+    interactions = [make_interaction(seq, message_type="TALK" if seq % 2 else "THINK") for seq in range(5)]
+    _finish(simulation_service, queue, first, interactions)
+    _finish(simulation_service, queue, second, status=SimulationStatus.FAILED)
+    monkeypatch.setattr(simulation_service.repository, "get", lambda simulation_id: pytest.fail("read in full"))
+
+    results = sweeps.get_results(sweep.id)
+
+    completed, failed = results.rows
+    assert (completed.initial_prompt, completed.status) == ("Cheap?", SimulationStatus.COMPLETED)
+    assert completed.interactions == 5
+    assert completed.message_types == {"THINK": 3, "TALK": 2}
+    assert (completed.llm_calls, completed.llm_cache_hits, completed.llm_tokens) == (4, 1, 15)
+    assert completed.duration_seconds == 30
+    assert completed.extracted_data == {"messages": 5}
+    assert (failed.status, failed.error, failed.interactions) == (SimulationStatus.FAILED, "LLM unavailable", 0)
+    assert results.status == SimulationStatus.COMPLETED
+    assert sweeps.get_results("missing") is None
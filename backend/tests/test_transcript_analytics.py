@@ -0,0 +1,103 @@
+"""Incremental transcript analytics."""
+
+import pytest
+
+from app.services.transcript_analytics import ANALYTICS_VERSION, TranscriptAnalytics
+
+from factories import make_interaction
+
+
+def _message(seq, second, agent_id, message_type, content, step):
+    name = {"a1": "Lisa", "a2": "Oscar"}[agent_id]
+    return make_interaction(
+        seq, step=step, agent_id=agent_id, agent_name=name, message_type=message_type,
+        content=content, timestamp=f"2025-01-01T00:00:{second:02d}",
+    )
+
+
+TRANSCRIPT = [
+    _message(0, 0, "a1", "TALK", "I love this great product", 1),
+    _message(1, 1, "a2", "THINK", "Too expensive, honestly", 1),
+    _message(2, 4, "a2", "TALK", "The price is too expensive", 1),
+    _message(3, 10, "a1", "TALK", "Fair point. The product quality is great", 2),
+    _message(4, 11, "a1", "DONE", "", 2),
+]
+
+
+def _analyze(batches):
+    analytics = TranscriptAnalytics()
+    for batch in batches:
+        analytics.add(batch)
+    return analytics.to_dict()
+
+
+def test_per_agent_statistics():
+    agents = _analyze([TRANSCRIPT])["agents"]
+
+    assert agents["a1"]["agent_name"] == "Lisa"
+    assert agents["a1"]["messages"] == 3
+    assert agents["a1"]["message_types"] == {"DONE": 1, "TALK": 2}
+    assert agents["a1"]["talk_count"] == 2
+    assert agents["a1"]["turn_words"] == {"total": 12, "mean": 6.0, "max": 7}
+    # Lisa answers Oscar's turn at 0:04 at 0:10; Oscar answers hers at 0:00 at 0:04
+    assert agents["a1"]["response_latency_seconds"] == {"responses": 1, "mean": 6.0, "max": 6.0}
+    assert agents["a2"]["response_latency_seconds"] == {"responses": 1, "mean": 4.0, "max": 4.0}
+    assert agents["a1"]["sentiment"] == {"mean": 1.0, "positive": 2, "negative": 0, "neutral": 0}
+    # Thoughts are scored, but are not turns
+    assert agents["a2"]["talk_count"] == 1
+    assert agents["a2"]["sentiment"] == {"mean": -1.0, "positive": 0, "negative": 2, "neutral": 0}
+    assert agents["a2"]["keywords"] == [
+        {"term": "expensive", "count": 2}, {"term": "honestly", "count": 1}, {"term": "price", "count": 1}
+    ]
+
+
+def test_overall_keywords_topics_and_sentiment():
+    data = _analyze([TRANSCRIPT])
+
+    assert data["analytics_version"] == ANALYTICS_VERSION
+    assert data["messages"] == 5
+    # Ties are ranked alphabetically; stopwords and one-letter words are skipped
+    assert [(k["term"], k["count"]) for k in data["keywords"]] == [
+        ("expensive", 2), ("great", 2), ("product", 2),
+        ("fair", 1), ("honestly", 1), ("love", 1), ("point", 1), ("price", 1), ("quality", 1),
+    ]
+    assert [t["term"] for t in data["topics"]] == [
+        "expensive honestly", "fair point", "great product", "product quality"
+    ]
+    assert data["sentiment"] == {"mean": 0.0, "by_step": {"1": -0.3333, "2": 1.0}}
+
+
+@pytest.mark.parametrize("batches", [
+    [TRANSCRIPT[:3], TRANSCRIPT[3:]],
+    [[message] for message in TRANSCRIPT],
+    [[], TRANSCRIPT[:1], [], TRANSCRIPT[1:]],
+])
+def test_batches_give_the_same_result_as_one_pass(batches):
+    assert _analyze(batches) == _analyze([TRANSCRIPT])
+
+
+def test_add_all_batches_a_whole_transcript():
+    analytics = TranscriptAnalytics()
+    analytics.add_all(iter(TRANSCRIPT), batch_size=2)
+
+    assert analytics.to_dict() == _analyze([TRANSCRIPT])
+
+
+def test_empty_transcript():
+    data = _analyze([[]])
+
+    assert data["messages"] == 0
+    assert data["agents"] == {}
+    assert data["keywords"] == []
+    assert data["topics"] == []
+    assert data["sentiment"] == {"mean": None, "by_step": {}}
+
+
+def test_agents_without_turns_have_no_averages():
+    data = _analyze([[_message(0, 0, "a2", "THINK", "Nothing to add", 1)]])
+
+    oscar = data["agents"]["a2"]
+    assert oscar["talk_count"] == 0
+    assert oscar["turn_words"] == {"total": 0, "mean": None, "max": None}
+    assert oscar["response_latency_seconds"] == {"responses": 0, "mean": None, "max": None}
+    assert oscar["sentiment"]["neutral"] == 1
@@ -0,0 +1,79 @@
+"""Full-text search over simulation transcripts."""
+
+import pytest
+
+from app.services.transcript_index import TranscriptIndex
+
+from factories import make_interaction
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "search.db"))
+    index.index("s1", [[
+        make_interaction(0, content="The price is too high for students"),
+        make_interaction(1, agent_name="Oscar", content="I would pay $49.99 for it"),
+        make_interaction(2, content="Pricing seems fair, prices elsewhere are higher"),
+    ]], completed_at="2025-01-01T00:00:30")
+    index.index("s2", [[
+        make_interaction(0, agent_name="Oscar", message_type="THINK", content="Students love the design"),
+    ]])
+    return index
+
+
+def _seqs(hits):
+    return [(hit["simulation_id"], hit["seq"]) for hit in hits]
+
+
+def test_fts5_syntax_is_supported(index):
+    hits, messages, simulations = index.search("price*")
+    assert sorted(_seqs(hits)) == [("s1", 0), ("s1", 2)]
+    assert (messages, simulations) == (2, 1)
+
+    hits, _, _ = index.search('"too high"')
+    assert _seqs(hits) == [("s1", 0)]
+
+    hits, _, _ = index.search("students NOT design")
+    assert _seqs(hits) == [("s1", 0)]
+
+    hits, messages, simulations = index.search("agent_name: oscar")
+    assert sorted(_seqs(hits)) == [("s1", 1), ("s2", 0)]
+    assert (messages, simulations) == (2, 2)
+
+    hits, _, _ = index.search("students", simulation_ids=["s2"])
+    assert _seqs(hits) == [("s2", 0)]
+
+
+def test_invalid_syntax_is_searched_as_plain_words(index):
+    hits, messages, _ = index.search("$49.99")
+    assert _seqs(hits) == [("s1", 1)]
+    assert messages == 1
+
+    # Operators on their own are literal words, found nowhere
+    assert index.search("AND (")[1] == 0
+    with pytest.raises(ValueError, match="empty"):
+        index.search("  ")
+
+
+def test_snippets_mark_matches_and_escape_content(tmp_path):
+    index = TranscriptIndex(str(tmp_path / "search.db"))
+    index.index("s1", [[make_interaction(0, content='<script>alert("price")</script> & the price <b>is</b> fine')]])
+
+    hits, _, _ = index.search("price")
+
+    assert hits[0]["snippet"] == (
+        '&lt;script&gt;alert(&quot;<mark>price</mark>&quot;)&lt;/script&gt; &amp; '
+        'the <mark>price</mark> &lt;b&gt;is&lt;/b&gt; fine'
+    )
+
+
+def test_reindexing_replaces_and_remove_drops(index):
+    index.index("s1", [[make_interaction(0, content="Completely new transcript")]], completed_at="later")
+
+    assert index.search("price*")[1] == 0
+    assert index.search("transcript")[1] == 1
+    assert index.indexed() == {"s1": "later", "s2": None}
+
+    index.remove("s1")
+    assert index.search("transcript")[1] == 0
+    assert index.indexed() == {"s2": None}
@@ -2,13 +2,18 @@
  * API client for OptimusSim backend
  */
 
-import type { Agent, AgentCreateRequest, AgentGenerateRequest, AgentListResponse } from '@/types/agent'
-import type { Simulation, SimulationCreateRequest, SimulationListResponse, SimulationStatusResponse } from '@/types/simulation'
+import type { Agent, AgentBatchGenerateItem, AgentBatchGenerateRequest, AgentCreateRequest, AgentGenerateRequest, AgentImportResponse, AgentListResponse, AgentSearchParams, AgentSearchResponse } from '@/types/agent'
+import type { Simulation, SimulationCreateRequest, SimulationExportFormat, SimulationForkRequest, SimulationListParams, SimulationListResponse, SimulationStatusResponse, TranscriptSearchParams, TranscriptSearchResponse, InteractionAggregateParams, InteractionAggregateResponse } from '@/types/simulation'
+import type { Sweep, SweepCreateRequest, SweepListResponse, SweepResultsResponse } from '@/types/sweep'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
 
+// Responses kept for ETag revalidation; the least recently used are evicted
+const ETAG_CACHE_MAX_ENTRIES = 200
+
 class ApiClient {
   private baseUrl: string
+  private etagCache = new Map<string, { etag: string; data: unknown }>()
 
   constructor(baseUrl: string = API_BASE_URL) {
     this.baseUrl = baseUrl
@@ -19,20 +24,42 @@ class ApiClient {
     options: RequestInit = {}
   ): Promise<T> {
     const url = `${this.baseUrl}${endpoint}`
+    const isGet = !options.method || options.method.toUpperCase() === 'GET'
+    // Revalidate GETs with the last ETag; unchanged resources come back as an empty 304
+    const cached = isGet ? this.etagCache.get(url) : undefined
+    if (cached) {
+      // Map iteration follows insertion order, so re-inserting marks it most recent
+      this.etagCache.delete(url)
+      this.etagCache.set(url, cached)
+    }
     const response = await fetch(url, {
       ...options,
       headers: {
         'Content-Type': 'application/json',
+        ...(cached ? { 'If-None-Match': cached.etag } : {}),
         ...options.headers,
       },
     })
 
+    if (response.status === 304 && cached) {
+      return cached.data as T
+    }
+
     if (!response.ok) {
       const error = await response.json().catch(() => ({ detail: response.statusText }))
       throw new Error(error.detail || `HTTP ${response.status}`)
     }
 
-    return response.json()
+    const data = await response.json()
+    const etag = response.headers.get('ETag')
+    if (isGet && etag) {
+      this.etagCache.delete(url)
+      this.etagCache.set(url, { etag, data })
+      while (this.etagCache.size > ETAG_CACHE_MAX_ENTRIES) {
+        this.etagCache.delete(this.etagCache.keys().next().value as string)
+      }
+    }
+    return data
   }
 
   // Agent endpoints
@@ -47,6 +74,23 @@ class ApiClient {
     return this.request<AgentListResponse>('/api/agents')
   }
 
+  async searchAgents(params: AgentSearchParams = {}): Promise<AgentSearchResponse> {
+    const query = new URLSearchParams()
+    if (params.name) query.set('name', params.name)
+    if (params.occupation) query.set('occupation', params.occupation)
+    if (params.nationality) query.set('nationality', params.nationality)
+    if (params.residence) query.set('residence', params.residence)
+    if (params.age_min !== undefined) query.set('age_min', String(params.age_min))
+    if (params.age_max !== undefined) query.set('age_max', String(params.age_max))
+    params.skills?.forEach((skill) => query.append('skill', skill))
+    params.traits?.forEach((trait) => query.append('trait', trait))
+    if (params.cursor) query.set('cursor', params.cursor)
+    if (params.limit) query.set('limit', String(params.limit))
+
+    const qs = query.toString()
+    return this.request<AgentSearchResponse>(`/api/agents/search${qs ? `?${qs}` : ''}`)
+  }
+
   async getAgent(id: string): Promise<Agent> {
     return this.request<Agent>(`/api/agents/${id}`)
   }
@@ -71,6 +115,39 @@ class ApiClient {
     })
   }
 
+  /**
+   * Generate agents in a batch, calling onItem as each one finishes.
+   */
+  async generateAgentsBatch(
+    data: AgentBatchGenerateRequest,
+    onItem: (item: AgentBatchGenerateItem) => void
+  ): Promise<void> {
+    const response = await fetch(`${this.baseUrl}/api/agents/generate/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(data),
+    })
+
+    if (!response.ok || !response.body) {
+      const error = await response.json().catch(() => ({ detail: response.statusText }))
+      throw new Error(error.detail || `HTTP ${response.status}`)
+    }
+
+    // Newline-delimited JSON, one item per generated agent
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    for (;;) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+      const lines = buffer.split('\n')
+      buffer = lines.pop() ?? ''
+      lines.filter((line) => line.trim()).forEach((line) => onItem(JSON.parse(line)))
+    }
+    if (buffer.trim()) onItem(JSON.parse(buffer))
+  }
+
   async uploadAgent(file: File): Promise<Agent> {
     const formData = new FormData()
     formData.append('file', file)
@@ -89,6 +166,24 @@ class ApiClient {
     return response.json()
   }
 
+  async importAgents(file: File): Promise<AgentImportResponse> {
+    // The file is the raw body, so the server can parse it while it uploads
+    const isZip = file.name.toLowerCase().endsWith('.zip')
+    const url = `${this.baseUrl}/api/agents/import`
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: { 'Content-Type': isZip ? 'application/zip' : 'application/x-ndjson' },
+      body: file,
+    })
+
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({ detail: response.statusText }))
+      throw new Error(error.detail || `HTTP ${response.status}`)
+    }
+
+    return response.json()
+  }
+
   // Simulation endpoints
   async createSimulation(data: SimulationCreateRequest): Promise<Simulation> {
     return this.request<Simulation>('/api/simulations', {
@@ -97,8 +192,41 @@ class ApiClient {
     })
   }
 
-  async listSimulations(): Promise<SimulationListResponse> {
-    return this.request<SimulationListResponse>('/api/simulations')
+  async listSimulations(params: SimulationListParams = {}): Promise<SimulationListResponse> {
+    const query = new URLSearchParams()
+    params.status?.forEach((status) => query.append('status', status))
+    if (params.created_after) query.set('created_after', params.created_after)
+    if (params.created_before) query.set('created_before', params.created_before)
+    if (params.cursor) query.set('cursor', params.cursor)
+    if (params.limit) query.set('limit', String(params.limit))
+
+    const qs = query.toString()
+    return this.request<SimulationListResponse>(`/api/simulations${qs ? `?${qs}` : ''}`)
+  }
+
+  async searchTranscripts(params: TranscriptSearchParams): Promise<TranscriptSearchResponse> {
+    const query = new URLSearchParams({ q: params.q })
+    params.ids?.forEach((id) => query.append('id', id))
+    if (params.offset) query.set('offset', String(params.offset))
+    if (params.limit) query.set('limit', String(params.limit))
+
+    return this.request<TranscriptSearchResponse>(`/api/simulations/search?${query.toString()}`)
+  }
+
+  async aggregateInteractions(params: InteractionAggregateParams = {}): Promise<InteractionAggregateResponse> {
+    const query = new URLSearchParams()
+    params.group_by?.forEach((dimension) => query.append('group_by', dimension))
+    if (params.bucket) query.set('bucket', params.bucket)
+    if (params.bucket_size) query.set('bucket_size', String(params.bucket_size))
+    params.ids?.forEach((id) => query.append('id', id))
+    params.agent_ids?.forEach((id) => query.append('agent_id', id))
+    params.message_types?.forEach((type) => query.append('message_type', type))
+    if (params.since) query.set('since', params.since)
+    if (params.until) query.set('until', params.until)
+    if (params.limit) query.set('limit', String(params.limit))
+
+    const qs = query.toString()
+    return this.request<InteractionAggregateResponse>(`/api/simulations/analytics${qs ? `?${qs}` : ''}`)
   }
 
   async getSimulation(id: string): Promise<Simulation> {
@@ -117,13 +245,54 @@ class ApiClient {
     })
   }
 
+  async forkSimulation(id: string, step: number, data: SimulationForkRequest = {}): Promise<Simulation> {
+    return this.request<Simulation>(`/api/simulations/${id}/fork?step=${step}`, {
+      method: 'POST',
+      body: JSON.stringify(data),
+    })
+  }
+
+  async resumeSimulation(id: string): Promise<Simulation> {
+    return this.request<Simulation>(`/api/simulations/${id}/resume`, {
+      method: 'POST',
+    })
+  }
+
+  getSimulationExportUrl(id: string, format: SimulationExportFormat): string {
+    return `${this.baseUrl}/api/simulations/${id}/export?format=${format}`
+  }
+
   async getSimulationStatus(id: string): Promise<SimulationStatusResponse> {
     return this.request<SimulationStatusResponse>(`/api/simulations/${id}/status`)
   }
 
+  simulationEventsUrl(id: string): string {
+    return `${this.baseUrl}/api/simulations/${id}/events`
+  }
+
   async getSimulationResults(id: string): Promise<Simulation> {
     return this.request<Simulation>(`/api/simulations/${id}/results`)
   }
+
+  // Sweep endpoints
+  async createSweep(data: SweepCreateRequest): Promise<Sweep> {
+    return this.request<Sweep>('/api/sweeps', {
+      method: 'POST',
+      body: JSON.stringify(data),
+    })
+  }
+
+  async listSweeps(): Promise<SweepListResponse> {
+    return this.request<SweepListResponse>('/api/sweeps')
+  }
+
+  async getSweep(id: string): Promise<Sweep> {
+    return this.request<Sweep>(`/api/sweeps/${id}`)
+  }
+
+  async getSweepResults(id: string): Promise<SweepResultsResponse> {
+    return this.request<SweepResultsResponse>(`/api/sweeps/${id}/results`)
+  }
 }
 
 // Export singleton instance
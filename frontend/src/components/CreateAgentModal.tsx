@@ -4,7 +4,8 @@ import Modal from './ui/Modal'
 import Button from './ui/Button'
 import Input from './ui/Input'
 import Textarea from './ui/Textarea'
-import { useGenerateAgent, useUploadAgent } from '@/hooks/useAgents'
+import { useGenerateAgent, useImportAgents, useUploadAgent } from '@/hooks/useAgents'
+import type { AgentImportResponse } from '@/types/agent'
 
 interface CreateAgentModalProps {
   isOpen: boolean
@@ -13,14 +14,18 @@ interface CreateAgentModalProps {
 
 type CreationMethod = 'quick' | 'upload' | 'scratch' | null
 
+const isBulkFile = (file: File) => /\.(jsonl|ndjson|zip)$/i.test(file.name)
+
 export default function CreateAgentModal({ isOpen, onClose }: CreateAgentModalProps) {
   const [method, setMethod] = useState<CreationMethod>(null)
   const [description, setDescription] = useState('')
   const [context, setContext] = useState('')
   const [file, setFile] = useState<File | null>(null)
+  const [importSummary, setImportSummary] = useState<AgentImportResponse | null>(null)
 
   const generateAgent = useGenerateAgent()
   const uploadAgent = useUploadAgent()
+  const importAgents = useImportAgents()
 
   const handleGenerate = async () => {
     if (!description.trim()) return
@@ -41,6 +46,11 @@ export default function CreateAgentModal({ isOpen, onClose }: CreateAgentModalPr
     if (!file) return
 
     try {
+      if (isBulkFile(file)) {
+        // Keep the modal open so rejected records can be reviewed
+        setImportSummary(await importAgents.mutateAsync(file))
+        return
+      }
       await uploadAgent.mutateAsync(file)
       onClose()
       resetForm()
@@ -61,6 +71,7 @@ export default function CreateAgentModal({ isOpen, onClose }: CreateAgentModalPr
     setDescription('')
     setContext('')
     setFile(null)
+    setImportSummary(null)
   }
 
   const handleClose = () => {
@@ -202,10 +213,10 @@ export default function CreateAgentModal({ isOpen, onClose }: CreateAgentModalPr
             </Button>
             <Button
               onClick={handleUpload}
-              isLoading={uploadAgent.isPending}
+              isLoading={uploadAgent.isPending || importAgents.isPending}
               disabled={!file}
             >
-              Upload Agent
+              {file && isBulkFile(file) ? 'Import Agents' : 'Upload Agent'}
             </Button>
           </>
         }
@@ -218,8 +229,11 @@ export default function CreateAgentModal({ isOpen, onClose }: CreateAgentModalPr
             <div className="border-2 border-dashed border-gray-300 rounded-lg p-6 text-center hover:border-primary-500 smooth-transition">
               <input
                 type="file"
-                accept=".json"
-                onChange={(e) => setFile(e.target.files?.[0] || null)}
+                accept=".json,.jsonl,.ndjson,.zip"
+                onChange={(e) => {
+                  setFile(e.target.files?.[0] || null)
+                  setImportSummary(null)
+                }}
                 className="hidden"
                 id="file-upload"
               />
@@ -228,16 +242,36 @@ export default function CreateAgentModal({ isOpen, onClose }: CreateAgentModalPr
                 <p className="text-sm text-gray-600">
                   {file ? file.name : 'Click to upload or drag and drop'}
                 </p>
-                <p className="text-xs text-gray-500 mt-1">JSON files only</p>
+                <p className="text-xs text-gray-500 mt-1">
+                  JSON for one agent; JSONL or zip to import many
+                </p>
               </label>
             </div>
           </div>
 
-          {uploadAgent.isError && (
+          {(uploadAgent.isError || importAgents.isError) && (
             <div className="p-3 bg-red-50 border border-red-200 rounded-lg text-sm text-red-800">
               Failed to upload agent. Please check the file format.
             </div>
           )}
+
+          {importSummary && (
+            <div className="p-3 bg-gray-50 border border-gray-200 rounded-lg text-sm text-gray-800">
+              <p className="font-medium">
+                Imported {importSummary.imported} agents, {importSummary.failed} rejected
+              </p>
+              {importSummary.errors.length > 0 && (
+                <ul className="mt-2 max-h-40 overflow-y-auto space-y-1 text-xs text-red-800">
+                  {importSummary.errors.map((error) => (
+                    <li key={error.record}>
+                      <span className="font-medium">{error.record}:</span> {error.error}
+                    </li>
+                  ))}
+                  {importSummary.errors_truncated && <li>…more errors not shown</li>}
+                </ul>
+              )}
+            </div>
+          )}
         </div>
       </Modal>
     )
@@ -3,11 +3,11 @@ import { useNavigate } from 'react-router-dom'
 import { Card, CardContent, CardFooter, CardHeader, CardTitle } from './ui/Card'
 import Badge from './ui/Badge'
 import Button from './ui/Button'
-import type { Simulation, SimulationStatus } from '@/types/simulation'
+import type { SimulationSummary, SimulationStatus } from '@/types/simulation'
 
 interface SimulationCardProps {
-  simulation: Simulation
-  onDelete?: (simulation: Simulation) => void
+  simulation: SimulationSummary
+  onDelete?: (simulation: SimulationSummary) => void
 }
 
 const statusConfig: Record<SimulationStatus, { label: string; variant: 'default' | 'warning' | 'success' | 'danger'; icon: any }> = {
@@ -4,7 +4,7 @@
 
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { apiClient } from '@/api/client'
-import type { AgentCreateRequest, AgentGenerateRequest } from '@/types/agent'
+import type { AgentCreateRequest, AgentGenerateRequest, AgentSearchParams } from '@/types/agent'
 
 const AGENTS_KEY = ['agents']
 
@@ -15,6 +15,13 @@ export function useAgents() {
   })
 }
 
+export function useAgentSearch(params: AgentSearchParams) {
+  return useQuery({
+    queryKey: [...AGENTS_KEY, 'search', params],
+    queryFn: () => apiClient.searchAgents(params),
+  })
+}
+
 export function useAgent(id: string) {
   return useQuery({
     queryKey: [...AGENTS_KEY, id],
@@ -78,3 +85,14 @@ export function useUploadAgent() {
     },
   })
 }
+
+export function useImportAgents() {
+  const queryClient = useQueryClient()
+
+  return useMutation({
+    mutationFn: (file: File) => apiClient.importAgents(file),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: AGENTS_KEY })
+    },
+  })
+}
@@ -2,16 +2,41 @@
  * React Query hooks for simulation management
  */
 
+import { useEffect, useState } from 'react'
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { apiClient } from '@/api/client'
-import type { SimulationCreateRequest } from '@/types/simulation'
+import type {
+  InteractionAggregateParams,
+  InteractionMessage,
+  SimulationCreateRequest,
+  SimulationForkRequest,
+  SimulationListParams,
+  SimulationStatusEvent,
+  SimulationStepEvent,
+  TranscriptSearchParams,
+} from '@/types/simulation'
 
 const SIMULATIONS_KEY = ['simulations']
 
-export function useSimulations() {
+export function useSimulations(params: SimulationListParams = {}) {
   return useQuery({
-    queryKey: SIMULATIONS_KEY,
-    queryFn: () => apiClient.listSimulations(),
+    queryKey: [...SIMULATIONS_KEY, 'list', params],
+    queryFn: () => apiClient.listSimulations(params),
+  })
+}
+
+export function useTranscriptSearch(params: TranscriptSearchParams) {
+  return useQuery({
+    queryKey: [...SIMULATIONS_KEY, 'search', params],
+    queryFn: () => apiClient.searchTranscripts(params),
+    enabled: params.q.trim().length > 0,
+  })
+}
+
+export function useInteractionAggregates(params: InteractionAggregateParams = {}) {
+  return useQuery({
+    queryKey: [...SIMULATIONS_KEY, 'analytics', params],
+    queryFn: () => apiClient.aggregateInteractions(params),
   })
 }
 
@@ -46,19 +71,92 @@ export function useStartSimulation() {
   })
 }
 
+export function useForkSimulation() {
+  const queryClient = useQueryClient()
+
+  return useMutation({
+    mutationFn: ({ id, step, data }: { id: string; step: number; data?: SimulationForkRequest }) =>
+      apiClient.forkSimulation(id, step, data),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: SIMULATIONS_KEY })
+    },
+  })
+}
+
+export function useResumeSimulation() {
+  const queryClient = useQueryClient()
+
+  return useMutation({
+    mutationFn: (id: string) => apiClient.resumeSimulation(id),
+    onSuccess: (_, id) => {
+      queryClient.invalidateQueries({ queryKey: [...SIMULATIONS_KEY, id] })
+      queryClient.invalidateQueries({ queryKey: SIMULATIONS_KEY })
+    },
+  })
+}
+
 export function useSimulationStatus(id: string, enabled: boolean = true) {
   return useQuery({
     queryKey: [...SIMULATIONS_KEY, id, 'status'],
     queryFn: () => apiClient.getSimulationStatus(id),
     enabled: enabled && !!id,
-    refetchInterval: (query) => {
-      const data = query.state.data
-      // Poll every 2 seconds if running
-      return data?.status === 'running' ? 2000 : false
-    },
   })
 }
 
+export interface SimulationEventsState {
+  progress: SimulationStepEvent | null
+  interactions: InteractionMessage[]
+}
+
+/**
+ * Subscribe to a simulation's live event stream (server-sent events).
+ * EventSource reconnects on its own and resumes via Last-Event-ID; the
+ * server's `end` event closes the stream once the latest run finished.
+ */
+export function useSimulationEvents(id: string, enabled: boolean = true): SimulationEventsState {
+  const queryClient = useQueryClient()
+  const [progress, setProgress] = useState<SimulationStepEvent | null>(null)
+  const [interactions, setInteractions] = useState<InteractionMessage[]>([])
+
+  useEffect(() => {
+    if (!enabled || !id) return
+
+    const source = new EventSource(apiClient.simulationEventsUrl(id))
+
+    source.addEventListener('step', (event) => {
+      setProgress(JSON.parse((event as MessageEvent).data))
+    })
+
+    source.addEventListener('interaction', (event) => {
+      const interaction: InteractionMessage = JSON.parse((event as MessageEvent).data)
+      setInteractions((current) => [...current, interaction])
+    })
+
+    source.addEventListener('status', (event) => {
+      const data: SimulationStatusEvent = JSON.parse((event as MessageEvent).data)
+      if (data.status === 'running') {
+        const resumeStep = data.resume_step
+        if (resumeStep) {
+          // A resumed run continues from its checkpoint; only later steps are run again
+          setInteractions((current) => current.filter((interaction) => (interaction.step ?? 0) <= resumeStep))
+        } else {
+          // A fresh run starts over from its first step
+          setProgress(null)
+          setInteractions([])
+        }
+      }
+      queryClient.invalidateQueries({ queryKey: [...SIMULATIONS_KEY, id] })
+    })
+
+    // A replayed failure may be followed by a resumed run, so only the server knows when to stop
+    source.addEventListener('end', () => source.close())
+
+    return () => source.close()
+  }, [id, enabled, queryClient])
+
+  return { progress, interactions }
+}
+
 export function useDeleteSimulation() {
   const queryClient = useQueryClient()
 
@@ -0,0 +1,44 @@
+/**
+ * React Query hooks for parameter sweeps
+ */
+
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
+import { apiClient } from '@/api/client'
+import type { SweepCreateRequest } from '@/types/sweep'
+
+const SWEEPS_KEY = ['sweeps']
+
+export function useSweeps() {
+  return useQuery({
+    queryKey: SWEEPS_KEY,
+    queryFn: () => apiClient.listSweeps(),
+  })
+}
+
+export function useSweep(id: string) {
+  return useQuery({
+    queryKey: [...SWEEPS_KEY, id],
+    queryFn: () => apiClient.getSweep(id),
+    enabled: !!id,
+  })
+}
+
+export function useSweepResults(id: string, enabled: boolean = true) {
+  return useQuery({
+    queryKey: [...SWEEPS_KEY, id, 'results'],
+    queryFn: () => apiClient.getSweepResults(id),
+    enabled: enabled && !!id,
+  })
+}
+
+export function useCreateSweep() {
+  const queryClient = useQueryClient()
+
+  return useMutation({
+    mutationFn: (data: SweepCreateRequest) => apiClient.createSweep(data),
+    onSuccess: () => {
+      queryClient.invalidateQueries({ queryKey: SWEEPS_KEY })
+      queryClient.invalidateQueries({ queryKey: ['simulations'] })
+    },
+  })
+}
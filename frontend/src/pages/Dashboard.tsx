@@ -7,20 +7,21 @@ import SimulationCard from '@/components/SimulationCard'
 import CreateSimulationModal from '@/components/CreateSimulationModal'
 import { useSimulations, useDeleteSimulation } from '@/hooks/useSimulations'
 import { useAgents } from '@/hooks/useAgents'
-import type { Simulation } from '@/types/simulation'
+import { SimulationStatus, type SimulationSummary } from '@/types/simulation'
 
 export default function Dashboard() {
   const navigate = useNavigate()
   const [isCreateModalOpen, setIsCreateModalOpen] = useState(false)
 
-  const { data: simulationsData, isLoading: simulationsLoading } = useSimulations()
+  const { data: simulationsData, isLoading: simulationsLoading } = useSimulations({ limit: 6 })
+  const { data: completedData } = useSimulations({ status: [SimulationStatus.COMPLETED], limit: 1 })
   const { data: agentsData } = useAgents()
   const deleteSimulation = useDeleteSimulation()
 
-  const recentSimulations = simulationsData?.simulations.slice(0, 6) || []
+  const recentSimulations = simulationsData?.simulations || []
   const agentCount = agentsData?.total || 0
 
-  const handleDelete = async (simulation: Simulation) => {
+  const handleDelete = async (simulation: SimulationSummary) => {
     if (window.confirm(`Are you sure you want to delete "${simulation.name}"?`)) {
       try {
         await deleteSimulation.mutateAsync(simulation.id)
@@ -92,7 +93,7 @@ export default function Dashboard() {
               <div>
                 <p className="text-sm text-gray-600">Completed</p>
                 <p className="text-3xl font-bold text-gray-900 mt-1">
-                  {simulationsData?.simulations.filter(s => s.status === 'completed').length || 0}
+                  {completedData?.total || 0}
                 </p>
               </div>
               <div className="w-12 h-12 bg-purple-100 rounded-lg flex items-center justify-center">
@@ -1,10 +1,11 @@
 import { useParams, useNavigate } from 'react-router-dom'
-import { ArrowLeft, Play, Clock, CheckCircle, XCircle, Download, Users } from 'lucide-react'
+import { ArrowLeft, Play, Clock, CheckCircle, XCircle, Download, Users, RotateCcw } from 'lucide-react'
 import Button from '@/components/ui/Button'
 import Badge from '@/components/ui/Badge'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/Card'
 import { LoadingState } from '@/components/ui/Spinner'
-import { useSimulation, useSimulationStatus } from '@/hooks/useSimulations'
+import { useResumeSimulation, useSimulation, useSimulationEvents } from '@/hooks/useSimulations'
+import { apiClient } from '@/api/client'
 import { SimulationStatus } from '@/types/simulation'
 
 export default function SimulationView() {
@@ -12,7 +13,9 @@ export default function SimulationView() {
   const navigate = useNavigate()
 
   const { data: simulation, isLoading, isError } = useSimulation(id!)
-  const { data: status } = useSimulationStatus(id!, simulation?.status === SimulationStatus.RUNNING)
+  const isActive = simulation?.status === SimulationStatus.PENDING || simulation?.status === SimulationStatus.RUNNING
+  const { progress, interactions: liveInteractions } = useSimulationEvents(id!, isActive)
+  const resumeSimulation = useResumeSimulation()
 
   if (isLoading) {
     return <LoadingState message="Loading simulation..." />
@@ -82,30 +85,55 @@ export default function SimulationView() {
               <span className="text-sm text-gray-500">
                 Created {formatDate(simulation.created_at)}
               </span>
+              {simulation.fork && (
+                <button
+                  className="text-sm text-primary-600 hover:underline"
+                  onClick={() => navigate(`/simulations/${simulation.fork!.parent_id}`)}
+                >
+                  Forked after step {simulation.fork.step}
+                </button>
+              )}
             </div>
           </div>
-          {simulation.result && (
-            <Button variant="secondary" onClick={handleExport}>
-              <Download className="w-4 h-4 mr-2" />
-              Export Results
+          {simulation.status === SimulationStatus.FAILED && (
+            <Button
+              variant="secondary"
+              onClick={() => resumeSimulation.mutate(simulation.id)}
+              isLoading={resumeSimulation.isPending}
+            >
+              <RotateCcw className="w-4 h-4 mr-2" />
+              Resume
             </Button>
           )}
+          {simulation.result && (
+            <div className="flex items-center gap-2">
+              <Button variant="secondary" onClick={handleExport}>
+                <Download className="w-4 h-4 mr-2" />
+                Export Results
+              </Button>
+              {(['csv', 'parquet'] as const).map((format) => (
+                <a key={format} href={apiClient.getSimulationExportUrl(simulation.id, format)} download>
+                  <Button variant="ghost" size="sm">{format.toUpperCase()}</Button>
+                </a>
+              ))}
+            </div>
+          )}
         </div>
 
         {/* Progress (for running simulations) */}
-        {simulation.status === SimulationStatus.RUNNING && status && (
+        {simulation.status === SimulationStatus.RUNNING && (
           <Card>
             <CardContent className="pt-6">
               <div className="flex items-center justify-between mb-2">
                 <span className="text-sm font-medium text-gray-700">Progress</span>
                 <span className="text-sm text-gray-600">
-                  {status.current_step || 0} / {status.total_steps || simulation.config.steps}
+                  {progress?.current_step || 0} / {progress?.total_steps || simulation.config.steps}
                 </span>
               </div>
               <div className="w-full bg-gray-200 rounded-full h-2">
                 <div
                   className="bg-primary-600 h-2 rounded-full smooth-transition"
-                  style={{ width: `${status.progress || 0}%` }}
+                  style={{ width: `${progress ? Math.round((progress.current_step / progress.total_steps) * 100) : 0}%` }}
                 />
               </div>
               <p className="text-sm text-gray-600 mt-2 text-center">
@@ -115,6 +143,29 @@ export default function SimulationView() {
           </Card>
         )}
 
+        {/* Live interactions (for running simulations) */}
+        {simulation.status === SimulationStatus.RUNNING && liveInteractions.length > 0 && (
+          <Card>
+            <CardHeader>
+              <CardTitle>Live Interactions</CardTitle>
+            </CardHeader>
+            <CardContent>
+              <div className="space-y-4">
+                {liveInteractions.map((interaction, idx) => (
+                  <div key={idx} className="border-l-4 border-yellow-400 pl-4 py-2">
+                    <div className="flex items-center gap-2 mb-1">
+                      <span className="font-medium text-gray-900">{interaction.agent_name}</span>
+                      <Badge variant="default" className="text-xs">{interaction.message_type}</Badge>
+                      <span className="text-xs text-gray-500">{new Date(interaction.timestamp).toLocaleTimeString()}</span>
+                    </div>
+                    <p className="text-gray-700 text-sm">{interaction.content}</p>
+                  </div>
+                ))}
+              </div>
+            </CardContent>
+          </Card>
+        )}
+
         {/* Config Details */}
         <div className="grid md:grid-cols-2 gap-6">
           <Card>
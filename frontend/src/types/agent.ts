@@ -75,7 +75,52 @@ export interface AgentGenerateRequest {
   context?: string
 }
 
+export interface AgentBatchGenerateRequest {
+  descriptions?: string[]
+  count?: number
+  description?: string
+  context?: string
+  concurrency?: number
+}
+
+export interface AgentBatchGenerateItem {
+  index: number
+  agent?: Agent | null
+  error?: string | null
+}
+
+export interface AgentImportError {
+  record: string
+  error: string
+}
+
+export interface AgentImportResponse {
+  imported: number
+  failed: number
+  errors: AgentImportError[]
+  errors_truncated: boolean
+}
+
 export interface AgentListResponse {
   agents: Agent[]
   total: number
 }
+
+export interface AgentSearchParams {
+  name?: string
+  occupation?: string
+  nationality?: string
+  residence?: string
+  age_min?: number
+  age_max?: number
+  skills?: string[]
+  traits?: string[]
+  cursor?: string
+  limit?: number
+}
+
+export interface AgentSearchResponse {
+  agents: Agent[]
+  total: number
+  next_cursor?: string | null
+}
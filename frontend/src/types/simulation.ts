@@ -30,18 +30,70 @@ export interface SimulationCreateRequest {
   config: SimulationConfig
 }
 
+export type SimulationExportFormat = 'jsonl' | 'csv' | 'parquet'
+
+export interface SimulationForkRequest {
+  name?: string
+  prompt?: string
+  agent_ids?: string[]
+  steps?: number
+}
+
+export interface SimulationFork {
+  parent_id: string
+  step: number
+  prompt?: string | null
+}
+
 export interface InteractionMessage {
   timestamp: string
   agent_id: string
   agent_name: string
   message_type: string
   content: string
+  step?: number
+}
+
+export interface LLMUsage {
+  calls?: number
+  cache_hits?: number
+  cache_misses?: number
+  prompt_tokens?: number
+  completion_tokens?: number
+}
+
+export interface TermCount {
+  term: string
+  count: number
+}
+
+export interface AgentAnalytics {
+  agent_name: string
+  messages: number
+  message_types: Record<string, number>
+  talk_count: number
+  turn_words: { total: number; mean: number | null; max: number | null }
+  response_latency_seconds: { responses: number; mean: number | null; max: number | null }
+  sentiment: { mean: number | null; positive: number; negative: number; neutral: number }
+  keywords: TermCount[]
+}
+
+/** Transcript analytics computed while the simulation runs */
+export interface ExtractedData {
+  analytics_version: number
+  messages: number
+  agents: Record<string, AgentAnalytics>
+  keywords: TermCount[]
+  topics: TermCount[]
+  sentiment: { mean: number | null; by_step: Record<string, number> }
 }
 
 export interface SimulationResult {
   interactions: InteractionMessage[]
   summary?: string
-  extracted_data?: Record<string, any>
+  // Empty for simulations completed before analytics were recorded
+  extracted_data?: ExtractedData | Record<string, never>
+  llm_usage?: LLMUsage & { agents?: Record<string, LLMUsage> }
 }
 
 export interface Simulation {
@@ -55,11 +107,23 @@ export interface Simulation {
   completed_at?: string
   result?: SimulationResult
   error?: string
+  fork?: SimulationFork | null
 }
 
+export type SimulationSummary = Omit<Simulation, 'result'>
+
 export interface SimulationListResponse {
-  simulations: Simulation[]
+  simulations: SimulationSummary[]
   total: number
+  next_cursor?: string | null
+}
+
+export interface SimulationListParams {
+  status?: SimulationStatus[]
+  created_after?: string
+  created_before?: string
+  cursor?: string
+  limit?: number
 }
 
 export interface SimulationStatusResponse {
@@ -70,3 +134,86 @@ export interface SimulationStatusResponse {
   total_steps?: number
   message?: string
 }
+
+export interface SimulationStepEvent {
+  current_step: number
+  total_steps: number
+  duration_seconds?: number
+}
+
+export interface SimulationStatusEvent {
+  status: SimulationStatus
+  started_at?: string | null
+  completed_at?: string | null
+  error?: string | null
+  /** Checkpointed step a resumed run continues after; null for a fresh start */
+  resume_step?: number | null
+}
+
+export interface TranscriptSearchParams {
+  q: string
+  ids?: string[]
+  offset?: number
+  limit?: number
+}
+
+export interface TranscriptSearchHit {
+  simulation_id: string
+  simulation_name?: string | null
+  seq: number
+  step?: number | null
+  timestamp: string
+  agent_id: string
+  agent_name: string
+  message_type: string
+  snippet: string
+  score: number
+}
+
+export interface TranscriptSearchResponse {
+  query: string
+  hits: TranscriptSearchHit[]
+  total: number
+  simulations: number
+  offset: number
+  limit: number
+}
+
+export type InteractionGroupDimension = 'simulation' | 'agent' | 'message_type' | 'step' | 'time'
+
+export interface InteractionAggregateParams {
+  group_by?: InteractionGroupDimension[]
+  bucket?: 'minute' | 'hour' | 'day' | 'week'
+  bucket_size?: number
+  ids?: string[]
+  agent_ids?: string[]
+  message_types?: string[]
+  since?: string
+  until?: string
+  limit?: number
+}
+
+export interface InteractionAggregate {
+  simulation_id?: string | null
+  simulation_name?: string | null
+  agent_id?: string | null
+  agent_name?: string | null
+  message_type?: string | null
+  step?: number | null
+  bucket_start?: string | null
+  messages: number
+  words?: number | null
+  mean_words?: number | null
+  simulations: number
+  agents: number
+  first_timestamp?: string | null
+  last_timestamp?: string | null
+}
+
+export interface InteractionAggregateResponse {
+  group_by: InteractionGroupDimension[]
+  bucket?: string | null
+  groups: InteractionAggregate[]
+  total_groups: number
+  totals: InteractionAggregate
+}
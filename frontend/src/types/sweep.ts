@@ -0,0 +1,80 @@
+/**
+ * TypeScript types for parameter sweeps
+ */
+
+import type { EnvironmentType, ExtractedData, SimulationStatus } from '@/types/simulation'
+
+export interface SweepGrid {
+  initial_prompt: string[]
+  agent_ids: string[][]
+  steps?: number[]
+  environment_type?: EnvironmentType[]
+}
+
+export interface SweepCreateRequest {
+  name: string
+  grid: SweepGrid
+  parallel_actions?: boolean
+  max_concurrency?: number
+}
+
+export interface SweepParameters {
+  initial_prompt: string
+  agent_ids: string[]
+  steps: number
+  environment_type: EnvironmentType
+}
+
+export interface SweepRun {
+  simulation_id: string
+  parameters: SweepParameters
+  status: SimulationStatus
+}
+
+export interface SweepProgress {
+  total: number
+  pending: number
+  running: number
+  completed: number
+  failed: number
+  completed_steps: number
+  total_steps: number
+  progress: number
+}
+
+export interface Sweep {
+  id: string
+  name: string
+  status: SimulationStatus
+  max_concurrency: number
+  created_at: string
+  completed_at?: string | null
+  progress: SweepProgress
+  runs: SweepRun[]
+}
+
+export interface SweepListResponse {
+  sweeps: Sweep[]
+  total: number
+}
+
+export interface SweepResultRow extends SweepParameters {
+  simulation_id: string
+  status: SimulationStatus
+  duration_seconds?: number | null
+  interactions: number
+  message_types: Record<string, number>
+  llm_calls: number
+  llm_cache_hits: number
+  llm_tokens: number
+  summary?: string | null
+  extracted_data?: ExtractedData | Record<string, never> | null
+  error?: string | null
+}
+
+export interface SweepResultsResponse {
+  sweep_id: string
+  status: SimulationStatus
+  progress: SweepProgress
+  rows: SweepResultRow[]
+}